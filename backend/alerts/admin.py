@@ -0,0 +1,35 @@
+from django.contrib import admin
+from wms.admin_utils import LargeTableAdmin
+from . import models
+
+
+@admin.register(models.StockThreshold)
+class StockThresholdAdmin(admin.ModelAdmin):
+    list_display = ('material', 'warehouse', 'minimum', 'is_active', 'company')
+    list_select_related = ('material', 'warehouse__company', 'company')
+    list_filter = ('is_active',)
+    autocomplete_fields = ('company', 'material', 'warehouse')
+    search_fields = ('=material__name',)
+
+
+@admin.register(models.MaterialStock)
+class MaterialStockAdmin(LargeTableAdmin):
+    list_display = ('material', 'warehouse', 'quantity')
+    list_select_related = ('material', 'warehouse__company')
+    search_fields = ('=material__name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.Alert)
+class AlertAdmin(LargeTableAdmin):
+    list_display = ('id', 'kind', 'material', 'warehouse', 'lot', 'quantity', 'created_at', 'resolved_at',
+                    'notified_at')
+    list_select_related = ('material', 'warehouse__company')
+    list_filter = ('kind',)
+    autocomplete_fields = ('company', 'material', 'warehouse', 'lot')
+    search_fields = ('=key',)
@@ -0,0 +1,273 @@
+"""
+Incremental low-stock and expiry alerts.
+
+Low stock is evaluated on every stock change instead of by rescanning
+``Inventory``:
+
+- ``MaterialStock`` keeps the running total of every material per warehouse.
+  Saved and deleted inventory rows add the difference to their snapshot (see
+  ``wms.models.SnapshotMixin``), and set-based writers describe their changes
+  in ``stock_changed`` (``deltas`` of ``(warehouse, lot, quantity)`` or the
+  ``pks`` and ``delta`` of adjusted rows). Anything else rebuilds the
+  company's totals, as does ``python manage.py check_alerts --rebuild``.
+- After a change only the thresholds of the touched materials are read;
+  materials without thresholds cost no further query. A threshold without a
+  warehouse applies to the company's total.
+
+Expiry uses the index on ``Lot.expiration`` as a time-ordered queue: the
+``check_alerts`` command raises alerts for lots expiring within the horizon
+after the stored watermark and moves the watermark forward, so every lot is
+read once. Lots saved with an expiration already inside the horizon raise
+their alert immediately.
+
+Alerts are keyed by the condition and a partial unique constraint allows one
+open alert per key, so a condition that persists is reported once; it is
+resolved when stock recovers or the threshold goes away. Pending alerts are
+handed to the notifiers in batches, grouped by company, by ``deliver``.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from products.models import Inventory, Lot
+from products.signals import lot_company_id, stock_changed, warehouse_company_id
+from wms.db import upsert_add
+from .models import Alert, ExpiryWatermark, MaterialStock, StockThreshold
+from .notifiers import Notifier
+
+DEFAULTS = {
+    # Lots expiring within this many days raise an expiry alert.
+    'EXPIRY_HORIZON_DAYS': 7,
+    # Dotted paths of ``alerts.notifiers.Notifier`` subclasses.
+    'NOTIFIERS': ['alerts.notifiers.EmailNotifier'],
+    # Alerts handed to the notifiers at once.
+    'BATCH_SIZE': 500,
+    'LOT_CACHE_SIZE': 100_000,
+}
+
+# Material of every lot seen; lots never change their material.
+_lot_materials: Dict[int, int] = {}
+
+
+def alerts_settings() -> Dict[str, Any]:
+    """Get ALERTS settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'ALERTS', {})}
+
+
+def lot_materials(lot_ids: Iterable[int]) -> Dict[int, int]:
+    """Material of each lot, reading unknown lots with one query."""
+    lot_ids = set(lot_ids)
+    missing = lot_ids - _lot_materials.keys()
+    if missing:
+        if len(_lot_materials) + len(missing) > alerts_settings()['LOT_CACHE_SIZE']:
+            _lot_materials.clear()
+        _lot_materials.update(Lot.objects.filter(pk__in=missing).values_list('pk', 'material_id'))
+    return {lot_id: _lot_materials[lot_id] for lot_id in lot_ids if lot_id in _lot_materials}
+
+
+def clear() -> None:
+    _lot_materials.clear()
+
+
+def apply_deltas(company_id: int, deltas: Iterable[Tuple[int, int, float]]) -> None:
+    """
+    Add inventory changes to the running totals and evaluate the touched materials.
+
+    Args:
+        company_id: Company owning the warehouses
+        deltas: ``(warehouse id, lot id, quantity change)`` triples
+    """
+    if company_id is None:
+        return
+    deltas = list(deltas)
+    materials = lot_materials(lot_id for _, lot_id, _ in deltas)
+    totals: Dict[Tuple[int, int], float] = defaultdict(float)
+    for warehouse_id, lot_id, delta in deltas:
+        if lot_id in materials:
+            totals[warehouse_id, materials[lot_id]] += delta
+    rows = [(warehouse_id, material_id, delta) for (warehouse_id, material_id), delta in totals.items() if delta]
+    if not rows:
+        return
+    upsert_add(MaterialStock, ['warehouse_id', 'material_id'], 'quantity', rows)
+    evaluate(company_id, {material_id for _, material_id, _ in rows})
+
+
+def rebuild(company_id: int) -> None:
+    """Recompute the running totals of a company from its inventory and evaluate all its thresholds."""
+    totals = (
+        Inventory.objects.filter(warehouse__company_id=company_id)
+        .values_list('warehouse_id', 'lot__material_id')
+        .annotate(total=Sum('quantity'))
+    )
+    with transaction.atomic():
+        MaterialStock.objects.filter(warehouse__company_id=company_id).delete()
+        MaterialStock.objects.bulk_create(
+            [MaterialStock(warehouse_id=warehouse_id, material_id=material_id, quantity=total)
+             for warehouse_id, material_id, total in totals]
+        )
+    evaluate(company_id)
+
+
+def low_stock_key(material_id: int, warehouse_id: Optional[int]) -> str:
+    return f'{Alert.LOW_STOCK}:{material_id}:{warehouse_id or "all"}'
+
+
+def evaluate(company_id: int, material_ids: Optional[Set[int]] = None) -> None:
+    """
+    Open or resolve low stock alerts of a company's thresholds.
+
+    Args:
+        company_id: Company whose thresholds are evaluated
+        material_ids: Evaluate only the thresholds of these materials
+    """
+    thresholds = StockThreshold.objects.filter(company_id=company_id, is_active=True)
+    if material_ids is not None:
+        thresholds = thresholds.filter(material_id__in=material_ids)
+    thresholds = list(thresholds.values_list('material_id', 'warehouse_id', 'minimum'))
+    if not thresholds:
+        return
+    stock: Dict[Tuple[int, Optional[int]], float] = defaultdict(float)
+    for warehouse_id, material_id, quantity in (
+        MaterialStock.objects
+        .filter(warehouse__company_id=company_id, material_id__in={material_id for material_id, _, _ in thresholds})
+        .values_list('warehouse_id', 'material_id', 'quantity')
+    ):
+        stock[material_id, warehouse_id] += quantity
+        stock[material_id, None] += quantity
+
+    low = {low_stock_key(material_id, warehouse_id): (material_id, warehouse_id, minimum)
+           for material_id, warehouse_id, minimum in thresholds
+           if stock[material_id, warehouse_id] < minimum}
+    keys = [low_stock_key(material_id, warehouse_id) for material_id, warehouse_id, _ in thresholds]
+    open_keys = set(Alert.objects.filter(company_id=company_id, key__in=keys, resolved_at__isnull=True)
+                    .values_list('key', flat=True))
+    new = [
+        Alert(company_id=company_id, kind=Alert.LOW_STOCK, key=key, material_id=material_id,
+              warehouse_id=warehouse_id, quantity=stock[material_id, warehouse_id], minimum=minimum)
+        for key, (material_id, warehouse_id, minimum) in low.items() if key not in open_keys
+    ]
+    if new:
+        Alert.objects.bulk_create(new, ignore_conflicts=True)
+    resolve(company_id, open_keys - low.keys())
+
+
+def resolve(company_id: int, keys: Iterable[str]) -> None:
+    keys = list(keys)
+    if keys:
+        Alert.objects.filter(company_id=company_id, key__in=keys, resolved_at__isnull=True).update(
+            resolved_at=timezone.now())
+
+
+def expiry_horizon(now: Optional[datetime] = None) -> datetime:
+    return (now or timezone.now()) + timedelta(days=alerts_settings()['EXPIRY_HORIZON_DAYS'])
+
+
+def expiry_alert(company_id: int, lot_id: int, material_id: int, quantity: float, expiration: datetime) -> Alert:
+    return Alert(company_id=company_id, kind=Alert.EXPIRY, key=f'{Alert.EXPIRY}:{lot_id}', material_id=material_id,
+                 lot_id=lot_id, quantity=quantity, expiration=expiration)
+
+
+def scan_expiring(now: Optional[datetime] = None) -> int:
+    """
+    Raise expiry alerts for lots expiring between the watermark and the horizon.
+
+    Returns:
+        Number of lots read
+    """
+    horizon = expiry_horizon(now)
+    batch_size = alerts_settings()['BATCH_SIZE']
+    with transaction.atomic():
+        watermark = ExpiryWatermark.objects.select_for_update().first()
+        lots = Lot.objects.filter(expiration__lte=horizon, quantity_remaining__gt=0)
+        if watermark is not None:
+            if watermark.position >= horizon:
+                return 0
+            lots = lots.filter(expiration__gt=watermark.position)
+        rows = lots.values_list('pk', 'material_id', 'material__company_id', 'quantity_remaining', 'expiration')
+        alerts = [expiry_alert(company_id, lot_id, material_id, quantity, expiration)
+                  for lot_id, material_id, company_id, quantity, expiration in rows.iterator(chunk_size=batch_size)]
+        Alert.objects.bulk_create(alerts, batch_size=batch_size, ignore_conflicts=True)
+        if watermark is None:
+            ExpiryWatermark.objects.create(position=horizon)
+        else:
+            watermark.position = horizon
+            watermark.save(update_fields=['position'])
+    return len(alerts)
+
+
+def deliver(notifiers: Optional[List[Any]] = None) -> int:
+    """
+    Hand pending alerts to the notifiers, grouped by company, and mark them notified.
+
+    Alerts resolved before they were delivered are marked without being sent.
+
+    Returns:
+        Number of alerts delivered
+    """
+    options = alerts_settings()
+    if notifiers is None:
+        notifiers = [import_string(path)() for path in options['NOTIFIERS']]
+    delivered = 0
+    while True:
+        pending = list(
+            Alert.objects.filter(notified_at__isnull=True)
+            .select_related('company', 'material', 'warehouse')
+            .order_by('pk')[:options['BATCH_SIZE']]
+        )
+        if not pending:
+            return delivered
+        by_company = Notifier.group([alert for alert in pending if alert.resolved_at is None])
+        for notifier in notifiers:
+            notifier.notify(by_company)
+        Alert.objects.filter(pk__in=[alert.pk for alert in pending]).update(notified_at=timezone.now())
+        delivered += sum(len(alerts) for alerts in by_company.values())
+
+
+@receiver([post_save, post_delete], sender=Inventory, dispatch_uid='alerts_inventory')
+def inventory_changed(sender: Any, instance: Inventory, **kwargs: Any) -> None:
+    deltas = []
+    if instance.previous('lot_id') is not None:
+        deltas.append((instance.previous('warehouse_id'), instance.previous('lot_id'), -instance.previous('quantity')))
+    elif kwargs['signal'] is post_delete:
+        deltas.append((instance.warehouse_id, instance.lot_id, -instance.quantity))
+    if kwargs['signal'] is post_save:
+        deltas.append((instance.warehouse_id, instance.lot_id, instance.quantity))
+    apply_deltas(warehouse_company_id(instance.warehouse_id), deltas)
+
+
+@receiver(post_save, sender=Lot, dispatch_uid='alerts_lot_expiry')
+def lot_saved(sender: Any, instance: Lot, **kwargs: Any) -> None:
+    if instance.quantity_remaining > 0 and instance.expiration <= expiry_horizon():
+        Alert.objects.bulk_create([expiry_alert(lot_company_id(instance.pk), instance.pk, instance.material_id,
+                                                instance.quantity_remaining, instance.expiration)],
+                                  ignore_conflicts=True)
+
+
+@receiver([post_save, post_delete], sender=StockThreshold, dispatch_uid='alerts_threshold')
+def threshold_changed(sender: Any, instance: StockThreshold, **kwargs: Any) -> None:
+    if kwargs['signal'] is post_save and instance.is_active:
+        evaluate(instance.company_id, {instance.material_id})
+    else:
+        resolve(instance.company_id, [low_stock_key(instance.material_id, instance.warehouse_id)])
+
+
+@receiver(stock_changed, dispatch_uid='alerts_stock_changed')
+def stock_changed_handler(sender: Any, company_id: Optional[int] = None, **kwargs: Any) -> None:
+    if company_id is None or kwargs.get('instance') is not None:
+        # Saved rows are handled by their own receivers.
+        return
+    if 'deltas' in kwargs:
+        apply_deltas(company_id, kwargs['deltas'])
+    elif sender is Inventory and 'pks' in kwargs:
+        rows = Inventory.objects.filter(pk__in=kwargs['pks']).values_list('warehouse_id', 'lot_id')
+        apply_deltas(company_id, [(warehouse_id, lot_id, kwargs['delta']) for warehouse_id, lot_id in rows])
+    elif sender is Inventory or not hasattr(sender, '_meta'):
+        # Bulk loads without details, e.g. generate_dataset.
+        rebuild(company_id)
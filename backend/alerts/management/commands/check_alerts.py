@@ -0,0 +1,21 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from users.models import Company
+from alerts import engine
+
+
+class Command(BaseCommand):
+    help = ('Raise alerts for lots nearing expiration and send pending alerts. '
+            'Meant to be run periodically (e.g. every few minutes from cron).')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute the running stock totals of every company first')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['rebuild']:
+            for company_id in Company.objects.values_list('pk', flat=True):
+                engine.rebuild(company_id)
+        expiring = engine.scan_expiring()
+        delivered = engine.deliver()
+        self.stdout.write(self.style.SUCCESS(f'Scanned {expiring} expiring lots, delivered {delivered} alerts'))
@@ -0,0 +1,80 @@
+# Generated by Django 5.1 on 2026-10-19 11:33
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0007_lot_inventory_version'),
+        ('users', '0008_revokedtoken'),
+        ('warehouse', '0003_wave'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'expiry_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='Alert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('low_stock', 'Low stock'), ('expiry', 'Expiry')], max_length=20)),
+                ('key', models.CharField(help_text='Identifies the condition; one open alert per key', max_length=100)),
+                ('quantity', models.FloatField()),
+                ('minimum', models.FloatField(blank=True, null=True)),
+                ('expiration', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+                ('lot', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='products.lot')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='products.material')),
+                ('warehouse', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='warehouse.warehouse')),
+            ],
+            options={
+                'db_table': 'alert',
+                'indexes': [models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['notified_at'], name='alert_pending_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('resolved_at__isnull', True)), fields=('company', 'key'), name='alert_open_key_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MaterialStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.FloatField(default=0)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='products.material')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='warehouse.warehouse')),
+            ],
+            options={
+                'db_table': 'material_stock',
+                'unique_together': {('warehouse', 'material')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StockThreshold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minimum', models.FloatField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('is_active', models.BooleanField(default=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='products.material')),
+                ('warehouse', models.ForeignKey(blank=True, help_text='Empty for the total of all warehouses', null=True, on_delete=django.db.models.deletion.CASCADE, to='warehouse.warehouse')),
+            ],
+            options={
+                'db_table': 'stock_threshold',
+                'constraints': [models.UniqueConstraint(fields=('material', 'warehouse'), name='stock_threshold_unique'), models.UniqueConstraint(condition=models.Q(('warehouse__isnull', True)), fields=('material',), name='stock_threshold_total_unique')],
+            },
+        ),
+    ]
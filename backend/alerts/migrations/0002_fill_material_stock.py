@@ -0,0 +1,23 @@
+from django.db import migrations
+from django.db.models import Sum
+
+
+def fill_material_stock(apps, schema_editor):
+    Inventory = apps.get_model('products', 'Inventory')
+    MaterialStock = apps.get_model('alerts', 'MaterialStock')
+    totals = Inventory.objects.values_list('warehouse_id', 'lot__material_id').annotate(total=Sum('quantity'))
+    MaterialStock.objects.bulk_create(
+        MaterialStock(warehouse_id=warehouse_id, material_id=material_id, quantity=total)
+        for warehouse_id, material_id, total in totals.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_material_stock, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+from django.core.validators import MinValueValidator
+from django.db import models
+from users.models import Company
+from warehouse.models import Warehouse
+from products.models import Lot, Material
+
+
+class StockThreshold(models.Model):
+    """Minimum stock of a material in one warehouse, or in all warehouses of the company."""
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    material = models.ForeignKey(Material, on_delete=models.CASCADE)
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, null=True, blank=True,
+                                  help_text="Empty for the total of all warehouses")
+    minimum = models.FloatField(validators=[MinValueValidator(0)])
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f'StockThreshold: {self.material} - {self.warehouse or "all"} - {self.minimum}'
+
+    class Meta:
+        db_table = 'stock_threshold'
+        constraints = [
+            models.UniqueConstraint(fields=['material', 'warehouse'], name='stock_threshold_unique'),
+            models.UniqueConstraint(fields=['material'], condition=models.Q(warehouse__isnull=True),
+                                    name='stock_threshold_total_unique'),
+        ]
+
+
+class MaterialStock(models.Model):
+    """Running total of a material's inventory in a warehouse, maintained by ``alerts.engine``."""
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE)
+    material = models.ForeignKey(Material, on_delete=models.CASCADE)
+    quantity = models.FloatField(default=0)
+
+    def __str__(self):
+        return f'MaterialStock: {self.warehouse} - {self.material} - {self.quantity}'
+
+    class Meta:
+        db_table = 'material_stock'
+        unique_together = ('warehouse', 'material')
+
+
+class Alert(models.Model):
+    LOW_STOCK = 'low_stock'
+    EXPIRY = 'expiry'
+    KIND_CHOICES = (
+        (LOW_STOCK, 'Low stock'),
+        (EXPIRY, 'Expiry'),
+    )
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    key = models.CharField(max_length=100, help_text="Identifies the condition; one open alert per key")
+    material = models.ForeignKey(Material, on_delete=models.CASCADE)
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, null=True, blank=True)
+    lot = models.ForeignKey(Lot, on_delete=models.CASCADE, null=True, blank=True)
+    quantity = models.FloatField()
+    minimum = models.FloatField(null=True, blank=True)
+    expiration = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Alert: {self.kind} - {self.key}'
+
+    class Meta:
+        db_table = 'alert'
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'key'], condition=models.Q(resolved_at__isnull=True),
+                                    name='alert_open_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['notified_at'], condition=models.Q(notified_at__isnull=True),
+                         name='alert_pending_idx'),
+        ]
+
+
+class ExpiryWatermark(models.Model):
+    """Expiration up to which lots have been scanned for expiry alerts; a single row."""
+    position = models.DateTimeField()
+
+    class Meta:
+        db_table = 'expiry_watermark'
@@ -0,0 +1,53 @@
+"""
+Pluggable delivery of alerts.
+
+``alerts.engine.deliver`` hands every batch of pending alerts to each class
+listed in ``ALERTS['NOTIFIERS']``, grouped by company, so a notifier sends
+one message per company and batch rather than one per alert.
+"""
+
+from collections import defaultdict
+from django.core.mail import EmailMessage, get_connection
+from typing import Dict, Iterable, List
+from users.models import Company
+from .models import Alert
+
+
+def describe(alert: Alert) -> str:
+    """One line summary of an alert."""
+    place = alert.warehouse.name if alert.warehouse_id else 'all warehouses'
+    if alert.kind == Alert.LOW_STOCK:
+        return (f'Low stock: {alert.material.name} at {alert.quantity:g} {alert.material.unit} in {place}, '
+                f'minimum {alert.minimum:g}')
+    return (f'Expiring: lot {alert.lot_id} of {alert.material.name} ({alert.quantity:g} {alert.material.unit}) '
+            f'expires {alert.expiration:%Y-%m-%d %H:%M}')
+
+
+class Notifier:
+    """Base class of alert notifiers."""
+
+    @staticmethod
+    def group(alerts: Iterable[Alert]) -> Dict[Company, List[Alert]]:
+        by_company: Dict[Company, List[Alert]] = defaultdict(list)
+        for alert in alerts:
+            by_company[alert.company].append(alert)
+        return by_company
+
+    def notify(self, alerts: Dict[Company, List[Alert]]) -> None:
+        """Deliver the alerts of each company."""
+        raise NotImplementedError
+
+
+class EmailNotifier(Notifier):
+    """Send each company one email listing its alerts, over a single connection."""
+
+    subject = 'WMS alerts'
+
+    def notify(self, alerts: Dict[Company, List[Alert]]) -> None:
+        messages = [
+            EmailMessage(subject=f'{self.subject} ({len(company_alerts)})',
+                         body='\n'.join(describe(alert) for alert in company_alerts), to=[company.email])
+            for company, company_alerts in alerts.items() if company_alerts
+        ]
+        if messages:
+            get_connection().send_messages(messages)
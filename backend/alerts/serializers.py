@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from . import models
+
+
+class StockThresholdSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.StockThreshold
+        fields = ['id', 'material', 'warehouse', 'minimum', 'is_active']
+
+    def validate(self, attrs):
+        company_id = self.context['request'].user.company_id
+        for field in ('material', 'warehouse'):
+            if attrs.get(field) is not None and attrs[field].company_id != company_id:
+                raise serializers.ValidationError({field: 'Object does not belong to your company.'})
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['company'] = self.context['request'].user.company
+        return super().create(validated_data)
+
+
+class AlertSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Alert
+        fields = ['id', 'kind', 'material', 'warehouse', 'lot', 'quantity', 'minimum', 'expiration',
+                  'created_at', 'notified_at']
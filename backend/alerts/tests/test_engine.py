@@ -0,0 +1,165 @@
+"""
+Test suite for incremental low stock and expiry alerts.
+"""
+
+from datetime import timedelta
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from rest_framework.test import APIClient
+from conftest import create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from products.models import Inventory, Lot, Material
+from products.services import adjust_quantity
+from products.transfers import transfer
+from ..engine import deliver, rebuild, scan_expiring
+from ..models import Alert, MaterialStock, StockThreshold
+
+
+class TestAlerts(TestCase):
+    """Test suite for running totals, thresholds, the expiry queue and delivery."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.main = Warehouse.objects.create(company=cls.company, name='Main')
+        cls.production = Warehouse.objects.create(company=cls.company, name='Production')
+        cls.supplier = create_supplier(cls.company)
+        cls.steel = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        cls.lots = [cls.lot(cls.steel, days=30) for _ in range(2)]
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    @classmethod
+    def lot(cls, material: Material, days: float, quantity: float = 10) -> Lot:
+        return Lot.objects.create(supplier=cls.supplier, material=material, quantity_received=quantity,
+                                  quantity_remaining=quantity, expiration=timezone.now() + timedelta(days=days))
+
+    def stock(self) -> dict:
+        return {(warehouse_id, material_id): quantity for warehouse_id, material_id, quantity
+                in MaterialStock.objects.values_list('warehouse_id', 'material_id', 'quantity')}
+
+    def open_alerts(self) -> list:
+        return sorted(Alert.objects.filter(resolved_at__isnull=True).values_list('key', flat=True))
+
+    def test_running_totals(self) -> None:
+        """
+        Test keeping per warehouse totals in step with inventory changes.
+
+        Verifies:
+            - Saves, moves and deletes of rows update the totals by their difference
+            - Transfers and optimistic adjustments update the totals without a rebuild
+            - A rebuild reproduces the incremental totals
+        """
+        first = Inventory.objects.create(warehouse=self.main, lot=self.lots[0], quantity=10)
+        second = Inventory.objects.create(warehouse=self.main, lot=self.lots[1], quantity=5)
+        first.quantity = 8
+        first.save()
+        assert self.stock() == {(self.main.pk, self.steel.pk): 13}
+
+        transfer(self.company.pk, self.main.pk, self.production.pk, [(self.lots[0].pk, 3)])
+        adjust_quantity(Inventory, second.pk, self.company.pk, -1)
+        assert self.stock() == {(self.main.pk, self.steel.pk): 9, (self.production.pk, self.steel.pk): 3}
+
+        Inventory.objects.get(pk=second.pk).delete()
+        incremental = self.stock()
+        assert incremental == {(self.main.pk, self.steel.pk): 5, (self.production.pk, self.steel.pk): 3}
+        rebuild(self.company.pk)
+        assert self.stock() == incremental
+
+    def test_thresholds(self) -> None:
+        """
+        Test opening and resolving low stock alerts.
+
+        Verifies:
+            - Warehouse and company wide thresholds are checked on each change
+            - A persisting condition keeps a single open alert
+            - Alerts resolve when stock recovers or the threshold is removed
+        """
+        row = Inventory.objects.create(warehouse=self.main, lot=self.lots[0], quantity=10)
+        Inventory.objects.create(warehouse=self.production, lot=self.lots[1], quantity=4)
+        in_main = StockThreshold.objects.create(company=self.company, material=self.steel, warehouse=self.main,
+                                                minimum=5)
+        StockThreshold.objects.create(company=self.company, material=self.steel, minimum=12)
+        assert self.open_alerts() == []
+
+        row.quantity = 4
+        row.save()
+        assert self.open_alerts() == sorted([f'low_stock:{self.steel.pk}:all',
+                                             f'low_stock:{self.steel.pk}:{self.main.pk}'])
+        row.quantity = 3
+        row.save()
+        assert Alert.objects.count() == 2
+
+        row.quantity = 6
+        row.save()
+        assert self.open_alerts() == [f'low_stock:{self.steel.pk}:all']
+        in_main.delete()
+        row.quantity = 1
+        row.save()
+        assert self.open_alerts() == [f'low_stock:{self.steel.pk}:all']
+
+    def test_expiry_queue(self) -> None:
+        """
+        Test raising expiry alerts.
+
+        Verifies:
+            - Lots received inside the horizon raise an alert right away
+            - The scan picks up lots that entered the horizon and reads each lot once
+            - Empty lots are skipped
+        """
+        soon = self.lot(self.steel, days=2)
+        assert self.open_alerts() == [f'expiry:{soon.pk}']
+        later = self.lot(self.steel, days=10)
+        self.lot(self.steel, days=9, quantity=0)
+
+        assert scan_expiring() == 1
+        assert scan_expiring() == 0
+        assert scan_expiring(timezone.now() + timedelta(days=5)) == 1
+        assert self.open_alerts() == sorted([f'expiry:{soon.pk}', f'expiry:{later.pk}'])
+
+    def test_delivery(self) -> None:
+        """
+        Test batched delivery through the email notifier.
+
+        Verifies:
+            - One email per company lists all pending alerts
+            - Delivered alerts are not sent again
+            - Alerts resolved before delivery are not sent
+        """
+        self.lot(self.steel, days=1)
+        self.lot(self.steel, days=2)
+        Alert.objects.create(company=self.company, kind=Alert.LOW_STOCK, key='resolved', material=self.steel,
+                             quantity=0, minimum=1, resolved_at=timezone.now())
+        out = StringIO()
+        call_command('check_alerts', stdout=out)
+        assert 'delivered 2 alerts' in out.getvalue()
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [self.company.email]
+        assert mail.outbox[0].body.count('Expiring: lot') == 2
+        assert deliver() == 0
+        assert len(mail.outbox) == 1
+
+    def test_endpoints(self) -> None:
+        """
+        Test the threshold and alert endpoints.
+
+        Verifies:
+            - A new threshold is evaluated at once
+            - Thresholds of materials of another company are rejected
+            - Open alerts are listed
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        other = Company.objects.create(name='Other', domain='other.com', email='other@other.com')
+        foreign = Material.objects.create(company=other, name='Foreign', unit='kg')
+        response = client.post(reverse('alerts:threshold'), {'material': self.steel.pk, 'minimum': 1}, format='json')
+        assert response.status_code == 201
+        response = client.post(reverse('alerts:threshold'), {'material': foreign.pk, 'minimum': 1}, format='json')
+        assert response.status_code == 400
+        alerts = client.get(reverse('alerts:alert')).json()
+        assert [(alert['kind'], alert['material'], alert['quantity']) for alert in alerts] == [
+            ('low_stock', self.steel.pk, 0)]
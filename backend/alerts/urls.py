@@ -0,0 +1,9 @@
+from . import views
+from django.urls import path
+
+app_name = 'alerts'
+
+urlpatterns = [
+    path('threshold/', views.StockThresholdViewSet.as_view(), name='threshold'),
+    path('alert/', views.AlertListView.as_view(), name='alert'),
+]
@@ -0,0 +1,52 @@
+from rest_framework import generics
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Any
+from . import serializers, models
+
+
+class StockThresholdViewSet(generics.ListCreateAPIView):
+    """View for managing low stock thresholds."""
+    serializer_class = serializers.StockThresholdSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 11}
+
+    def get_queryset(self):
+        return models.StockThreshold.objects.filter(company_id=self.request.user.company_id)
+
+    @swagger_auto_schema(
+        operation_description="Get the stock thresholds of the user's company",
+        responses={200: serializers.StockThresholdSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Alert when the stock of a material falls below `minimum`, in one warehouse "
+                              "or, without `warehouse`, in all warehouses together",
+        responses={201: serializers.StockThresholdSerializer},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+
+class AlertListView(generics.ListAPIView):
+    """View for the open alerts of the user's company."""
+    serializer_class = serializers.AlertSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3}
+
+    def get_queryset(self):
+        return (models.Alert.objects
+                .filter(company_id=self.request.user.company_id, resolved_at__isnull=True)
+                .order_by('-created_at'))
+
+    @swagger_auto_schema(
+        operation_description="Get open low stock and expiry alerts, newest first",
+        responses={200: serializers.AlertSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
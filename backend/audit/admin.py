@@ -0,0 +1,18 @@
+from django.contrib import admin
+from wms.admin_utils import LargeTableAdmin
+from . import models
+
+
+@admin.register(models.AuditEntry)
+class AuditEntryAdmin(LargeTableAdmin):
+    list_display = ('created_at', 'model', 'object_id', 'action', 'company_id', 'user_id')
+    list_filter = ('model', 'action')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,150 @@
+"""
+Batched audit log of stock-affecting writes.
+
+Writes to ``Lot``, ``Inventory``, ``Batch``, ``Item`` and ``Order`` are
+described by ``AuditEntry`` rows (see ``audit.signals``) without adding an
+INSERT to every write:
+
+- A receiver describes the write as a ``Change`` in memory and hands it to
+  ``transaction.on_commit``, so changes of rolled back transactions and
+  savepoints are dropped together with their callbacks.
+- Committed changes collect in the buffer of the current ``capture()``
+  scope, held in a context variable, and are written with one multi-row
+  INSERT (see ``wms.db.insert``) when the scope ends. ``AuditMiddleware`` opens a scope for
+  every request and fills in the requesting user, so a request costs one
+  INSERT after its response is built however many rows it wrote.
+- Outside a scope (management commands, the shell) every change is written
+  as soon as its transaction commits; batch jobs should run in ``capture()``.
+
+Set-based writers are covered through ``stock_changed``: optimistic
+adjustments are recorded per row and transfers per moved ``(warehouse,
+lot)``, whose inventory row ids are looked up when the scope is written.
+Raw bulk loads that describe no rows are not audited.
+
+Entries are written after their transaction has committed, so the entries
+of a process that dies in between are lost; a failed write is logged and
+never turns a committed request into an error.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from django.conf import settings
+from django.db import DatabaseError, router, transaction
+from django.db.models import Model
+from django.utils import timezone
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+from wms.db import insert
+from .models import AuditEntry
+import logging
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('created_at', 'company_id', 'user_id', 'model', 'object_id', 'action', 'changes')
+
+DEFAULTS = {
+    # Months of partitions created ahead on PostgreSQL.
+    'PARTITIONS_AHEAD': 3,
+    # Entries older than this many days are dropped by ``audit_partitions``, never if None.
+    'RETENTION_DAYS': None,
+}
+
+
+def audit_settings() -> Dict[str, Any]:
+    """Get AUDIT settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'AUDIT', {})}
+
+
+@dataclass
+class Change:
+    """A write waiting to be stored as an ``AuditEntry``."""
+
+    model: Type[Model]
+    object_id: Optional[int]
+    action: str
+    changes: Dict[str, Any]
+    company_id: Optional[int]
+    created_at: datetime = field(default_factory=timezone.now)
+    # Field values identifying the row when its id is not known, e.g. rows written by a set-based UPDATE.
+    lookup: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Scope:
+    """Changes committed while a ``capture()`` block runs."""
+
+    changes: List[Change] = field(default_factory=list)
+    user_id: Optional[int] = None
+
+
+_scope: ContextVar[Optional[Scope]] = ContextVar('audit_scope', default=None)
+
+
+def record(change: Change, using: Optional[str] = None) -> None:
+    """Store a change once the current transaction commits."""
+    transaction.on_commit(partial(_committed, change), using=using or router.db_for_write(change.model))
+
+
+def _committed(change: Change) -> None:
+    scope = _scope.get()
+    if scope is None:
+        flush([change])
+    else:
+        scope.changes.append(change)
+
+
+@contextmanager
+def capture(user_id: Optional[int] = None) -> Iterator[Scope]:
+    """
+    Buffer the changes committed inside the block and write them together at its end.
+
+    Args:
+        user_id: User the changes are attributed to; can also be set on the scope later
+    """
+    scope = Scope(user_id=user_id)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+        try:
+            flush(scope.changes, scope.user_id)
+        except DatabaseError:
+            logger.exception('Could not write %d audit entries', len(scope.changes))
+
+
+def flush(changes: Sequence[Change], user_id: Optional[int] = None) -> None:
+    """Write changes as audit entries."""
+    if not changes:
+        return
+    ids = _resolve(change for change in changes if change.object_id is None and change.lookup)
+    with transaction.atomic(using=router.db_for_write(AuditEntry)):
+        insert(AuditEntry, FIELDS, [
+            (change.created_at, change.company_id, user_id, change.model._meta.model_name,
+             change.object_id if change.object_id is not None else ids.get(id(change)), change.action,
+             change.changes)
+            for change in changes
+        ])
+
+
+def _resolve(changes: Iterator[Change]) -> Dict[int, int]:
+    """Ids of the rows identified by ``lookup``, by ``id()`` of their change; one query per model and lookup."""
+    groups: Dict[tuple, List[Change]] = defaultdict(list)
+    for change in changes:
+        groups[change.model, tuple(change.lookup)].append(change)
+    ids = {}
+    for (model, names), group in groups.items():
+        found = {
+            tuple(row[:-1]): row[-1]
+            for row in model.objects.filter(**{
+                f'{name}__in': {change.lookup[name] for change in group} for name in names
+            }).values_list(*names, 'pk')
+        }
+        for change in group:
+            pk = found.get(tuple(change.lookup[name] for name in names))
+            if pk is not None:
+                ids[id(change)] = pk
+    return ids
@@ -0,0 +1,13 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from audit import partitions
+
+
+class Command(BaseCommand):
+    help = ('Create the audit log partitions of the coming months and drop the expired ones. '
+            'Meant to be run daily (e.g. from cron).')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        created = partitions.create_partitions()
+        dropped = partitions.drop_expired()
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} partitions, removed {dropped} expired'))
@@ -0,0 +1,25 @@
+from django.http import HttpRequest, HttpResponse
+from typing import Callable
+from . import log
+
+
+class AuditMiddleware:
+    """
+    Middleware writing the audit entries of a request in one batch, see ``audit.log``.
+
+    The entries are attributed to the user DRF authenticated for the view.
+    It should be placed before ``QueryInspectorMiddleware``: the batch is
+    written once per request, not by the view, so it does not count against
+    view query budgets.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with log.capture() as scope:
+            try:
+                return self.get_response(request)
+            finally:
+                user = getattr(request, 'user', None)
+                scope.user_id = user.pk if user is not None and user.is_authenticated else None
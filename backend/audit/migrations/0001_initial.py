@@ -0,0 +1,99 @@
+import django.core.serializers.json
+import django.utils.timezone
+from datetime import datetime, timedelta, timezone
+from django.db import migrations, models
+
+PARTITIONS_AHEAD = 3
+
+
+def create_table(apps, schema_editor):
+    AuditEntry = apps.get_model('audit', 'AuditEntry')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(AuditEntry)
+        if schema_editor.connection.vendor == 'sqlite':
+            schema_editor.execute(
+                "CREATE TRIGGER audit_entry_append_only BEFORE UPDATE ON audit_entry "
+                "BEGIN SELECT RAISE(ABORT, 'audit_entry is append-only'); END"
+            )
+        return
+    # The primary key of a partitioned table must contain the partition key.
+    schema_editor.execute(
+        'CREATE TABLE audit_entry ('
+        'id bigint GENERATED BY DEFAULT AS IDENTITY, '
+        'created_at timestamp with time zone NOT NULL, '
+        'company_id bigint NULL, '
+        'user_id bigint NULL, '
+        'model varchar(50) NOT NULL, '
+        'object_id bigint NULL, '
+        'action varchar(10) NOT NULL, '
+        'changes jsonb NOT NULL, '
+        'PRIMARY KEY (id, created_at)'
+        ') PARTITION BY RANGE (created_at)'
+    )
+    for index in AuditEntry._meta.indexes:
+        schema_editor.add_index(AuditEntry, index)
+    schema_editor.execute('CREATE TABLE audit_entry_default PARTITION OF audit_entry DEFAULT')
+    start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(PARTITIONS_AHEAD + 1):
+        end = (start + timedelta(days=32)).replace(day=1)
+        schema_editor.execute(
+            f"CREATE TABLE audit_entry_y{start.year}m{start.month:02d} PARTITION OF audit_entry "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    schema_editor.execute(
+        "CREATE FUNCTION audit_entry_append_only() RETURNS trigger LANGUAGE plpgsql AS "
+        "$$ BEGIN RAISE EXCEPTION 'audit_entry is append-only'; END $$"
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER audit_entry_append_only BEFORE UPDATE OR DELETE ON audit_entry '
+        'FOR EACH ROW EXECUTE FUNCTION audit_entry_append_only()'
+    )
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.execute('DROP TABLE audit_entry')
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP FUNCTION audit_entry_append_only()')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AuditEntry',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('company_id', models.BigIntegerField(null=True)),
+                        ('user_id', models.BigIntegerField(null=True)),
+                        ('model', models.CharField(max_length=50)),
+                        ('object_id', models.BigIntegerField(null=True)),
+                        ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'),
+                                                             ('deleted', 'Deleted'), ('adjusted', 'Adjusted')],
+                                                    max_length=10)),
+                        ('changes', models.JSONField(
+                            encoder=django.core.serializers.json.DjangoJSONEncoder,
+                            help_text='Values of created and deleted rows, [old, new] pairs of updated fields and '
+                                      'the change of adjusted quantities')),
+                    ],
+                    options={
+                        'verbose_name_plural': 'audit entries',
+                        'db_table': 'audit_entry',
+                        'indexes': [
+                            models.Index(fields=['model', 'object_id', 'created_at'], name='audit_entry_object'),
+                            models.Index(fields=['company_id', 'created_at'], name='audit_entry_company'),
+                        ],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_table, drop_table),
+    ]
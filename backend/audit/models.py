@@ -0,0 +1,44 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEntry(models.Model):
+    """
+    A change of a stock-affecting row, see ``audit.log``.
+
+    The table is append-only and, on PostgreSQL, partitioned by month of
+    ``created_at``. Companies, users and objects are referenced by id only,
+    so entries outlive the rows they describe.
+    """
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ADJUSTED = 'adjusted'
+    ACTION_CHOICES = (
+        (CREATED, 'Created'),
+        (UPDATED, 'Updated'),
+        (DELETED, 'Deleted'),
+        (ADJUSTED, 'Adjusted'),
+    )
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    company_id = models.BigIntegerField(null=True)
+    user_id = models.BigIntegerField(null=True)
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField(null=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(encoder=DjangoJSONEncoder, help_text=(
+        "Values of created and deleted rows, [old, new] pairs of updated fields and the change of "
+        "adjusted quantities"))
+
+    def __str__(self):
+        return f'{self.model} {self.object_id} {self.action} at {self.created_at}'
+
+    class Meta:
+        db_table = 'audit_entry'
+        verbose_name_plural = 'audit entries'
+        indexes = [
+            models.Index(fields=['model', 'object_id', 'created_at'], name='audit_entry_object'),
+            models.Index(fields=['company_id', 'created_at'], name='audit_entry_company'),
+        ]
@@ -0,0 +1,102 @@
+"""
+Monthly partitions and retention of the audit log.
+
+On PostgreSQL ``audit_entry`` is partitioned by range of ``created_at``,
+one partition per calendar month (UTC) named ``audit_entry_yYYYYmMM``, plus
+a default partition catching entries no month partition covers. Per-object
+history reads the ``(model, object_id, created_at)`` index of every
+partition, or only of the partitions in range when bounded by time, and
+retention drops whole partitions instead of deleting rows, so the table
+never needs vacuuming for it. The table rejects updates and deletes.
+
+``python manage.py audit_partitions`` creates the partitions of the coming
+``PARTITIONS_AHEAD`` months and drops the ones older than
+``RETENTION_DAYS``; run it daily. Month partitions must exist before their
+first entry arrives, since a partition cannot be attached while the default
+partition holds rows of its range. Elsewhere the table is not partitioned
+and retention deletes the expired rows.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db import connections, router
+from django.utils import timezone
+from typing import Iterator, List, Optional, Tuple
+from .log import audit_settings
+from .models import AuditEntry
+import re
+
+PARTITION_NAME = re.compile(r'^audit_entry_y(\d{4})m(\d{2})$')
+
+
+def months(start: datetime, count: int) -> Iterator[Tuple[datetime, datetime]]:
+    """Bounds of ``count`` calendar months (UTC) from the one containing ``start``."""
+    first = start.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(count):
+        following = (first + timedelta(days=32)).replace(day=1)
+        yield first, following
+        first = following
+
+
+def partition_name(start: datetime) -> str:
+    return f'audit_entry_y{start.year}m{start.month:02d}'
+
+
+def create_partitions(now: Optional[datetime] = None, ahead: Optional[int] = None) -> List[str]:
+    """
+    Create the missing month partitions from the current month on.
+
+    Returns:
+        Names of the created partitions; nothing outside PostgreSQL
+    """
+    connection = connections[router.db_for_write(AuditEntry)]
+    if connection.vendor != 'postgresql':
+        return []
+    ahead = audit_settings()['PARTITIONS_AHEAD'] if ahead is None else ahead
+    existing = set(partitions())
+    created = []
+    with connection.cursor() as cursor:
+        for start, end in months(now or timezone.now(), ahead + 1):
+            name = partition_name(start)
+            if name in existing:
+                continue
+            cursor.execute(f"CREATE TABLE {name} PARTITION OF audit_entry "
+                           f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+            created.append(name)
+    return created
+
+
+def partitions() -> List[str]:
+    """Names of the month partitions of ``audit_entry``, oldest first."""
+    connection = connections[router.db_for_write(AuditEntry)]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                       "WHERE i.inhparent = 'audit_entry'::regclass")
+        return sorted(name for name, in cursor.fetchall() if PARTITION_NAME.match(name))
+
+
+def drop_expired(now: Optional[datetime] = None, retention_days: Optional[float] = None) -> int:
+    """
+    Remove entries older than the retention period.
+
+    On PostgreSQL only months that lie entirely before the cutoff are dropped.
+
+    Returns:
+        Number of dropped partitions on PostgreSQL, of deleted entries elsewhere
+    """
+    retention_days = audit_settings()['RETENTION_DAYS'] if retention_days is None else retention_days
+    if retention_days is None:
+        return 0
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    connection = connections[router.db_for_write(AuditEntry)]
+    if connection.vendor != 'postgresql':
+        return AuditEntry.objects.filter(created_at__lt=cutoff).delete()[0]
+    expired = []
+    for name in partitions():
+        year, month = map(int, PARTITION_NAME.match(name).groups())
+        _, end = next(months(datetime(year, month, 1, tzinfo=dt_timezone.utc), 1))
+        if end <= cutoff:
+            expired.append(name)
+    with connection.cursor() as cursor:
+        for name in expired:
+            cursor.execute(f'DROP TABLE {name}')
+    return len(expired)
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from . import models
+from .signals import AUDITED
+
+MAX_LIMIT = 500
+
+
+class AuditQuerySerializer(serializers.Serializer):
+    model = serializers.ChoiceField(choices=[model._meta.model_name for model in AUDITED], required=False)
+    object_id = serializers.IntegerField(required=False, help_text='Only this row of the model')
+    before = serializers.DateTimeField(required=False, help_text='Only entries older than this, to page back')
+    limit = serializers.IntegerField(default=100, min_value=1, max_value=MAX_LIMIT)
+
+    def validate(self, attrs):
+        if 'object_id' in attrs and 'model' not in attrs:
+            raise serializers.ValidationError({'model': 'Required with object_id.'})
+        return attrs
+
+
+class AuditEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.AuditEntry
+        fields = ['id', 'created_at', 'user_id', 'model', 'object_id', 'action', 'changes']
@@ -0,0 +1,69 @@
+"""
+Model signal receivers describing stock-affecting writes for the audit log.
+
+Saved and deleted rows are described by their ``snapshot_fields`` (see
+``wms.models.SnapshotMixin``): created and deleted rows with their values,
+updated rows with ``[old, new]`` pairs of the fields that changed. Saves
+that change none of them are not recorded. Set-based writers are recorded
+from ``stock_changed``.
+"""
+
+from django.db import router
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+from events.signals import product_batch_company_id
+from orders.models import Order
+from products.models import Batch, Inventory, Item, Lot
+from products.services import QUANTITY_FIELDS
+from products.signals import lot_company_id, stock_changed, warehouse_company_id
+from .log import Change, record
+from .models import AuditEntry
+
+# Company of a row of every audited model.
+AUDITED: Dict[Type, Callable[[Any], Optional[int]]] = {
+    Lot: lambda lot: lot_company_id(lot.pk),
+    Inventory: lambda row: warehouse_company_id(row.warehouse_id),
+    Batch: lambda batch: lot_company_id(batch.lot_id),
+    Item: lambda item: product_batch_company_id(item.batch_id),
+    Order: lambda order: order.company_id,
+}
+
+
+def values(instance: Any) -> Dict[str, Any]:
+    return {name: instance.__dict__.get(name) for name in instance.snapshot_fields}
+
+
+def saved(sender: Any, instance: Any, created: bool, using: str, **kwargs: Any) -> None:
+    if created:
+        action, changes = AuditEntry.CREATED, values(instance)
+    else:
+        changed = instance.changed_fields()
+        if not changed:
+            return
+        action = AuditEntry.UPDATED
+        changes = {name: [instance.previous(name), instance.__dict__.get(name)] for name in sorted(changed)}
+    record(Change(sender, instance.pk, action, changes, AUDITED[sender](instance)), using)
+
+
+def deleted(sender: Any, instance: Any, using: str, **kwargs: Any) -> None:
+    record(Change(sender, instance.pk, AuditEntry.DELETED, values(instance), AUDITED[sender](instance)), using)
+
+
+for model in AUDITED:
+    post_save.connect(saved, sender=model, dispatch_uid=f'audit_saved_{model._meta.model_name}')
+    post_delete.connect(deleted, sender=model, dispatch_uid=f'audit_deleted_{model._meta.model_name}')
+
+
+@receiver(stock_changed, dispatch_uid='audit_stock_changed')
+def adjusted(sender: Any, company_id: Optional[int] = None, pks: Iterable[int] = (), delta: float = 0,
+             deltas: Iterable[Tuple[int, int, float]] = (), **kwargs: Any) -> None:
+    if sender not in QUANTITY_FIELDS:
+        return
+    field = QUANTITY_FIELDS[sender][0]
+    using = router.db_for_write(sender)
+    for pk in pks:
+        record(Change(sender, pk, AuditEntry.ADJUSTED, {field: delta}, company_id), using)
+    for warehouse_id, lot_id, quantity in deltas:
+        record(Change(sender, None, AuditEntry.ADJUSTED, {field: quantity}, company_id,
+                      lookup={'warehouse_id': warehouse_id, 'lot_id': lot_id}), using)
@@ -0,0 +1,224 @@
+"""
+Test suite for the audit log.
+"""
+
+from datetime import timedelta
+from unittest import skipIf, skipUnless
+from django.db import DatabaseError, connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from products.models import Inventory, Lot, Material
+from products.services import adjust_quantity
+from products.transfers import transfer
+from ..log import capture
+from ..middleware import AuditMiddleware
+from ..models import AuditEntry
+from ..partitions import create_partitions, drop_expired, months, partition_name, partitions
+
+
+class TestAudit(TestCase):
+    """Test suite for recording, storing and reading audit entries."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.main = Warehouse.objects.create(company=cls.company, name='Main')
+        cls.production = Warehouse.objects.create(company=cls.company, name='Production')
+        cls.supplier = create_supplier(cls.company)
+        cls.customer = create_client(cls.company)
+        cls.material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def lot(self, quantity: float = 10) -> Lot:
+        return Lot.objects.create(supplier=self.supplier, material=self.material, quantity_received=quantity,
+                                  quantity_remaining=quantity, expiration=timezone.now() + timedelta(days=30))
+
+    def entries(self) -> list:
+        return list(AuditEntry.objects.order_by('id').values_list('model', 'object_id', 'action', 'changes'))
+
+    def test_writes(self) -> None:
+        """
+        Test the entries recorded for model and set-based writes.
+
+        Verifies:
+            - Created and deleted rows are recorded with their values
+            - Updates are recorded with the fields that changed; saves changing nothing are skipped
+            - Optimistic adjustments and transfers are recorded per row
+            - Entries are written when the scope ends with the scope's user and the row's company
+        """
+        with capture(self.user.pk), self.captureOnCommitCallbacks(execute=True):
+            lot = self.lot()
+            lot.quantity_remaining = 8
+            lot.save()
+            lot.save()
+            inventory = Inventory.objects.create(warehouse=self.main, lot=lot, quantity=8)
+            adjust_quantity(Inventory, inventory.pk, self.company.pk, -2)
+            transfer(self.company.pk, self.main.pk, self.production.pk, [(lot.pk, 5)])
+            order = Order.objects.create(company=self.company, client=self.customer)
+            order.status = 'Confirmed'
+            order.save()
+            order_id = order.pk
+            order.delete()
+            assert AuditEntry.objects.count() == 0
+
+        target = Inventory.objects.get(warehouse=self.production, lot=lot)
+        entries = self.entries()
+        assert entries[:4] == [
+            ('lot', lot.pk, 'created', {'supplier_id': self.supplier.pk, 'material_id': self.material.pk,
+                                        'quantity_received': 10, 'quantity_remaining': 10,
+                                        'expiration': entries[0][3]['expiration']}),
+            ('lot', lot.pk, 'updated', {'quantity_remaining': [10, 8]}),
+            ('inventory', inventory.pk, 'created', {'warehouse_id': self.main.pk, 'lot_id': lot.pk,
+                                                    'location_id': None, 'quantity': 8}),
+            ('inventory', inventory.pk, 'adjusted', {'quantity': -2}),
+        ]
+        assert entries[4:6] == [('inventory', inventory.pk, 'adjusted', {'quantity': -5}),
+                                ('inventory', target.pk, 'adjusted', {'quantity': 5})]
+        assert [entry[:3] for entry in entries[6:]] == [
+            ('order', order_id, 'created'), ('order', order_id, 'updated'), ('order', order_id, 'deleted')]
+        assert entries[7][3] == {'status': ['Draft', 'Confirmed']}
+        assert set(AuditEntry.objects.values_list('user_id', 'company_id')) == {(self.user.pk, self.company.pk)}
+
+    def test_single_insert(self) -> None:
+        """
+        Test the cost of writing a scope.
+
+        Verifies:
+            - Hundreds of changes are written with one INSERT
+        """
+        with CaptureQueriesContext(connection) as queries:
+            with capture(), self.captureOnCommitCallbacks(execute=True):
+                lots = Lot.objects.bulk_create(
+                    Lot(supplier=self.supplier, material=self.material, quantity_received=1, quantity_remaining=1,
+                        expiration=timezone.now()) for _ in range(300))
+                for lot in lots:
+                    adjust_quantity(Lot, lot.pk, self.company.pk, -1)
+        inserts = [query for query in queries.captured_queries if 'INSERT INTO "audit_entry"' in query['sql']]
+        assert len(inserts) == 1
+        assert AuditEntry.objects.filter(model='lot', action='adjusted').count() == 300
+
+    def test_rollback(self) -> None:
+        """
+        Test writes that are rolled back.
+
+        Verifies:
+            - Changes of rolled back transactions and savepoints are not recorded
+        """
+        with capture(), self.captureOnCommitCallbacks(execute=True):
+            kept = self.lot()
+            try:
+                with transaction.atomic():
+                    self.lot()
+                    raise ValueError
+            except ValueError:
+                pass
+        assert self.entries() == [('lot', kept.pk, 'created', self.entries()[0][3])]
+
+    def test_middleware(self) -> None:
+        """
+        Test recording the writes of a request.
+
+        Verifies:
+            - Changes are written when the response is done and attributed to the authenticated user
+        """
+        def view(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.lot()
+            assert AuditEntry.objects.count() == 0
+            request.user = self.user
+            return HttpResponse()
+
+        AuditMiddleware(view)(RequestFactory().post('/'))
+        assert list(AuditEntry.objects.values_list('model', 'user_id')) == [('lot', self.user.pk)]
+
+    def test_append_only(self) -> None:
+        """
+        Test the storage of entries.
+
+        Verifies:
+            - Entries cannot be updated
+        """
+        with capture(), self.captureOnCommitCallbacks(execute=True):
+            self.lot()
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            AuditEntry.objects.update(action=AuditEntry.DELETED)
+
+    @skipIf(connection.vendor == 'postgresql', 'PostgreSQL drops whole month partitions')
+    def test_retention(self) -> None:
+        """
+        Test removing old entries.
+
+        Verifies:
+            - Entries past the retention period are removed
+        """
+        with capture(), self.captureOnCommitCallbacks(execute=True):
+            self.lot()
+        assert drop_expired(timezone.now() + timedelta(days=10), retention_days=30) == 0
+        assert drop_expired(timezone.now() + timedelta(days=31), retention_days=30) == 1
+
+    @skipUnless(connection.vendor == 'postgresql', 'Partitions need PostgreSQL')
+    def test_partitions(self) -> None:
+        """
+        Test the month partitions of the audit log.
+
+        Verifies:
+            - Missing month partitions are created once
+            - Entries are stored in the partition of their month
+            - Retention drops the partitions that lie entirely before the cutoff
+        """
+        now = timezone.now()
+        expected = [partition_name(start) for start, _ in months(now, 7)]
+        create_partitions(now, ahead=6)
+        assert create_partitions(now, ahead=6) == []
+        assert set(expected) <= set(partitions())
+
+        with capture(), self.captureOnCommitCallbacks(execute=True):
+            self.lot()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM audit_entry')
+            assert cursor.fetchall() == [(expected[0],)]
+
+        cutoff = now + timedelta(days=62)
+        dropped = [name for name in partitions() if name < partition_name(cutoff)]
+        assert drop_expired(now + timedelta(days=92), retention_days=30) == len(dropped)
+        assert partitions()[0] == partition_name(cutoff)
+        assert not AuditEntry.objects.exists()
+
+    def test_endpoint(self) -> None:
+        """
+        Test reading the audit log.
+
+        Verifies:
+            - The history of one row is listed newest first and can be paged with ``before``
+            - Entries of other companies are not listed
+            - ``object_id`` requires ``model``
+        """
+        with capture(self.user.pk), self.captureOnCommitCallbacks(execute=True):
+            lot = self.lot()
+            for quantity in (9, 8, 7):
+                lot.quantity_remaining = quantity
+                lot.save()
+            self.lot()
+        AuditEntry.objects.create(company_id=0, model='lot', object_id=lot.pk, action=AuditEntry.DELETED, changes={})
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('audit:audit-entry'), {'model': 'lot', 'object_id': lot.pk, 'limit': 3})
+        assert response.status_code == 200
+        page = response.json()
+        assert [entry['changes'] for entry in page] == [
+            {'quantity_remaining': [8, 7]}, {'quantity_remaining': [9, 8]}, {'quantity_remaining': [10, 9]}]
+        assert page[0]['user_id'] == self.user.pk
+        response = client.get(reverse('audit:audit-entry'), {'model': 'lot', 'object_id': lot.pk,
+                                                             'before': page[-1]['created_at']})
+        assert [entry['action'] for entry in response.json()] == ['created']
+        assert len(client.get(reverse('audit:audit-entry')).json()) == 5
+        assert client.get(reverse('audit:audit-entry'), {'object_id': lot.pk}).status_code == 400
@@ -0,0 +1,8 @@
+from . import views
+from django.urls import path
+
+app_name = 'audit'
+
+urlpatterns = [
+    path('', views.AuditEntryListView.as_view(), name='audit-entry'),
+]
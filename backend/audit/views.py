@@ -0,0 +1,38 @@
+from rest_framework import generics
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Any
+from . import serializers, models
+
+
+class AuditEntryListView(generics.ListAPIView):
+    """View for the audit log of the user's company."""
+    serializer_class = serializers.AuditEntrySerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3}
+
+    def get_queryset(self):
+        query = serializers.AuditQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        entries = models.AuditEntry.objects.filter(company_id=self.request.user.company_id)
+        for name in ('model', 'object_id'):
+            if name in params:
+                entries = entries.filter(**{name: params[name]})
+        if 'before' in params:
+            entries = entries.filter(created_at__lt=params['before'])
+        return entries.order_by('-created_at', '-id')[:params['limit']]
+
+    @swagger_auto_schema(
+        operation_description="Get the changes of lots, inventory, batches, items and orders, newest first. "
+                              "Pass `model` and `object_id` for the history of one row and the `created_at` "
+                              "of the last entry as `before` for the next page. Entries appear once the "
+                              "request that made the change has finished.",
+        query_serializer=serializers.AuditQuerySerializer,
+        responses={200: serializers.AuditEntrySerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
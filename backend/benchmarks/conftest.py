@@ -0,0 +1,150 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Benchmarks are skipped by the regular test run (see pytest.ini) and are
+executed with ``pytest benchmarks --benchmark-only``. The database under
+test is selected the same way as for the application itself, through the
+``POSTGRES_*`` environment variables, so the same suite runs on SQLite and
+on a local PostgreSQL instance.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+import pytest
+from users.models import Company, CustomUser, UserGroups
+from users.tenants import active_companies
+from warehouse.models import Warehouse
+from suppliers.models import Supplier
+from clients.models import Client
+from orders.models import Order
+from products.models import (
+    Material, Product, BillOfMaterials, Lot, Inventory, ProductBatch
+)
+
+DATASET_SIZES = [10, 100, 1000]
+PASSWORD = 'benchmark-password'
+
+
+@dataclass
+class Dataset:
+    """Handles to the rows seeded for a single benchmark."""
+
+    size: int
+    company: Company
+    user: CustomUser
+    warehouses: Dict[str, Warehouse]
+    supplier: Supplier
+    product: Product
+    product_batch: ProductBatch
+    materials: List[Material] = field(default_factory=list)
+    lots: List[Lot] = field(default_factory=list)
+
+
+def seed_dataset(size: int) -> Dataset:
+    """
+    Seed a single company with ``size`` materials, lots and inventory rows.
+
+    Args:
+        size: Number of materials (and lots, one per material) to create
+
+    Returns:
+        Dataset: Handles to the created rows
+    """
+    company = Company.objects.create(
+        name=f'Benchmark {size}',
+        domain=f'https://benchmark-{size}.example.com',
+        email=f'benchmark-{size}@example.com',
+        is_active=True,
+        expiration_date=timezone.now().date() + timezone.timedelta(days=30),
+    )
+    user = CustomUser.objects.create(
+        username=f'benchmark-{size}',
+        password=PASSWORD,
+        email=f'user-{size}@example.com',
+        role=UserGroups.ADMIN.value,
+        company=company,
+    )
+    group, _ = Group.objects.get_or_create(name=UserGroups.ADMIN.value)
+    user.groups.add(group)
+
+    warehouses = {
+        name: Warehouse.objects.create(company=company, name=name)
+        for name, _ in Warehouse.NAME_CHOICES
+    }
+    supplier = Supplier.objects.create(
+        company=company, name='Supplier', address='Street 1', phone='123',
+        email='supplier@example.com', website='https://supplier.example.com',
+    )
+    client = Client.objects.create(
+        company=company, name='Client', address='Street 2', phone='456',
+        email='client@example.com', website='https://client.example.com',
+    )
+    materials = Material.objects.bulk_create(
+        Material(company=company, name=f'M{size}-{i}', unit='kg') for i in range(size)
+    )
+    expiration = timezone.now() + timezone.timedelta(days=365)
+    lots = Lot.objects.bulk_create(
+        Lot(supplier=supplier, material=material, quantity_received=1000,
+            quantity_remaining=1000, expiration=expiration)
+        for material in materials
+    )
+    Inventory.objects.bulk_create(
+        Inventory(warehouse=warehouses['Main'], lot=lot, quantity=lot.quantity_remaining)
+        for lot in lots
+    )
+    product = Product.objects.create(company=company, name=f'P{size}', unit='pcs')
+    BillOfMaterials.objects.bulk_create(
+        BillOfMaterials(product=product, material=material, quantity=1)
+        for material in materials[:10]
+    )
+    order = Order.objects.create(company=company, client=client, status='Confirmed')
+    product_batch = ProductBatch.objects.create(
+        warehouse=warehouses['Production'], product=product, order=order,
+        ordered_quantity=size, produced_quantity=0,
+    )
+    return Dataset(
+        size=size, company=company, user=user, warehouses=warehouses,
+        supplier=supplier, product=product, product_batch=product_batch,
+        materials=materials, lots=lots,
+    )
+
+
+@pytest.fixture(autouse=True)
+def database_info(benchmark) -> None:
+    """Record the database vendor so SQLite and PostgreSQL runs can be told apart."""
+    benchmark.extra_info['database'] = connection.vendor
+
+
+@pytest.fixture(params=DATASET_SIZES, ids=lambda size: f'size={size}')
+def dataset(request, db) -> Dataset:
+    """Seed a dataset for every configured size."""
+    dataset = seed_dataset(request.param)
+    # The company is applied to the active set on commit, which never happens inside the test transaction.
+    active_companies.refresh(force=True)
+    return dataset
+
+
+@pytest.fixture
+def api_client(dataset: Dataset) -> APIClient:
+    """API client sending a real JWT for the dataset's company admin."""
+    client = APIClient()
+    token = RefreshToken.for_user(dataset.user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture
+def counter() -> Callable[[], int]:
+    """Monotonic counter for generating unique values inside benchmark loops."""
+    state = {'value': 0}
+
+    def next_value() -> int:
+        state['value'] += 1
+        return state['value']
+
+    return next_value
@@ -0,0 +1,35 @@
+"""
+Benchmarks for incremental low stock evaluation.
+"""
+
+from alerts.engine import rebuild
+from alerts.models import StockThreshold
+from products.models import Inventory
+from products.services import adjust_quantity
+from .conftest import Dataset
+
+
+def thresholds(dataset: Dataset) -> None:
+    StockThreshold.objects.bulk_create(
+        StockThreshold(company=dataset.company, material=material, minimum=500) for material in dataset.materials
+    )
+    rebuild(dataset.company.pk)
+
+
+def test_adjust_with_thresholds(benchmark, dataset: Dataset) -> None:
+    """Take stock out of one inventory row while every material has a threshold."""
+    thresholds(dataset)
+    row = Inventory.objects.filter(lot=dataset.lots[0]).values_list('pk', flat=True).get()
+    state = {'delta': -1}
+
+    def adjust():
+        state['delta'] = -state['delta']
+        return adjust_quantity(Inventory, row, dataset.company.pk, state['delta'])
+
+    benchmark(adjust)
+
+
+def test_rebuild(benchmark, dataset: Dataset) -> None:
+    """Recompute every running total of the company, the cost an incremental update avoids."""
+    thresholds(dataset)
+    benchmark(rebuild, dataset.company.pk)
@@ -0,0 +1,27 @@
+"""
+Benchmarks for the audit log.
+"""
+
+from contextlib import nullcontext
+from django.test import TestCase
+from products.models import Lot
+from products.services import adjust_quantity
+from audit.log import capture
+from .conftest import Dataset
+
+
+def adjust(dataset: Dataset, batched: bool) -> None:
+    """Adjust up to 100 lots and commit, like one request."""
+    with capture() if batched else nullcontext(), TestCase.captureOnCommitCallbacks(execute=True):
+        for lot in dataset.lots[:100]:
+            adjust_quantity(Lot, lot.pk, dataset.company.pk, 1)
+
+
+def test_batched_entries(benchmark, dataset: Dataset) -> None:
+    """Entries of the adjustments written with one INSERT, as in a request."""
+    benchmark(adjust, dataset, True)
+
+
+def test_entry_per_write(benchmark, dataset: Dataset) -> None:
+    """Entries written one by one, the synchronous audit the batching replaces."""
+    benchmark(adjust, dataset, False)
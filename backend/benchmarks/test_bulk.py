@@ -0,0 +1,25 @@
+"""
+Benchmarks for bulk catalog uploads.
+"""
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+from .conftest import Dataset
+
+
+def test_upload_bill_of_materials(benchmark, api_client: APIClient, dataset: Dataset) -> None:
+    """Upsert one bill of materials line per material of the dataset in a single request."""
+    lines = [{'product': dataset.product.pk, 'material': material.pk, 'quantity': 2}
+             for material in dataset.materials]
+
+    response = benchmark(lambda: api_client.post(reverse('products:bom'), lines, format='json'))
+    assert response.status_code == 200
+    assert all(result['status'] != 'error' for result in response.json())
+
+
+def test_upload_materials(benchmark, api_client: APIClient, dataset: Dataset) -> None:
+    """Update the unit of every material of the dataset in a single request."""
+    items = [{'name': material.name, 'unit': 'kg'} for material in dataset.materials]
+
+    response = benchmark(lambda: api_client.post(reverse('products:material'), items, format='json'))
+    assert response.status_code == 200
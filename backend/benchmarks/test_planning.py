@@ -0,0 +1,68 @@
+"""
+Benchmarks for demand forecasting and reorder points.
+"""
+
+from datetime import timedelta
+import numpy as np
+import pytest
+from orders.models import Order
+from products.models import BillOfMaterials, Product, ProductBatch, ProductClosure
+from django.utils import timezone
+from planning.forecast import forecast, history_window, plan
+from planning.models import ReorderPoint
+from planning.purchasing import suggest
+from .conftest import Dataset
+
+
+@pytest.mark.parametrize('products', [10_000, 100_000], ids=lambda count: f'products={count}')
+def test_forecast(benchmark, products: int) -> None:
+    """Forecast a year of weekly demand, a third of the products ordered intermittently."""
+    rng = np.random.default_rng(0)
+    rates = rng.uniform(0.05, 20, (products, 1))
+    demand = rng.poisson(rates, (products, 52)).astype(float)
+
+    result = benchmark(forecast, demand, 0.2, 0.1, 1.32)
+    assert result.demand.shape == (products,)
+
+
+def test_plan(benchmark, dataset: Dataset) -> None:
+    """Plan one product per dataset row, each made of two materials and ordered in random weeks of the year."""
+    company = dataset.company
+    client = dataset.product_batch.order.client
+    products = Product.objects.bulk_create(
+        Product(company=company, name=f'Planned {dataset.size}-{i}', unit='pcs') for i in range(dataset.size)
+    )
+    BillOfMaterials.objects.bulk_create(
+        BillOfMaterials(product=product, material=dataset.materials[(i + offset) % dataset.size], quantity=1)
+        for i, product in enumerate(products) for offset in (0, 1)
+    )
+    ProductClosure.objects.bulk_create(
+        ProductClosure(ancestor=product, descendant=product, quantity=1) for product in products
+    )
+    start, _ = history_window(52)
+    orders = Order.objects.bulk_create(
+        Order(company=company, client=client, status='Delivered') for _ in range(52)
+    )
+    for week, order in enumerate(orders):
+        Order.objects.filter(pk=order.pk).update(order_date=start + timedelta(weeks=week, days=2))
+    rng = np.random.default_rng(0)
+    ProductBatch.objects.bulk_create(
+        ProductBatch(warehouse=dataset.warehouses['Production'], product=product, order=orders[week],
+                     ordered_quantity=int(quantity), produced_quantity=int(quantity))
+        for product in products
+        for week, quantity in zip(rng.choice(52, 20, replace=False), rng.integers(1, 10, 20))
+    )
+
+    assert benchmark(plan, company.pk) == (dataset.size, dataset.size)
+
+
+def test_suggest(benchmark, dataset: Dataset) -> None:
+    """Check every material of the dataset against a reorder point, half of them below it."""
+    ReorderPoint.objects.bulk_create(
+        ReorderPoint(company=dataset.company, material=material, supplier=dataset.supplier, weekly_demand=100,
+                     safety_stock=0, reorder_point=500 if i % 2 else 2000, lead_time_days=14,
+                     computed_at=timezone.now())
+        for i, material in enumerate(dataset.materials)
+    )
+
+    assert benchmark(suggest, dataset.company.pk, 7) == (dataset.size + 1) // 2
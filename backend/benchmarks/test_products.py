@@ -0,0 +1,88 @@
+"""
+Benchmarks for the products hot paths: material endpoints, lot allocation,
+inventory aggregation, available-to-promise and item registration.
+"""
+
+from typing import Callable
+from django.db import transaction
+from django.db.models import F, Sum
+from django.urls import reverse
+from rest_framework.test import APIClient
+from products.atp import compute
+from products.models import Lot, Batch, Inventory, Item
+from .conftest import Dataset
+
+
+def test_material_list(benchmark, dataset: Dataset, api_client: APIClient) -> None:
+    """List all materials through the API."""
+    url = reverse('products:material')
+
+    response = benchmark(api_client.get, url)
+    assert response.status_code == 200
+    assert len(response.json()) == dataset.size
+
+
+def test_material_create(benchmark, dataset: Dataset, api_client: APIClient,
+                         counter: Callable[[], int]) -> None:
+    """Create a single material through the API."""
+    url = reverse('products:material')
+
+    def create():
+        return api_client.post(url, {'name': f'New {dataset.size}-{counter()}', 'unit': 'kg'})
+
+    response = benchmark(create)
+    assert response.status_code == 201
+
+
+def test_lot_allocation(benchmark, dataset: Dataset) -> None:
+    """Allocate material from a lot to a product batch and decrement the lot."""
+    lot_ids = [lot.pk for lot in dataset.lots]
+    state = {'index': 0}
+
+    def allocate():
+        lot_id = lot_ids[state['index'] % len(lot_ids)]
+        state['index'] += 1
+        with transaction.atomic():
+            lot = Lot.objects.select_for_update().get(pk=lot_id)
+            Lot.objects.filter(pk=lot.pk).update(quantity_remaining=F('quantity_remaining') - 0.001)
+            batch, created = Batch.objects.get_or_create(
+                product_batch=dataset.product_batch, lot=lot, defaults={'quantity': 0.001}
+            )
+            if not created:
+                Batch.objects.filter(pk=batch.pk).update(quantity=F('quantity') + 0.001)
+
+    benchmark(allocate)
+
+
+def test_inventory_aggregation(benchmark, dataset: Dataset) -> None:
+    """Sum stock per material for the whole company."""
+
+    def aggregate():
+        return list(
+            Inventory.objects
+            .filter(warehouse__company=dataset.company)
+            .values('lot__material')
+            .annotate(total=Sum('quantity'))
+        )
+
+    result = benchmark(aggregate)
+    assert len(result) == dataset.size
+
+
+def test_available_to_promise(benchmark, dataset: Dataset) -> None:
+    """Compute buildable quantities of all products of the company without the cache."""
+    result = benchmark(compute, dataset.company.pk)
+    assert result[dataset.product.pk] > 0
+
+
+def test_item_registration(benchmark, dataset: Dataset, counter: Callable[[], int]) -> None:
+    """Register a produced item against a product batch."""
+
+    def register():
+        return Item.objects.create(
+            serial_number=f'SN-{dataset.size}-{counter()}',
+            batch=dataset.product_batch,
+            operator=dataset.user,
+        )
+
+    assert benchmark(register).pk
@@ -0,0 +1,56 @@
+"""
+Benchmarks for the report rollups.
+"""
+
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from products.models import Item
+from reports.rollups import rebuild, update_all
+from .conftest import Dataset
+
+
+def history(dataset: Dataset) -> None:
+    """Register 100 items per dataset row, spread over the last year."""
+    now = timezone.now()
+    items = Item.objects.bulk_create(
+        Item(serial_number=f'R{dataset.size}-{i}', batch=dataset.product_batch, operator=dataset.user)
+        for i in range(100 * dataset.size)
+    )
+    for day in range(365):
+        Item.objects.filter(pk__in=[item.pk for item in items[day::365]]).update(
+            production_date=now - timedelta(days=day, hours=1))
+
+
+def test_production_report(benchmark, dataset: Dataset, api_client: APIClient) -> None:
+    """Read a year of daily production from the rollups; the time must not grow with the history."""
+    history(dataset)
+    update_all()
+    url = reverse('reports:production')
+    start = (timezone.localdate() - timedelta(days=365)).isoformat()
+
+    response = benchmark(api_client.get, url, {'period': 'day', 'start': start})
+    assert response.status_code == 200
+    assert sum(row['value'] for row in response.json()) == 100 * dataset.size
+
+
+def test_delta_update(benchmark, dataset: Dataset) -> None:
+    """Run the periodic job after one new item, the steady state cost."""
+    history(dataset)
+    update_all()
+    state = {'now': timezone.now()}
+
+    def run():
+        Item.objects.create(serial_number=f'D{dataset.size}-{state["now"].timestamp()}',
+                            batch=dataset.product_batch, operator=dataset.user)
+        state['now'] += timedelta(minutes=5)
+        return update_all(state['now'])
+
+    benchmark(run)
+
+
+def test_rebuild(benchmark, dataset: Dataset) -> None:
+    """Aggregate the full history, the scan the rollups save every report from."""
+    history(dataset)
+    benchmark(rebuild)
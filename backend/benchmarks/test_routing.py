@@ -0,0 +1,59 @@
+"""
+Benchmarks for pick route planning.
+"""
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+import pytest
+from products.models import Batch, Inventory
+from warehouse.models import Location
+from warehouse.routing import layouts, plan_route
+from .conftest import Dataset
+
+BINS_PER_AISLE = 25
+
+
+@pytest.fixture
+def located(dataset: Dataset) -> list:
+    """Place every lot of the dataset in its own bin and allocate up to 50 of them to the batch."""
+    main = dataset.warehouses['Main']
+    Location.objects.create(warehouse=main, code='DEPOT', aisle='', x=0, y=0, is_depot=True)
+    bins = Location.objects.bulk_create(
+        Location(warehouse=main, code=f'{i // BINS_PER_AISLE:02d}-{i % BINS_PER_AISLE:02d}',
+                 aisle=f'{i // BINS_PER_AISLE:02d}', rack=i % BINS_PER_AISLE,
+                 x=1 + 3 * (i // BINS_PER_AISLE), y=1.5 * (i % BINS_PER_AISLE + 1))
+        for i in range(dataset.size)
+    )
+    stock = list(Inventory.objects.filter(warehouse=main).order_by('lot_id'))
+    for row, location in zip(stock, bins):
+        row.location = location
+    Inventory.objects.bulk_update(stock, ['location'])
+    Batch.objects.bulk_create(
+        Batch(product_batch=dataset.product_batch, lot=lot, quantity=1) for lot in dataset.lots[::max(1, dataset.size // 50)]
+    )
+    layouts.clear()
+    return [location.pk for location in bins]
+
+
+@pytest.mark.parametrize('warm', [False, True], ids=['cold', 'warm'])
+def test_plan_route(benchmark, dataset: Dataset, located: list, warm: bool) -> None:
+    """Order 50 bins spread over the warehouse, with and without a cached distance matrix."""
+    warehouse_id = dataset.warehouses['Main'].pk
+    stops = located[::max(1, len(located) // 50)]
+
+    def plan():
+        if not warm:
+            layouts.clear()
+        return plan_route(warehouse_id, stops)
+
+    route, _ = benchmark(plan)
+    assert sorted(route) == sorted(stops)
+
+
+def test_picklist(benchmark, api_client: APIClient, dataset: Dataset, located: list) -> None:
+    """Build the pick list of the dataset's order."""
+    url = reverse('warehouse:picklist', args=[dataset.warehouses['Main'].pk, dataset.product_batch.order_id])
+
+    response = benchmark(api_client.get, url)
+    assert response.status_code == 200
+    assert not response.json()['unlocated']
@@ -0,0 +1,48 @@
+"""
+Benchmarks for the barcode scan endpoint.
+"""
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+import pytest
+from products.models import Item
+from products.scanning import item_cache
+from .conftest import Dataset
+
+
+@pytest.fixture
+def serials(dataset: Dataset) -> list:
+    """Register one item per dataset row and return their serial numbers."""
+    items = Item.objects.bulk_create(
+        Item(serial_number=f'SCAN-{dataset.size}-{i}', batch=dataset.product_batch, operator=dataset.user)
+        for i in range(dataset.size)
+    )
+    item_cache.clear()
+    return [item.serial_number for item in items]
+
+
+@pytest.mark.parametrize('warm', [False, True], ids=['cold', 'warm'])
+def test_scan_single(benchmark, api_client: APIClient, serials: list, warm: bool) -> None:
+    """Scan a single serial number, with and without the item cache."""
+    url = reverse('products:scan')
+    state = {'index': 0}
+
+    def scan():
+        if not warm:
+            item_cache.clear()
+        serial = serials[state['index'] % len(serials)]
+        state['index'] += 1
+        return api_client.post(url, {'barcodes': [serial]}, format='json')
+
+    response = benchmark(scan)
+    assert response.status_code == 200
+
+
+def test_scan_batch(benchmark, api_client: APIClient, serials: list, dataset: Dataset) -> None:
+    """Scan up to 50 serial numbers and a lot label in one request."""
+    url = reverse('products:scan')
+    barcodes = serials[:50] + [f'LOT-{dataset.lots[0].pk}']
+
+    response = benchmark(api_client.post, url, {'barcodes': barcodes}, format='json')
+    assert response.status_code == 200
+    assert all(result['type'] for result in response.json())
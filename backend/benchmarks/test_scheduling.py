@@ -0,0 +1,60 @@
+"""
+Benchmarks for the production scheduler.
+"""
+
+from datetime import timedelta
+from django.utils import timezone
+import pytest
+from orders.models import Order
+from products.models import Inventory, ProductBatch
+from products.scheduling import Scheduler
+from .conftest import Dataset
+
+BATCHES = 10_000
+BATCHES_PER_ORDER = 10
+
+
+@pytest.fixture
+def pending_batches(dataset: Dataset) -> Dataset:
+    """Add 10k pending batches with spread due dates to the Production warehouse."""
+    now = timezone.now()
+    production = dataset.warehouses['Production']
+    Inventory.objects.bulk_create(
+        Inventory(warehouse=production, lot=lot, quantity=lot.quantity_remaining) for lot in dataset.lots
+    )
+    client = dataset.product_batch.order.client
+    orders = Order.objects.bulk_create(
+        Order(company=dataset.company, client=client, status='Confirmed',
+              due_date=now + timedelta(hours=i % 500))
+        for i in range(BATCHES // BATCHES_PER_ORDER)
+    )
+    ProductBatch.objects.bulk_create(
+        ProductBatch(warehouse=production, product=dataset.product, order=order,
+                     ordered_quantity=0.01, produced_quantity=0)
+        for order in orders for _ in range(BATCHES_PER_ORDER)
+    )
+    return dataset
+
+
+def test_full_plan(benchmark, pending_batches: Dataset) -> None:
+    """Plan 10k pending batches from scratch."""
+
+    def plan():
+        ProductBatch.objects.update(scheduled_start=None, scheduled_end=None)
+        return Scheduler(pending_batches.company.pk).plan()
+
+    result = benchmark.pedantic(plan, rounds=3)
+    assert result.scheduled + len(result.blocked) == BATCHES + 1
+
+
+def test_insert_urgent_batch(benchmark, pending_batches: Dataset) -> None:
+    """Insert a batch due mid-plan into an existing plan of 10k batches."""
+    Scheduler(pending_batches.company.pk).plan()
+    urgent = pending_batches.product_batch
+    urgent.ordered_quantity = 1
+    urgent.save()
+    urgent.order.due_date = timezone.now() + timedelta(hours=250)
+    urgent.order.save()
+
+    benchmark(Scheduler(pending_batches.company.pk).insert, urgent)
+    assert ProductBatch.objects.get(pk=urgent.pk).scheduled_start is not None
@@ -0,0 +1,31 @@
+"""
+Benchmarks for the catalog search.
+"""
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+from products.models import Material, Product
+from .conftest import Dataset
+
+WORDS = ['oak', 'pine', 'steel', 'glass', 'linen', 'brass', 'maple', 'walnut', 'cotton', 'granite']
+
+
+def catalog(dataset: Dataset) -> None:
+    """Add 500 materials and 500 products per dataset row, a million entries for the largest dataset."""
+    for model, noun in ((Material, 'board'), (Product, 'table')):
+        model.objects.bulk_create(
+            (model(company=dataset.company, unit='pcs',
+                   name=f'{WORDS[i % 10]} {WORDS[i // 10 % 10]} {noun} {dataset.size}-{i}')
+             for i in range(500 * dataset.size)),
+            batch_size=10000,
+        )
+
+
+def test_type_ahead(benchmark, dataset: Dataset, api_client: APIClient) -> None:
+    """Search the catalog as a user types; the time must stay flat as the catalog grows."""
+    catalog(dataset)
+    url = reverse('search:search')
+
+    response = benchmark(api_client.get, url, {'q': 'walnut gra'})
+    assert response.status_code == 200
+    assert len(response.json()) == 20
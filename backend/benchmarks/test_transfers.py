@@ -0,0 +1,23 @@
+"""
+Benchmarks for bulk stock transfers.
+"""
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+from .conftest import Dataset
+
+
+def test_transfer_all_lots(benchmark, api_client: APIClient, dataset: Dataset) -> None:
+    """Move one unit of every lot of the dataset, alternating between Main and Production."""
+    main, production = dataset.warehouses['Main'].pk, dataset.warehouses['Production'].pk
+    lines = [{'lot': lot.pk, 'quantity': 1} for lot in dataset.lots]
+    state = {'forward': True}
+
+    def move():
+        source, target = (main, production) if state['forward'] else (production, main)
+        state['forward'] = not state['forward']
+        return api_client.post(reverse('products:transfer'),
+                               {'source': source, 'target': target, 'lines': lines}, format='json')
+
+    response = benchmark(move)
+    assert response.status_code == 200
@@ -0,0 +1,41 @@
+"""
+Benchmarks for authentication and permission checks.
+
+Every benchmark runs once per dataset size so that the cost of the
+company/group lookups can be compared as the tenant grows.
+"""
+
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
+from users.models import UserGroups
+from users.permissions import has_group_permission, IsCompanyAdmin
+from .conftest import Dataset, PASSWORD
+
+
+def test_login(benchmark, dataset: Dataset) -> None:
+    """Obtain a token pair through the login endpoint."""
+    client = APIClient()
+    url = reverse('users:login')
+    payload = {'username': dataset.user.username, 'password': PASSWORD}
+
+    response = benchmark(client.post, url, payload)
+    assert response.status_code == 200
+
+
+def test_group_permission(benchmark, dataset: Dataset) -> None:
+    """Evaluate the group based permission used by the products endpoints."""
+    permission = has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])()
+    request = Request(APIRequestFactory().get('/'))
+    request.user = dataset.user
+
+    assert benchmark(permission.has_permission, request, None)
+
+
+def test_company_admin_permission(benchmark, dataset: Dataset) -> None:
+    """Evaluate the role based company admin permission."""
+    permission = IsCompanyAdmin()
+    request = Request(APIRequestFactory().get('/'))
+    request.user = dataset.user
+
+    assert benchmark(permission.has_permission, request, None)
@@ -0,0 +1,52 @@
+"""
+Benchmarks for wave planning.
+"""
+
+from django.db import transaction
+import numpy as np
+import pytest
+from orders.models import Order
+from products.models import Batch, ProductBatch
+from warehouse.waves import PendingOrder, WavePlanner, cluster
+from .conftest import Dataset
+
+
+@pytest.mark.parametrize('count', [1000, 5000], ids=lambda count: f'orders={count}')
+def test_cluster(benchmark, count: int) -> None:
+    """Cluster orders of 1-8 lines spread over 2000 locations."""
+    rng = np.random.default_rng(0)
+    orders = [
+        PendingOrder(i, int(lines), frozenset(rng.integers(0, 2000, lines).tolist()), frozenset())
+        for i, lines in enumerate(rng.integers(1, 9, count))
+    ]
+
+    waves = benchmark(cluster, orders, 20, 200)
+    assert sum(len(wave) for wave in waves) == count
+
+
+def test_plan(benchmark, dataset: Dataset) -> None:
+    """Plan waves for one confirmed order per dataset row, each allocating three lots."""
+    client = dataset.product_batch.order.client
+    orders = Order.objects.bulk_create(
+        Order(company=dataset.company, client=client, status='Confirmed') for _ in range(dataset.size)
+    )
+    batches = ProductBatch.objects.bulk_create(
+        ProductBatch(warehouse=dataset.warehouses['Production'], product=dataset.product, order=order,
+                     ordered_quantity=1, produced_quantity=0)
+        for order in orders
+    )
+    rng = np.random.default_rng(0)
+    Batch.objects.bulk_create(
+        Batch(product_batch=batch, lot=dataset.lots[i], quantity=1)
+        for batch in batches for i in rng.choice(len(dataset.lots), 3, replace=False)
+    )
+
+    def plan():
+        # Roll back so every round plans the same orders.
+        with transaction.atomic():
+            waves = WavePlanner(dataset.company.pk, dataset.warehouses['Main'].pk).plan()
+            transaction.set_rollback(True)
+        return waves
+
+    waves = benchmark(plan)
+    assert sum(wave.lines for wave in waves) == 3 * dataset.size
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from .models import Client
 
-# Register your models here.
+
+@admin.register(Client)
+class ClientAdmin(admin.ModelAdmin):
+    list_display = ('name', 'email', 'phone', 'company')
+    list_select_related = ('company',)
+    autocomplete_fields = ('company',)
+    search_fields = ('name', 'email')
+    show_full_result_count = False
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from . import models
+
+
+class ClientSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Client
+        fields = ['id', 'name', 'address', 'phone', 'email', 'website']
+
+    def create(self, validated_data):
+        validated_data['company'] = self.context['request'].user.company
+        return super().create(validated_data)
+
+
+class ClientBulkSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    address = serializers.CharField(max_length=100)
+    phone = serializers.CharField(max_length=20)
+    email = serializers.EmailField()
+    website = serializers.URLField()
@@ -0,0 +1,8 @@
+from . import views
+from django.urls import path
+
+app_name = 'clients'
+
+urlpatterns = [
+    path('client/', views.ClientViewSet.as_view(), name='client'),
+]
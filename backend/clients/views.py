@@ -1,3 +1,39 @@
-from django.shortcuts import render
+from rest_framework import generics
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Any
+from wms.bulk import BulkResultSerializer, BulkUpsertMixin
+from wms.idempotency import idempotency_key_parameter
+from . import serializers, models
 
-# Create your views here.
+
+class ClientViewSet(BulkUpsertMixin, generics.ListCreateAPIView):
+    """View for managing clients."""
+    serializer_class = serializers.ClientSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 7}
+    bulk_serializer_class = serializers.ClientBulkSerializer
+    bulk_unique_fields = ['name', 'email']
+    bulk_update_fields = ['address', 'phone', 'website']
+
+    def get_queryset(self):
+        return models.Client.objects.filter(company_id=self.request.user.company_id)
+
+    @swagger_auto_schema(
+        operation_description="Get all clients of the user's company",
+        responses={200: serializers.ClientSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Create a new client. A list of up to 5000 clients is upserted by name and "
+                              "email and answered with one result per item.",
+        manual_parameters=[idempotency_key_parameter],
+        responses={201: serializers.ClientSerializer, 200: BulkResultSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
@@ -0,0 +1,85 @@
+"""
+Fixtures applied to every test, and helpers creating the rows most test cases share.
+
+The helpers are plain functions so that ``TestCase.setUpTestData`` can call
+them, e.g. ``from conftest import create_supplier, create_user``.
+"""
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from alerts import engine as alerts_engine
+from events import signals as event_signals
+from events.bus import bus
+from products import signals as product_signals
+from products.scanning import item_cache
+from users.revocation import revocation_list
+from users.tenants import active_companies
+from warehouse.routing import layouts
+from clients.models import Client
+from suppliers.models import Supplier
+from users.models import Company, CustomUser, UserGroups
+
+
+def create_user(company: Company, username: str, role: UserGroups) -> CustomUser:
+    """Create a user with password ``password`` in the group of its role."""
+    user = CustomUser.objects.create_user(username=username, password='password', company=company, role=role.value)
+    user.groups.add(Group.objects.get(name=role.value))
+    return user
+
+
+def create_supplier(company: Company) -> Supplier:
+    """Create the supplier ``Supplier`` of a company."""
+    return Supplier.objects.create(
+        company=company, name='Supplier', address='Street 1', phone='1',
+        email='supplier@example.com', website='https://supplier.example.com',
+    )
+
+
+def create_client(company: Company) -> Client:
+    """Create the client ``Client`` of a company."""
+    return Client.objects.create(
+        company=company, name='Client', address='Street 2', phone='2',
+        email='client@example.com', website='https://client.example.com',
+    )
+
+
+def empty_caches() -> None:
+    """Empty the shared cache and the in-process caches of lookups, layouts, events and alerts."""
+    cache.clear()
+    item_cache.clear()
+    layouts.clear()
+    bus.clear()
+    alerts_engine.clear()
+    for lookup in (product_signals.warehouse_company_id, product_signals.lot_company_id,
+                   product_signals.product_company_id, event_signals.product_batch_company_id):
+        lookup.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings) -> None:
+    """Fail tests whose requests exceed their query budget or repeat queries."""
+    settings.QUERY_INSPECTOR = {**settings.QUERY_INSPECTOR, 'RAISE': True}
+
+
+@pytest.fixture(autouse=True)
+def empty_revocation_list(settings) -> None:
+    """Start every test with an empty token revocation list that only refreshes on demand."""
+    settings.TOKEN_REVOCATION = {
+        **settings.TOKEN_REVOCATION, 'REFRESH_INTERVAL': float('inf'), 'REBUILD_INTERVAL': float('inf'),
+    }
+    revocation_list.reset()
+
+
+@pytest.fixture(autouse=True)
+def loaded_active_companies(settings, django_db_setup, django_db_blocker) -> None:
+    """Load the active company set before the test so that requests never reload it."""
+    settings.ACTIVE_COMPANIES = {'REFRESH_INTERVAL': float('inf')}
+    with django_db_blocker.unblock():
+        active_companies.refresh(force=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Start every test with empty caches, rolled back rows may have left entries behind."""
+    empty_caches()
@@ -0,0 +1,175 @@
+"""
+In-process event bus feeding the Server-Sent Events stream.
+
+Every worker process keeps one ``EventBus``. Events are published from
+model signal receivers once their transaction commits (or, on PostgreSQL,
+from the ``LISTEN`` thread of ``events.listener``, so every worker sees the
+events of every other worker) and are handed to the subscribers of the
+event's company. Subscribers are asyncio queues of the stream responses;
+publishing is thread safe and never blocks: a subscriber whose queue is
+full is marked as overflowed and its stream ends with a ``reset`` event.
+
+The last ``BUFFER_SIZE`` events are kept in a ring buffer so a client that
+reconnects with a ``Last-Event-ID`` gets the events it missed. If that id
+has already left the buffer the client gets a ``reset`` event and should
+reload its data instead.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from django.conf import settings
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+
+DEFAULTS = {
+    # Events kept for clients resuming with Last-Event-ID.
+    'BUFFER_SIZE': 10_000,
+    # Undelivered events per subscriber before its stream is reset.
+    'QUEUE_SIZE': 1000,
+    # Seconds between keep-alive comments on idle streams.
+    'HEARTBEAT': 15,
+    # Milliseconds browsers wait before reconnecting.
+    'RETRY': 3000,
+}
+
+
+def events_settings() -> Dict[str, Any]:
+    """Get EVENTS settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'EVENTS', {})}
+
+
+@dataclass
+class Event:
+    """A change of a company's data."""
+
+    id: str
+    company_id: int
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(',', ':'), default=str)
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'Event':
+        return cls(**json.loads(payload))
+
+    def to_sse(self) -> str:
+        return f'id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n'
+
+
+_sequence = itertools.count()
+
+
+def next_id() -> str:
+    """Id unique across workers: publish time, process id and a per-process counter."""
+    return f'{time.time_ns():x}-{os.getpid():x}-{next(_sequence):x}'
+
+
+class Subscriber:
+    """Queue of events of one company, consumed by one stream response."""
+
+    def __init__(self, company_id: int, queue_size: int) -> None:
+        self.company_id = company_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def put(self, event: Optional[Event]) -> None:
+        """Queue an event; ``None`` wakes the stream up to end it. Runs on the subscriber's loop."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Make room for the wake-up so the stream notices the overflow.
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    def reset(self) -> None:
+        self.loop.call_soon_threadsafe(self._reset)
+
+    def _reset(self) -> None:
+        self.put(None)
+        self.overflowed = True
+
+
+class EventBus:
+    """Thread-safe fan-out of events to per-company subscribers with a replay buffer."""
+
+    def __init__(self, buffer_size: int, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._buffer: Deque[Event] = deque(maxlen=buffer_size)
+        self._subscribers: Dict[int, Set[Subscriber]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, event: Event) -> None:
+        with self._lock:
+            self._buffer.append(event)
+            subscribers = list(self._subscribers.get(event.company_id, ()))
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(subscriber.put, event)
+
+    def subscribe(self, company_id: int, last_id: Optional[str] = None) -> Tuple[Subscriber, Optional[List[Event]]]:
+        """
+        Subscribe to a company's events, must be called on the consumer's event loop.
+
+        Args:
+            company_id: Company whose events are delivered
+            last_id: Id of the last event the client has seen
+
+        Returns:
+            The subscriber and the company's buffered events after ``last_id``
+            (empty without ``last_id``), or ``None`` instead of the events when
+            ``last_id`` is no longer buffered
+        """
+        subscriber = Subscriber(company_id, self.queue_size)
+        with self._lock:
+            # Registering and reading the buffer under one lock neither loses nor repeats events.
+            self._subscribers[company_id].add(subscriber)
+            backlog = self._since(company_id, last_id) if last_id else []
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.company_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.company_id]
+
+    def reset_all(self) -> None:
+        """End every stream with a reset, e.g. after events may have been lost."""
+        with self._lock:
+            subscribers = [subscriber for group in self._subscribers.values() for subscriber in group]
+            self._buffer.clear()
+        for subscriber in subscribers:
+            subscriber.reset()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+            self._subscribers.clear()
+
+    def _since(self, company_id: int, last_id: str) -> Optional[List[Event]]:
+        events = []
+        for event in reversed(self._buffer):
+            if event.id == last_id:
+                return events[::-1]
+            if event.company_id == company_id:
+                events.append(event)
+        return None
+
+
+def create_bus() -> EventBus:
+    options = events_settings()
+    return EventBus(options['BUFFER_SIZE'], options['QUEUE_SIZE'])
+
+
+bus = create_bus()
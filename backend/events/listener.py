@@ -0,0 +1,92 @@
+"""
+PostgreSQL ``LISTEN``/``NOTIFY`` fan-out of events across worker processes.
+
+On PostgreSQL every event is sent with ``pg_notify`` inside the writing
+transaction and each worker runs one daemon thread that ``LISTEN``s on
+``CHANNEL`` over its own connection and publishes what arrives to the
+worker's ``EventBus``, including the worker's own events. The thread is
+started by the first stream of the worker. When its connection drops,
+events may have been missed, so every open stream is reset before the
+thread reconnects.
+
+Other databases have no cross-process notifications; events are then
+published to the bus of the writing process only, which suits the
+single-process development server.
+"""
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from typing import Optional
+from .bus import Event, EventBus, bus
+import logging
+import select
+import threading
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'wms_events'
+POLL_TIMEOUT = 5
+RECONNECT_DELAY = 1
+
+
+def uses_notify(connection: BaseDatabaseWrapper) -> bool:
+    return connection.vendor == 'postgresql'
+
+
+class Listener(threading.Thread):
+    """Daemon thread publishing notifications of ``CHANNEL`` to a bus."""
+
+    def __init__(self, target: EventBus, alias: str = 'default') -> None:
+        super().__init__(name='events-listener', daemon=True)
+        self.target = target
+        self.alias = alias
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.listen()
+            except Exception:
+                logger.exception('Event listener lost its database connection')
+            self.target.reset_all()
+            self.stopped.wait(RECONNECT_DELAY)
+
+    def listen(self) -> None:
+        # A connection of its own, outside Django's per-thread connection handling.
+        wrapper = connections.create_connection(self.alias)
+        try:
+            wrapper.ensure_connection()
+            wrapper.set_autocommit(True)
+            raw = wrapper.connection
+            with raw.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            while not self.stopped.is_set():
+                if select.select([raw], [], [], POLL_TIMEOUT) == ([], [], []):
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    notify = raw.notifies.pop(0)
+                    try:
+                        self.target.publish(Event.from_json(notify.payload))
+                    except (ValueError, TypeError):
+                        logger.warning('Ignoring malformed event %r', notify.payload)
+        finally:
+            wrapper.close()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+_listener: Optional[Listener] = None
+_lock = threading.Lock()
+
+
+def ensure_listener(alias: str = 'default') -> None:
+    """Start the worker's listener thread on PostgreSQL unless it is running."""
+    global _listener
+    if not uses_notify(connections[alias]):
+        return
+    with _lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = Listener(bus, alias)
+            _listener.start()
@@ -0,0 +1,90 @@
+"""
+Model signal receivers publishing change events.
+
+Each receiver builds a small event from the saved row and hands it to
+``emit``. Events of rolled back transactions are never delivered: on
+PostgreSQL they are sent with ``pg_notify``, which the database delivers
+only on commit, and elsewhere they are published on commit.
+
+Writers that bypass model signals (transfers, bulk uploads, optimistic
+adjustments) send ``stock_changed``, which becomes a ``stock`` event telling
+clients to reload the company's stock.
+"""
+
+from django.db import connections, router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from functools import lru_cache, partial
+from typing import Any, Dict, Optional
+from orders.models import Order
+from products.models import Inventory, Item, Lot, ProductBatch
+from products.signals import lot_company_id, stock_changed, warehouse_company_id
+from .bus import Event, bus, next_id
+from .listener import CHANNEL, uses_notify
+
+
+@lru_cache(maxsize=10_000)
+def product_batch_company_id(product_batch_id: int) -> Optional[int]:
+    """Company of a product batch; batches never move between companies."""
+    return (ProductBatch.objects.filter(pk=product_batch_id)
+            .values_list('warehouse__company_id', flat=True).first())
+
+
+def emit(company_id: Optional[int], type: str, data: Dict[str, Any], using: str = 'default') -> None:
+    """Publish an event to the company's streams once the current transaction commits."""
+    if company_id is None:
+        return
+    event = Event(next_id(), company_id, type, data)
+    connection = connections[using]
+    if uses_notify(connection):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, event.to_json()])
+    else:
+        transaction.on_commit(partial(bus.publish, event), using=using)
+
+
+@receiver([post_save, post_delete], sender=Inventory, dispatch_uid='events_inventory')
+def inventory_event(sender: Any, instance: Inventory, using: str, **kwargs: Any) -> None:
+    emit(warehouse_company_id(instance.warehouse_id), 'inventory', {
+        'action': 'saved' if kwargs['signal'] is post_save else 'deleted',
+        'id': instance.pk, 'warehouse': instance.warehouse_id, 'lot': instance.lot_id,
+        'location': instance.location_id, 'quantity': instance.quantity, 'version': instance.version,
+    }, using)
+
+
+@receiver([post_save, post_delete], sender=Lot, dispatch_uid='events_lot')
+def lot_event(sender: Any, instance: Lot, using: str, **kwargs: Any) -> None:
+    emit(lot_company_id(instance.pk), 'lot', {
+        'action': 'saved' if kwargs['signal'] is post_save else 'deleted',
+        'id': instance.pk, 'material': instance.material_id, 'supplier': instance.supplier_id,
+        'quantity_remaining': instance.quantity_remaining, 'expiration': instance.expiration,
+        'version': instance.version,
+    }, using)
+
+
+@receiver(post_save, sender=Order, dispatch_uid='events_order_status')
+def order_event(sender: Any, instance: Order, created: bool, using: str, **kwargs: Any) -> None:
+    if 'status' not in instance.changed_fields():
+        return
+    emit(instance.company_id, 'order', {
+        'action': 'created' if created else 'status',
+        'id': instance.pk, 'status': instance.status, 'due_date': instance.due_date,
+    }, using)
+
+
+@receiver(post_save, sender=Item, dispatch_uid='events_item_created')
+def item_event(sender: Any, instance: Item, created: bool, using: str, **kwargs: Any) -> None:
+    if created:
+        emit(product_batch_company_id(instance.batch_id), 'item', {
+            'action': 'created', 'id': instance.pk, 'serial_number': instance.serial_number,
+            'batch': instance.batch_id, 'production_date': instance.production_date,
+        }, using)
+
+
+@receiver(stock_changed, dispatch_uid='events_stock_changed')
+def stock_event(sender: Any, company_id: Optional[int] = None, **kwargs: Any) -> None:
+    # Saved inventory rows already have their own event.
+    if isinstance(kwargs.get('instance'), Inventory):
+        return
+    emit(company_id, 'stock', {'source': getattr(getattr(sender, '_meta', None), 'model_name', None)},
+         router.db_for_write(Inventory))
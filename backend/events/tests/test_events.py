@@ -0,0 +1,225 @@
+"""
+Test suite for the change event stream.
+"""
+
+from datetime import timedelta
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import skipUnless
+from unittest.mock import patch
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from products.models import Inventory, Item, Lot, Material, Product, ProductBatch
+from products.services import adjust_quantity
+from ..bus import Event, EventBus, bus, next_id
+from ..listener import Listener
+from ..signals import emit
+import asyncio
+import time
+
+
+def event(company_id: int, type: str = 'inventory') -> Event:
+    return Event(next_id(), company_id, type, {'id': 1})
+
+
+class TestEventBus(TestCase):
+    """Test suite for the in-process fan-out and replay buffer."""
+
+    async def test_fan_out_by_company(self) -> None:
+        """
+        Test delivering events to subscribers.
+
+        Verifies:
+            - Subscribers get the events of their company only
+            - Unsubscribed queues get nothing
+        """
+        events = EventBus(buffer_size=10, queue_size=10)
+        first, _ = events.subscribe(1)
+        second, _ = events.subscribe(2)
+        gone, _ = events.subscribe(1)
+        events.unsubscribe(gone)
+        published = event(1)
+        events.publish(published)
+        events.publish(event(3))
+        assert await asyncio.wait_for(first.queue.get(), 1) == published
+        await asyncio.sleep(0)
+        assert second.queue.empty() and gone.queue.empty()
+
+    async def test_resume(self) -> None:
+        """
+        Test resuming from a last event id.
+
+        Verifies:
+            - The company's events after the id are returned in order
+            - An id that left the buffer returns None
+        """
+        events = EventBus(buffer_size=4, queue_size=10)
+        published = [event(1), event(2), event(1), event(1)]
+        for item in published:
+            events.publish(item)
+        _, backlog = events.subscribe(1, published[0].id)
+        assert backlog == published[2:]
+        events.publish(event(1))
+        _, backlog = events.subscribe(1, published[0].id)
+        assert backlog is None
+
+    async def test_overflow_ends_stream(self) -> None:
+        """
+        Test a subscriber that does not keep up.
+
+        Verifies:
+            - Publishing never blocks on a full queue
+            - The subscriber is marked as overflowed and woken up with None
+        """
+        events = EventBus(buffer_size=10, queue_size=2)
+        subscriber, _ = events.subscribe(1)
+        for _ in range(5):
+            events.publish(event(1))
+        await asyncio.sleep(0)
+        assert subscriber.overflowed
+        items = [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+        assert items[-1] is None
+
+
+class TestChangeEvents(TestCase):
+    """Test suite for events published by model changes and the stream endpoint."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.warehouse = Warehouse.objects.create(company=cls.company, name='Main')
+        supplier = create_supplier(cls.company)
+        client = create_client(cls.company)
+        material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        cls.lot = Lot.objects.create(supplier=supplier, material=material, quantity_received=10,
+                                     quantity_remaining=10, expiration=timezone.now() + timedelta(days=30))
+        cls.order = Order.objects.create(company=cls.company, client=client)
+        product = Product.objects.create(company=cls.company, name='Chair', unit='pcs')
+        cls.batch = ProductBatch.objects.create(warehouse=cls.warehouse, product=product, order=cls.order,
+                                                ordered_quantity=1, produced_quantity=0)
+        cls.user = create_user(cls.company, 'picker', UserGroups.PICKER_PACKER)
+
+    def published(self, action) -> list:
+        with patch.object(bus, 'publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            action()
+        return [(call.args[0].type, call.args[0].data) for call in publish.call_args_list]
+
+    def test_model_changes(self) -> None:
+        """
+        Test events of saved rows.
+
+        Verifies:
+            - Inventory saves publish the row
+            - Orders publish on status changes only
+            - Created items publish once, later saves do not
+            - Bulk stock changes publish a stock event
+        """
+        events = self.published(lambda: Inventory.objects.create(warehouse=self.warehouse, lot=self.lot, quantity=4))
+        assert events == [('inventory', {
+            'action': 'saved', 'id': Inventory.objects.get().pk, 'warehouse': self.warehouse.pk,
+            'lot': self.lot.pk, 'location': None, 'quantity': 4, 'version': 0,
+        })]
+
+        order = Order.objects.get(pk=self.order.pk)
+        order.due_date = timezone.now()
+        assert self.published(order.save) == []
+        order.status = 'Confirmed'
+        events = self.published(order.save)
+        assert [(type, data['status']) for type, data in events] == [('order', 'Confirmed')]
+        assert self.published(order.save) == []
+
+        item = Item(serial_number='SN-1', batch=self.batch, operator=self.user)
+        assert [type for type, _ in self.published(item.save)] == ['item']
+        assert self.published(item.save) == []
+
+        events = self.published(lambda: adjust_quantity(Lot, self.lot.pk, self.company.pk, -1))
+        assert events == [('stock', {'source': 'lot'})]
+
+    def test_rolled_back_changes_are_not_published(self) -> None:
+        """
+        Test a change whose transaction rolls back.
+
+        Verifies:
+            - No event is published
+        """
+        def change():
+            with transaction.atomic():
+                Inventory.objects.create(warehouse=self.warehouse, lot=self.lot, quantity=4)
+                transaction.set_rollback(True)
+
+        assert self.published(change) == []
+
+    async def test_stream(self) -> None:
+        """
+        Test the Server-Sent Events endpoint.
+
+        Verifies:
+            - The stream opens with a retry hint and delivers the company's events
+            - Reconnecting with Last-Event-ID replays missed events
+            - An unknown Last-Event-ID starts with a reset event
+            - Requests without a valid token are rejected
+        """
+        token = str(RefreshToken.for_user(self.user).access_token)
+        url = reverse('events:stream')
+        response = await self.async_client.get(url, {'token': token})
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        chunks = aiter(response.streaming_content)
+        assert await anext(chunks) == b'retry: 3000\n\n'
+        published = event(self.company.pk)
+        next_chunk = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.01)
+        bus.publish(published)
+        assert await asyncio.wait_for(next_chunk, 1) == published.to_sse().encode()
+        await chunks.aclose()
+
+        missed = event(self.company.pk)
+        bus.publish(missed)
+        response = await self.async_client.get(url, headers={'Authorization': f'Bearer {token}',
+                                                               'Last-Event-ID': published.id})
+        chunks = aiter(response.streaming_content)
+        assert [await anext(chunks) for _ in range(2)][1] == missed.to_sse().encode()
+        await chunks.aclose()
+
+        response = await self.async_client.get(url, {'token': token, 'last_event_id': 'gone'})
+        chunks = aiter(response.streaming_content)
+        assert [await anext(chunks) for _ in range(2)][1].startswith(b'id: \nevent: reset')
+        await chunks.aclose()
+
+        assert (await self.async_client.get(url)).status_code == 401
+        assert (await self.async_client.get(url, {'token': 'invalid'})).status_code == 401
+
+
+@skipUnless(connection.vendor == 'postgresql', 'LISTEN/NOTIFY needs PostgreSQL')
+class TestPostgresFanOut(TransactionTestCase):
+    """Test suite for delivering events through PostgreSQL notifications."""
+
+    def test_committed_events_reach_the_listener(self) -> None:
+        """
+        Test a notification sent by a committed transaction.
+
+        Verifies:
+            - The listener thread publishes it to its bus
+            - Notifications of rolled back transactions are not delivered
+        """
+        events = EventBus(buffer_size=10, queue_size=10)
+        listener = Listener(events)
+        listener.start()
+        try:
+            time.sleep(0.5)
+            with transaction.atomic():
+                emit(1, 'stock', {'source': 'rolled back'})
+                transaction.set_rollback(True)
+            emit(1, 'stock', {'source': 'test'})
+            deadline = time.monotonic() + 5
+            while not events._buffer and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert [event.data for event in events._buffer] == [{'source': 'test'}]
+        finally:
+            listener.stop()
+            listener.join(10)
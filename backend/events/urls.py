@@ -0,0 +1,8 @@
+from . import views
+from django.urls import path
+
+app_name = 'events'
+
+urlpatterns = [
+    path('stream/', views.EventStreamView.as_view(), name='stream'),
+]
@@ -0,0 +1,79 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from typing import Any, AsyncIterator, Optional
+from users.authentication import JWTAuthentication
+from .bus import bus, events_settings
+from .listener import ensure_listener
+import asyncio
+
+# An empty id makes the browser reconnect without Last-Event-ID, i.e. from scratch.
+RESET = 'id: \nevent: reset\ndata: {}\n\n'
+
+
+def authenticate(request: HttpRequest) -> Optional[Any]:
+    """
+    Authenticate with the Authorization header or, since browsers' EventSource
+    cannot send headers, with an access token in the ``token`` query parameter.
+    """
+    authentication = JWTAuthentication()
+    token = request.GET.get('token')
+    if token:
+        return authentication.get_user(authentication.get_validated_token(token.encode()))
+    result = authentication.authenticate(request)
+    return result[0] if result else None
+
+
+async def stream(company_id: int, last_id: Optional[str]) -> AsyncIterator[str]:
+    """Yield a company's events as Server-Sent Events until the client disconnects."""
+    options = events_settings()
+    subscriber, backlog = bus.subscribe(company_id, last_id)
+    try:
+        yield f'retry: {options["RETRY"]}\n\n'
+        if backlog is None:
+            yield RESET
+        for event in backlog or ():
+            yield event.to_sse()
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), options['HEARTBEAT'])
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if event is None:
+                yield RESET
+                return
+            yield event.to_sse()
+    finally:
+        bus.unsubscribe(subscriber)
+
+
+class EventStreamView(View):
+    """
+    Server-Sent Events stream of the changes of the user's company.
+
+    Events: ``inventory`` and ``lot`` (saved or deleted rows), ``order``
+    (created or status changed), ``item`` (created) and ``stock`` (bulk stock
+    changes, reload the stock). A ``reset`` event means events were lost and
+    the client should reload its data. Needs an ASGI server; under WSGI every
+    open stream holds a worker.
+    """
+    query_budget = {'get': 3}
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        try:
+            user = await sync_to_async(authenticate)(request)
+        except APIException as e:
+            return JsonResponse({'error': str(e.detail)}, status=e.status_code)
+        if user is None:
+            return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+        if user.company_id is None:
+            return JsonResponse({'error': 'User has no company.'}, status=403)
+        ensure_listener()
+        last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        response = StreamingHttpResponse(stream(user.company_id, last_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Tell nginx not to buffer the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,23 @@
+"""
+Gunicorn hooks keeping multiprocess Prometheus metrics consistent.
+
+Gunicorn loads this file automatically from the working directory.
+"""
+from prometheus_client import multiprocess
+import shutil
+import os
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+
+def on_starting(server):
+    """Remove metric files left over by a previous run."""
+    if MULTIPROC_DIR:
+        shutil.rmtree(MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(MULTIPROC_DIR)
+
+
+def child_exit(server, worker):
+    """Drop live gauges of exited workers."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(worker.pid)
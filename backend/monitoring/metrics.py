@@ -0,0 +1,95 @@
+"""
+Prometheus metrics of the application.
+
+When the ``PROMETHEUS_MULTIPROC_DIR`` environment variable is set, metric
+values are written to memory mapped files in that directory by every worker
+process and aggregated when ``/metrics`` is scraped, so the endpoint reports
+the same totals regardless of which worker serves it.
+"""
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+from django.urls import URLPattern, URLResolver, get_resolver
+from typing import Iterator, List
+import os
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+UNRESOLVED = '<unresolved>'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+REQUEST_LATENCY = Histogram(
+    'wms_request_duration_seconds', 'Request latency per URL name.',
+    ['view'], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'wms_requests_total', 'Handled requests per URL name, method and status code.',
+    ['view', 'method', 'status'],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'wms_requests_in_flight', 'Requests currently being handled.',
+    multiprocess_mode='livesum',
+)
+DB_DURATION = Histogram(
+    'wms_request_db_duration_seconds', 'Time spent in database queries per request.',
+    ['view'], buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'wms_request_db_queries', 'Number of database queries per request.',
+    ['view'], buckets=QUERY_BUCKETS,
+)
+AUTH_DURATION = Histogram(
+    'wms_authentication_duration_seconds', 'Time spent authenticating requests.',
+    ['authenticator'], buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'wms_cache_requests_total', 'Cache lookups per cache and result (hit or miss).',
+    ['cache', 'result'],
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup; the hit ratio is hits / (hits + misses)."""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def url_names(patterns: List = None, namespace: str = '') -> Iterator[str]:
+    """
+    Iterate over the fully qualified names of all named URL patterns.
+
+    Args:
+        patterns: URL patterns to walk, the root URLconf by default
+        namespace: Namespace prefix of ``patterns``
+
+    Yields:
+        str: URL names such as ``users:login``
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            yield from url_names(pattern.url_patterns, nested)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f'{namespace}{pattern.name}'
+
+
+def initialize_views() -> None:
+    """Create the per-view series for every URL name so they are exported before first use."""
+    for name in url_names():
+        REQUEST_LATENCY.labels(name)
+        DB_DURATION.labels(name)
+        DB_QUERIES.labels(name)
+
+
+def render() -> bytes:
+    """Render all metrics in the Prometheus text exposition format."""
+    if not MULTIPROC_DIR:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from typing import Any, Callable, Dict, Optional
+from .queries import QueryRecorder, QueryBudgetExceeded
+from . import metrics
+import logging
+import json
+import time
+
+logger = logging.getLogger('monitoring.queries')
+
+DEFAULTS = {
+    # Raise QueryBudgetExceeded instead of only logging budget violations.
+    'RAISE': False,
+    # Query limit for views that do not declare their own ``query_budget``.
+    'MAX_QUERIES': None,
+    # Maximum number of executions of the same query fingerprint.
+    'MAX_DUPLICATES': None,
+}
+
+
+def inspector_settings() -> Dict[str, Any]:
+    """Get QUERY_INSPECTOR settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'QUERY_INSPECTOR', {})}
+
+
+def view_query_budget(request: HttpRequest) -> Optional[int]:
+    """
+    Get the query budget declared by the view that handled the request.
+
+    Views declare budgets with a ``query_budget`` attribute, either a single
+    number or a mapping of lower case HTTP method to number.
+    """
+    match = getattr(request, 'resolver_match', None)
+    view_class = getattr(getattr(match, 'func', None), 'view_class', None)
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(request.method.lower())
+    return budget
+
+
+class QueryInspectorMiddleware:
+    """
+    Middleware recording SQL query count, database time and duplicate queries.
+
+    The numbers are exposed through a ``Server-Timing`` header and a
+    structured log line for every request. Requests exceeding their query
+    budget or repeating a query fingerprint more than ``MAX_DUPLICATES`` times
+    are logged as warnings, or raise ``QueryBudgetExceeded`` when ``RAISE``
+    is enabled (as in the test suite).
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            request.query_recorder = recorder
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries", '
+            f'total;dur={duration * 1000:.2f}'
+        )
+        self.check_budget(request, response, recorder, duration)
+        return response
+
+    def check_budget(self, request: HttpRequest, response: HttpResponse,
+                     recorder: QueryRecorder, duration: float) -> None:
+        """Log the request's query statistics and enforce the configured budgets."""
+        options = inspector_settings()
+        budget = view_query_budget(request)
+        if budget is None:
+            budget = options['MAX_QUERIES']
+        problems = []
+        if budget is not None and recorder.count > budget:
+            problems.append(f'{recorder.count} queries exceed the budget of {budget}')
+        if options['MAX_DUPLICATES'] is not None:
+            for sql, count in recorder.duplicates(options['MAX_DUPLICATES'] + 1):
+                problems.append(f'query repeated {count} times: {sql}')
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(match, 'view_name', None),
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'duration_ms': round(duration * 1000, 2),
+            'duplicates': [
+                {'sql': sql, 'count': count} for sql, count in recorder.duplicates()
+            ],
+        }
+        if not problems:
+            logger.info(json.dumps(record))
+            return
+        record['problems'] = problems
+        logger.warning(json.dumps(record))
+        if options['RAISE']:
+            raise QueryBudgetExceeded(f'{request.method} {request.path}: ' + '; '.join(problems))
+
+
+class MetricsMiddleware:
+    """
+    Middleware collecting per-view latency, status and database metrics.
+
+    It should be placed before ``QueryInspectorMiddleware`` so that the query
+    statistics recorded for the request are available once it is handled.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        metrics.initialize_views()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        with metrics.REQUESTS_IN_FLIGHT.track_inprogress():
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = getattr(match, 'view_name', None) or metrics.UNRESOLVED
+        metrics.REQUEST_LATENCY.labels(view).observe(duration)
+        metrics.REQUESTS.labels(view, request.method, response.status_code).inc()
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            metrics.DB_DURATION.labels(view).observe(recorder.duration)
+            metrics.DB_QUERIES.labels(view).observe(recorder.count)
+        return response
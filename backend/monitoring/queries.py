@@ -0,0 +1,79 @@
+from django.db import connections
+from collections import Counter
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+import time
+
+IN_CLAUSE = re.compile(r'IN \((?:%s, )*%s\)')
+WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request runs more queries than it is allowed to."""
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalize an SQL template so that equivalent queries share a fingerprint.
+
+    Parameters are already separated from the template by the database
+    backend, so only variable length ``IN`` lists and whitespace differ
+    between executions of the same query.
+
+    Args:
+        sql: SQL template with parameter placeholders
+
+    Returns:
+        str: Normalized SQL
+    """
+    return WHITESPACE.sub(' ', IN_CLAUSE.sub('IN (...)', sql)).strip()
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that records query count, time and fingerprints.
+
+    Use it as a context manager to install it on every database connection:
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.duration
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+        self._stack: Optional[ExitStack] = None
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def __enter__(self) -> 'QueryRecorder':
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stack.close()
+        self._stack = None
+
+    def duplicates(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        """
+        Get fingerprints executed at least ``threshold`` times.
+
+        Args:
+            threshold: Minimum number of executions
+
+        Returns:
+            List of (fingerprint, count) pairs, most repeated first
+        """
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
@@ -0,0 +1,76 @@
+"""
+Test suite for the Prometheus metrics endpoint.
+"""
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import Company, CustomUser
+from .. import metrics
+
+
+@override_settings(METRICS_AUTH_TOKEN='secret')
+class TestMetrics(TestCase):
+    """Test suite for metric collection and exposition."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.superuser = CustomUser.objects.create_superuser(
+            username='metrics', password='password', email='metrics@example.com',
+            company_id=Company.objects.first().pk,
+        )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def scrape(self) -> str:
+        self.client.credentials()
+        response = self.client.get(reverse('monitoring:metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        return response.content.decode()
+
+    def test_all_url_names_are_exported(self) -> None:
+        """
+        Test that every users and products URL name has latency series before first use.
+        """
+        names = set(metrics.url_names())
+        assert {'users:login', 'users:create_user', 'products:material'} <= names
+        body = self.scrape()
+        for name in names:
+            assert f'wms_request_duration_seconds_count{{view="{name}"}}' in body
+
+    def test_requests_are_counted(self) -> None:
+        """
+        Test that handled requests update latency, status, database and auth metrics.
+        """
+        token = RefreshToken.for_user(self.superuser).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        before = metrics.REQUESTS.labels('products:material', 'GET', '200')._value.get()
+        self.client.get(reverse('products:material'))
+        body = self.scrape()
+        assert metrics.REQUESTS.labels('products:material', 'GET', '200')._value.get() == before + 1
+        assert 'wms_request_db_queries_bucket{le="0.0",view="products:material"}' in body
+        assert 'wms_authentication_duration_seconds_count{authenticator="jwt"}' in body
+        assert 'wms_requests_in_flight' in body
+
+    def test_token_required(self) -> None:
+        """
+        Test that the endpoint requires the configured bearer token.
+        """
+        response = self.client.get(reverse('monitoring:metrics'))
+        assert response.status_code == 401
+        response = self.client.get(reverse('monitoring:metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        assert response.status_code == 401
+        response = self.client.get(reverse('monitoring:metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == 200
+
+    def test_closed_without_token(self) -> None:
+        """
+        Test that the endpoint is only open without a token when DEBUG is on.
+        """
+        with self.settings(METRICS_AUTH_TOKEN=None):
+            assert self.client.get(reverse('monitoring:metrics')).status_code == 403
+            with self.settings(DEBUG=True):
+                assert self.client.get(reverse('monitoring:metrics')).status_code == 200
@@ -0,0 +1,96 @@
+"""
+Test suite for the SQL query instrumentation middleware.
+"""
+
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from users.models import Company, CustomUser
+from products.views import MaterialViewSet
+from ..middleware import QueryInspectorMiddleware
+from ..queries import QueryBudgetExceeded, QueryRecorder, fingerprint
+
+
+class TestQueryInspector(TestCase):
+    """Test suite for query recording, Server-Timing headers and budgets."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.superuser = CustomUser.objects.create_superuser(
+            username='monitoring', password='password', email='monitoring@example.com',
+            company_id=Company.objects.first().pk,
+        )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.superuser)
+
+    @staticmethod
+    def repeated_queries(count: int) -> QueryInspectorMiddleware:
+        def view(request):
+            for _ in range(count):
+                Company.objects.filter(pk=1).exists()
+            return HttpResponse()
+        return QueryInspectorMiddleware(view)
+
+    def test_fingerprint_collapses_in_lists(self) -> None:
+        """
+        Test that queries differing only in IN list length share a fingerprint.
+        """
+        assert fingerprint('SELECT 1 WHERE id IN (%s, %s)') == fingerprint('SELECT 1  WHERE id IN (%s)')
+
+    def test_recorder_counts_queries(self) -> None:
+        """
+        Test that the recorder counts queries and duplicate fingerprints.
+        """
+        with QueryRecorder() as recorder:
+            Company.objects.filter(pk=1).exists()
+            Company.objects.filter(pk=2).exists()
+        assert recorder.count == 2
+        assert recorder.duplicates()[0][1] == 2
+
+    def test_server_timing_header(self) -> None:
+        """
+        Test that responses carry database timings.
+
+        Verifies:
+            - Server-Timing header contains the db metric and query count
+        """
+        response = self.client.get(reverse('products:material'))
+        assert response.status_code == 200
+        assert response['Server-Timing'].startswith('db;dur=')
+        assert 'queries' in response['Server-Timing']
+
+    @override_settings(QUERY_INSPECTOR={'RAISE': True, 'MAX_QUERIES': 1})
+    def test_raises_when_budget_exceeded(self) -> None:
+        """
+        Test that a request over its query budget raises when enforcement is enabled.
+        """
+        request = RequestFactory().get('/')
+        self.repeated_queries(1)(request)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.repeated_queries(2)(request)
+
+    def test_view_budget_is_used(self) -> None:
+        """
+        Test that the budget declared on the view takes precedence over the default.
+        """
+        with patch.object(MaterialViewSet, 'query_budget', {'get': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('products:material'))
+
+    @override_settings(QUERY_INSPECTOR={'RAISE': True, 'MAX_DUPLICATES': 2})
+    def test_raises_on_repeated_fingerprint(self) -> None:
+        """
+        Test duplicate query detection.
+
+        Verifies:
+            - Two executions of the same query are allowed
+            - A third execution raises QueryBudgetExceeded
+        """
+        request = RequestFactory().get('/')
+        self.repeated_queries(2)(request)
+        with self.assertRaises(QueryBudgetExceeded):
+            self.repeated_queries(3)(request)
@@ -0,0 +1,188 @@
+"""
+Query-count budgets for every API endpoint.
+
+Endpoints declare their budget next to the view with a ``query_budget``
+attribute (``{'get': 3, 'post': 5}``). This module checks that:
+
+- every method implemented by a project view routed in ``wms/urls.py`` has a budget,
+- every GET endpoint without URL arguments runs the same number of queries,
+  within its budget, against a small and a ten times larger company, read
+  by a user of that company and starting from empty caches.
+
+Budgets of the other methods are enforced by ``QueryInspectorMiddleware``
+whenever the functional tests call them, since the suite runs with
+``QUERY_INSPECTOR['RAISE']`` enabled.
+"""
+
+from datetime import timedelta
+from typing import Iterator, List, Tuple
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from io import StringIO
+from pathlib import Path
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from conftest import empty_caches
+from alerts.models import StockThreshold
+from orders.models import Order
+from planning.forecast import plan
+from planning.purchasing import suggest
+from products.models import Material, Product, ProductComponent
+from products.scheduling import Scheduler
+from reports import rollups
+from reports.models import Rollup
+from users.models import Company, CustomUser
+from users.revocation import revocation_list
+from users.tenants import active_companies
+from warehouse.models import Warehouse
+from warehouse.waves import WavePlanner
+from ..queries import QueryRecorder
+
+IGNORED_METHODS = {'options', 'head'}
+
+
+def project_modules() -> Tuple[str, ...]:
+    """Top level module names of the project's own apps."""
+    base_dir = Path(settings.BASE_DIR)
+    return tuple(
+        config.name for config in apps.get_app_configs()
+        if base_dir in Path(config.path).parents
+    )
+
+
+def project_routes(patterns: List = None, prefix: str = '') -> Iterator[Tuple[str, URLPattern]]:
+    """Yield (route, pattern) pairs of class based views defined by the project."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from project_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+            continue
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class and view_class.__module__.startswith(project_modules()):
+            yield prefix + str(pattern.pattern), pattern
+
+
+def implemented_methods(view_class: type) -> List[str]:
+    """HTTP methods whose handlers are written in project code."""
+    methods = []
+    for method in view_class.http_method_names:
+        if method in IGNORED_METHODS:
+            continue
+        for klass in view_class.__mro__:
+            if method in vars(klass):
+                if klass.__module__.startswith(project_modules()):
+                    methods.append(method)
+                break
+    return methods
+
+
+@override_settings(
+    ACTIVE_COMPANIES={'REFRESH_INTERVAL': float('inf')},
+    TOKEN_REVOCATION={**settings.TOKEN_REVOCATION, 'REFRESH_INTERVAL': float('inf'),
+                      'REBUILD_INTERVAL': float('inf')},
+)
+class TestQueryBudgets(TestCase):
+    """Test suite checking declared query budgets of all API endpoints."""
+
+    small = {'materials': 5, 'products': 5, 'orders': 10, 'suppliers': 2, 'clients': 2, 'locations': 10}
+    large = {'materials': 50, 'products': 50, 'orders': 100, 'suppliers': 20, 'clients': 20, 'locations': 100}
+    # Sent with every request; search needs a query and the rollups span more than the default 30 days.
+    params = {'q': 'Material', 'period': Rollup.MONTH}
+
+    def setUp(self) -> None:
+        self.reset()
+
+    @staticmethod
+    def reset() -> None:
+        """Drop the process-wide state earlier tests or requests left behind."""
+        empty_caches()
+        revocation_list.reset()
+        active_companies.refresh(force=True)
+
+    def seed(self, seed: int, **options: int) -> APIClient:
+        """
+        Generate a company, fill the tables the generator leaves empty and log in as its superuser.
+
+        Every GET endpoint then returns rows, so a query per row shows up as growth.
+        """
+        # One BOM line, one item per batch and ten lots per material leave enough stock in
+        # production to schedule some batches of both datasets.
+        call_command('generate_dataset', seed=seed, users=2, lots=10, bom_lines=1, items=1,
+                     stdout=StringIO(), **options)
+        company = Company.objects.latest('pk')
+        products = list(Product.objects.filter(company=company).order_by('pk'))
+        for parent, component in zip(products, products[1:]):
+            ProductComponent.objects.create(parent=parent, component=component, quantity=1)
+        for material in Material.objects.filter(company=company):
+            StockThreshold.objects.create(company=company, material=material, minimum=1e9)
+        Scheduler(company.pk).plan()
+        for warehouse_id in Warehouse.objects.filter(company=company).values_list('pk', flat=True):
+            WavePlanner(company.pk, warehouse_id).plan()
+        plan(company.pk)
+        # Ten years ahead every lot has expired, so every material with a reorder point is suggested.
+        suggest(company.pk, 0, now=timezone.now() + timedelta(days=3650))
+        rollups.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            for order in Order.objects.filter(company=company):
+                order.due_date += timedelta(days=1)
+                order.save()
+
+        superuser = CustomUser.objects.create_superuser(
+            username=f'budget{company.pk}', password='password', email=f'budget{company.pk}@example.com',
+            company=company,
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(superuser).access_token}')
+        return client
+
+    def count_queries(self, client: APIClient, route: str) -> int:
+        # Budgets cover the cold path, so every request starts from empty caches.
+        self.reset()
+        with QueryRecorder() as recorder:
+            response = client.get(f'/{route}', self.params)
+        assert response.status_code == 200, f'GET /{route} returned {response.status_code}'
+        if not response.streaming:
+            assert response.json(), f'GET /{route} returned no rows'
+        return recorder.count
+
+    def test_every_endpoint_declares_a_budget(self) -> None:
+        """
+        Test that each implemented method of each routed project view has a budget.
+        """
+        missing = []
+        for route, pattern in project_routes():
+            view_class = pattern.callback.view_class
+            budget = getattr(view_class, 'query_budget', None)
+            for method in implemented_methods(view_class):
+                if not isinstance(budget, dict) or method not in budget:
+                    missing.append(f'{method.upper()} /{route} ({view_class.__name__})')
+        assert not missing, 'Views without query_budget: ' + ', '.join(missing)
+
+    def test_list_endpoints_do_not_grow_with_data(self) -> None:
+        """
+        Test that GET endpoints run a constant number of queries.
+
+        Verifies:
+            - Every endpoint returns rows of the seeded company
+            - Query count is the same for a small and a ten times larger dataset
+            - Query count is within the declared budget
+        """
+        routes = [
+            (route, pattern) for route, pattern in project_routes()
+            if not pattern.pattern.converters and 'get' in implemented_methods(pattern.callback.view_class)
+        ]
+        assert routes
+
+        client = self.seed(seed=1, **self.small)
+        small = {route: self.count_queries(client, route) for route, _ in routes}
+        client = self.seed(seed=2, **self.large)
+        for route, pattern in routes:
+            large = self.count_queries(client, route)
+            budget = pattern.callback.view_class.query_budget['get']
+            assert large == small[route], f'GET /{route}: {small[route]} queries grew to {large}'
+            assert large <= budget, f'GET /{route}: {large} queries exceed the budget of {budget}'
@@ -0,0 +1,8 @@
+from . import views
+from django.urls import path
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('', views.metrics_view, name='metrics'),
+]
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from . import metrics
+import hmac
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Expose application metrics in the Prometheus text format.
+
+    The scraper has to send ``METRICS_AUTH_TOKEN`` as a bearer token. Without
+    a configured token the endpoint is only open when ``DEBUG`` is on.
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.render(), content_type=CONTENT_TYPE_LATEST)
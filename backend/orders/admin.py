@@ -1,3 +1,12 @@
 from django.contrib import admin
+from wms.admin_utils import LargeTableAdmin
+from .models import Order
 
-# Register your models here.
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ('id', 'status', 'client', 'company', 'order_date', 'shipped_date')
+    list_filter = ('status', ('order_date', admin.DateFieldListFilter))
+    list_select_related = ('client', 'company')
+    autocomplete_fields = ('client', 'company', 'wave')
+    search_fields = ('=id',)
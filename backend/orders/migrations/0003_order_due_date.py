@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-19 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_alter_order_order_date_alter_order_shipped_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='due_date',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-19 11:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_due_date'),
+        ('warehouse', '0003_wave'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='wave',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='warehouse.wave'),
+        ),
+    ]
@@ -1,9 +1,10 @@
 from users.models import Company
 from clients.models import Client
 from django.db import models
+from wms.models import SnapshotMixin
 
 
-class Order(models.Model):
+class Order(SnapshotMixin, models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
     STATUS_CHOICES = (
         ('Draft', 'Draft'),
@@ -12,11 +13,15 @@ class Order(models.Model):
         ('Delivered', 'Delivered'),
         ('Cancelled', 'Cancelled'),
     )
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Draft')
-    order_date = models.DateTimeField(auto_now_add=True)
-    shipped_date = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Draft', db_index=True)
+    order_date = models.DateTimeField(auto_now_add=True, db_index=True)
+    shipped_date = models.DateTimeField(null=True, blank=True, db_index=True)
     delivered_date = models.DateTimeField(null=True, blank=True)
+    due_date = models.DateTimeField(null=True, blank=True, db_index=True)
     client = models.ForeignKey(Client, on_delete=models.CASCADE)
+    wave = models.ForeignKey('warehouse.Wave', on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name='orders')
+    snapshot_fields = ('status', 'client_id', 'due_date', 'shipped_date', 'delivered_date')
 
     def __str__(self):
         return f'Order: {self.id} - {self.status}'
@@ -0,0 +1,44 @@
+from django.contrib import admin
+from wms.admin_utils import LargeTableAdmin
+from . import models
+
+
+@admin.register(models.ProductForecast)
+class ProductForecastAdmin(LargeTableAdmin):
+    list_display = ('product', 'method', 'weekly_demand', 'deviation', 'computed_at')
+    list_select_related = ('product',)
+    list_filter = ('method',)
+    search_fields = ('=product__name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.ReorderPoint)
+class ReorderPointAdmin(LargeTableAdmin):
+    list_display = ('material', 'supplier', 'weekly_demand', 'safety_stock', 'reorder_point', 'lead_time_days',
+                    'computed_at')
+    list_select_related = ('material', 'supplier')
+    search_fields = ('=material__name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.PurchaseSuggestion)
+class PurchaseSuggestionAdmin(LargeTableAdmin):
+    list_display = ('material', 'supplier', 'quantity', 'on_hand', 'open_receipts', 'reorder_point', 'computed_at')
+    list_select_related = ('material', 'supplier')
+    search_fields = ('=material__name', '=supplier__name')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
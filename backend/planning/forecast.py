@@ -0,0 +1,266 @@
+"""
+Demand forecasts of products and reorder points of materials.
+
+Weekly demand is the ``ordered_quantity`` of product batches by the week
+their order was placed, over the last ``HISTORY_WEEKS`` complete weeks of
+orders that were not drafts or cancelled. It is read with one aggregated
+query, bucketed into weeks by the database, into a products x weeks matrix
+and every method below runs on whole
+columns of that matrix, one numpy operation per week for all products, so
+the cost grows with the number of weeks rather than with a Python loop per
+product:
+
+- Products ordered in most weeks (average demand interval up to
+  ``INTERMITTENT_INTERVAL``) are forecast with simple exponential smoothing.
+- Products with intermittent demand are forecast with Croston's method,
+  smoothing the size of non-zero demands and the interval between them
+  separately, with the Syntetos-Boylan bias correction.
+
+The deviation of a forecast is the root mean squared error of its
+one-week-ahead forecasts over the history.
+
+Forecasts are exploded into materials through the bill of materials of
+every subassembly level (see ``products.bom``), as ``products.atp`` does.
+Assuming independent product demands, the weekly variance of a material is
+the sum of the squared deviations weighted by its quantity per unit, and
+
+    safety stock  = z(SERVICE_LEVEL) * deviation * sqrt(lead time in weeks)
+    reorder point = weekly demand * lead time in weeks + safety stock
+
+where the lead time is that of the material's supplier (see
+``planning.purchasing``), ``LEAD_TIME_DAYS`` when it has none.
+
+Results replace the stored rows of the company; ``python manage.py
+plan_replenishment`` recomputes every company and is meant to run nightly.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Func, IntegerField, Sum
+from django.utils import timezone
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+from products.models import BillOfMaterials, ProductBatch
+from wms.db import upsert
+from .models import ProductForecast, ReorderPoint
+from .purchasing import latest_suppliers
+import numpy as np
+
+DEMAND_STATUSES = ('Confirmed', 'Shipped', 'Delivered')
+METHODS = np.array(['', ProductForecast.SES, ProductForecast.CROSTON])
+NONE, SES, CROSTON = range(3)
+
+DEFAULTS = {
+    # Complete weeks of order history used for the forecasts.
+    'HISTORY_WEEKS': 52,
+    # Smoothing constant of simple exponential smoothing.
+    'SES_ALPHA': 0.2,
+    # Smoothing constant of Croston's demand sizes and intervals.
+    'CROSTON_ALPHA': 0.1,
+    # Products with a longer average interval between demands use Croston.
+    'INTERMITTENT_INTERVAL': 1.32,
+    # Probability of not running out of a material during its lead time.
+    'SERVICE_LEVEL': 0.95,
+    # Lead time of materials whose supplier has none.
+    'LEAD_TIME_DAYS': 14,
+    # Days of forecast demand a purchase covers beyond the reorder point.
+    'ORDER_COVER_DAYS': 7,
+}
+
+
+def planning_settings() -> Dict[str, Any]:
+    """Get PLANNING settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'PLANNING', {})}
+
+
+@dataclass
+class Forecast:
+    """Forecasts of the rows of a demand matrix."""
+
+    method: np.ndarray
+    demand: np.ndarray
+    deviation: np.ndarray
+
+
+def forecast(demand: np.ndarray, ses_alpha: float, croston_alpha: float,
+             intermittent_interval: float) -> Forecast:
+    """
+    Forecast next week's demand of every row of a products x weeks matrix.
+
+    Args:
+        demand: Weekly demand, one row per product, oldest week first
+        ses_alpha: Smoothing constant of simple exponential smoothing
+        croston_alpha: Smoothing constant of Croston's method
+        intermittent_interval: Average demand interval above which Croston's method is used
+
+    Returns:
+        Method codes (``NONE`` for rows without demand), forecasts and their deviations
+    """
+    demand = np.asarray(demand, dtype=np.float64)
+    products, weeks = demand.shape
+    level = demand[:, 0].copy() if weeks else np.zeros(products)
+    ses_errors = np.zeros(products)
+    size = np.zeros(products)
+    interval = np.ones(products)
+    since = np.ones(products)
+    seen = np.zeros(products, dtype=bool)
+    croston_errors = np.zeros(products)
+    croston_weeks = np.zeros(products)
+    correction = 1 - croston_alpha / 2
+
+    for week in range(weeks):
+        current = demand[:, week]
+        if week:
+            error = current - level
+            ses_errors += error ** 2
+            level += ses_alpha * error
+            error = np.where(seen, current - correction * size / interval, 0)
+            croston_errors += error ** 2
+            croston_weeks += seen
+        ordered = current > 0
+        update = ordered & seen
+        size = np.where(update, size + croston_alpha * (current - size), np.where(ordered, current, size))
+        interval = np.where(update, interval + croston_alpha * (since - interval), np.where(ordered, since, interval))
+        seen |= ordered
+        since = np.where(ordered, 1, since + 1)
+
+    ordered_weeks = np.count_nonzero(demand > 0, axis=1)
+    intermittent = weeks > intermittent_interval * ordered_weeks
+    method = np.where(ordered_weeks == 0, NONE, np.where(intermittent, CROSTON, SES))
+    ses_deviation = np.sqrt(ses_errors / max(weeks - 1, 1))
+    croston_deviation = np.sqrt(np.divide(croston_errors, croston_weeks, out=np.zeros(products),
+                                          where=croston_weeks > 0))
+    return Forecast(
+        method=method,
+        demand=np.select([method == SES, method == CROSTON], [level, correction * size / interval], 0.0),
+        deviation=np.select([method == SES, method == CROSTON], [ses_deviation, croston_deviation], 0.0),
+    )
+
+
+class WeekOffset(Func):
+    """
+    Whole weeks from ``origin`` to a datetime column.
+
+    Computed with plain SQL arithmetic; ``TruncWeek`` is a Python function
+    called for every row on SQLite and would dominate the demand query.
+    """
+    output_field = IntegerField()
+    template = 'CAST(FLOOR((EXTRACT(EPOCH FROM %(expressions)s) - %(origin)s) / 604800) AS INTEGER)'
+
+    def __init__(self, expression: str, origin: datetime) -> None:
+        super().__init__(expression, origin=float(origin.timestamp()))
+
+    def as_sqlite(self, compiler: Any, connection: Any, **extra_context: Any) -> Any:
+        # Values are never before the origin, so truncating is flooring.
+        template = "CAST(((julianday(%(expressions)s) - 2440587.5) * 86400 - %(origin)s) / 604800 AS INTEGER)"
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+
+def history_window(weeks: int, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """First and end (exclusive) instants of the last ``weeks`` complete weeks, weeks starting on Monday."""
+    today = timezone.localtime(now or timezone.now())
+    end = today.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=today.weekday())
+    return end - timedelta(weeks=weeks), end
+
+
+def demand_matrix(company_id: int, weeks: int, now: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the weekly demand of a company's products.
+
+    Returns:
+        Ids of the products with demand, ascending, and their products x weeks demand matrix
+    """
+    start, end = history_window(weeks, now)
+    rows = list(
+        ProductBatch.objects
+        .filter(product__company_id=company_id, order__status__in=DEMAND_STATUSES,
+                order__order_date__gte=start, order__order_date__lt=end)
+        .annotate(week=WeekOffset('order__order_date', start))
+        .values('product_id', 'week')
+        .annotate(quantity=Sum('ordered_quantity'))
+        .values_list('product_id', 'week', 'quantity')
+    )
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, weeks))
+    product, week, quantity = (np.array(column) for column in zip(*rows))
+    product_ids, positions = np.unique(product.astype(np.int64), return_inverse=True)
+    matrix = np.zeros((len(product_ids), weeks))
+    np.add.at(matrix, (positions, week.astype(np.int64)), quantity)
+    return product_ids, matrix
+
+
+def exploded_bom(company_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Material lines of every product exploded through all subassembly levels: products, materials, quantities."""
+    ancestor = 'product__closure_ancestors__ancestor_id'
+    rows = [
+        row for row in
+        BillOfMaterials.objects
+        .filter(product__company_id=company_id, quantity__gt=0)
+        .values(ancestor, 'material')
+        .annotate(per_unit=Sum(F('quantity') * F('product__closure_ancestors__quantity')))
+        .values_list(ancestor, 'material', 'per_unit')
+        # Products loaded without their closure row have no ancestor.
+        if row[0] is not None
+    ]
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    products, materials, per_unit = zip(*rows)
+    return np.array(products, dtype=np.int64), np.array(materials, dtype=np.int64), np.array(per_unit)
+
+
+def plan(company_id: int, now: Optional[datetime] = None) -> Tuple[int, int]:
+    """
+    Recompute the product forecasts and material reorder points of a company.
+
+    Returns:
+        Number of products and of materials with a forecast demand
+    """
+    options = planning_settings()
+    now = now or timezone.now()
+    product_ids, matrix = demand_matrix(company_id, options['HISTORY_WEEKS'], now)
+    result = forecast(matrix, options['SES_ALPHA'], options['CROSTON_ALPHA'], options['INTERMITTENT_INTERVAL'])
+
+    bom_products, bom_materials, per_unit = exploded_bom(company_id)
+    positions = np.searchsorted(product_ids, bom_products)
+    known = positions < len(product_ids)
+    known[known] = product_ids[positions[known]] == bom_products[known]
+    positions, bom_materials, per_unit = positions[known], bom_materials[known], per_unit[known]
+    material_ids, materials = np.unique(bom_materials, return_inverse=True)
+    demand = np.bincount(materials, weights=result.demand[positions] * per_unit, minlength=len(material_ids))
+    variance = np.bincount(materials, weights=(result.deviation[positions] * per_unit) ** 2,
+                           minlength=len(material_ids))
+    suppliers = latest_suppliers(company_id)
+    latest = [suppliers.get(material_id, (None, None)) for material_id in material_ids.tolist()]
+    supplier_ids = [supplier_id for supplier_id, _ in latest]
+    lead_days = np.array([options['LEAD_TIME_DAYS'] if days is None else days for _, days in latest],
+                         dtype=np.float64)
+    lead_weeks = lead_days / 7
+    safety_stock = NormalDist().inv_cdf(options['SERVICE_LEVEL']) * np.sqrt(variance * lead_weeks)
+    reorder_point = demand * lead_weeks + safety_stock
+
+    forecasts = result.method != NONE
+    with transaction.atomic():
+        upsert(
+            ProductForecast,
+            ['company_id', 'product_id', 'method', 'weekly_demand', 'deviation', 'computed_at'],
+            ['product_id'],
+            ['method', 'weekly_demand', 'deviation', 'computed_at'],
+            list(zip([company_id] * int(forecasts.sum()), product_ids[forecasts].tolist(),
+                     METHODS[result.method[forecasts]].tolist(), result.demand[forecasts].tolist(),
+                     result.deviation[forecasts].tolist(), [now] * int(forecasts.sum()))),
+        )
+        upsert(
+            ReorderPoint,
+            ['company_id', 'material_id', 'supplier_id', 'weekly_demand', 'safety_stock', 'reorder_point',
+             'lead_time_days', 'computed_at'],
+            ['material_id'],
+            ['supplier_id', 'weekly_demand', 'safety_stock', 'reorder_point', 'lead_time_days', 'computed_at'],
+            list(zip([company_id] * len(material_ids), material_ids.tolist(), supplier_ids, demand.tolist(),
+                     safety_stock.tolist(), reorder_point.tolist(), lead_days.tolist(), [now] * len(material_ids))),
+        )
+        # Products and materials without demand in the history keep no stale rows.
+        ProductForecast.objects.filter(company_id=company_id, computed_at__lt=now).delete()
+        ReorderPoint.objects.filter(company_id=company_id, computed_at__lt=now).delete()
+    return int(forecasts.sum()), len(material_ids)
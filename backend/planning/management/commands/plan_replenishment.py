@@ -0,0 +1,29 @@
+import time
+from typing import Any
+from django.core.management.base import BaseCommand
+from users.models import Company
+from planning.forecast import plan, planning_settings
+from planning.purchasing import suggest
+
+
+class Command(BaseCommand):
+    help = ('Forecast product demand from the order history, recompute material reorder points and '
+            'purchase suggestions. Meant to be run nightly (e.g. from cron).')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--company', type=int, action='append',
+                            help='Plan only this company; may be repeated')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        companies = Company.objects.filter(is_active=True)
+        if options['company']:
+            companies = companies.filter(pk__in=options['company'])
+        for company_id in companies.values_list('pk', flat=True):
+            started = time.perf_counter()
+            products, materials = plan(company_id)
+            purchases = suggest(company_id, planning_settings()['ORDER_COVER_DAYS'])
+            self.stdout.write(
+                f'Company {company_id}: {products} product forecasts, {materials} reorder points, '
+                f'{purchases} purchase suggestions in {time.perf_counter() - started:.1f}s'
+            )
+        self.stdout.write(self.style.SUCCESS('Planning complete'))
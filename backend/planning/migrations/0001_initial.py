@@ -0,0 +1,48 @@
+# Generated by Django 5.1 on 2026-10-19 11:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0007_lot_inventory_version'),
+        ('users', '0008_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(choices=[('ses', 'Simple exponential smoothing'), ('croston', 'Croston')], max_length=10)),
+                ('weekly_demand', models.FloatField()),
+                ('deviation', models.FloatField(help_text='Root mean squared one-week-ahead forecast error')),
+                ('computed_at', models.DateTimeField()),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='products.product')),
+            ],
+            options={
+                'db_table': 'product_forecast',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReorderPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekly_demand', models.FloatField()),
+                ('safety_stock', models.FloatField()),
+                ('reorder_point', models.FloatField(help_text='Demand over the lead time plus safety stock')),
+                ('lead_time_days', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+                ('material', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='products.material')),
+            ],
+            options={
+                'db_table': 'reorder_point',
+            },
+        ),
+    ]
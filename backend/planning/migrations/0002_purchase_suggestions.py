@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-19 11:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning', '0001_initial'),
+        ('products', '0007_lot_inventory_version'),
+        ('suppliers', '0002_lead_time_and_minimum_order'),
+        ('users', '0008_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reorderpoint',
+            name='supplier',
+            field=models.ForeignKey(blank=True, help_text="Supplier of the material's latest lot", null=True, on_delete=django.db.models.deletion.SET_NULL, to='suppliers.supplier'),
+        ),
+        migrations.CreateModel(
+            name='PurchaseSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.FloatField()),
+                ('on_hand', models.FloatField(help_text="Unexpired stock in the company's warehouses")),
+                ('open_receipts', models.FloatField(help_text='Received lot quantity not yet put away into inventory')),
+                ('reorder_point', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+                ('material', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='products.material')),
+                ('supplier', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='suppliers.supplier')),
+            ],
+            options={
+                'db_table': 'purchase_suggestion',
+            },
+        ),
+    ]
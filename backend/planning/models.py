@@ -0,0 +1,63 @@
+from django.db import models
+from users.models import Company
+from suppliers.models import Supplier
+from products.models import Material, Product
+
+
+class ProductForecast(models.Model):
+    """Weekly demand forecast of a product, computed nightly by ``planning.forecast``."""
+    SES = 'ses'
+    CROSTON = 'croston'
+    METHOD_CHOICES = (
+        (SES, 'Simple exponential smoothing'),
+        (CROSTON, 'Croston'),
+    )
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    product = models.OneToOneField(Product, on_delete=models.CASCADE)
+    method = models.CharField(max_length=10, choices=METHOD_CHOICES)
+    weekly_demand = models.FloatField()
+    deviation = models.FloatField(help_text="Root mean squared one-week-ahead forecast error")
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'ProductForecast: {self.product} - {self.weekly_demand}'
+
+    class Meta:
+        db_table = 'product_forecast'
+
+
+class ReorderPoint(models.Model):
+    """Reorder point and safety stock of a material derived from the product forecasts."""
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    material = models.OneToOneField(Material, on_delete=models.CASCADE)
+    supplier = models.ForeignKey(Supplier, on_delete=models.SET_NULL, null=True, blank=True,
+                                 help_text="Supplier of the material's latest lot")
+    weekly_demand = models.FloatField()
+    safety_stock = models.FloatField()
+    reorder_point = models.FloatField(help_text="Demand over the lead time plus safety stock")
+    lead_time_days = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'ReorderPoint: {self.material} - {self.reorder_point}'
+
+    class Meta:
+        db_table = 'reorder_point'
+
+
+class PurchaseSuggestion(models.Model):
+    """Quantity of a material to order from a supplier, computed by ``planning.purchasing``."""
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    material = models.OneToOneField(Material, on_delete=models.CASCADE)
+    supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, null=True, blank=True)
+    quantity = models.FloatField()
+    on_hand = models.FloatField(help_text="Unexpired stock in the company's warehouses")
+    open_receipts = models.FloatField(help_text="Received lot quantity not yet put away into inventory")
+    reorder_point = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'PurchaseSuggestion: {self.supplier} - {self.material} - {self.quantity}'
+
+    class Meta:
+        db_table = 'purchase_suggestion'
@@ -0,0 +1,104 @@
+"""
+Purchase suggestions from reorder points.
+
+A material is supplied by the supplier of its latest lot, whose
+``lead_time_days`` (or ``PLANNING['LEAD_TIME_DAYS']``) sets the lead time of
+its reorder point (see ``planning.forecast``).
+
+Suggestions follow a reorder point, order-up-to policy. The inventory
+position of a material is its unexpired stock in the company's warehouses
+plus open receipts, the remaining quantity of unexpired lots that has not
+been put away into inventory yet. When the position is at or below the
+reorder point, enough is ordered to bring it up to the reorder point plus
+``ORDER_COVER_DAYS`` of forecast demand, rounded up to whole units and at
+least the supplier's ``minimum_order_quantity``.
+
+All reorder points of a company are read with their stock and open receipts
+in one aggregated query, the quantities are computed with numpy and the
+suggestions replace the company's previous ones. ``python manage.py
+plan_replenishment`` refreshes them nightly after the forecasts.
+"""
+
+from datetime import datetime
+from django.db import transaction
+from django.db.models import FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from typing import Dict, Optional, Tuple
+from products.models import Inventory, Lot, Material
+from wms.db import upsert
+from .models import PurchaseSuggestion, ReorderPoint
+import numpy as np
+
+
+def latest_suppliers(company_id: int) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """Supplier of the latest lot of every material of a company and the supplier's lead time in days."""
+    latest = Lot.objects.filter(material=OuterRef('pk')).order_by('-received', '-pk')
+    return {
+        material_id: (supplier_id, lead_time_days)
+        for material_id, supplier_id, lead_time_days in
+        Material.objects.filter(company_id=company_id)
+        .annotate(latest_supplier=Subquery(latest.values('supplier')[:1]),
+                  lead_time_days=Subquery(latest.values('supplier__lead_time_days')[:1]))
+        .values_list('pk', 'latest_supplier', 'lead_time_days')
+    }
+
+
+def suggest(company_id: int, cover_days: float, now: Optional[datetime] = None) -> int:
+    """
+    Replace the purchase suggestions of a company.
+
+    Args:
+        company_id: Company whose reorder points are checked
+        cover_days: Days of forecast demand ordered on top of the reorder point
+        now: Lots expiring before this instant are not counted
+
+    Returns:
+        Number of materials to order
+    """
+    now = now or timezone.now()
+    on_hand = (
+        Inventory.objects
+        .filter(lot__material=OuterRef('material'), warehouse__company_id=company_id, lot__expiration__gt=now)
+        .values('lot__material')
+        .annotate(total=Sum('quantity'))
+        .values('total')
+    )
+    remaining = (
+        Lot.objects
+        .filter(material=OuterRef('material'), expiration__gt=now)
+        .values('material')
+        .annotate(total=Sum('quantity_remaining'))
+        .values('total')
+    )
+    rows = list(
+        ReorderPoint.objects
+        .filter(company_id=company_id, reorder_point__gt=0)
+        .values_list(
+            'material_id', 'supplier_id', 'weekly_demand', 'reorder_point',
+            Coalesce(Subquery(on_hand), Value(0.0), output_field=FloatField()),
+            Coalesce(Subquery(remaining), Value(0.0), output_field=FloatField()),
+            Coalesce('supplier__minimum_order_quantity', Value(0.0), output_field=FloatField()),
+        )
+    )
+    material_ids, supplier_ids = [row[0] for row in rows], [row[1] for row in rows]
+    demand, reorder_point, stock, lots, minimum = (
+        np.array([row[column] for row in rows], dtype=np.float64) for column in range(2, 7)
+    )
+    receipts = np.maximum(lots - stock, 0)
+    position = stock + receipts
+    quantity = np.maximum(np.ceil(reorder_point + demand * cover_days / 7 - position), minimum)
+    selected = np.flatnonzero(position <= reorder_point).tolist()
+
+    with transaction.atomic():
+        upsert(
+            PurchaseSuggestion,
+            ['company_id', 'material_id', 'supplier_id', 'quantity', 'on_hand', 'open_receipts', 'reorder_point',
+             'computed_at'],
+            ['material_id'],
+            ['supplier_id', 'quantity', 'on_hand', 'open_receipts', 'reorder_point', 'computed_at'],
+            [(company_id, material_ids[i], supplier_ids[i], quantity[i].item(), stock[i].item(),
+              receipts[i].item(), reorder_point[i].item(), now) for i in selected],
+        )
+        PurchaseSuggestion.objects.filter(company_id=company_id, computed_at__lt=now).delete()
+    return len(selected)
@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from . import models
+
+
+class ReorderPointSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ReorderPoint
+        fields = ['material', 'supplier', 'weekly_demand', 'safety_stock', 'reorder_point', 'lead_time_days', 'computed_at']
+
+
+class PurchaseLineSerializer(serializers.ModelSerializer):
+    material_name = serializers.CharField(source='material.name', read_only=True)
+    unit = serializers.CharField(source='material.unit', read_only=True)
+
+    class Meta:
+        model = models.PurchaseSuggestion
+        fields = ['material', 'material_name', 'unit', 'quantity', 'on_hand', 'open_receipts', 'reorder_point',
+                  'computed_at']
+
+
+class SupplierPurchaseSerializer(serializers.Serializer):
+    """Suggested order of one supplier; ``supplier`` is empty for materials never received."""
+    supplier = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
+    email = serializers.EmailField(allow_null=True)
+    lead_time_days = serializers.IntegerField(allow_null=True)
+    minimum_order_quantity = serializers.FloatField(allow_null=True)
+    lines = PurchaseLineSerializer(many=True)
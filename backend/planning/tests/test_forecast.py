@@ -0,0 +1,145 @@
+"""
+Test suite for demand forecasts and reorder points.
+"""
+
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from rest_framework.test import APIClient
+from conftest import create_client, create_user
+from statistics import NormalDist
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from products.models import BillOfMaterials, Material, Product, ProductBatch, ProductComponent
+from ..forecast import CROSTON, NONE, SES, forecast, history_window, plan
+from ..models import ProductForecast, ReorderPoint
+import numpy as np
+
+
+class TestForecast(TestCase):
+    """Test suite for the vectorized forecasting methods."""
+
+    def test_methods(self) -> None:
+        """
+        Test forecasting regular, intermittent and missing demand in one matrix.
+
+        Verifies:
+            - Regular demand uses exponential smoothing and a constant series is forecast exactly
+            - Intermittent demand uses Croston's method with the bias correction
+            - Rows without demand get no forecast
+        """
+        demand = np.array([
+            [5, 5, 5, 5, 5, 5, 5, 5],
+            [0, 0, 8, 0, 0, 0, 8, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0],
+        ])
+        result = forecast(demand, ses_alpha=0.2, croston_alpha=0.5, intermittent_interval=1.32)
+        assert result.method.tolist() == [SES, CROSTON, NONE]
+        assert result.demand[0] == 5 and result.deviation[0] == 0
+        # Size 8, interval 3 then 4 smoothed to 3.5.
+        assert np.isclose(result.demand[1], 0.75 * 8 / 3.5)
+        assert result.deviation[1] > 0
+        assert result.demand[2] == 0 and result.deviation[2] == 0
+
+    def test_rows_are_independent(self) -> None:
+        """
+        Test that a row is forecast the same way alone and within a larger matrix.
+
+        Verifies:
+            - Forecasts and deviations do not depend on the other rows
+        """
+        rng = np.random.default_rng(0)
+        demand = rng.poisson(rng.uniform(0.1, 10, (50, 1)), (50, 26)).astype(float)
+        together = forecast(demand, 0.2, 0.1, 1.32)
+        for row in (0, 17, 49):
+            alone = forecast(demand[row:row + 1], 0.2, 0.1, 1.32)
+            assert alone.method[0] == together.method[row]
+            assert np.isclose(alone.demand[0], together.demand[row])
+            assert np.isclose(alone.deviation[0], together.deviation[row])
+
+
+class TestReorderPoints(TestCase):
+    """Test suite for planning a company from its order history."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.warehouse = Warehouse.objects.create(company=cls.company, name='Production')
+        cls.customer = create_client(cls.company)
+        cls.chair = Product.objects.create(company=cls.company, name='Chair', unit='pcs')
+        cls.leg = Product.objects.create(company=cls.company, name='Leg', unit='pcs')
+        ProductComponent.objects.create(parent=cls.chair, component=cls.leg, quantity=4)
+        cls.wood = Material.objects.create(company=cls.company, name='Wood', unit='kg')
+        cls.glue = Material.objects.create(company=cls.company, name='Glue', unit='l')
+        BillOfMaterials.objects.create(product=cls.leg, material=cls.wood, quantity=0.5)
+        BillOfMaterials.objects.create(product=cls.chair, material=cls.glue, quantity=0.1)
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def order(self, product: Product, quantity: float, weeks_ago: int, status: str = 'Delivered') -> None:
+        start, end = history_window(1)
+        order = Order.objects.create(company=self.company, client=self.customer, status=status)
+        Order.objects.filter(pk=order.pk).update(order_date=start - timedelta(weeks=weeks_ago - 1, hours=-12))
+        ProductBatch.objects.create(warehouse=self.warehouse, product=product, order=order,
+                                    ordered_quantity=quantity, produced_quantity=quantity)
+
+    def test_plan(self) -> None:
+        """
+        Test translating product forecasts into material reorder points.
+
+        Verifies:
+            - Orders of a week are summed; drafts, cancelled orders and the current week are ignored
+            - Material demand is exploded through subassemblies
+            - Safety stock follows the service level, the deviation and the lead time
+            - Rows of products without demand any more are removed
+        """
+        for weeks_ago in range(1, 11):
+            self.order(self.chair, 5, weeks_ago)
+            self.order(self.chair, 5, weeks_ago)
+        self.order(self.chair, 100, 1, status='Draft')
+        self.order(self.chair, 100, 2, status='Cancelled')
+        self.order(self.chair, 100, 0)
+
+        with self.settings(PLANNING={'HISTORY_WEEKS': 10, 'LEAD_TIME_DAYS': 14, 'SERVICE_LEVEL': 0.95}):
+            assert plan(self.company.pk) == (1, 2)
+        chair = ProductForecast.objects.get(product=self.chair)
+        assert (chair.method, chair.weekly_demand, chair.deviation) == (ProductForecast.SES, 10, 0)
+        wood = ReorderPoint.objects.get(material=self.wood)
+        assert np.isclose(wood.weekly_demand, 20) and wood.safety_stock == 0
+        assert np.isclose(wood.reorder_point, 40)
+
+        self.order(self.chair, 30, 1)
+        with self.settings(PLANNING={'HISTORY_WEEKS': 10, 'LEAD_TIME_DAYS': 7, 'SERVICE_LEVEL': 0.95}):
+            plan(self.company.pk)
+        chair.refresh_from_db()
+        glue = ReorderPoint.objects.get(material=self.glue)
+        assert np.isclose(glue.safety_stock, NormalDist().inv_cdf(0.95) * chair.deviation * 0.1)
+        assert np.isclose(glue.reorder_point, chair.weekly_demand * 0.1 + glue.safety_stock)
+
+        with self.settings(PLANNING={'HISTORY_WEEKS': 10}):
+            assert plan(self.company.pk, timezone.now() + timedelta(weeks=20)) == (0, 0)
+        assert not ProductForecast.objects.exists() and not ReorderPoint.objects.exists()
+
+    def test_command_and_endpoint(self) -> None:
+        """
+        Test the nightly command and the reorder point endpoint.
+
+        Verifies:
+            - The command plans every active company
+            - The endpoint lists the reorder points of the user's company
+        """
+        for weeks_ago in range(1, 5):
+            self.order(self.leg, 8, weeks_ago)
+        out = StringIO()
+        with self.settings(PLANNING={'HISTORY_WEEKS': 4}):
+            call_command('plan_replenishment', stdout=out)
+        assert f'Company {self.company.pk}: 1 product forecasts, 1 reorder points' in out.getvalue()
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('planning:reorder-point'))
+        assert response.status_code == 200
+        assert [(row['material'], row['weekly_demand']) for row in response.json()] == [(self.wood.pk, 4)]
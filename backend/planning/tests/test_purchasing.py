@@ -0,0 +1,136 @@
+"""
+Test suite for purchase suggestions.
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_client, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from suppliers.models import Supplier
+from orders.models import Order
+from products.models import BillOfMaterials, Inventory, Lot, Material, Product, ProductBatch
+from ..forecast import history_window, plan
+from ..models import PurchaseSuggestion, ReorderPoint
+from ..purchasing import suggest
+
+
+class TestPurchaseSuggestions(TestCase):
+    """Test suite for turning reorder points into supplier orders."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.warehouse = Warehouse.objects.create(company=cls.company, name='Main')
+        cls.timber = cls.supplier('Timber', lead_time_days=7, minimum_order_quantity=50)
+        cls.chemicals = cls.supplier('Chemicals')
+        cls.wood, cls.tape, cls.glue, cls.steel = (
+            Material.objects.create(company=cls.company, name=name, unit='kg')
+            for name in ('Wood', 'Tape', 'Glue', 'Steel')
+        )
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    @classmethod
+    def supplier(cls, name: str, **fields) -> Supplier:
+        return Supplier.objects.create(
+            company=cls.company, name=name, address='Street 1', phone='1', email=f'{name.lower()}@example.com',
+            website='https://supplier.example.com', **fields,
+        )
+
+    def lot(self, supplier: Supplier, material: Material, remaining: float, stocked: float, days: float = 30) -> Lot:
+        lot = Lot.objects.create(supplier=supplier, material=material, quantity_received=remaining,
+                                 quantity_remaining=remaining, expiration=timezone.now() + timedelta(days=days))
+        if stocked:
+            Inventory.objects.create(warehouse=self.warehouse, lot=lot, quantity=stocked)
+        return lot
+
+    def reorder_point(self, material: Material, supplier: Supplier, demand: float, reorder_point: float) -> None:
+        ReorderPoint.objects.create(company=self.company, material=material, supplier=supplier, weekly_demand=demand,
+                                    safety_stock=0, reorder_point=reorder_point, lead_time_days=7,
+                                    computed_at=timezone.now())
+
+    def test_suggest(self) -> None:
+        """
+        Test the quantities suggested for every material of a company.
+
+        Verifies:
+            - Stock, open receipts and the cover period set the quantity; expired lots do not count
+            - Materials above their reorder point are not ordered
+            - Quantities are raised to the supplier's minimum order quantity
+            - Suggestions that are no longer needed are removed
+        """
+        self.lot(self.timber, self.wood, remaining=40, stocked=30)
+        self.lot(self.timber, self.wood, remaining=500, stocked=500, days=-1)
+        self.lot(self.timber, self.tape, remaining=0, stocked=0)
+        self.lot(self.chemicals, self.glue, remaining=20, stocked=20)
+        self.reorder_point(self.wood, self.timber, demand=70, reorder_point=100)
+        self.reorder_point(self.tape, self.timber, demand=0.5, reorder_point=5)
+        self.reorder_point(self.glue, self.chemicals, demand=1, reorder_point=10)
+        self.reorder_point(self.steel, None, demand=1, reorder_point=2)
+
+        assert suggest(self.company.pk, cover_days=7) == 3
+        suggestions = {row.material_id: row for row in PurchaseSuggestion.objects.all()}
+        wood = suggestions[self.wood.pk]
+        assert (wood.supplier_id, wood.quantity, wood.on_hand, wood.open_receipts) == (self.timber.pk, 130, 30, 10)
+        assert suggestions[self.tape.pk].quantity == 50
+        assert (suggestions[self.steel.pk].supplier_id, suggestions[self.steel.pk].quantity) == (None, 3)
+
+        self.lot(self.timber, self.wood, remaining=200, stocked=0)
+        assert suggest(self.company.pk, cover_days=7) == 2
+        assert self.wood.pk not in set(PurchaseSuggestion.objects.values_list('material_id', flat=True))
+
+    def test_supplier_lead_time(self) -> None:
+        """
+        Test reorder points computed with the lead time of the material's supplier.
+
+        Verifies:
+            - The supplier of the latest lot is used
+            - Materials without a supplier lead time use the planning default
+        """
+        self.lot(self.chemicals, self.wood, remaining=1, stocked=0)
+        self.lot(self.timber, self.wood, remaining=1, stocked=0)
+        self.lot(self.chemicals, self.glue, remaining=1, stocked=0)
+        product = Product.objects.create(company=self.company, name='Chair', unit='pcs')
+        BillOfMaterials.objects.create(product=product, material=self.wood, quantity=1)
+        BillOfMaterials.objects.create(product=product, material=self.glue, quantity=1)
+        client = create_client(self.company)
+        start, _ = history_window(1)
+        order = Order.objects.create(company=self.company, client=client, status='Delivered')
+        Order.objects.filter(pk=order.pk).update(order_date=start + timedelta(hours=12))
+        ProductBatch.objects.create(warehouse=self.warehouse, product=product, order=order, ordered_quantity=7,
+                                    produced_quantity=7)
+
+        with self.settings(PLANNING={'HISTORY_WEEKS': 1, 'LEAD_TIME_DAYS': 21}):
+            plan(self.company.pk)
+        points = {row.material_id: row for row in ReorderPoint.objects.all()}
+        assert (points[self.wood.pk].supplier_id, points[self.wood.pk].lead_time_days) == (self.timber.pk, 7)
+        assert points[self.wood.pk].reorder_point == 7
+        assert (points[self.glue.pk].supplier_id, points[self.glue.pk].lead_time_days) == (self.chemicals.pk, 21)
+        assert points[self.glue.pk].reorder_point == 21
+
+    def test_endpoint(self) -> None:
+        """
+        Test listing the suggestions grouped by supplier.
+
+        Verifies:
+            - Every supplier is listed once with its lines and ordering terms
+            - Materials without a supplier are listed under an empty supplier
+        """
+        self.reorder_point(self.wood, self.timber, demand=70, reorder_point=100)
+        self.reorder_point(self.tape, self.timber, demand=0.5, reorder_point=5)
+        self.reorder_point(self.steel, None, demand=1, reorder_point=2)
+        suggest(self.company.pk, cover_days=7)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('planning:purchase-suggestion'))
+        assert response.status_code == 200
+        orders = {order['supplier']: order for order in response.json()}
+        assert set(orders) == {self.timber.pk, None}
+        timber = orders[self.timber.pk]
+        assert (timber['name'], timber['lead_time_days'], timber['minimum_order_quantity']) == ('Timber', 7, 50)
+        assert [(line['material_name'], line['quantity']) for line in timber['lines']] == [('Tape', 50), ('Wood', 170)]
+        assert [line['material'] for line in orders[None]['lines']] == [self.steel.pk]
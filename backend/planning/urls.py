@@ -0,0 +1,9 @@
+from . import views
+from django.urls import path
+
+app_name = 'planning'
+
+urlpatterns = [
+    path('reorder-point/', views.ReorderPointListView.as_view(), name='reorder-point'),
+    path('purchase-suggestion/', views.PurchaseSuggestionListView.as_view(), name='purchase-suggestion'),
+]
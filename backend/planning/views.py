@@ -0,0 +1,60 @@
+from rest_framework import generics
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from itertools import groupby
+from typing import Any
+from . import serializers, models
+
+
+class ReorderPointListView(generics.ListAPIView):
+    """View for the material reorder points of the user's company."""
+    serializer_class = serializers.ReorderPointSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3}
+
+    def get_queryset(self):
+        return models.ReorderPoint.objects.filter(company_id=self.request.user.company_id).order_by('material_id')
+
+    @swagger_auto_schema(
+        operation_description="Get the reorder points and safety stock of materials computed from the "
+                              "nightly demand forecast",
+        responses={200: serializers.ReorderPointSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+
+class PurchaseSuggestionListView(generics.ListAPIView):
+    """View for the purchase suggestions of the user's company, grouped by supplier."""
+    serializer_class = serializers.SupplierPurchaseSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3}
+
+    def get_queryset(self):
+        return (models.PurchaseSuggestion.objects
+                .filter(company_id=self.request.user.company_id)
+                .select_related('supplier', 'material')
+                .order_by('supplier__name', 'supplier_id', 'material__name'))
+
+    @swagger_auto_schema(
+        operation_description="Get the materials to order today, one entry per supplier. Refreshed nightly "
+                              "from the reorder points, stock and open receipts.",
+        responses={200: serializers.SupplierPurchaseSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        orders = []
+        for _, lines in groupby(self.get_queryset(), key=lambda line: line.supplier_id):
+            lines = list(lines)
+            supplier = lines[0].supplier
+            orders.append({
+                'supplier': supplier and supplier.pk,
+                'name': supplier and supplier.name,
+                'email': supplier and supplier.email,
+                'lead_time_days': supplier and supplier.lead_time_days,
+                'minimum_order_quantity': supplier and supplier.minimum_order_quantity,
+                'lines': lines,
+            })
+        return Response(self.get_serializer(orders, many=True).data)
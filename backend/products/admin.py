@@ -1,3 +1,102 @@
 from django.contrib import admin
+from wms.admin_utils import LargeTableAdmin
+from . import models
 
-# Register your models here.
+
+@admin.register(models.Material)
+class MaterialAdmin(admin.ModelAdmin):
+    list_display = ('name', 'unit', 'company')
+    list_select_related = ('company',)
+    autocomplete_fields = ('company',)
+    search_fields = ('name',)
+    show_full_result_count = False
+
+
+@admin.register(models.Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('name', 'unit', 'company')
+    list_select_related = ('company',)
+    autocomplete_fields = ('company',)
+    search_fields = ('name',)
+    show_full_result_count = False
+
+
+@admin.register(models.BillOfMaterials)
+class BillOfMaterialsAdmin(LargeTableAdmin):
+    list_display = ('product', 'material', 'quantity')
+    list_select_related = ('product', 'material')
+    autocomplete_fields = ('product', 'material')
+    search_fields = ('=product__name',)
+
+
+@admin.register(models.ProductComponent)
+class ProductComponentAdmin(admin.ModelAdmin):
+    list_display = ('parent', 'component', 'quantity')
+    list_select_related = ('parent', 'component')
+    autocomplete_fields = ('parent', 'component')
+    search_fields = ('=parent__name',)
+    show_full_result_count = False
+
+
+@admin.register(models.ProductClosure)
+class ProductClosureAdmin(LargeTableAdmin):
+    list_display = ('ancestor', 'descendant', 'quantity', 'paths')
+    list_select_related = ('ancestor', 'descendant')
+    search_fields = ('=ancestor__name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.Lot)
+class LotAdmin(LargeTableAdmin):
+    list_display = ('id', 'material', 'supplier', 'quantity_remaining', 'received', 'expiration')
+    list_filter = (('expiration', admin.DateFieldListFilter),)
+    list_select_related = ('material', 'supplier')
+    autocomplete_fields = ('material', 'supplier')
+    search_fields = ('=id',)
+    readonly_fields = ('version',)
+
+
+@admin.register(models.Inventory)
+class InventoryAdmin(LargeTableAdmin):
+    list_display = ('id', 'warehouse', 'lot', 'location', 'quantity')
+    list_filter = ('warehouse__name',)
+    list_select_related = ('warehouse__company', 'lot__material', 'location__warehouse')
+    autocomplete_fields = ('warehouse', 'lot', 'location')
+    search_fields = ('=lot__id',)
+    readonly_fields = ('version',)
+
+
+@admin.register(models.ProductBatch)
+class ProductBatchAdmin(LargeTableAdmin):
+    list_display = ('id', 'product', 'order', 'warehouse', 'ordered_quantity', 'produced_quantity')
+    list_filter = ('warehouse__name',)
+    list_select_related = ('product', 'order', 'warehouse__company')
+    autocomplete_fields = ('product', 'order', 'warehouse')
+    search_fields = ('=id', '=order__id')
+
+
+@admin.register(models.Batch)
+class BatchAdmin(LargeTableAdmin):
+    list_display = ('id', 'product_batch', 'lot', 'quantity')
+    list_select_related = (
+        'product_batch__product', 'product_batch__order', 'lot__material'
+    )
+    autocomplete_fields = ('product_batch', 'lot')
+    search_fields = ('=product_batch__id', '=lot__id')
+
+
+@admin.register(models.Item)
+class ItemAdmin(LargeTableAdmin):
+    list_display = ('serial_number', 'batch', 'operator', 'production_date')
+    list_filter = (('production_date', admin.DateFieldListFilter),)
+    list_select_related = ('batch__product', 'batch__order', 'operator')
+    autocomplete_fields = ('batch', 'operator')
+    search_fields = ('=serial_number',)
@@ -0,0 +1,151 @@
+"""
+Available-to-promise (ATP) quantities of products.
+
+The buildable quantity of a product is the minimum over its materials,
+exploded through all subassembly levels with the product closure (see
+``products.bom``), of ``floor(available / quantity per unit)``, where
+``available`` is the unexpired stock of the material in the company's Main
+and Production warehouses less what ``Batch`` allocations of unfinished
+product batches have reserved. The exploded material lines of all products
+of a company are read with their stock and reservations in one aggregated
+query and the minimum per product is taken with ``numpy.minimum.reduceat``.
+
+Results are cached per company under a version that is bumped by the
+``stock_changed`` signal, so a stock movement invalidates the cached result
+of its company only and a computation racing with it cannot store a stale one.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import receiver
+from django.utils import timezone
+from typing import Any, Dict, Iterable, Optional
+from monitoring import metrics
+from .models import BillOfMaterials, Batch, Inventory
+from .scheduling import PENDING_STATUSES
+from .signals import stock_changed
+import numpy as np
+
+STOCK_WAREHOUSES = ('Main', 'Production')
+TOLERANCE = 1e-9
+
+
+def version_key(company_id: int) -> str:
+    return f'atp:version:{company_id}'
+
+
+def result_key(company_id: int) -> str:
+    return f'atp:{company_id}'
+
+
+def compute(company_id: int) -> Dict[int, int]:
+    """
+    Compute the buildable quantity of every product of a company with a bill of materials.
+
+    Args:
+        company_id: Company whose products are computed
+
+    Returns:
+        Mapping of product id to the number of units that can be built
+    """
+    stock = (
+        Inventory.objects
+        .filter(
+            lot__material=OuterRef('material'),
+            warehouse__company_id=company_id,
+            warehouse__name__in=STOCK_WAREHOUSES,
+            lot__expiration__gt=timezone.now(),
+        )
+        .values('lot__material')
+        .annotate(total=Sum('quantity'))
+        .values('total')
+    )
+    reserved = (
+        Batch.objects
+        .filter(
+            lot__material=OuterRef('material'),
+            product_batch__warehouse__company_id=company_id,
+            product_batch__order__status__in=PENDING_STATUSES,
+            product_batch__ordered_quantity__gt=F('product_batch__produced_quantity'),
+        )
+        .values('lot__material')
+        .annotate(total=Sum('quantity'))
+        .values('total')
+    )
+    ancestor = 'product__closure_ancestors__ancestor_id'
+    queryset = (
+        BillOfMaterials.objects
+        .filter(product__company_id=company_id, quantity__gt=0)
+        .values(ancestor, 'material')
+        .annotate(per_unit=Sum(F('quantity') * F('product__closure_ancestors__quantity')))
+        .order_by(ancestor)
+        .values_list(
+            ancestor, 'per_unit',
+            Coalesce(Subquery(stock), Value(0.0), output_field=FloatField()),
+            Coalesce(Subquery(reserved), Value(0.0), output_field=FloatField()),
+        )
+    )
+    # Products loaded without their closure row have no ancestor.
+    rows = [row for row in queryset if row[0] is not None]
+    if not rows:
+        return {}
+
+    product_ids, per_unit, on_hand, allocated = (np.array(column) for column in zip(*rows))
+    buildable = np.floor(np.maximum(on_hand - allocated, 0) / per_unit + TOLERANCE)
+    starts = np.flatnonzero(np.r_[True, product_ids[1:] != product_ids[:-1]])
+    quantities = np.minimum.reduceat(buildable, starts)
+    return dict(zip(product_ids[starts].tolist(), quantities.astype(np.int64).tolist()))
+
+
+def available_to_promise(company_id: int, product_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+    """
+    Get cached buildable quantities of a company's products.
+
+    Args:
+        company_id: Company of the products
+        product_ids: Products to return, all products with a bill of materials by default
+
+    Returns:
+        Mapping of product id to the number of units that can be built;
+        products without a bill of materials are omitted
+    """
+    version = cache.get_or_set(version_key(company_id), 1, timeout=None)
+    quantities = cache.get(result_key(company_id), version=version)
+    metrics.record_cache_lookup('atp', hit=quantities is not None)
+    if quantities is None:
+        quantities = compute(company_id)
+        cache.set(result_key(company_id), quantities, settings.ATP_CACHE_TIMEOUT, version=version)
+    if product_ids is None:
+        return quantities
+    return {pk: quantities[pk] for pk in product_ids if pk in quantities}
+
+
+def invalidate(company_id: Optional[int]) -> None:
+    """
+    Discard cached quantities of a company.
+
+    The version is bumped again when the surrounding transaction commits, so
+    that a result computed from the pre-commit state in the meantime is
+    discarded too.
+    """
+    if company_id is None:
+        return
+    _bump_version(company_id)
+    if not transaction.get_autocommit():
+        transaction.on_commit(lambda: _bump_version(company_id))
+
+
+def _bump_version(company_id: int) -> None:
+    try:
+        cache.incr(version_key(company_id))
+    except ValueError:
+        # Nothing has been cached for the company yet.
+        pass
+
+
+@receiver(stock_changed, dispatch_uid='atp_invalidate')
+def stock_changed_handler(sender: Any, company_id: Optional[int] = None, **kwargs: Any) -> None:
+    invalidate(company_id)
@@ -0,0 +1,182 @@
+"""
+Multi-level bills of materials.
+
+Products are composed of materials (``BillOfMaterials``) and of other
+products (``ProductComponent``). ``ProductClosure`` keeps the transitive
+closure of the component graph with the total quantity of every descendant
+per unit of its ancestor, so a full explosion is one indexed lookup on
+``ancestor`` joined with ``BillOfMaterials``.
+
+Because quantities along a path multiply and quantities of parallel paths
+add up, adding the edge ``parent -> component`` with quantity ``q`` changes
+the closure by ``Q(a, parent) * q * Q(component, d)`` for every ancestor
+``a`` of the parent and every descendant ``d`` of the component, both
+including the product itself. Removing the edge subtracts the same amount
+and changing its quantity applies the difference, so every change touches
+only the affected rows. The component graph stays acyclic: an edge is
+rejected when the parent is already a descendant of the component.
+
+Structure changes of a company are serialized by locking its row. Queryset
+``update``/``delete`` and ``bulk_create`` of ``ProductComponent`` bypass the
+closure maintenance; use ``save``/``delete`` of single rows.
+"""
+
+from collections import namedtuple
+from django.core.exceptions import ValidationError
+from django.db.models import F, Sum
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from typing import Any, Dict, Optional
+from users.models import Company
+from .models import BillOfMaterials, Product, ProductClosure, ProductComponent
+from .signals import product_company_id, stock_changed
+
+Edge = namedtuple('Edge', ['parent_id', 'component_id', 'quantity'])
+
+
+def would_create_cycle(parent_id: int, component_id: int) -> bool:
+    """Check whether ``parent -> component`` closes a cycle."""
+    return parent_id == component_id or ProductClosure.objects.filter(
+        ancestor_id=component_id, descendant_id=parent_id
+    ).exists()
+
+
+def prepare_component_change(component: ProductComponent, deleting: bool = False) -> Optional[Edge]:
+    """
+    Lock the company's structure and validate a component row before it is written.
+
+    Args:
+        component: Row about to be saved or deleted
+        deleting: Whether the row is being deleted
+
+    Returns:
+        The stored edge the row replaces, if any
+
+    Raises:
+        ValidationError: If the products belong to different companies or
+            the new edge would create a cycle
+    """
+    fields = (ProductComponent.parent.field, ProductComponent.component.field)
+    if all(field.is_cached(component) for field in fields):
+        companies = {component.parent_id: component.parent.company_id,
+                     component.component_id: component.component.company_id}
+    else:
+        companies = dict(
+            Product.objects.filter(pk__in=[component.parent_id, component.component_id])
+            .values_list('pk', 'company_id')
+        )
+    company_id = companies.get(component.parent_id)
+    list(Company.objects.select_for_update().filter(pk=company_id).values_list('pk'))
+
+    previous = None
+    if component.pk is not None:
+        previous = (
+            ProductComponent.objects.filter(pk=component.pk)
+            .values_list('parent_id', 'component_id', 'quantity').first()
+        )
+        previous = previous and Edge(*previous)
+    if deleting:
+        return previous
+
+    if companies.get(component.component_id) != company_id:
+        raise ValidationError('A component must belong to the same company as its parent.')
+    unchanged = previous is not None and previous[:2] == (component.parent_id, component.component_id)
+    if not unchanged and would_create_cycle(component.parent_id, component.component_id):
+        raise ValidationError(f'Product {component.component_id} already contains product {component.parent_id}.')
+    return previous
+
+
+def apply_component_change(previous: Optional[Edge], current: Optional[ProductComponent]) -> None:
+    """Update the closure after a component row was saved or deleted."""
+    if previous and current and previous[:2] == (current.parent_id, current.component_id):
+        if previous.quantity != current.quantity:
+            update_closure(current.parent_id, current.component_id, current.quantity - previous.quantity, 0)
+    else:
+        if previous:
+            update_closure(previous.parent_id, previous.component_id, -previous.quantity, -1)
+        if current:
+            update_closure(current.parent_id, current.component_id, current.quantity, 1)
+    product_id = current.parent_id if current else previous and previous.parent_id
+    if product_id:
+        stock_changed.send(sender=ProductComponent, company_id=product_company_id(product_id))
+
+
+def update_closure(parent_id: int, component_id: int, quantity: float, paths: int) -> None:
+    """
+    Add (or with negative arguments remove) the paths through ``parent -> component``.
+
+    Args:
+        parent_id: Parent product of the edge
+        component_id: Component product of the edge
+        quantity: Change of the edge quantity
+        paths: Change of the number of edges between the two products (-1, 0 or 1)
+    """
+    ancestors = {parent_id: (1.0, 1)}
+    ancestors.update(
+        (pk, (q, n)) for pk, q, n in
+        ProductClosure.objects.filter(descendant_id=parent_id).values_list('ancestor_id', 'quantity', 'paths')
+    )
+    descendants = {component_id: (1.0, 1)}
+    descendants.update(
+        (pk, (q, n)) for pk, q, n in
+        ProductClosure.objects.filter(ancestor_id=component_id).values_list('descendant_id', 'quantity', 'paths')
+    )
+    existing = {
+        (row.ancestor_id, row.descendant_id): row
+        for row in ProductClosure.objects.filter(ancestor_id__in=ancestors, descendant_id__in=descendants)
+    }
+
+    created, changed, removed = [], [], []
+    for ancestor_id, (ancestor_quantity, ancestor_paths) in ancestors.items():
+        for descendant_id, (descendant_quantity, descendant_paths) in descendants.items():
+            quantity_delta = ancestor_quantity * quantity * descendant_quantity
+            paths_delta = ancestor_paths * paths * descendant_paths
+            row = existing.get((ancestor_id, descendant_id))
+            if row is None:
+                created.append(ProductClosure(ancestor_id=ancestor_id, descendant_id=descendant_id,
+                                              quantity=quantity_delta, paths=paths_delta))
+            elif row.paths + paths_delta <= 0:
+                removed.append(row.pk)
+            else:
+                row.quantity += quantity_delta
+                row.paths += paths_delta
+                changed.append(row)
+
+    ProductClosure.objects.bulk_create(created)
+    ProductClosure.objects.bulk_update(changed, ['quantity', 'paths'])
+    if removed:
+        ProductClosure.objects.filter(pk__in=removed).delete()
+
+
+def explode(product_id: int) -> Dict[int, float]:
+    """
+    Get the total quantity of every material in one unit of a product across all levels.
+
+    Args:
+        product_id: Exploded product
+
+    Returns:
+        Mapping of material id to quantity
+    """
+    rows = (
+        BillOfMaterials.objects
+        .filter(product__closure_ancestors__ancestor_id=product_id)
+        .values('material_id')
+        .annotate(total=Sum(F('quantity') * F('product__closure_ancestors__quantity')))
+        .values_list('material_id', 'total')
+    )
+    return dict(rows)
+
+
+@receiver(post_save, sender=Product, dispatch_uid='product_closure_self')
+def create_self_closure(sender: Any, instance: Product, created: bool, **kwargs: Any) -> None:
+    if created:
+        ProductClosure.objects.create(ancestor=instance, descendant=instance, quantity=1, paths=1)
+
+
+@receiver(pre_delete, sender=Product, dispatch_uid='product_closure_delete')
+def remove_product_edges(sender: Any, instance: Product, **kwargs: Any) -> None:
+    # Paths through the product must go before the cascade removes its edges.
+    edges = ProductComponent.objects.filter(parent=instance) | ProductComponent.objects.filter(component=instance)
+    for parent_id, component_id, quantity in edges.values_list('parent_id', 'component_id', 'quantity'):
+        update_closure(parent_id, component_id, -quantity, -1)
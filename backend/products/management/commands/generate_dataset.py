@@ -0,0 +1,413 @@
+import io
+import time
+from typing import Any, Dict, Iterable, List, Type
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandParser
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+from users.models import Company, CustomUser, UserGroups
+from warehouse.models import Warehouse, Location
+from suppliers.models import Supplier
+from clients.models import Client
+from orders.models import Order
+from products.signals import stock_changed
+from products.models import (
+    Material, Product, ProductClosure, BillOfMaterials, Lot, Inventory, ProductBatch, Batch, Item
+)
+
+WAREHOUSE_NAMES = [name for name, _ in Warehouse.NAME_CHOICES]
+BINS_PER_AISLE = 25
+ORDER_STATUSES = np.array([status for status, _ in Order.STATUS_CHOICES])
+ORDER_STATUS_WEIGHTS = np.array([0.05, 0.15, 0.15, 0.6, 0.05])
+DAY = np.timedelta64(1, 'D')
+
+
+def format_datetimes(values: np.ndarray) -> List[str]:
+    """Render UTC ``datetime64`` values the way the database backend expects them."""
+    text = np.datetime_as_string(values.astype('datetime64[s]'), unit='s')
+    suffix = '+00:00' if connection.vendor == 'postgresql' else ''
+    return [f'{value.replace("T", " ")}{suffix}' for value in text]
+
+
+class Loader:
+    """
+    Loads column arrays into tables with explicitly allocated primary keys.
+
+    Rows are written with COPY on PostgreSQL and with a batched multi-row
+    INSERT elsewhere. Primary keys are allocated up front so that child tables
+    can reference parents without reading ids back from the database.
+    """
+
+    def __init__(self, chunk_size: int) -> None:
+        self.chunk_size = chunk_size
+        self.counts: Dict[str, int] = {}
+        self._next_id: Dict[Type[models.Model], int] = {}
+
+    def allocate(self, model: Type[models.Model], count: int) -> np.ndarray:
+        """Reserve ``count`` consecutive primary keys for ``model``."""
+        if model not in self._next_id:
+            current = model.objects.aggregate(max_id=Max('pk'))['max_id'] or 0
+            self._next_id[model] = current + 1
+        start = self._next_id[model]
+        self._next_id[model] = start + count
+        return np.arange(start, start + count, dtype=np.int64)
+
+    def load(self, model: Type[models.Model], columns: Dict[str, Any]) -> None:
+        """
+        Insert rows given as a mapping of field name to an array of values.
+
+        Args:
+            model: Model whose table is loaded
+            columns: Field names (``company_id`` style for foreign keys) mapped
+                to equally long arrays
+        """
+        names = [model._meta.get_field(name.removesuffix('_id')).column
+                 if name.endswith('_id') else model._meta.get_field(name).column
+                 for name in columns]
+        arrays = [self._prepare(values) for values in columns.values()]
+        total = len(arrays[0])
+        for start in range(0, total, self.chunk_size):
+            rows = zip(*(array[start:start + self.chunk_size] for array in arrays))
+            if connection.vendor == 'postgresql':
+                self._copy(model._meta.db_table, names, rows)
+            else:
+                self._insert(model._meta.db_table, names, rows)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + total
+
+    def reset_sequences(self) -> None:
+        """Move the primary key sequences past the explicitly inserted ids."""
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self._next_id))
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def _prepare(self, values: Any) -> List[Any]:
+        if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+            return format_datetimes(values)
+        if isinstance(values, np.ndarray):
+            return values.tolist()
+        return list(values)
+
+    def _copy(self, table: str, names: List[str], rows: Iterable[tuple]) -> None:
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(self._copy_value(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f'COPY "{table}" ({", ".join(names)}) FROM STDIN', buffer
+            )
+
+    @staticmethod
+    def _copy_value(value: Any) -> str:
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        return str(value)
+
+    def _insert(self, table: str, names: List[str], rows: Iterable[tuple]) -> None:
+        rows = list(rows)
+        if not rows:
+            return
+        # Stay below the bound parameter limit of the backend.
+        max_rows = max(1, 900 // len(names))
+        placeholders = f'({", ".join(["%s"] * len(names))})'
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), max_rows):
+                batch = rows[start:start + max_rows]
+                cursor.execute(
+                    f'INSERT INTO "{table}" ({", ".join(names)}) VALUES '
+                    + ', '.join([placeholders] * len(batch)),
+                    [value for row in batch for value in row],
+                )
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset for benchmarking and capacity planning.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Multiplier applied to every per-company count.')
+        parser.add_argument('--companies', type=int, default=1)
+        parser.add_argument('--users', type=int, default=10, help='Users per company.')
+        parser.add_argument('--suppliers', type=int, default=20, help='Suppliers per company.')
+        parser.add_argument('--clients', type=int, default=50, help='Clients per company.')
+        parser.add_argument('--materials', type=int, default=1000, help='Materials per company.')
+        parser.add_argument('--products', type=int, default=500, help='Products per company.')
+        parser.add_argument('--bom-lines', type=int, default=5, help='Materials per product.')
+        parser.add_argument('--lots', type=int, default=20, help='Lots per material.')
+        parser.add_argument('--orders', type=int, default=2000, help='Orders per company.')
+        parser.add_argument('--batches', type=int, default=2, help='Product batches per order.')
+        parser.add_argument('--allocations', type=int, default=3, help='Lot allocations per product batch.')
+        parser.add_argument('--items', type=int, default=20, help='Maximum items per product batch.')
+        parser.add_argument('--locations', type=int, default=500,
+                            help='Bin locations in the main warehouse, 0 leaves inventory unlocated.')
+        parser.add_argument('--history-days', type=int, default=730,
+                            help='How far back orders and lots are spread.')
+        parser.add_argument('--chunk-size', type=int, default=100_000,
+                            help='Number of rows written per COPY/INSERT round trip.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.rng = np.random.default_rng(options['seed'])
+        self.options = options
+        self.loader = Loader(options['chunk_size'])
+        self.now = np.datetime64(timezone.now().replace(tzinfo=None), 's')
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            company_ids = [self.generate_company() for _ in range(options['companies'])]
+            self.loader.reset_sequences()
+        for company_id in company_ids:
+            stock_changed.send(sender=self.__class__, company_id=company_id)
+
+        elapsed = time.perf_counter() - started
+        for model, count in self.loader.counts.items():
+            self.stdout.write(f'{model}: {count}')
+        total = sum(self.loader.counts.values())
+        self.stdout.write(self.style.SUCCESS(f'Generated {total} rows in {elapsed:.1f}s'))
+
+    def scaled(self, name: str) -> int:
+        return max(1, int(self.options[name] * self.options['scale']))
+
+    def random_dates(self, count: int, days_back: int, days_forward: int = 0) -> np.ndarray:
+        offsets = self.rng.integers(-days_back * 86400, days_forward * 86400 + 1, count)
+        return self.now + offsets.astype('timedelta64[s]')
+
+    def generate_company(self) -> int:
+        load, allocate, rng = self.loader.load, self.loader.allocate, self.rng
+
+        company_id = int(allocate(Company, 1)[0])
+        load(Company, {
+            'id': [company_id],
+            'name': [f'Dataset company {company_id}'],
+            'domain': [f'https://company-{company_id}.example.com'],
+            'email': [f'company-{company_id}@example.com'],
+            'is_active': [True],
+            'created_at': np.array([self.now]),
+            'expiration_date': [str((self.now + 365 * DAY).astype('datetime64[D]'))],
+        })
+
+        def company_ids(count: int) -> np.ndarray:
+            return np.full(count, company_id, dtype=np.int64)
+
+        n_users = self.scaled('users')
+        user_ids = allocate(CustomUser, n_users)
+        roles = np.array([str(group) for group in UserGroups])
+        load(CustomUser, {
+            'id': user_ids,
+            'password': [make_password('password')] * n_users,
+            'is_superuser': [False] * n_users,
+            'username': [f'user-{user_id}' for user_id in user_ids],
+            'first_name': [''] * n_users,
+            'last_name': [''] * n_users,
+            'email': [f'user-{user_id}@company-{company_id}.example.com' for user_id in user_ids],
+            'is_staff': [False] * n_users,
+            'is_active': [True] * n_users,
+            'date_joined': np.full(n_users, self.now),
+            'company_id': company_ids(n_users),
+            'role': np.concatenate([roles[:1], rng.choice(roles, n_users - 1)]),
+        })
+
+        warehouse_ids = allocate(Warehouse, len(WAREHOUSE_NAMES))
+        load(Warehouse, {
+            'id': warehouse_ids,
+            'company_id': company_ids(len(WAREHOUSE_NAMES)),
+            'name': WAREHOUSE_NAMES,
+        })
+        main_warehouse, production_warehouse = warehouse_ids[0], warehouse_ids[1]
+
+        # Derived from the ids so that the random stream of the rest of the dataset is unchanged.
+        supplier_ids = self.generate_contacts(
+            Supplier, company_id, self.scaled('suppliers'),
+            lead_time_days=lambda ids: 3 + ids % 28,
+            minimum_order_quantity=lambda ids: (ids % 4) * 25.0,
+        )
+        client_ids = self.generate_contacts(Client, company_id, self.scaled('clients'))
+
+        n_materials = self.scaled('materials')
+        material_ids = allocate(Material, n_materials)
+        load(Material, {
+            'id': material_ids,
+            'company_id': company_ids(n_materials),
+            'name': [f'Material {material_id}' for material_id in material_ids],
+            'unit': rng.choice(['kg', 'l', 'm', 'pcs'], n_materials),
+        })
+
+        n_products = self.scaled('products')
+        product_ids = allocate(Product, n_products)
+        load(Product, {
+            'id': product_ids,
+            'company_id': company_ids(n_products),
+            'name': [f'Product {product_id}' for product_id in product_ids],
+            'unit': np.full(n_products, 'pcs'),
+            'production_rate': rng.uniform(1, 50, n_products).round(1),
+        })
+        load(ProductClosure, {
+            'id': allocate(ProductClosure, n_products),
+            'ancestor_id': product_ids,
+            'descendant_id': product_ids,
+            'quantity': np.ones(n_products),
+            'paths': np.ones(n_products, dtype=np.int64),
+        })
+
+        # Consecutive offsets from a random start keep the materials of a
+        # product distinct without a per-product sampling loop.
+        bom_lines = min(self.options['bom_lines'], n_materials)
+        starts = rng.integers(0, n_materials, n_products)
+        offsets = (starts[:, None] + np.arange(bom_lines)[None, :]) % n_materials
+        load(BillOfMaterials, {
+            'id': allocate(BillOfMaterials, n_products * bom_lines),
+            'product_id': np.repeat(product_ids, bom_lines),
+            'material_id': material_ids[offsets.ravel()],
+            'quantity': np.round(rng.uniform(0.1, 10, n_products * bom_lines), 3),
+        })
+
+        n_lots = n_materials * self.options['lots']
+        lot_ids = allocate(Lot, n_lots)
+        received = rng.uniform(100, 10_000, n_lots).round(2)
+        remaining = (received * rng.uniform(0, 1, n_lots)).round(2)
+        received_dates = self.random_dates(n_lots, self.options['history_days'])
+        load(Lot, {
+            'id': lot_ids,
+            'supplier_id': rng.choice(supplier_ids, n_lots),
+            'material_id': np.repeat(material_ids, self.options['lots']),
+            'quantity_received': received,
+            'quantity_remaining': remaining,
+            'received': received_dates,
+            'expiration': received_dates + rng.integers(30, 720, n_lots) * DAY,
+            'version': np.zeros(n_lots, dtype=np.int64),
+        })
+
+        # Every lot is stocked in the main warehouse, a fifth of them is
+        # partially moved to production.
+        in_production = rng.random(n_lots) < 0.2
+        moved = (remaining * rng.uniform(0, 0.5, n_lots)).round(2)
+        location_ids = self.generate_locations(main_warehouse)
+        bins = rng.choice(location_ids, n_lots).tolist() if len(location_ids) else [None] * n_lots
+        load(Inventory, {
+            'id': allocate(Inventory, n_lots + int(in_production.sum())),
+            'warehouse_id': np.concatenate([
+                np.full(n_lots, main_warehouse),
+                np.full(int(in_production.sum()), production_warehouse),
+            ]),
+            'lot_id': np.concatenate([lot_ids, lot_ids[in_production]]),
+            'quantity': np.concatenate([
+                np.where(in_production, remaining - moved, remaining),
+                moved[in_production],
+            ]),
+            'location_id': bins + [None] * int(in_production.sum()),
+            'version': np.zeros(n_lots + int(in_production.sum()), dtype=np.int64),
+        })
+
+        self.generate_orders(company_id, client_ids, product_ids, lot_ids,
+                             user_ids, production_warehouse)
+        return company_id
+
+    def generate_locations(self, warehouse_id: int) -> np.ndarray:
+        """Load a depot and a grid of bins, ``BINS_PER_AISLE`` deep, and return the bin ids."""
+        if self.options['locations'] <= 0:
+            return np.array([], dtype=np.int64)
+        n_bins = self.scaled('locations')
+        ids = self.loader.allocate(Location, n_bins + 1)
+        aisles, racks = np.divmod(np.arange(n_bins), BINS_PER_AISLE)
+        self.loader.load(Location, {
+            'id': ids,
+            'warehouse_id': np.full(n_bins + 1, warehouse_id),
+            'code': ['DEPOT'] + [f'{aisle:02d}-{rack + 1:02d}' for aisle, rack in zip(aisles, racks)],
+            'aisle': [''] + [f'{aisle:02d}' for aisle in aisles],
+            'rack': np.r_[0, racks + 1],
+            'level': np.zeros(n_bins + 1, dtype=np.int64),
+            'x': np.r_[0.0, 1.0 + 3.0 * aisles],
+            'y': np.r_[0.0, 1.5 * (racks + 1)],
+            'is_depot': [True] + [False] * n_bins,
+        })
+        return ids[1:]
+
+    def generate_contacts(self, model: Type[models.Model], company_id: int, count: int,
+                          **extra: Any) -> np.ndarray:
+        ids = self.loader.allocate(model, count)
+        prefix = model.__name__.lower()
+        self.loader.load(model, {
+            'id': ids,
+            'company_id': np.full(count, company_id),
+            'name': [f'{model.__name__} {pk}' for pk in ids],
+            'address': [f'Street {pk}' for pk in ids],
+            'phone': [f'+48{pk:09d}' for pk in ids],
+            'email': [f'{prefix}-{pk}@example.com' for pk in ids],
+            'website': [f'https://{prefix}-{pk}.example.com' for pk in ids],
+            **{name: column(ids) for name, column in extra.items()},
+        })
+        return ids
+
+    def generate_orders(self, company_id: int, client_ids: np.ndarray, product_ids: np.ndarray,
+                        lot_ids: np.ndarray, user_ids: np.ndarray,
+                        production_warehouse: int) -> None:
+        load, allocate, rng, options = self.loader.load, self.loader.allocate, self.rng, self.options
+
+        n_orders = self.scaled('orders')
+        order_ids = allocate(Order, n_orders)
+        statuses = rng.choice(ORDER_STATUSES, n_orders, p=ORDER_STATUS_WEIGHTS)
+        order_dates = self.random_dates(n_orders, options['history_days'])
+        shipped = np.isin(statuses, ['Shipped', 'Delivered'])
+        delivered = statuses == 'Delivered'
+        shipped_dates = order_dates + rng.integers(1, 14, n_orders) * DAY
+        delivered_dates = shipped_dates + rng.integers(1, 7, n_orders) * DAY
+        load(Order, {
+            'id': order_ids,
+            'company_id': np.full(n_orders, company_id),
+            'status': statuses,
+            'order_date': order_dates,
+            'shipped_date': self.optional_dates(shipped_dates, shipped),
+            'delivered_date': self.optional_dates(delivered_dates, delivered),
+            'due_date': order_dates + rng.integers(3, 30, n_orders) * DAY,
+            'client_id': rng.choice(client_ids, n_orders),
+        })
+
+        per_order = options['batches']
+        n_batches = n_orders * per_order
+        batch_ids = allocate(ProductBatch, n_batches)
+        ordered = rng.integers(1, options['items'] + 1, n_batches)
+        done = np.repeat(shipped, per_order)
+        produced = np.where(done, ordered, (ordered * rng.random(n_batches)).astype(np.int64))
+        load(ProductBatch, {
+            'id': batch_ids,
+            'warehouse_id': np.full(n_batches, production_warehouse),
+            'product_id': rng.choice(product_ids, n_batches),
+            'order_id': np.repeat(order_ids, per_order),
+            'ordered_quantity': ordered.astype(float),
+            'produced_quantity': produced.astype(float),
+        })
+
+        allocations = min(options['allocations'], len(lot_ids))
+        starts = rng.integers(0, len(lot_ids), n_batches)
+        offsets = (starts[:, None] + np.arange(allocations)[None, :]) % len(lot_ids)
+        load(Batch, {
+            'id': allocate(Batch, n_batches * allocations),
+            'product_batch_id': np.repeat(batch_ids, allocations),
+            'lot_id': lot_ids[offsets.ravel()],
+            'quantity': rng.uniform(1, 50, n_batches * allocations).round(3),
+            'created_at': np.repeat(order_dates, per_order * allocations),
+        })
+
+        n_items = int(produced.sum())
+        item_ids = allocate(Item, n_items)
+        item_batches = np.repeat(batch_ids, produced)
+        load(Item, {
+            'id': item_ids,
+            'serial_number': [f'SN{item_id:012d}' for item_id in item_ids],
+            'batch_id': item_batches,
+            'operator_id': rng.choice(user_ids, n_items),
+            'production_date': np.repeat(order_dates, per_order)[np.searchsorted(batch_ids, item_batches)]
+            + rng.integers(0, 86400, n_items).astype('timedelta64[s]'),
+        })
+
+    @staticmethod
+    def optional_dates(dates: np.ndarray, mask: np.ndarray) -> List[Any]:
+        return [value if present else None
+                for value, present in zip(format_datetimes(dates), mask)]
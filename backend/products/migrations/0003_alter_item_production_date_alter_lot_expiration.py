@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-19 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_alter_material_name_alter_material_unit_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='item',
+            name='production_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='lot',
+            name='expiration',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
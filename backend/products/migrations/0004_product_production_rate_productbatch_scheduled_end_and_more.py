@@ -0,0 +1,29 @@
+# Generated by Django 5.1 on 2026-10-19 10:43
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_alter_item_production_date_alter_lot_expiration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='production_rate',
+            field=models.FloatField(default=1, validators=[django.core.validators.MinValueValidator(0.001)], verbose_name='Units Produced per Hour'),
+        ),
+        migrations.AddField(
+            model_name='productbatch',
+            name='scheduled_end',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='productbatch',
+            name='scheduled_start',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
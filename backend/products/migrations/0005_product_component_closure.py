@@ -0,0 +1,55 @@
+# Generated by Django 5.1 on 2026-10-19 10:54
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_self_closures(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    ProductClosure = apps.get_model('products', 'ProductClosure')
+    ProductClosure.objects.bulk_create(
+        (ProductClosure(ancestor_id=pk, descendant_id=pk, quantity=1, paths=1)
+         for pk in Product.objects.values_list('pk', flat=True).iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_production_rate_productbatch_scheduled_end_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.FloatField()),
+                ('paths', models.PositiveIntegerField(default=1)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_descendants', to='products.product')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_ancestors', to='products.product')),
+            ],
+            options={
+                'db_table': 'product_closure',
+                'indexes': [models.Index(fields=['descendant', 'ancestor'], name='product_clo_descend_b0b6d6_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductComponent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.FloatField(validators=[django.core.validators.MinValueValidator(0)], verbose_name='Units per Parent Unit')),
+                ('component', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='used_in', to='products.product')),
+                ('parent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='components', to='products.product')),
+            ],
+            options={
+                'db_table': 'product_component',
+                'constraints': [models.CheckConstraint(condition=models.Q(('parent', models.F('component')), _negated=True), name='component_not_parent')],
+                'unique_together': {('parent', 'component')},
+            },
+        ),
+        migrations.RunPython(create_self_closures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_component_closure'),
+        ('warehouse', '0002_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='warehouse.location'),
+        ),
+    ]
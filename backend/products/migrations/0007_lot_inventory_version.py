@@ -0,0 +1,37 @@
+# Generated by Django 5.1 on 2026-10-19 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_inventory_location'),
+        ('suppliers', '0001_initial'),
+        ('warehouse', '0003_wave'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented by every quantity update'),
+        ),
+        migrations.AddField(
+            model_name='lot',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented by every quantity update'),
+        ),
+        migrations.AddConstraint(
+            model_name='inventory',
+            constraint=models.CheckConstraint(condition=models.Q(('quantity__gte', 0)), name='inventory_quantity_non_negative'),
+        ),
+        migrations.AddConstraint(
+            model_name='lot',
+            constraint=models.CheckConstraint(condition=models.Q(('quantity_received__gte', 0)), name='lot_received_non_negative'),
+        ),
+        migrations.AddConstraint(
+            model_name='lot',
+            constraint=models.CheckConstraint(condition=models.Q(('quantity_remaining__gte', 0)), name='lot_remaining_non_negative'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-19 14:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_lot_inventory_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batch',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -1,9 +1,11 @@
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from users.models import CustomUser, Company
-from warehouse.models import Warehouse
+from warehouse.models import Warehouse, Location
 from suppliers.models import Supplier
 from orders.models import Order
-from django.db import models
+from django.db import models, transaction
+from wms.models import SnapshotMixin, VersionedMixin
 
 
 class Material(models.Model):
@@ -22,6 +24,9 @@ class Product(models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
     name = models.CharField(max_length=100, unique=True, verbose_name="Product Name")
     unit = models.CharField(max_length=20, verbose_name="Unit of Measure")
+    production_rate = models.FloatField(
+        default=1, validators=[MinValueValidator(0.001)], verbose_name="Units Produced per Hour"
+    )
 
     def __str__(self):
         return f'Product: {self.name}'
@@ -43,25 +48,95 @@ class BillOfMaterials(models.Model):
         unique_together = ('product', 'material')
 
 
-class Lot(models.Model):
+class ProductComponent(models.Model):
+    """A product used as a subassembly of another product."""
+    parent = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='components')
+    component = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='used_in')
+    quantity = models.FloatField(validators=[MinValueValidator(0)], verbose_name="Units per Parent Unit")
+
+    def __str__(self):
+        return f'Component: {self.parent} - {self.component} - {self.quantity}'
+
+    def clean(self):
+        from . import bom
+        if self.parent_id and self.component_id and bom.would_create_cycle(self.parent_id, self.component_id):
+            raise ValidationError({'component': 'The component already contains the parent product.'})
+
+    def save(self, *args, **kwargs):
+        from . import bom
+        with transaction.atomic():
+            previous = bom.prepare_component_change(self)
+            super().save(*args, **kwargs)
+            bom.apply_component_change(previous, self)
+
+    def delete(self, *args, **kwargs):
+        from . import bom
+        with transaction.atomic():
+            previous = bom.prepare_component_change(self, deleting=True)
+            result = super().delete(*args, **kwargs)
+            bom.apply_component_change(previous, None)
+        return result
+
+    class Meta:
+        db_table = 'product_component'
+        unique_together = ('parent', 'component')
+        constraints = [
+            models.CheckConstraint(condition=~models.Q(parent=models.F('component')), name='component_not_parent'),
+        ]
+
+
+class ProductClosure(models.Model):
+    """
+    Transitive closure of ``ProductComponent``, maintained by ``products.bom``.
+
+    Every product has a row with itself (quantity 1). ``quantity`` is the
+    total number of ``descendant`` units in one ``ancestor`` unit summed over
+    all paths and ``paths`` is the number of those paths.
+    """
+    ancestor = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='closure_descendants')
+    descendant = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='closure_ancestors')
+    quantity = models.FloatField()
+    paths = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f'Closure: {self.ancestor} - {self.descendant} - {self.quantity}'
+
+    class Meta:
+        db_table = 'product_closure'
+        unique_together = ('ancestor', 'descendant')
+        indexes = [models.Index(fields=['descendant', 'ancestor'])]
+
+
+class Lot(VersionedMixin, models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE)
     material = models.ForeignKey(Material, on_delete=models.CASCADE)
     quantity_received = models.FloatField(validators=[MinValueValidator(0)])
     quantity_remaining = models.FloatField(validators=[MinValueValidator(0)])
     received = models.DateTimeField(auto_now_add=True)
-    expiration = models.DateTimeField()
+    expiration = models.DateTimeField(db_index=True)
+    version = models.PositiveIntegerField(default=0, help_text="Incremented by every quantity update")
+    snapshot_fields = ('supplier_id', 'material_id', 'quantity_received', 'quantity_remaining', 'expiration')
+    versioned_fields = ('quantity_remaining',)
 
     def __str__(self):
         return f'Lot: {self.material} - {self.quantity_remaining}'
 
     class Meta:
         db_table = 'lot'
+        constraints = [
+            models.CheckConstraint(condition=models.Q(quantity_received__gte=0), name='lot_received_non_negative'),
+            models.CheckConstraint(condition=models.Q(quantity_remaining__gte=0), name='lot_remaining_non_negative'),
+        ]
 
 
-class Inventory(models.Model):
+class Inventory(VersionedMixin, models.Model):
     warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE)
     lot = models.ForeignKey(Lot, on_delete=models.CASCADE)
+    location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True)
     quantity = models.FloatField(validators=[MinValueValidator(0)])
+    version = models.PositiveIntegerField(default=0, help_text="Incremented by every quantity update")
+    snapshot_fields = ('warehouse_id', 'lot_id', 'location_id', 'quantity')
+    versioned_fields = ('quantity',)
 
     def __str__(self):
         return f'Inventory: {self.warehouse} - {self.lot} - {self.quantity}'
@@ -69,6 +144,9 @@ class Inventory(models.Model):
     class Meta:
         db_table = 'inventory'
         unique_together = ('warehouse', 'lot')
+        constraints = [
+            models.CheckConstraint(condition=models.Q(quantity__gte=0), name='inventory_quantity_non_negative'),
+        ]
 
 
 class ProductBatch(models.Model):
@@ -77,6 +155,8 @@ class ProductBatch(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE)
     ordered_quantity = models.FloatField(validators=[MinValueValidator(0)])
     produced_quantity = models.FloatField(validators=[MinValueValidator(0)])
+    scheduled_start = models.DateTimeField(null=True, blank=True, db_index=True)
+    scheduled_end = models.DateTimeField(null=True, blank=True)
     lots = models.ManyToManyField(Lot, through='Batch')
 
     def __str__(self):
@@ -86,10 +166,12 @@ class ProductBatch(models.Model):
         db_table = 'product_batch'
 
 
-class Batch(models.Model):
+class Batch(SnapshotMixin, models.Model):
     product_batch = models.ForeignKey(ProductBatch, on_delete=models.CASCADE)
     lot = models.ForeignKey(Lot, on_delete=models.CASCADE)
     quantity = models.FloatField(validators=[MinValueValidator(0)])
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    snapshot_fields = ('product_batch_id', 'lot_id', 'quantity')
 
     def __str__(self):
         return f'Batch: {self.product_batch} - {self.lot} - {self.quantity}'
@@ -99,11 +181,12 @@ class Batch(models.Model):
         unique_together = ('product_batch', 'lot')
 
 
-class Item(models.Model):
+class Item(SnapshotMixin, models.Model):
     serial_number = models.CharField(max_length=100, unique=True)
     batch = models.ForeignKey(ProductBatch, on_delete=models.CASCADE)
     operator = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
-    production_date = models.DateTimeField(auto_now_add=True)
+    production_date = models.DateTimeField(auto_now_add=True, db_index=True)
+    snapshot_fields = ('serial_number', 'batch_id', 'operator_id')
 
     def __str__(self):
         return f'Item: {self.serial_number}'
@@ -0,0 +1,192 @@
+"""
+Resolution of scanned barcodes.
+
+Two kinds of barcodes are printed: item serial numbers and lot labels of
+the form ``LOT-<lot id>``. A scan request resolves any number of barcodes
+with at most one ``IN`` query per kind, using the unique index on
+``Item.serial_number`` and the lot primary key.
+
+Resolved items are kept in a bounded per-process LRU, since the same serial
+is typically scanned several times while it is picked, packed and shipped.
+Entries are evicted when the item or its product batch is saved or deleted
+and the whole cache is dropped when a product is saved. Those signals only
+reach the worker making the change, so entries also expire after
+``SCAN_CACHE_TTL`` seconds, which bounds how long other workers can return
+a stale item.
+"""
+
+from collections import OrderedDict, defaultdict
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from typing import Any, Dict, Iterable, List, Optional, Set
+from monitoring import metrics
+from .models import Item, Lot, Product, ProductBatch
+import threading
+import time
+
+LOT_PREFIX = 'LOT-'
+
+ITEM_FIELDS = {
+    'id': 'pk',
+    'serial_number': 'serial_number',
+    'production_date': 'production_date',
+    'batch': 'batch_id',
+    'order': 'batch__order_id',
+    'product': 'batch__product_id',
+    'product_name': 'batch__product__name',
+    'warehouse': 'batch__warehouse_id',
+    'warehouse_name': 'batch__warehouse__name',
+    'company': 'batch__warehouse__company_id',
+}
+LOT_FIELDS = {
+    'id': 'pk',
+    'material': 'material_id',
+    'material_name': 'material__name',
+    'supplier': 'supplier_id',
+    'quantity_remaining': 'quantity_remaining',
+    'expiration': 'expiration',
+    'company': 'material__company_id',
+}
+
+
+class ItemCache:
+    """
+    Thread-safe LRU of resolved items keyed by serial number.
+
+    Args:
+        size: Maximum number of cached items
+        ttl: Seconds an item is kept
+    """
+
+    def __init__(self, size: int, ttl: float) -> None:
+        self.size = size
+        self.ttl = ttl
+        # Serial number -> (monotonic expiration time, item)
+        self._items: OrderedDict = OrderedDict()
+        self._serials_by_batch: Dict[int, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, serial: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(serial)
+            if entry is None:
+                return None
+            expires_at, item = entry
+            if expires_at <= time.monotonic():
+                del self._items[serial]
+                self._discard_from_batch(item)
+                return None
+            self._items.move_to_end(serial)
+            return item
+
+    def put(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[item['serial_number']] = (time.monotonic() + self.ttl, item)
+            self._items.move_to_end(item['serial_number'])
+            self._serials_by_batch[item['batch']].add(item['serial_number'])
+            while len(self._items) > self.size:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._discard_from_batch(evicted)
+
+    def evict(self, serial: str) -> None:
+        with self._lock:
+            entry = self._items.pop(serial, None)
+            if entry is not None:
+                self._discard_from_batch(entry[1])
+
+    def evict_batch(self, batch_id: int) -> None:
+        with self._lock:
+            for serial in self._serials_by_batch.pop(batch_id, ()):
+                self._items.pop(serial, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._serials_by_batch.clear()
+
+    def _discard_from_batch(self, item: Dict[str, Any]) -> None:
+        serials = self._serials_by_batch.get(item['batch'])
+        if serials is not None:
+            serials.discard(item['serial_number'])
+            if not serials:
+                del self._serials_by_batch[item['batch']]
+
+
+item_cache = ItemCache(getattr(settings, 'SCAN_CACHE_SIZE', 10_000), getattr(settings, 'SCAN_CACHE_TTL', 60))
+
+
+def resolve(barcodes: Iterable[str], company_id: int) -> List[Dict[str, Any]]:
+    """
+    Resolve scanned barcodes of a company.
+
+    Args:
+        barcodes: Scanned serial numbers and lot labels
+        company_id: Company of the scanning user; other companies' barcodes are not resolved
+
+    Returns:
+        One result per barcode, in order, with ``type`` set to ``'item'``,
+        ``'lot'`` or None for unknown barcodes
+    """
+    barcodes = list(barcodes)
+    items: Dict[str, Dict[str, Any]] = {}
+    missing_serials, lot_ids = set(), set()
+    for barcode in barcodes:
+        lot_id = lot_id_of(barcode)
+        if lot_id is not None:
+            lot_ids.add(lot_id)
+            continue
+        item = item_cache.get(barcode)
+        metrics.record_cache_lookup('scan', hit=item is not None)
+        if item is None:
+            missing_serials.add(barcode)
+        else:
+            items[barcode] = item
+
+    if missing_serials:
+        for row in Item.objects.filter(serial_number__in=missing_serials).values_list(*ITEM_FIELDS.values()):
+            item = dict(zip(ITEM_FIELDS, row))
+            item_cache.put(item)
+            items[item['serial_number']] = item
+    lots = {}
+    if lot_ids:
+        lots = {
+            row[0]: dict(zip(LOT_FIELDS, row))
+            for row in Lot.objects.filter(pk__in=lot_ids).values_list(*LOT_FIELDS.values())
+        }
+
+    results = []
+    for barcode in barcodes:
+        lot_id = lot_id_of(barcode)
+        found, kind = (lots.get(lot_id), 'lot') if lot_id is not None else (items.get(barcode), 'item')
+        if found is None or found['company'] != company_id:
+            results.append({'barcode': barcode, 'type': None})
+        else:
+            results.append({'barcode': barcode, 'type': kind, kind: found})
+    return results
+
+
+def lot_id_of(barcode: str) -> Optional[int]:
+    """Lot id encoded in a lot label, None for other barcodes."""
+    if barcode.startswith(LOT_PREFIX) and barcode[len(LOT_PREFIX):].isdigit():
+        return int(barcode[len(LOT_PREFIX):])
+    return None
+
+
+@receiver([post_save, post_delete], sender=Item, dispatch_uid='scan_item_changed')
+def item_changed(sender: Any, instance: Item, created: bool = False, **kwargs: Any) -> None:
+    if created:
+        return
+    # Evicting the batch also drops the entry of a renamed serial number.
+    item_cache.evict(instance.serial_number)
+    item_cache.evict_batch(instance.batch_id)
+
+
+@receiver([post_save, post_delete], sender=ProductBatch, dispatch_uid='scan_batch_changed')
+def batch_changed(sender: Any, instance: ProductBatch, **kwargs: Any) -> None:
+    item_cache.evict_batch(instance.pk)
+
+
+@receiver(post_save, sender=Product, dispatch_uid='scan_product_changed')
+def product_changed(sender: Any, instance: Product, **kwargs: Any) -> None:
+    item_cache.clear()
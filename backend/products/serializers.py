@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from drf_yasg import openapi
 from . import models
@@ -9,7 +10,7 @@ class MaterialSerializer(serializers.ModelSerializer):
         fields = ['name', 'unit']
     
     def create(self, validated_data):
-        validated_data['company'] = self.context['request'].user.company
+        validated_data['company_id'] = self.context['request'].user.company_id
         return super().create(validated_data)
 
 
@@ -17,6 +18,11 @@ class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Product
         fields = '__all__'
+        read_only_fields = ['company']
+
+    def create(self, validated_data):
+        validated_data['company'] = self.context['request'].user.company
+        return super().create(validated_data)
 
 
 class BillOfMaterialsSerializer(serializers.ModelSerializer):
@@ -24,6 +30,30 @@ class BillOfMaterialsSerializer(serializers.ModelSerializer):
         model = models.BillOfMaterials
         fields = '__all__'
 
+    def validate(self, attrs):
+        company_id = self.context['request'].user.company_id
+        for field in ('product', 'material'):
+            if attrs[field].company_id != company_id:
+                raise serializers.ValidationError({field: 'Object does not belong to your company.'})
+        return attrs
+
+
+class MaterialBulkSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    unit = serializers.CharField(max_length=20)
+
+
+class ProductBulkSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    unit = serializers.CharField(max_length=20)
+    production_rate = serializers.FloatField(min_value=0.001, default=1)
+
+
+class BillOfMaterialsBulkSerializer(serializers.Serializer):
+    product = serializers.IntegerField(source='product_id')
+    material = serializers.IntegerField(source='material_id')
+    quantity = serializers.FloatField(min_value=0)
+
 
 class LotSerializer(serializers.ModelSerializer):
     class Meta:
@@ -55,3 +85,123 @@ class ItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Item
         fields = '__all__'
+
+
+class ScheduledBatchSerializer(serializers.ModelSerializer):
+    due_date = serializers.DateTimeField(source='order.due_date', read_only=True)
+
+    class Meta:
+        model = models.ProductBatch
+        fields = ['id', 'warehouse', 'product', 'order', 'ordered_quantity', 'produced_quantity',
+                  'due_date', 'scheduled_start', 'scheduled_end']
+
+
+class ScheduleRequestSerializer(serializers.Serializer):
+    warehouse = serializers.IntegerField(required=False, help_text='Plan only this warehouse')
+    batch = serializers.IntegerField(required=False, help_text='Insert this batch into the existing plan')
+
+
+class ScheduleResultSerializer(serializers.Serializer):
+    scheduled = serializers.IntegerField()
+    late = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    blocked = serializers.ListField(child=serializers.IntegerField())
+
+
+class AvailableToPromiseSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    quantity = serializers.IntegerField(help_text='Units that can be built from the available stock')
+
+
+class ProductComponentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ProductComponent
+        fields = ['id', 'parent', 'component', 'quantity']
+
+    def validate(self, attrs):
+        company_id = self.context['request'].user.company_id
+        for field in ('parent', 'component'):
+            if attrs[field].company_id != company_id:
+                raise serializers.ValidationError({field: 'Product does not belong to your company.'})
+        return attrs
+
+    def save(self, **kwargs):
+        try:
+            return super().save(**kwargs)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'component': e.messages})
+
+
+class ExplodedMaterialSerializer(serializers.Serializer):
+    material = serializers.IntegerField()
+    quantity = serializers.FloatField(help_text='Total quantity in one unit of the product')
+
+
+class ScanRequestSerializer(serializers.Serializer):
+    barcodes = serializers.ListField(
+        child=serializers.CharField(max_length=100), min_length=1, max_length=500,
+        help_text='Serial numbers and lot labels (LOT-<id>)',
+    )
+
+
+class ScannedItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    serial_number = serializers.CharField()
+    production_date = serializers.DateTimeField()
+    batch = serializers.IntegerField()
+    order = serializers.IntegerField()
+    product = serializers.IntegerField()
+    product_name = serializers.CharField()
+    warehouse = serializers.IntegerField()
+    warehouse_name = serializers.CharField()
+    company = serializers.IntegerField()
+
+
+class ScannedLotSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    material = serializers.IntegerField()
+    material_name = serializers.CharField()
+    supplier = serializers.IntegerField()
+    quantity_remaining = serializers.FloatField()
+    expiration = serializers.DateTimeField()
+    company = serializers.IntegerField()
+
+
+class ScanResultSerializer(serializers.Serializer):
+    barcode = serializers.CharField()
+    type = serializers.ChoiceField(choices=['item', 'lot'], allow_null=True)
+    item = ScannedItemSerializer(required=False)
+    lot = ScannedLotSerializer(required=False)
+
+
+class TransferLineSerializer(serializers.Serializer):
+    lot = serializers.IntegerField()
+    quantity = serializers.FloatField()
+
+    def validate_quantity(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Quantity must be positive.')
+        return value
+
+
+class TransferSerializer(serializers.Serializer):
+    source = serializers.IntegerField(help_text='Warehouse the stock is taken from')
+    target = serializers.IntegerField(help_text='Warehouse the stock is moved to')
+    lines = TransferLineSerializer(many=True, allow_empty=False, max_length=5000)
+
+
+class TransferResultSerializer(serializers.Serializer):
+    lot = serializers.IntegerField()
+    quantity = serializers.FloatField(help_text='Moved quantity')
+
+
+class AdjustmentRequestSerializer(serializers.Serializer):
+    delta = serializers.FloatField(help_text='Change of the quantity, negative to take stock out')
+    version = serializers.IntegerField(required=False, min_value=0,
+                                       help_text='Version last read; the request fails with 409 if it changed')
+
+
+class AdjustmentSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    quantity = serializers.FloatField()
+    version = serializers.IntegerField()
@@ -0,0 +1,105 @@
+"""
+Optimistic concurrency for stock quantity updates.
+
+``Lot`` and ``Inventory`` rows carry a ``version`` that every quantity update
+increments. An update reads the row without locking it, computes the new
+quantity and writes it with ``UPDATE ... WHERE id = %s AND version = %s``;
+when another writer got there first no row matches and the update is retried
+from a fresh read, up to ``MAX_ATTEMPTS`` times with a short jittered pause.
+Readers never wait for writers, and under the low-conflict traffic that
+dominates (different lots, different warehouses) every update is one read
+and one write. Set-based writers (``products.transfers``) and model saves
+changing a quantity (``wms.models.VersionedMixin``) increment the version
+as well, and check constraints keep quantities non-negative even
+for writes that bypass this module.
+"""
+
+from dataclasses import dataclass
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from typing import Optional, Type
+from .models import Inventory, Lot
+from .signals import stock_changed
+import random
+import time
+
+MAX_ATTEMPTS = 5
+BACKOFF = 0.005
+
+# Quantity field and company lookup of every versioned model.
+QUANTITY_FIELDS = {
+    Inventory: ('quantity', 'warehouse__company_id'),
+    Lot: ('quantity_remaining', 'material__company_id'),
+}
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a row kept changing under an optimistic update."""
+
+
+@dataclass
+class Adjustment:
+    """Result of a quantity adjustment."""
+
+    pk: int
+    quantity: float
+    version: int
+
+
+def adjust_quantity(model: Type[models.Model], pk: int, company_id: int, delta: float,
+                    expected_version: Optional[int] = None, attempts: int = MAX_ATTEMPTS) -> Adjustment:
+    """
+    Add ``delta`` to the quantity of a lot or inventory row.
+
+    Args:
+        model: ``Lot`` (``quantity_remaining``) or ``Inventory`` (``quantity``)
+        pk: Row to update
+        company_id: Company the row must belong to
+        delta: Change of the quantity, negative to take stock out
+        expected_version: Version the caller has read; the update fails instead
+            of being retried when the row has changed since
+        attempts: Maximum number of read-write rounds
+
+    Returns:
+        Adjustment: The new quantity and version
+
+    Raises:
+        model.DoesNotExist: If the row does not exist or belongs to another company
+        ValidationError: If the quantity would become negative
+        ConcurrentUpdateError: If the expected version is stale or every attempt lost a race
+    """
+    field, company_field = QUANTITY_FIELDS[model]
+    queryset = model.objects.filter(pk=pk, **{company_field: company_id})
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(random.uniform(0, BACKOFF * attempt))
+        row = queryset.values_list(field, 'version').first()
+        if row is None:
+            raise model.DoesNotExist(f'{model.__name__} {pk} not found.')
+        quantity, version = row
+        if expected_version is not None and version != expected_version:
+            raise ConcurrentUpdateError(f'{model.__name__} {pk} is at version {version}, not {expected_version}.')
+        if quantity + delta < 0:
+            raise ValidationError(f'{model.__name__} {pk} holds {quantity}, cannot take out {-delta}.')
+        if update_versioned(model, pk, version, **{field: quantity + delta}):
+            stock_changed.send(sender=model, company_id=company_id, pks=[pk], delta=delta)
+            return Adjustment(pk, quantity + delta, version + 1)
+        if expected_version is not None:
+            break
+    raise ConcurrentUpdateError(f'{model.__name__} {pk} was changed concurrently, try again.')
+
+
+def update_versioned(model: Type[models.Model], pk: int, version: int, **values) -> bool:
+    """
+    Write ``values`` if the row is still at ``version`` and increment the version.
+
+    Returns:
+        Whether the row was updated
+    """
+    try:
+        with transaction.atomic():
+            return model.objects.filter(pk=pk, version=version).update(version=F('version') + 1, **values) == 1
+    except IntegrityError as e:
+        # A check constraint rejected the write, e.g. a quantity below zero.
+        raise ValidationError(str(e)) from e
@@ -0,0 +1,55 @@
+"""
+Signals of the products app.
+
+``stock_changed`` is sent with a ``company_id`` argument whenever stock of a
+company moves in a way that bypasses model signals (bulk loads, queryset
+updates). Saving or deleting ``Inventory``, ``Batch`` and ``BillOfMaterials``
+rows sends it automatically, with the row as the ``instance`` argument.
+Set-based writers may describe their changes for incremental consumers with
+``deltas`` (``(warehouse id, lot id, quantity change)`` triples) or, for rows
+of ``sender`` changed by the same amount, ``pks`` and ``delta``.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from functools import lru_cache
+from typing import Any, Optional
+from warehouse.models import Warehouse
+from .models import BillOfMaterials, Batch, Inventory, Lot, Product
+
+stock_changed = Signal()
+
+
+@lru_cache(maxsize=10_000)
+def warehouse_company_id(warehouse_id: int) -> Optional[int]:
+    """Company of a warehouse; warehouses never move between companies."""
+    return Warehouse.objects.filter(pk=warehouse_id).values_list('company_id', flat=True).first()
+
+
+@lru_cache(maxsize=100_000)
+def lot_company_id(lot_id: int) -> Optional[int]:
+    """Company of a lot; lots never move between companies."""
+    return Lot.objects.filter(pk=lot_id).values_list('material__company_id', flat=True).first()
+
+
+@lru_cache(maxsize=10_000)
+def product_company_id(product_id: int) -> Optional[int]:
+    """Company of a product; products never move between companies."""
+    return Product.objects.filter(pk=product_id).values_list('company_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Inventory, dispatch_uid='inventory_stock_changed')
+def inventory_changed(sender: Any, instance: Inventory, **kwargs: Any) -> None:
+    stock_changed.send(sender=sender, company_id=warehouse_company_id(instance.warehouse_id),
+                       instance=instance)
+
+
+@receiver([post_save, post_delete], sender=Batch, dispatch_uid='batch_stock_changed')
+def batch_changed(sender: Any, instance: Batch, **kwargs: Any) -> None:
+    stock_changed.send(sender=sender, company_id=lot_company_id(instance.lot_id), instance=instance)
+
+
+@receiver([post_save, post_delete], sender=BillOfMaterials, dispatch_uid='bom_stock_changed')
+def bom_changed(sender: Any, instance: BillOfMaterials, **kwargs: Any) -> None:
+    stock_changed.send(sender=sender, company_id=product_company_id(instance.product_id),
+                       instance=instance)
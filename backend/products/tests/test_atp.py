@@ -0,0 +1,86 @@
+"""
+Test suite for available-to-promise quantities.
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from ..atp import available_to_promise, compute
+from ..models import Material, Product, BillOfMaterials, Lot, Inventory, ProductBatch, Batch
+
+
+class TestAvailableToPromise(TestCase):
+    """Test suite for buildable quantities computed from BOM, stock and allocations."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        expiration = timezone.now() + timedelta(days=365)
+        cls.main = Warehouse.objects.create(company=cls.company, name='Main')
+        supplier = create_supplier(cls.company)
+        cls.client_obj = create_client(cls.company)
+        steel = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        paint = Material.objects.create(company=cls.company, name='Paint', unit='l')
+        cls.steel_lot = Lot.objects.create(supplier=supplier, material=steel, quantity_received=100,
+                                           quantity_remaining=100, expiration=expiration)
+        paint_lot = Lot.objects.create(supplier=supplier, material=paint, quantity_received=10,
+                                       quantity_remaining=10, expiration=expiration)
+        cls.steel_stock = Inventory.objects.create(warehouse=cls.main, lot=cls.steel_lot, quantity=100)
+        Inventory.objects.create(warehouse=cls.main, lot=paint_lot, quantity=10)
+
+        cls.frame = Product.objects.create(company=cls.company, name='Frame', unit='pcs')
+        BillOfMaterials.objects.create(product=cls.frame, material=steel, quantity=10)
+        BillOfMaterials.objects.create(product=cls.frame, material=paint, quantity=0.5)
+        cls.bolt = Product.objects.create(company=cls.company, name='Bolt', unit='pcs')
+        BillOfMaterials.objects.create(product=cls.bolt, material=steel, quantity=0.1)
+
+        cls.user = create_user(cls.company, 'sales', UserGroups.ADMIN)
+
+    def test_minimum_over_materials(self) -> None:
+        """
+        Test that the scarcest material limits the buildable quantity.
+        """
+        assert compute(self.company.pk) == {self.frame.pk: 10, self.bolt.pk: 1000}
+
+    def test_allocations_are_reserved(self) -> None:
+        """
+        Test that allocations of unfinished batches reduce the available stock.
+        """
+        order = Order.objects.create(company=self.company, client=self.client_obj, status='Confirmed')
+        product_batch = ProductBatch.objects.create(
+            warehouse=self.main, product=self.frame, order=order, ordered_quantity=5, produced_quantity=0,
+        )
+        Batch.objects.create(product_batch=product_batch, lot=self.steel_lot, quantity=50)
+        assert compute(self.company.pk)[self.frame.pk] == 5
+
+    def test_cache_is_invalidated_by_stock_movements(self) -> None:
+        """
+        Test caching per company.
+
+        Verifies:
+            - A repeated call runs no queries
+            - Saving inventory invalidates the cached result
+        """
+        assert available_to_promise(self.company.pk, [self.frame.pk]) == {self.frame.pk: 10}
+        with self.assertNumQueries(0):
+            available_to_promise(self.company.pk)
+
+        self.steel_stock.quantity = 50
+        self.steel_stock.save()
+        assert available_to_promise(self.company.pk, [self.frame.pk]) == {self.frame.pk: 5}
+
+    def test_atp_endpoint(self) -> None:
+        """
+        Test the ATP endpoint for selected products.
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('products:atp'), {'product': [self.bolt.pk]})
+        assert response.status_code == 200
+        assert response.json() == [{'product': self.bolt.pk, 'quantity': 1000}]
@@ -0,0 +1,156 @@
+"""
+Test suite for multi-level bills of materials and the product closure.
+"""
+
+from collections import defaultdict
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from conftest import create_user
+from users.models import Company, UserGroups
+from ..bom import explode
+from ..models import Material, Product, BillOfMaterials, ProductClosure, ProductComponent
+import random
+
+
+def brute_force_closure() -> dict:
+    """Closure recomputed from scratch by walking every path."""
+    edges = defaultdict(list)
+    for component in ProductComponent.objects.all():
+        edges[component.parent_id].append((component.component_id, component.quantity))
+
+    def walk(product_id, quantity, totals):
+        totals[product_id][0] += quantity
+        totals[product_id][1] += 1
+        for component_id, edge_quantity in edges[product_id]:
+            walk(component_id, quantity * edge_quantity, totals)
+
+    closure = {}
+    for product_id in Product.objects.values_list('pk', flat=True):
+        totals = defaultdict(lambda: [0.0, 0])
+        walk(product_id, 1.0, totals)
+        for descendant_id, (quantity, paths) in totals.items():
+            closure[product_id, descendant_id] = (round(quantity, 6), paths)
+    return closure
+
+
+def stored_closure() -> dict:
+    return {
+        (row.ancestor_id, row.descendant_id): (round(row.quantity, 6), row.paths)
+        for row in ProductClosure.objects.all()
+    }
+
+
+class TestMultiLevelBom(TestCase):
+    """Test suite for subassemblies, cycle detection and closure maintenance."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.products = {
+            name: Product.objects.create(company=cls.company, name=name, unit='pcs') for name in 'ABCD'
+        }
+        cls.steel = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        BillOfMaterials.objects.create(product=cls.products['D'], material=cls.steel, quantity=1.5)
+        cls.user = create_user(cls.company, 'engineer', UserGroups.ADMIN)
+
+    def link(self, parent: str, component: str, quantity: float) -> ProductComponent:
+        return ProductComponent.objects.create(
+            parent=self.products[parent], component=self.products[component], quantity=quantity,
+        )
+
+    def closure(self, ancestor: str, descendant: str) -> tuple:
+        row = ProductClosure.objects.get(ancestor=self.products[ancestor], descendant=self.products[descendant])
+        return row.quantity, row.paths
+
+    def test_diamond_quantities(self) -> None:
+        """
+        Test quantities summed over parallel paths.
+
+        Verifies:
+            - Quantities multiply along a path and add up across paths
+            - Changing and removing an edge updates the affected rows
+        """
+        self.link('A', 'B', 2)
+        a_c = self.link('A', 'C', 1)
+        b_d = self.link('B', 'D', 1)
+        self.link('C', 'D', 4)
+        assert self.closure('A', 'D') == (6, 2)
+        assert explode(self.products['A'].pk) == {self.steel.pk: 9}
+
+        b_d.quantity = 5
+        b_d.save()
+        assert self.closure('A', 'D') == (14, 2)
+
+        a_c.delete()
+        assert self.closure('A', 'D') == (10, 1)
+        assert not ProductClosure.objects.filter(ancestor=self.products['A'], descendant=self.products['C']).exists()
+
+    def test_cycles_are_rejected(self) -> None:
+        """
+        Test that an edge closing a cycle is rejected and nothing is written.
+        """
+        self.link('A', 'B', 1)
+        self.link('B', 'C', 1)
+        with self.assertRaises(ValidationError):
+            self.link('C', 'A', 1)
+        assert not ProductComponent.objects.filter(parent=self.products['C']).exists()
+        assert stored_closure() == brute_force_closure()
+
+    def test_deleting_a_subassembly(self) -> None:
+        """
+        Test that deleting a product in the middle removes the paths through it.
+        """
+        self.link('A', 'B', 2)
+        self.link('B', 'C', 3)
+        self.products['B'].delete()
+        assert stored_closure() == brute_force_closure()
+
+    def test_random_changes_match_full_recomputation(self) -> None:
+        """
+        Test incremental maintenance against a closure recomputed from scratch.
+        """
+        rng = random.Random(0)
+        names = list('ABCD') + [f'P{i}' for i in range(6)]
+        for name in names[4:]:
+            self.products[name] = Product.objects.create(company=self.company, name=name, unit='pcs')
+        for _ in range(60):
+            parent, component = rng.sample(names, 2)
+            existing = ProductComponent.objects.filter(
+                parent=self.products[parent], component=self.products[component]
+            ).first()
+            try:
+                if existing is None:
+                    self.link(parent, component, rng.randint(1, 4))
+                elif rng.random() < 0.5:
+                    existing.delete()
+                else:
+                    existing.quantity = rng.randint(1, 4)
+                    existing.save()
+            except ValidationError:
+                pass
+        assert stored_closure() == brute_force_closure()
+
+    def test_component_endpoints(self) -> None:
+        """
+        Test the component and explosion endpoints.
+
+        Verifies:
+            - Components can be added through the API
+            - A cycle is rejected with 400
+            - The explosion lists exploded material quantities
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        products = {name: product.pk for name, product in self.products.items()}
+
+        response = client.post(reverse('products:component'),
+                               {'parent': products['A'], 'component': products['D'], 'quantity': 2})
+        assert response.status_code == 201
+        response = client.post(reverse('products:component'),
+                               {'parent': products['D'], 'component': products['A'], 'quantity': 1})
+        assert response.status_code == 400
+
+        response = client.get(reverse('products:explosion', args=[products['A']]))
+        assert response.json() == [{'material': self.steel.pk, 'quantity': 3.0}]
@@ -0,0 +1,98 @@
+"""
+Test suite for the barcode scan endpoint.
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from ..models import Material, Product, Lot, ProductBatch, Item
+from ..scanning import item_cache, resolve
+import time
+
+
+class TestScanning(TestCase):
+    """Test suite for resolving serial numbers and lot labels."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.other_company = Company.objects.create(name='Other', domain='https://other.com', email='o@other.com')
+        cls.user = create_user(cls.company, 'picker', UserGroups.PICKER_PACKER)
+        warehouse = Warehouse.objects.create(company=cls.company, name='Finished')
+        supplier = create_supplier(cls.company)
+        client = create_client(cls.company)
+        material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        cls.lot = Lot.objects.create(supplier=supplier, material=material, quantity_received=10,
+                                     quantity_remaining=10, expiration=timezone.now() + timedelta(days=30))
+        product = Product.objects.create(company=cls.company, name='Frame', unit='pcs')
+        order = Order.objects.create(company=cls.company, client=client)
+        cls.batch = ProductBatch.objects.create(warehouse=warehouse, product=product, order=order,
+                                                ordered_quantity=2, produced_quantity=2)
+        cls.items = [Item.objects.create(serial_number=f'SN-{i}', batch=cls.batch, operator=cls.user)
+                     for i in range(2)]
+
+    def test_resolves_many_barcodes_in_order(self) -> None:
+        """
+        Test resolving items, lots and unknown barcodes in one call.
+
+        Verifies:
+            - Results keep the order of the request
+            - Items carry batch, product and warehouse context
+            - Barcodes of other companies are not resolved
+        """
+        results = resolve(['SN-1', f'LOT-{self.lot.pk}', 'unknown', 'SN-0'], self.company.pk)
+        assert [result['type'] for result in results] == ['item', 'lot', None, 'item']
+        assert results[0]['item']['batch'] == self.batch.pk
+        assert results[0]['item']['product_name'] == 'Frame'
+        assert results[0]['item']['warehouse_name'] == 'Finished'
+        assert resolve(['SN-0'], self.other_company.pk)[0]['type'] is None
+
+    def test_cached_items_need_no_queries(self) -> None:
+        """
+        Test the per-process item cache.
+
+        Verifies:
+            - A repeated scan runs no queries
+            - Saving the product batch evicts its items
+        """
+        resolve(['SN-0'], self.company.pk)
+        with self.assertNumQueries(0):
+            resolve(['SN-0'], self.company.pk)
+
+        self.batch.save()
+        assert item_cache.get('SN-0') is None
+
+    def test_cached_items_expire(self) -> None:
+        """
+        Test that cached items expire for changes made by other workers.
+
+        Verifies:
+            - An item changed without signals reaching this process is read again after the TTL
+        """
+        resolve(['SN-0'], self.company.pk)
+        Item.objects.filter(serial_number='SN-0').update(serial_number='SN-X')
+        assert resolve(['SN-0'], self.company.pk)[0]['type'] == 'item'
+
+        now = time.monotonic()
+        with patch('products.scanning.time.monotonic', return_value=now + item_cache.ttl):
+            assert resolve(['SN-0'], self.company.pk)[0]['type'] is None
+
+    def test_scan_endpoint(self) -> None:
+        """
+        Test the scan endpoint for a Picker/Packer.
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('products:scan'), {'barcodes': ['SN-0', f'LOT-{self.lot.pk}']}, format='json')
+        assert response.status_code == 200
+        assert [result['type'] for result in response.json()] == ['item', 'lot']
+
+        response = client.post(reverse('products:scan'), {'barcodes': []}, format='json')
+        assert response.status_code == 400
@@ -0,0 +1,115 @@
+"""
+Test suite for the production scheduler.
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from ..models import Material, Product, BillOfMaterials, Lot, Inventory, ProductBatch
+from ..scheduling import Scheduler
+
+
+class TestScheduler(TestCase):
+    """Test suite for sequencing product batches under material constraints."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.now = timezone.now().replace(microsecond=0)
+        cls.warehouse = Warehouse.objects.create(company=cls.company, name='Production')
+        supplier = create_supplier(cls.company)
+        cls.client_obj = create_client(cls.company)
+        cls.material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        lot = Lot.objects.create(
+            supplier=supplier, material=cls.material, quantity_received=100, quantity_remaining=100,
+            expiration=cls.now + timedelta(days=365),
+        )
+        Inventory.objects.create(warehouse=cls.warehouse, lot=lot, quantity=100)
+        cls.product = Product.objects.create(company=cls.company, name='Frame', unit='pcs', production_rate=2)
+        BillOfMaterials.objects.create(product=cls.product, material=cls.material, quantity=10)
+
+        cls.user = create_user(cls.company, 'planner', UserGroups.WAREHOUSE_MANAGER)
+
+    def create_batch(self, due_in_days: int, quantity: float = 2) -> ProductBatch:
+        order = Order.objects.create(
+            company=self.company, client=self.client_obj, status='Confirmed',
+            due_date=self.now + timedelta(days=due_in_days),
+        )
+        return ProductBatch.objects.create(
+            warehouse=self.warehouse, product=self.product, order=order,
+            ordered_quantity=quantity, produced_quantity=0,
+        )
+
+    def test_batches_are_sequenced_by_due_date(self) -> None:
+        """
+        Test earliest-due-date sequencing.
+
+        Verifies:
+            - Batches run back to back starting now, the earliest due date first
+            - Slot length follows the product's production rate
+        """
+        later = self.create_batch(due_in_days=5)
+        sooner = self.create_batch(due_in_days=1)
+
+        result = Scheduler(self.company.pk, now=self.now).plan()
+        later.refresh_from_db()
+        sooner.refresh_from_db()
+
+        assert result.scheduled == 2 and not result.blocked
+        assert sooner.scheduled_start == self.now
+        assert sooner.scheduled_end == later.scheduled_start == self.now + timedelta(hours=1)
+
+    def test_batches_without_material_are_blocked(self) -> None:
+        """
+        Test that batches whose materials are used up are not scheduled.
+        """
+        first = self.create_batch(due_in_days=1, quantity=8)
+        second = self.create_batch(due_in_days=2, quantity=8)
+
+        result = Scheduler(self.company.pk, now=self.now).plan()
+        second.refresh_from_db()
+
+        assert result.blocked == [second.pk]
+        assert second.scheduled_start is None
+        assert ProductBatch.objects.get(pk=first.pk).scheduled_start == self.now
+
+    def test_insert_reschedules_only_the_suffix(self) -> None:
+        """
+        Test incremental insertion of an urgent batch.
+
+        Verifies:
+            - Batches due before the urgent one keep their slots
+            - The urgent batch and later ones are moved, nothing else is written
+        """
+        batches = [self.create_batch(due_in_days=day) for day in (1, 2, 5, 6)]
+        Scheduler(self.company.pk, now=self.now).plan()
+
+        urgent = self.create_batch(due_in_days=3)
+        result = Scheduler(self.company.pk, now=self.now).insert(urgent)
+
+        starts = {batch.pk: batch.scheduled_start for batch in ProductBatch.objects.all()}
+        assert result.updated == 3
+        assert starts[batches[1].pk] == self.now + timedelta(hours=1)
+        assert starts[urgent.pk] == self.now + timedelta(hours=2)
+        assert starts[batches[2].pk] == self.now + timedelta(hours=3)
+
+    def test_schedule_endpoint(self) -> None:
+        """
+        Test planning and listing the schedule through the API.
+        """
+        batch = self.create_batch(due_in_days=1)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(reverse('products:schedule'), {}, format='json')
+        assert response.status_code == 200
+        assert response.json()['scheduled'] == 1
+
+        response = client.get(reverse('products:schedule'))
+        assert [row['id'] for row in response.json()] == [batch.pk]
@@ -0,0 +1,137 @@
+"""
+Test suite for optimistic quantity updates.
+"""
+
+from datetime import timedelta
+from unittest import mock
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from .. import services
+from ..models import Material, Lot, Inventory
+from ..services import ConcurrentUpdateError, adjust_quantity
+
+
+class TestOptimisticUpdates(TestCase):
+    """Test suite for versioned updates of lot and inventory quantities."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        warehouse = Warehouse.objects.create(company=cls.company, name='Main')
+        supplier = create_supplier(cls.company)
+        material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        cls.lot = Lot.objects.create(supplier=supplier, material=material, quantity_received=10,
+                                     quantity_remaining=10, expiration=timezone.now() + timedelta(days=30))
+        cls.stock = Inventory.objects.create(warehouse=warehouse, lot=cls.lot, quantity=10)
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def test_adjust_increments_version(self) -> None:
+        """
+        Test a plain adjustment of a lot and an inventory row.
+        """
+        adjustment = adjust_quantity(Inventory, self.stock.pk, self.company.pk, -4)
+        assert (adjustment.quantity, adjustment.version) == (6, 1)
+        assert Inventory.objects.values_list('quantity', 'version').get(pk=self.stock.pk) == (6, 1)
+        assert adjust_quantity(Lot, self.lot.pk, self.company.pk, -10).quantity == 0
+
+    def test_save_increments_version(self) -> None:
+        """
+        Test model saves of versioned rows.
+
+        Verifies:
+            - A save changing the quantity increments the version written since the row was loaded
+            - Optimistic updates expecting an older version fail afterwards
+            - Saves leaving the quantity unchanged keep the version
+        """
+        stock = Inventory.objects.get(pk=self.stock.pk)
+        adjust_quantity(Inventory, stock.pk, self.company.pk, -1)
+        stock.quantity = 7
+        stock.save()
+        assert stock.version == 2
+        assert Inventory.objects.values_list('quantity', 'version').get(pk=stock.pk) == (7, 2)
+        with self.assertRaises(ConcurrentUpdateError):
+            adjust_quantity(Inventory, stock.pk, self.company.pk, 1, expected_version=1)
+
+        stock.save()
+        stock.location = None
+        stock.save(update_fields=['location'])
+        lot = Lot.objects.get(pk=self.lot.pk)
+        lot.quantity_remaining = 5
+        lot.save(update_fields=['quantity_remaining'])
+        assert Inventory.objects.get(pk=stock.pk).version == 2
+        assert Lot.objects.get(pk=lot.pk).version == 1
+
+    def test_lost_race_is_retried(self) -> None:
+        """
+        Test retrying after a concurrent writer.
+
+        Verifies:
+            - The retry starts from the concurrently written quantity
+            - A stale expected version is not retried
+            - Giving up raises ConcurrentUpdateError
+        """
+        update_versioned = services.update_versioned
+
+        def racing(model, pk, version, **values):
+            if racing.calls == 0:
+                Inventory.objects.filter(pk=pk).update(quantity=F('quantity') - 1, version=F('version') + 1)
+            racing.calls += 1
+            return update_versioned(model, pk, version, **values)
+        racing.calls = 0
+
+        with mock.patch.object(services, 'update_versioned', racing), mock.patch.object(services, 'BACKOFF', 0):
+            assert adjust_quantity(Inventory, self.stock.pk, self.company.pk, -4).quantity == 5
+        assert racing.calls == 2
+
+        with self.assertRaises(ConcurrentUpdateError):
+            adjust_quantity(Inventory, self.stock.pk, self.company.pk, 1, expected_version=0)
+        with mock.patch.object(services, 'update_versioned', return_value=False), \
+                mock.patch.object(services, 'BACKOFF', 0), self.assertRaises(ConcurrentUpdateError):
+            adjust_quantity(Inventory, self.stock.pk, self.company.pk, 1)
+
+    def test_quantities_stay_non_negative(self) -> None:
+        """
+        Test that stock cannot go below zero.
+
+        Verifies:
+            - The service rejects taking out more than is held
+            - The database rejects negative quantities written around the service
+        """
+        with self.assertRaises(ValidationError):
+            adjust_quantity(Inventory, self.stock.pk, self.company.pk, -11)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Inventory.objects.filter(pk=self.stock.pk).update(quantity=-1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Lot.objects.filter(pk=self.lot.pk).update(quantity_remaining=F('quantity_remaining') - 11)
+
+    def test_adjust_endpoints(self) -> None:
+        """
+        Test the adjust endpoints.
+
+        Verifies:
+            - An adjustment returns the new quantity and version
+            - A stale version is a conflict
+            - Other companies' rows are not found
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse('products:inventory_adjust', args=[self.stock.pk])
+        response = client.post(url, {'delta': 2, 'version': 0}, format='json')
+        assert response.status_code == 200
+        assert response.json() == {'id': self.stock.pk, 'quantity': 12, 'version': 1}
+        response = client.post(url, {'delta': 2, 'version': 0}, format='json')
+        assert response.status_code == 409
+
+        other = Company.objects.create(name='Other', domain='https://other.com', email='o@other.com')
+        self.user.company = other
+        self.user.save()
+        response = client.post(reverse('products:lot_adjust', args=[self.lot.pk]), {'delta': 1}, format='json')
+        assert response.status_code == 404
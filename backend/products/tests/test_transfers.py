@@ -0,0 +1,105 @@
+"""
+Test suite for stock transfers between warehouse zones.
+"""
+
+from datetime import timedelta
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from ..atp import available_to_promise
+from ..models import Material, Product, BillOfMaterials, Lot, Inventory
+from ..transfers import transfer
+
+
+class TestTransfers(TestCase):
+    """Test suite for moving stock of many lots at once."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.warehouses = {name: Warehouse.objects.create(company=cls.company, name=name)
+                          for name, _ in Warehouse.NAME_CHOICES}
+        supplier = create_supplier(cls.company)
+        cls.material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        expiration = timezone.now() + timedelta(days=30)
+        cls.lots = [Lot.objects.create(supplier=supplier, material=cls.material, quantity_received=10,
+                                       quantity_remaining=10, expiration=expiration) for _ in range(3)]
+        for lot in cls.lots:
+            Inventory.objects.create(warehouse=cls.warehouses['Main'], lot=lot, quantity=10)
+        Inventory.objects.create(warehouse=cls.warehouses['Production'], lot=cls.lots[0], quantity=1)
+
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def stock(self, name: str) -> dict:
+        return dict(Inventory.objects.filter(warehouse=self.warehouses[name]).values_list('lot_id', 'quantity'))
+
+    def test_moves_many_lots(self) -> None:
+        """
+        Test a transfer from Main to Production.
+
+        Verifies:
+            - Source rows are decremented
+            - Existing target rows are incremented and missing ones created
+            - Repeated lots add up
+        """
+        moved = transfer(self.company.pk, self.warehouses['Main'].pk, self.warehouses['Production'].pk,
+                         [(self.lots[0].pk, 4), (self.lots[1].pk, 10), (self.lots[0].pk, 1)])
+        assert moved == {self.lots[0].pk: 5, self.lots[1].pk: 10}
+        assert self.stock('Main') == {self.lots[0].pk: 5, self.lots[1].pk: 0, self.lots[2].pk: 10}
+        assert self.stock('Production') == {self.lots[0].pk: 6, self.lots[1].pk: 10}
+
+    def test_shortage_rolls_back(self) -> None:
+        """
+        Test that a transfer with a short lot moves nothing.
+        """
+        with self.assertRaises(ValidationError) as raised:
+            transfer(self.company.pk, self.warehouses['Main'].pk, self.warehouses['Production'].pk,
+                     [(self.lots[0].pk, 5), (self.lots[1].pk, 11)])
+        assert raised.exception.messages == [f'Lot {self.lots[1].pk} has less than 11.0 in Main.']
+        assert self.stock('Main') == {lot.pk: 10 for lot in self.lots}
+
+    def test_only_connected_zones(self) -> None:
+        """
+        Test that stock follows the zone flow.
+        """
+        with self.assertRaises(ValidationError):
+            transfer(self.company.pk, self.warehouses['Main'].pk, self.warehouses['Shipped'].pk,
+                     [(self.lots[0].pk, 1)])
+
+    def test_transfer_invalidates_atp(self) -> None:
+        """
+        Test that moving stock out of the stock zones invalidates cached ATP quantities.
+        """
+        product = Product.objects.create(company=self.company, name='Frame', unit='pcs')
+        BillOfMaterials.objects.create(product=product, material=self.material, quantity=1)
+        assert available_to_promise(self.company.pk) == {product.pk: 31}
+        transfer(self.company.pk, self.warehouses['Production'].pk, self.warehouses['Finished'].pk,
+                 [(self.lots[0].pk, 1)])
+        assert available_to_promise(self.company.pk) == {product.pk: 30}
+
+    def test_transfer_endpoint(self) -> None:
+        """
+        Test the transfer endpoint.
+
+        Verifies:
+            - A valid transfer returns the moved quantities
+            - A shortage is a bad request
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = {
+            'source': self.warehouses['Main'].pk, 'target': self.warehouses['Production'].pk,
+            'lines': [{'lot': lot.pk, 'quantity': 2} for lot in self.lots],
+        }
+        response = client.post(reverse('products:transfer'), payload, format='json')
+        assert response.status_code == 200
+        assert response.json() == [{'lot': lot.pk, 'quantity': 2} for lot in self.lots]
+
+        payload['lines'] = [{'lot': self.lots[0].pk, 'quantity': 100}]
+        response = client.post(reverse('products:transfer'), payload, format='json')
+        assert response.status_code == 400
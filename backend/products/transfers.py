@@ -0,0 +1,84 @@
+"""
+Set-based stock transfers between the warehouse zones of a company.
+
+Stock flows Main -> Production -> Finished -> Shipped, and unused material
+can go back from Production to Main. A transfer moves any number of lots
+between two zones with three statements regardless of its size:
+
+1. the inventory rows of both zones are locked in ``(warehouse, lot)``
+   order, so concurrent transfers touching the same rows queue up instead
+   of deadlocking,
+2. one conditional ``UPDATE`` subtracts every quantity from the source rows
+   that hold enough of it,
+3. one ``INSERT ... ON CONFLICT DO UPDATE`` adds the quantities to the
+   target rows, creating missing ones.
+
+If any lot is short the whole transfer is rolled back. Queryset updates
+bypass model signals, so ``stock_changed`` is sent once per transfer with
+the moved quantities as ``deltas``.
+"""
+
+from collections import defaultdict
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from typing import Dict, Iterable, Tuple
+from warehouse.models import Warehouse
+from wms.db import conditional_subtract, upsert_add
+from .models import Inventory
+from .signals import stock_changed
+
+ROUTES = {
+    ('Main', 'Production'),
+    ('Production', 'Main'),
+    ('Production', 'Finished'),
+    ('Finished', 'Shipped'),
+}
+
+
+def transfer(company_id: int, source_id: int, target_id: int, lines: Iterable[Tuple[int, float]]) -> Dict[int, float]:
+    """
+    Move quantities of lots from one warehouse zone of a company to another.
+
+    Args:
+        company_id: Company owning both warehouses
+        source_id: Warehouse the stock is taken from
+        target_id: Warehouse the stock is moved to
+        lines: ``(lot id, quantity)`` pairs; quantities of repeated lots add up
+
+    Returns:
+        Moved quantity per lot
+
+    Raises:
+        ValidationError: If a warehouse is not the company's, the zones are
+            not connected or a lot has less stock in the source than requested
+    """
+    quantities: Dict[int, float] = defaultdict(float)
+    for lot_id, quantity in lines:
+        quantities[lot_id] += quantity
+    names = dict(Warehouse.objects.filter(company_id=company_id, pk__in=[source_id, target_id])
+                 .values_list('pk', 'name'))
+    if source_id not in names or target_id not in names:
+        raise ValidationError('Warehouse not found.')
+    if (names[source_id], names[target_id]) not in ROUTES:
+        raise ValidationError(f'Stock cannot be moved from {names[source_id]} to {names[target_id]}.')
+
+    moves = sorted(quantities.items())
+    with transaction.atomic():
+        list(
+            Inventory.objects.select_for_update()
+            .filter(warehouse_id__in=[source_id, target_id], lot_id__in=quantities)
+            .order_by('warehouse_id', 'lot_id')
+            .values_list('pk')
+        )
+        short = conditional_subtract(Inventory, 'warehouse_id', source_id, 'lot_id', 'quantity', moves,
+                                     version_field='version')
+        if short:
+            raise ValidationError([f'Lot {lot_id} has less than {quantities[lot_id]} in {names[source_id]}.'
+                                   for lot_id in sorted(short)])
+        upsert_add(Inventory, ['warehouse_id', 'lot_id'], 'quantity',
+                   [(target_id, lot_id, quantity) for lot_id, quantity in moves], version_field='version')
+    stock_changed.send(sender=Inventory, company_id=company_id, deltas=[
+        (warehouse_id, lot_id, sign * quantity)
+        for lot_id, quantity in moves for warehouse_id, sign in ((source_id, -1), (target_id, 1))
+    ])
+    return dict(moves)
@@ -5,4 +5,14 @@ app_name = 'products'
 
 urlpatterns = [
     path('material/', views.MaterialViewSet.as_view(), name='material'),
+    path('product/', views.ProductViewSet.as_view(), name='product'),
+    path('bom/', views.BillOfMaterialsViewSet.as_view(), name='bom'),
+    path('component/', views.ProductComponentViewSet.as_view(), name='component'),
+    path('product/<int:pk>/explosion/', views.ProductExplosionView.as_view(), name='explosion'),
+    path('scan/', views.ScanView.as_view(), name='scan'),
+    path('transfer/', views.TransferView.as_view(), name='transfer'),
+    path('inventory/<int:pk>/adjust/', views.InventoryAdjustView.as_view(), name='inventory_adjust'),
+    path('lot/<int:pk>/adjust/', views.LotAdjustView.as_view(), name='lot_adjust'),
+    path('atp/', views.AvailableToPromiseView.as_view(), name='atp'),
+    path('schedule/', views.ScheduleView.as_view(), name='schedule'),
 ]
@@ -4,18 +4,35 @@ from rest_framework import generics, permissions, status
 from users.models import UserGroups
 from users.permissions import has_group_permission
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 from rest_framework.request import Request
 from rest_framework.response import Response
 from . import serializers, models
 from typing import Any
+from dataclasses import asdict
 from django.db import transaction
+from .scheduling import Scheduler
+from .atp import available_to_promise
+from .bom import explode
+from .scanning import resolve
+from .transfers import transfer
+from .services import ConcurrentUpdateError, adjust_quantity
+from django.core.exceptions import ValidationError as DjangoValidationError
+from wms.idempotency import idempotency_key_parameter
+from wms.bulk import BulkResultSerializer, BulkUpsertMixin
+from .scanning import item_cache
+from .signals import stock_changed
 
 
-class MaterialViewSet(generics.ListCreateAPIView):
+class MaterialViewSet(BulkUpsertMixin, generics.ListCreateAPIView):
     """View for managing materials."""
     queryset = models.Material.objects.all()
     serializer_class = serializers.MaterialSerializer
     permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 7}
+    bulk_serializer_class = serializers.MaterialBulkSerializer
+    bulk_unique_fields = ['name']
+    bulk_update_fields = ['unit']
 
     @swagger_auto_schema(
         operation_description="Get all materials",
@@ -25,8 +42,290 @@ class MaterialViewSet(generics.ListCreateAPIView):
         return super().get(request, *args, **kwargs)
 
     @swagger_auto_schema(
-        operation_description="Create a new material",
-        responses={201: serializers.MaterialSerializer},
+        operation_description="Create a new material. A list of up to 5000 materials is upserted by name "
+                              "and answered with one result per item.",
+        manual_parameters=[idempotency_key_parameter],
+        responses={201: serializers.MaterialSerializer, 200: BulkResultSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+
+class ProductViewSet(BulkUpsertMixin, generics.ListCreateAPIView):
+    """View for managing products."""
+    serializer_class = serializers.ProductSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 8}
+    bulk_serializer_class = serializers.ProductBulkSerializer
+    bulk_unique_fields = ['name']
+    bulk_update_fields = ['unit', 'production_rate']
+
+    def get_queryset(self):
+        return models.Product.objects.filter(company_id=self.request.user.company_id)
+
+    @swagger_auto_schema(
+        operation_description="Get all products of the user's company",
+        responses={200: serializers.ProductSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Create a new product. A list of up to 5000 products is upserted by name "
+                              "and answered with one result per item.",
+        manual_parameters=[idempotency_key_parameter],
+        responses={201: serializers.ProductSerializer, 200: BulkResultSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+    def bulk_saved(self, created, updated, company_id):
+        # bulk_create skips post_save, which seeds the closure and evicts scan results.
+        models.ProductClosure.objects.bulk_create(
+            [models.ProductClosure(ancestor_id=pk, descendant_id=pk, quantity=1, paths=1) for pk in created],
+            ignore_conflicts=True,
+        )
+        if updated:
+            item_cache.clear()
+
+
+class BillOfMaterialsViewSet(BulkUpsertMixin, generics.ListCreateAPIView):
+    """View for managing bills of materials."""
+    serializer_class = serializers.BillOfMaterialsSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 9}
+    bulk_serializer_class = serializers.BillOfMaterialsBulkSerializer
+    bulk_unique_fields = ['product_id', 'material_id']
+    bulk_update_fields = ['quantity']
+    bulk_related = {'product_id': (models.Product, 'company_id'), 'material_id': (models.Material, 'company_id')}
+    bulk_company_lookup = 'product__company_id'
+
+    def get_queryset(self):
+        return models.BillOfMaterials.objects.filter(product__company_id=self.request.user.company_id)
+
+    @swagger_auto_schema(
+        operation_description="Get the bills of materials of the user's company",
+        responses={200: serializers.BillOfMaterialsSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Add a material to a product's bill. A list of up to 5000 lines is upserted "
+                              "by product and material and answered with one result per item.",
+        manual_parameters=[idempotency_key_parameter],
+        responses={201: serializers.BillOfMaterialsSerializer, 200: BulkResultSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+    def bulk_saved(self, created, updated, company_id):
+        stock_changed.send(sender=models.BillOfMaterials, company_id=company_id)
+
+
+class ScheduleView(generics.ListAPIView):
+    """View for the production schedule of the user's company."""
+    serializer_class = serializers.ScheduledBatchSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 8}
+
+    def get_queryset(self):
+        return (
+            models.ProductBatch.objects
+            .filter(warehouse__company_id=self.request.user.company_id, scheduled_start__isnull=False)
+            .select_related('order')
+            .order_by('warehouse_id', 'scheduled_start')
+        )
+
+    @swagger_auto_schema(
+        operation_description="Get scheduled product batches ordered by warehouse and start time",
+        responses={200: serializers.ScheduledBatchSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Plan pending product batches. With `batch` only that batch and the ones "
+                              "after it in its warehouse are rescheduled.",
+        request_body=serializers.ScheduleRequestSerializer,
+        responses={200: serializers.ScheduleResultSerializer},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        params = serializers.ScheduleRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        scheduler = Scheduler(request.user.company_id)
+        if 'batch' in params.validated_data:
+            batch = generics.get_object_or_404(
+                models.ProductBatch, pk=params.validated_data['batch'],
+                warehouse__company_id=request.user.company_id,
+            )
+            result = scheduler.insert(batch)
+        elif 'warehouse' in params.validated_data:
+            result = scheduler.plan([params.validated_data['warehouse']])
+        else:
+            result = scheduler.plan()
+        return Response(serializers.ScheduleResultSerializer(asdict(result)).data, status=status.HTTP_200_OK)
+
+
+class AvailableToPromiseView(generics.GenericAPIView):
+    """View for the quantities of products that can be built from current stock."""
+    serializer_class = serializers.AvailableToPromiseSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3}
+
+    @swagger_auto_schema(
+        operation_description="Get available-to-promise quantities of the given (by default all) products. "
+                              "Products without a bill of materials are omitted.",
+        manual_parameters=[openapi.Parameter(
+            'product', openapi.IN_QUERY, type=openapi.TYPE_ARRAY,
+            items=openapi.Items(type=openapi.TYPE_INTEGER), collection_format='multi',
+        )],
+        responses={200: serializers.AvailableToPromiseSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        product_ids = request.query_params.getlist('product')
+        if not all(pk.isdigit() for pk in product_ids):
+            return Response({'error': 'product must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        quantities = available_to_promise(
+            request.user.company_id, [int(pk) for pk in product_ids] if product_ids else None
+        )
+        data = [{'product': pk, 'quantity': quantity} for pk, quantity in quantities.items()]
+        return Response(self.get_serializer(data, many=True).data)
+
+
+class ProductComponentViewSet(generics.ListCreateAPIView):
+    """View for managing subassemblies of products."""
+    serializer_class = serializers.ProductComponentSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 14}
+
+    def get_queryset(self):
+        return models.ProductComponent.objects.filter(parent__company_id=self.request.user.company_id)
+
+    @swagger_auto_schema(
+        operation_description="Get all product components",
+        responses={200: serializers.ProductComponentSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Add a product as a component of another product. Cycles are rejected.",
+        responses={201: serializers.ProductComponentSerializer},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+
+class ProductExplosionView(generics.GenericAPIView):
+    """View for the materials of a product across all subassembly levels."""
+    serializer_class = serializers.ExplodedMaterialSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 4}
+
+    def get_queryset(self):
+        return models.Product.objects.filter(company_id=self.request.user.company_id)
+
+    @swagger_auto_schema(
+        operation_description="Get the total quantity of every material in one unit of the product",
+        responses={200: serializers.ExplodedMaterialSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        product = self.get_object()
+        data = [{'material': pk, 'quantity': quantity} for pk, quantity in explode(product.pk).items()]
+        return Response(self.get_serializer(data, many=True).data)
+
+
+class ScanView(generics.GenericAPIView):
+    """View resolving scanned serial numbers and lot labels."""
+    serializer_class = serializers.ScanRequestSerializer
+    permission_classes = [has_group_permission(
+        [UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER, UserGroups.PICKER_PACKER]
+    )]
+    query_budget = {'post': 4}
+
+    @swagger_auto_schema(
+        operation_description="Resolve up to 500 scanned barcodes. Results keep the order of the request; "
+                              "unknown barcodes have a null type.",
+        responses={200: serializers.ScanResultSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Results are built as plain dicts; output serializers only document the schema.
+        return Response(resolve(serializer.validated_data['barcodes'], request.user.company_id))
+
+
+class TransferView(generics.GenericAPIView):
+    """View moving stock of many lots between two warehouse zones."""
+    serializer_class = serializers.TransferSerializer
+    permission_classes = [has_group_permission(
+        [UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER, UserGroups.PICKER_PACKER]
+    )]
+    query_budget = {'post': 11}
+
+    @swagger_auto_schema(
+        operation_description="Move up to 5000 lots from one warehouse to another in one transaction. "
+                               "Allowed moves: Main to Production and back, Production to Finished and "
+                               "Finished to Shipped. Nothing is moved when a lot is short.",
+        responses={200: serializers.TransferResultSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            moved = transfer(request.user.company_id, data['source'], data['target'],
+                             [(line['lot'], line['quantity']) for line in data['lines']])
+        except DjangoValidationError as e:
+            return Response({'error': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        result = [{'lot': lot_id, 'quantity': quantity} for lot_id, quantity in moved.items()]
+        return Response(serializers.TransferResultSerializer(result, many=True).data)
+
+
+class AdjustQuantityView(generics.GenericAPIView):
+    """Base view adjusting the quantity of a versioned stock row."""
+    serializer_class = serializers.AdjustmentRequestSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'post': 10}
+    model = None
+
+    def post(self, request: Request, pk: int, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            adjustment = adjust_quantity(self.model, pk, request.user.company_id, serializer.validated_data['delta'],
+                                         serializer.validated_data.get('version'))
+        except self.model.DoesNotExist:
+            return Response({'error': f'{self.model.__name__} not found'}, status=status.HTTP_404_NOT_FOUND)
+        except DjangoValidationError as e:
+            return Response({'error': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        except ConcurrentUpdateError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(serializers.AdjustmentSerializer(asdict(adjustment) | {'id': adjustment.pk}).data)
+
+
+class InventoryAdjustView(AdjustQuantityView):
+    """View adjusting the quantity of an inventory row."""
+    model = models.Inventory
+
+    @swagger_auto_schema(
+        operation_description="Add `delta` to the quantity of an inventory row. Conflicting concurrent "
+                              "updates are retried; with `version` a changed row is a conflict.",
+        responses={200: serializers.AdjustmentSerializer, 409: 'Concurrent update'},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+
+class LotAdjustView(AdjustQuantityView):
+    """View adjusting the remaining quantity of a lot."""
+    model = models.Lot
+
+    @swagger_auto_schema(
+        operation_description="Add `delta` to the remaining quantity of a lot. Conflicting concurrent "
+                              "updates are retried; with `version` a changed row is a conflict.",
+        responses={200: serializers.AdjustmentSerializer, 409: 'Concurrent update'},
     )
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().post(request, *args, **kwargs)
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from wms.admin_utils import LargeTableAdmin
+from . import models
+
+
+@admin.register(models.Rollup)
+class RollupAdmin(LargeTableAdmin):
+    list_display = ('metric', 'period', 'start', 'subject', 'value', 'company')
+    list_select_related = ('company',)
+    list_filter = ('metric', 'period')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
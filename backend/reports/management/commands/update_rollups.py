@@ -0,0 +1,17 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from reports import rollups
+
+
+class Command(BaseCommand):
+    help = ('Add new production, shipment and consumption rows to the report rollups. '
+            'Meant to be run periodically (e.g. every few minutes from cron).')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute every rollup from the full history')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        counts = rollups.rebuild() if options['rebuild'] else rollups.update_all()
+        summary = ', '.join(f'{count} {metric} day totals' for metric, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Added {summary}'))
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-19 11:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0008_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=20, unique=True)),
+                ('position', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'rollup_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('production', 'Produced units per product'), ('shipments', 'Shipped orders'), ('consumption', 'Allocated quantity per material')], max_length=20)),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('start', models.DateField(help_text='First day of the period; weeks start on Monday')),
+                ('subject', models.PositiveBigIntegerField(default=0, help_text='Product or material id, 0 for shipments')),
+                ('value', models.FloatField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+            ],
+            options={
+                'db_table': 'rollup',
+                'constraints': [models.UniqueConstraint(fields=('company', 'metric', 'period', 'start', 'subject'), name='rollup_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+from users.models import Company
+
+
+class Rollup(models.Model):
+    """Total of a metric over a day, week or month, maintained by ``reports.rollups``."""
+    PRODUCTION = 'production'
+    SHIPMENTS = 'shipments'
+    CONSUMPTION = 'consumption'
+    METRIC_CHOICES = (
+        (PRODUCTION, 'Produced units per product'),
+        (SHIPMENTS, 'Shipped orders'),
+        (CONSUMPTION, 'Allocated quantity per material'),
+    )
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    PERIOD_CHOICES = (
+        (DAY, 'Day'),
+        (WEEK, 'Week'),
+        (MONTH, 'Month'),
+    )
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    start = models.DateField(help_text="First day of the period; weeks start on Monday")
+    subject = models.PositiveBigIntegerField(default=0, help_text="Product or material id, 0 for shipments")
+    value = models.FloatField(default=0)
+
+    def __str__(self):
+        return f'Rollup: {self.metric} - {self.period} {self.start} - {self.subject} - {self.value}'
+
+    class Meta:
+        db_table = 'rollup'
+        constraints = [
+            # Also serves the reports' range reads.
+            models.UniqueConstraint(fields=['company', 'metric', 'period', 'start', 'subject'],
+                                    name='rollup_unique'),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Timestamp up to which the source rows of a metric have been added to the rollups."""
+    metric = models.CharField(max_length=20, unique=True)
+    position = models.DateTimeField()
+
+    class Meta:
+        db_table = 'rollup_watermark'
@@ -0,0 +1,125 @@
+"""
+Rollup tables for production, shipment and consumption reports.
+
+Reports read pre-aggregated totals from ``Rollup`` instead of scanning the
+source tables, so a dashboard query reads the same number of rows however
+long the history is. Every metric is summed per company, subject (product or
+material) and day, ISO week and month:
+
+- ``production``: items produced per product, by ``Item.production_date``
+- ``shipments``: orders shipped, by ``Order.shipped_date``
+- ``consumption``: lot quantity allocated to product batches per material,
+  by ``Batch.created_at``
+
+The rollups are maintained by a delta job keyed on a watermark rather than
+by signals, so bulk loads and set-based writes are covered as well. For
+every metric ``update`` reads the rows whose timestamp lies between the
+metric's watermark and ``now - LAG_SECONDS``, aggregated by day in the
+database, adds them to the day, week and month rows with one
+``INSERT ... ON CONFLICT DO UPDATE`` (see ``wms.db.upsert_add``) and moves
+the watermark, all in one transaction. The lag keeps rows of transactions
+still open when the job runs from being skipped. ``python manage.py
+update_rollups`` runs the job and is meant to run every few minutes.
+
+Rows are counted once, when their timestamp passes the watermark. Later
+edits of their quantities and rows written with a timestamp before the
+watermark are only reflected by ``update_rollups --rebuild``.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Model, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+from orders.models import Order
+from products.models import Batch, Item
+from wms.db import upsert_add
+from .models import Rollup, RollupWatermark
+
+DEFAULTS = {
+    # Rows younger than this are left for the next run.
+    'LAG_SECONDS': 60,
+}
+
+
+def reports_settings() -> Dict[str, Any]:
+    """Get REPORTS settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'REPORTS', {})}
+
+
+@dataclass
+class Source:
+    """Rows summed into the rollups of a metric."""
+
+    model: Type[Model]
+    timestamp: str
+    company: str
+    subject: Optional[str]
+    value: Any
+
+
+SOURCES = {
+    Rollup.PRODUCTION: Source(Item, 'production_date', 'batch__product__company_id', 'batch__product_id', Count('pk')),
+    Rollup.SHIPMENTS: Source(Order, 'shipped_date', 'company_id', None, Count('pk')),
+    Rollup.CONSUMPTION: Source(Batch, 'created_at', 'lot__material__company_id', 'lot__material_id', Sum('quantity')),
+}
+
+
+def period_starts(day: date) -> Iterator[Tuple[str, date]]:
+    """Periods containing a day with their first day."""
+    yield Rollup.DAY, day
+    yield Rollup.WEEK, day - timedelta(days=day.weekday())
+    yield Rollup.MONTH, day.replace(day=1)
+
+
+def update(metric: str, now: Optional[datetime] = None) -> int:
+    """
+    Add the source rows of a metric that passed the watermark to its rollups.
+
+    Returns:
+        Number of day totals read
+    """
+    source = SOURCES[metric]
+    cutoff = (now or timezone.now()) - timedelta(seconds=reports_settings()['LAG_SECONDS'])
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().filter(metric=metric).first()
+        rows = source.model.objects.filter(**{f'{source.timestamp}__lt': cutoff})
+        if watermark is not None:
+            if watermark.position >= cutoff:
+                return 0
+            rows = rows.filter(**{f'{source.timestamp}__gte': watermark.position})
+        groups = [source.company, *([source.subject] if source.subject else [])]
+        days = list(
+            rows.annotate(day=TruncDate(source.timestamp))
+            .values(*groups, 'day')
+            .annotate(total=source.value)
+            .values_list(*groups, 'day', 'total')
+        )
+        totals: Dict[Tuple, float] = defaultdict(float)
+        for company_id, *subject, day, total in days:
+            for period, start in period_starts(day):
+                totals[company_id, metric, period, start, subject[0] if subject else 0] += total
+        upsert_add(Rollup, ['company_id', 'metric', 'period', 'start', 'subject'], 'value',
+                   [(*key, total) for key, total in totals.items()])
+        if watermark is None:
+            RollupWatermark.objects.create(metric=metric, position=cutoff)
+        else:
+            watermark.position = cutoff
+            watermark.save(update_fields=['position'])
+    return len(days)
+
+
+def update_all(now: Optional[datetime] = None) -> Dict[str, int]:
+    return {metric: update(metric, now) for metric in SOURCES}
+
+
+def rebuild(now: Optional[datetime] = None) -> Dict[str, int]:
+    """Recompute every rollup from the full history."""
+    with transaction.atomic():
+        Rollup.objects.all().delete()
+        RollupWatermark.objects.all().delete()
+        return update_all(now)
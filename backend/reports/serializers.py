@@ -0,0 +1,32 @@
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import serializers
+from . import models
+
+# Periods returned when the request gives no start.
+DEFAULT_PERIODS = {
+    models.Rollup.DAY: timedelta(days=30),
+    models.Rollup.WEEK: timedelta(weeks=26),
+    models.Rollup.MONTH: timedelta(days=365),
+}
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=models.Rollup.PERIOD_CHOICES, default=models.Rollup.DAY)
+    start = serializers.DateField(required=False, help_text='First day, by default 30 days, 26 weeks or '
+                                                             '12 months before the end')
+    end = serializers.DateField(required=False, help_text='Last day, today by default')
+    subject = serializers.IntegerField(required=False, help_text='Only this product or material')
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', attrs['end'] - DEFAULT_PERIODS[attrs['period']])
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'start': 'Start must not be after the end.'})
+        return attrs
+
+
+class RollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Rollup
+        fields = ['start', 'subject', 'value']
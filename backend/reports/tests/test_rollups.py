@@ -0,0 +1,140 @@
+"""
+Test suite for the report rollups.
+"""
+
+from datetime import date, datetime, timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from rest_framework.test import APIClient
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from warehouse.models import Warehouse
+from orders.models import Order
+from products.models import Batch, Item, Lot, Material, Product, ProductBatch
+from ..models import Rollup
+from ..rollups import rebuild, update, update_all
+
+MONDAY = timezone.make_aware(datetime(2026, 3, 2, 12))
+
+
+class TestRollups(TestCase):
+    """Test suite for the watermark delta job and the report endpoints."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.warehouse = Warehouse.objects.create(company=cls.company, name='Production')
+        supplier = create_supplier(cls.company)
+        customer = create_client(cls.company)
+        cls.material = Material.objects.create(company=cls.company, name='Steel', unit='kg')
+        cls.lots = [
+            Lot.objects.create(supplier=supplier, material=cls.material, quantity_received=100,
+                               quantity_remaining=100, expiration=MONDAY + timedelta(days=365))
+            for _ in range(3)
+        ]
+        cls.product = Product.objects.create(company=cls.company, name='Chair', unit='pcs')
+        cls.order = Order.objects.create(company=cls.company, client=customer, status='Shipped')
+        cls.batch = ProductBatch.objects.create(warehouse=cls.warehouse, product=cls.product, order=cls.order,
+                                                ordered_quantity=10, produced_quantity=0)
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def produce(self, *moments: datetime) -> None:
+        for moment in moments:
+            item = Item.objects.create(serial_number=f'SN-{Item.objects.count()}', batch=self.batch,
+                                       operator=self.user)
+            Item.objects.filter(pk=item.pk).update(production_date=moment)
+
+    def allocate(self, lot: Lot, quantity: float, moment: datetime) -> None:
+        batch = Batch.objects.create(product_batch=self.batch, lot=lot, quantity=quantity)
+        Batch.objects.filter(pk=batch.pk).update(created_at=moment)
+
+    def rollups(self, metric: str, period: str) -> list:
+        return list(Rollup.objects.filter(metric=metric, period=period).order_by('start', 'subject')
+                    .values_list('start', 'subject', 'value'))
+
+    def test_incremental_updates(self) -> None:
+        """
+        Test maintaining the rollups with the delta job.
+
+        Verifies:
+            - Rows are summed per day, week starting on Monday and month
+            - A run adds only rows that passed the watermark since the last run
+            - Rows younger than the lag are left for a later run
+            - Rows written behind the watermark are only counted by a rebuild
+            - A rebuild reproduces the incremental totals
+        """
+        self.produce(MONDAY, MONDAY + timedelta(hours=1), MONDAY + timedelta(days=1), MONDAY + timedelta(days=8))
+        Order.objects.filter(pk=self.order.pk).update(shipped_date=MONDAY + timedelta(days=1))
+        self.allocate(self.lots[0], 5, MONDAY)
+        self.allocate(self.lots[1], 2.5, MONDAY + timedelta(days=30))
+        now = MONDAY + timedelta(days=18)
+        assert update_all(now) == {Rollup.PRODUCTION: 3, Rollup.SHIPMENTS: 1, Rollup.CONSUMPTION: 1}
+
+        product = self.product.pk
+        assert self.rollups(Rollup.PRODUCTION, Rollup.DAY) == [
+            (date(2026, 3, 2), product, 2), (date(2026, 3, 3), product, 1), (date(2026, 3, 10), product, 1)]
+        assert self.rollups(Rollup.PRODUCTION, Rollup.WEEK) == [
+            (date(2026, 3, 2), product, 3), (date(2026, 3, 9), product, 1)]
+        assert self.rollups(Rollup.PRODUCTION, Rollup.MONTH) == [(date(2026, 3, 1), product, 4)]
+        assert self.rollups(Rollup.SHIPMENTS, Rollup.MONTH) == [(date(2026, 3, 1), 0, 1)]
+        assert self.rollups(Rollup.CONSUMPTION, Rollup.DAY) == [(date(2026, 3, 2), self.material.pk, 5)]
+
+        later = now + timedelta(hours=2)
+        self.produce(now - timedelta(hours=1), now + timedelta(hours=1), later - timedelta(seconds=30))
+        assert update(Rollup.PRODUCTION, later) == 1
+        assert update(Rollup.PRODUCTION, later + timedelta(minutes=5)) == 1
+        assert update(Rollup.PRODUCTION, later + timedelta(minutes=5)) == 0
+        assert self.rollups(Rollup.PRODUCTION, Rollup.MONTH) == [(date(2026, 3, 1), product, 6)]
+
+        update_all(now + timedelta(days=60))
+        incremental = {metric: self.rollups(metric, Rollup.DAY) for metric, _ in Rollup.METRIC_CHOICES}
+        rebuild(now + timedelta(days=60))
+        rebuilt = {metric: self.rollups(metric, Rollup.DAY) for metric, _ in Rollup.METRIC_CHOICES}
+        assert rebuilt[Rollup.CONSUMPTION] == incremental[Rollup.CONSUMPTION]
+        assert rebuilt[Rollup.PRODUCTION] == incremental[Rollup.PRODUCTION][:-1] + [
+            (date(2026, 3, 20), product, incremental[Rollup.PRODUCTION][-1][2] + 1)]
+
+    def test_command(self) -> None:
+        """
+        Test the periodic command.
+
+        Verifies:
+            - Every metric is updated
+        """
+        self.produce(MONDAY)
+        out = StringIO()
+        call_command('update_rollups', stdout=out)
+        assert '1 production day totals, 0 shipments day totals, 0 consumption day totals' in out.getvalue()
+
+    def test_endpoints(self) -> None:
+        """
+        Test reading the rollups.
+
+        Verifies:
+            - Totals of the requested period and range are listed by start
+            - Rollups of other companies are not listed
+            - A start after the end is rejected
+        """
+        self.produce(MONDAY, MONDAY + timedelta(days=7))
+        update_all(MONDAY + timedelta(days=30))
+        other = Company.objects.create(name='Other', domain='other.com', email='other@other.com')
+        Rollup.objects.create(company=other, metric=Rollup.PRODUCTION, period=Rollup.WEEK, start=date(2026, 3, 2),
+                              subject=1, value=10)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('reports:production'), {'period': 'week', 'start': '2026-03-01',
+                                                              'end': '2026-03-31'})
+        assert response.status_code == 200
+        assert response.json() == [
+            {'start': '2026-03-02', 'subject': self.product.pk, 'value': 1},
+            {'start': '2026-03-09', 'subject': self.product.pk, 'value': 1},
+        ]
+        response = client.get(reverse('reports:production'), {'period': 'day', 'start': '2026-03-03',
+                                                              'end': '2026-03-31', 'subject': self.product.pk})
+        assert [row['start'] for row in response.json()] == ['2026-03-09']
+        response = client.get(reverse('reports:shipments'), {'start': '2026-03-31', 'end': '2026-03-01'})
+        assert response.status_code == 400
@@ -0,0 +1,10 @@
+from . import views, models
+from django.urls import path
+
+app_name = 'reports'
+
+urlpatterns = [
+    path('production/', views.ReportView.as_view(metric=models.Rollup.PRODUCTION), name='production'),
+    path('shipments/', views.ReportView.as_view(metric=models.Rollup.SHIPMENTS), name='shipments'),
+    path('consumption/', views.ReportView.as_view(metric=models.Rollup.CONSUMPTION), name='consumption'),
+]
@@ -0,0 +1,38 @@
+from rest_framework import generics
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Any
+from . import serializers, models
+
+
+class ReportView(generics.ListAPIView):
+    """View for the rollups of one metric of the user's company."""
+    serializer_class = serializers.RollupSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3}
+    metric = None
+
+    def get_queryset(self):
+        query = serializers.ReportQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        rollups = models.Rollup.objects.filter(
+            company_id=self.request.user.company_id, metric=self.metric, period=params['period'],
+            start__gte=params['start'], start__lte=params['end'],
+        )
+        if 'subject' in params:
+            rollups = rollups.filter(subject=params['subject'])
+        return rollups.order_by('start', 'subject')
+
+    @swagger_auto_schema(
+        operation_description="Get totals per day, week or month read from the report rollups, which are "
+                              "refreshed every few minutes. `subject` is the product of production, the "
+                              "material of consumption and 0 for shipments.",
+        query_serializer=serializers.ReportQuerySerializer,
+        responses={200: serializers.RollupSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
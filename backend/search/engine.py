@@ -0,0 +1,126 @@
+"""
+Type-ahead search over the catalog: materials, products, clients and suppliers.
+
+Every source is matched by substring, case-insensitively, on its name and,
+for clients and suppliers, also on email and phone, within one company:
+
+- On PostgreSQL the columns have ``pg_trgm`` GIN indexes (see
+  ``search/migrations/0001_search_index.py``), so ``ILIKE '%query%'`` is an
+  index lookup. Matches are ranked by trigram similarity to the query.
+- On SQLite the migration creates ``search_index``, an FTS5 table with the
+  trigram tokenizer kept in step with the source tables by triggers, so
+  set-based updates and raw bulk loads are indexed too. Matches by name rank
+  above matches by email or phone only, shorter names first.
+- Other databases fall back to scanning with ``LIKE``, shorter names first.
+
+Names starting with the query rank first on every backend. All sources are
+searched with one statement. Ranking reads every column of every match, so
+only the first ``CANDIDATES`` matches of each source are ranked; a query
+that broad is refined by the next keystroke anyway. Queries shorter than
+``MIN_LENGTH`` characters have no trigram to look up and return nothing.
+"""
+
+from dataclasses import dataclass
+from django.db import connection
+from typing import Dict, List, Optional, Sequence
+
+MIN_LENGTH = 3
+MAX_LIMIT = 50
+# Matches ranked per source; broader queries rank an arbitrary subset of their matches.
+CANDIDATES = 1000
+
+
+@dataclass
+class Source:
+    """A searchable table."""
+
+    code: int
+    table: str
+    columns: Sequence[str]
+
+
+SOURCES: Dict[str, Source] = {
+    'material': Source(0, 'material', ('name',)),
+    'product': Source(1, 'product', ('name',)),
+    'client': Source(2, 'client', ('name', 'email', 'phone')),
+    'supplier': Source(3, 'supplier', ('name', 'email', 'phone')),
+}
+
+
+@dataclass
+class Result:
+    kind: str
+    id: int
+    name: str
+    email: Optional[str]
+    phone: Optional[str]
+
+
+def like_pattern(query: str) -> str:
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def search(company_id: int, query: str, kinds: Optional[Sequence[str]] = None, limit: int = 20) -> List[Result]:
+    """
+    Find catalog entries of a company containing the query.
+
+    Args:
+        company_id: Company whose entries are searched
+        query: Text to find; shorter than ``MIN_LENGTH`` characters finds nothing
+        kinds: Sources to search, all by default
+        limit: Maximum number of results
+
+    Returns:
+        Best matches first
+    """
+    query = query.strip()
+    kinds = list(kinds or SOURCES)
+    if len(query) < MIN_LENGTH or not kinds:
+        return []
+    limit = min(limit, MAX_LIMIT)
+    if connection.vendor == 'sqlite':
+        sql, params = _fts5_sql(company_id, query, kinds, limit)
+    else:
+        sql, params = _like_sql(company_id, query, kinds, limit, connection.vendor == 'postgresql')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [Result(*row) for row in cursor.fetchall()]
+
+
+def _like_sql(company_id: int, query: str, kinds: Sequence[str], limit: int, trigram: bool):
+    pattern = like_pattern(query)
+    operator = 'ILIKE' if trigram else 'LIKE'
+    branches, params = [], []
+    for kind in kinds:
+        source = SOURCES[kind]
+        contact = 'email, phone' if 'email' in source.columns else 'NULL AS email, NULL AS phone'
+        if trigram:
+            rank = f'GREATEST({", ".join(f"similarity({column}, %s)" for column in source.columns)})'
+        else:
+            rank = '-LENGTH(name)'
+        matches = ' OR '.join(f"{column} {operator} %s ESCAPE '\\'" for column in source.columns)
+        branches.append(
+            f"SELECT * FROM (SELECT '{kind}' AS kind, id, name, email, phone, "
+            f"CASE WHEN name {operator} %s ESCAPE '\\' THEN 0 ELSE 1 END AS prefix, {rank} AS rank "
+            f"FROM (SELECT id, name, {contact} FROM {source.table} WHERE company_id = %s AND ({matches}) "
+            f"LIMIT %s) AS {kind}_candidates ORDER BY prefix, rank DESC, name LIMIT %s) AS {kind}_results"
+        )
+        params += [pattern[1:], *[query] * len(source.columns) * trigram, company_id,
+                   *[pattern] * len(source.columns), CANDIDATES, limit]
+    sql = (f'SELECT kind, id, name, email, phone FROM ({" UNION ALL ".join(branches)}) AS results '
+           f'ORDER BY prefix, rank DESC, name LIMIT %s')
+    return sql, params + [limit]
+
+
+def _fts5_sql(company_id: int, query: str, kinds: Sequence[str], limit: int):
+    pattern = like_pattern(query)
+    placeholders = ', '.join(['%s'] * len(kinds))
+    sql = (
+        "SELECT kind, object_id, name, email, phone FROM ("
+        "SELECT kind, object_id, name, email, phone FROM search_index "
+        f"WHERE search_index MATCH %s AND company_id = %s AND kind IN ({placeholders}) LIMIT %s"
+        ") AS candidates ORDER BY CASE WHEN name LIKE %s ESCAPE '\\' THEN 0 "
+        "WHEN name LIKE %s ESCAPE '\\' THEN 1 ELSE 2 END, LENGTH(name), name LIMIT %s"
+    )
+    return sql, ['"' + query.replace('"', '""') + '"', company_id, *kinds, CANDIDATES, pattern[1:], pattern, limit]
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# Table: (row id offset in search_index, whether it has email and phone), see search.engine.SOURCES.
+SOURCES = {
+    'material': (0, False),
+    'product': (1, False),
+    'client': (2, True),
+    'supplier': (3, True),
+}
+
+
+def sqlite_statements():
+    yield (
+        "CREATE VIRTUAL TABLE search_index USING fts5("
+        "kind UNINDEXED, company_id UNINDEXED, object_id UNINDEXED, name, email, phone, tokenize='trigram')"
+    )
+    for table, (code, contact) in SOURCES.items():
+        email, phone = ('email', 'phone') if contact else ('NULL', 'NULL')
+        new_email, new_phone = ('new.email', 'new.phone') if contact else ('NULL', 'NULL')
+        insert = (
+            "INSERT INTO search_index(rowid, kind, company_id, object_id, name, email, phone) "
+            f"VALUES (new.id * 4 + {code}, '{table}', new.company_id, new.id, new.name, {new_email}, {new_phone});"
+        )
+        delete = f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code};"
+        yield f"CREATE TRIGGER search_{table}_insert AFTER INSERT ON {table} BEGIN {insert} END"
+        yield f"CREATE TRIGGER search_{table}_update AFTER UPDATE ON {table} BEGIN {delete} {insert} END"
+        yield f"CREATE TRIGGER search_{table}_delete AFTER DELETE ON {table} BEGIN {delete} END"
+        yield (
+            "INSERT INTO search_index(rowid, kind, company_id, object_id, name, email, phone) "
+            f"SELECT id * 4 + {code}, '{table}', company_id, id, name, {email}, {phone} FROM {table}"
+        )
+
+
+def postgresql_statements():
+    yield 'CREATE EXTENSION IF NOT EXISTS pg_trgm'
+    for table, (_, contact) in SOURCES.items():
+        for column in ('name', 'email', 'phone') if contact else ('name',):
+            yield (f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm '
+                   f'ON {table} USING gin ({column} gin_trgm_ops)')
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': sqlite_statements, 'postgresql': postgresql_statements}.get(vendor)
+    for statement in statements() if statements else ():
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table in SOURCES:
+            for event in ('insert', 'update', 'delete'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS search_{table}_{event}')
+        schema_editor.execute('DROP TABLE IF EXISTS search_index')
+    elif vendor == 'postgresql':
+        for table, (_, contact) in SOURCES.items():
+            for column in ('name', 'email', 'phone') if contact else ('name',):
+                schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_batch_created_at'),
+        ('clients', '0001_initial'),
+        ('suppliers', '0002_lead_time_and_minimum_order'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from . import engine
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(required=False, default='', allow_blank=True, max_length=100,
+                              help_text=f'Text to find, at least {engine.MIN_LENGTH} characters')
+    kinds = serializers.MultipleChoiceField(choices=list(engine.SOURCES), required=False,
+                                            help_text='Only these kinds of entries, all by default')
+    limit = serializers.IntegerField(default=20, min_value=1, max_value=engine.MAX_LIMIT)
+
+
+class SearchResultSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=list(engine.SOURCES))
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    email = serializers.CharField(allow_null=True)
+    phone = serializers.CharField(allow_null=True)
@@ -0,0 +1,94 @@
+"""
+Test suite for the catalog search.
+"""
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from conftest import create_user
+from users.models import Company, UserGroups
+from suppliers.models import Supplier
+from clients.models import Client
+from products.models import Material, Product
+from ..engine import search
+
+
+class TestSearch(TestCase):
+    """Test suite for searching materials, products, clients and suppliers."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.other = Company.objects.create(name='Other', domain='other.com', email='other@other.com')
+        cls.oak = Material.objects.create(company=cls.company, name='Oak board', unit='m2')
+        cls.cloak = Material.objects.create(company=cls.company, name='Cloak fabric', unit='m2')
+        cls.table = Product.objects.create(company=cls.company, name='Oak table', unit='pcs')
+        cls.supplier = Supplier.objects.create(
+            company=cls.company, name='Timber', address='Street 1', phone='+48 555 010 203',
+            email='sales@oakwood.example.com', website='https://oakwood.example.com',
+        )
+        cls.customer = Client.objects.create(
+            company=cls.company, name='Furniture 100%', address='Street 2', phone='+48 600 700 800',
+            email='orders@furniture.example.com', website='https://furniture.example.com',
+        )
+        Material.objects.create(company=cls.other, name='Oak veneer', unit='m2')
+        cls.user = create_user(cls.company, 'picker', UserGroups.PICKER_PACKER)
+
+    def found(self, query: str, **kwargs) -> list:
+        return [(result.kind, result.id) for result in search(self.company.pk, query, **kwargs)]
+
+    def test_search(self) -> None:
+        """
+        Test matching and ranking.
+
+        Verifies:
+            - Names are matched by substring regardless of case, names starting with the query first
+            - Clients and suppliers are also matched by email and phone
+            - Entries of other companies are not found
+            - Results can be limited to some kinds and in number
+            - Queries shorter than three characters and LIKE wildcards find nothing special
+        """
+        found = self.found('OAK')
+        assert set(found[:2]) == {('material', self.oak.pk), ('product', self.table.pk)}
+        assert set(found[2:]) == {('material', self.cloak.pk), ('supplier', self.supplier.pk)}
+        assert self.found('555 010') == [('supplier', self.supplier.pk)]
+        assert self.found('oak', kinds=['product']) == [('product', self.table.pk)]
+        assert len(self.found('oak', limit=3)) == 3
+        assert self.found('oa') == []
+        assert self.found('100%') == [('client', self.customer.pk)]
+        assert self.found('o%k') == []
+
+    def test_index_follows_changes(self) -> None:
+        """
+        Test finding entries after they change.
+
+        Verifies:
+            - Created, renamed and deleted entries are found accordingly, also after set-based updates
+        """
+        walnut = Material.objects.create(company=self.company, name='Walnut board', unit='m2')
+        assert self.found('walnut') == [('material', walnut.pk)]
+        Material.objects.filter(pk=walnut.pk).update(name='Maple board')
+        assert self.found('walnut') == []
+        assert self.found('maple') == [('material', walnut.pk)]
+        walnut.delete()
+        assert self.found('maple') == []
+
+    def test_endpoint(self) -> None:
+        """
+        Test the search endpoint.
+
+        Verifies:
+            - Results are listed with their kind and contact details
+            - A missing query lists nothing
+            - Unknown kinds are rejected
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('search:search'), {'q': 'timber'})
+        assert response.status_code == 200
+        assert response.json() == [{'kind': 'supplier', 'id': self.supplier.pk, 'name': 'Timber',
+                                    'email': 'sales@oakwood.example.com', 'phone': '+48 555 010 203'}]
+        response = client.get(reverse('search:search'), {'q': 'oak', 'kinds': ['material', 'product']})
+        assert {row['kind'] for row in response.json()} == {'material', 'product'}
+        assert client.get(reverse('search:search')).json() == []
+        assert client.get(reverse('search:search'), {'q': 'oak', 'kinds': 'order'}).status_code == 400
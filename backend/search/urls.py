@@ -0,0 +1,8 @@
+from . import views
+from django.urls import path
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.SearchView.as_view(), name='search'),
+]
@@ -0,0 +1,33 @@
+from rest_framework import generics
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Any
+from . import serializers, engine
+
+
+class SearchView(generics.ListAPIView):
+    """View for type-ahead search over the catalog of the user's company."""
+    serializer_class = serializers.SearchResultSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER,
+                                                UserGroups.PICKER_PACKER])]
+    query_budget = {'get': 3}
+
+    def get_queryset(self):
+        query = serializers.SearchQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        return engine.search(self.request.user.company_id, params['q'], sorted(params.get('kinds', ())),
+                             params['limit'])
+
+    @swagger_auto_schema(
+        operation_description="Find materials, products, clients and suppliers whose name, or email or phone "
+                              "for clients and suppliers, contains the query. Best matches, names starting "
+                              "with the query first.",
+        query_serializer=serializers.SearchQuerySerializer,
+        responses={200: serializers.SearchResultSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from .models import Supplier
 
-# Register your models here.
+
+@admin.register(Supplier)
+class SupplierAdmin(admin.ModelAdmin):
+    list_display = ('name', 'email', 'phone', 'lead_time_days', 'minimum_order_quantity', 'company')
+    list_select_related = ('company',)
+    autocomplete_fields = ('company',)
+    search_fields = ('name', 'email')
+    show_full_result_count = False
@@ -0,0 +1,24 @@
+# Generated by Django 5.1 on 2026-10-19 11:43
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suppliers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplier',
+            name='lead_time_days',
+            field=models.PositiveIntegerField(blank=True, help_text='Days from ordering to delivery; empty uses the planning default', null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='minimum_order_quantity',
+            field=models.FloatField(default=0, help_text='Smallest quantity of a material per order', validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from users.models import Company
+from django.core.validators import MinValueValidator
 from django.db import models
 
 
@@ -9,10 +10,16 @@ class Supplier(models.Model):
     phone = models.CharField(max_length=20)
     email = models.EmailField()
     website = models.URLField()
+    lead_time_days = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Days from ordering to delivery; empty uses the planning default"
+    )
+    minimum_order_quantity = models.FloatField(
+        default=0, validators=[MinValueValidator(0)], help_text="Smallest quantity of a material per order"
+    )
 
     def __str__(self):
         return f'Supplier: {self.name}'
 
     class Meta:
         db_table = 'supplier'
-        unique_together = ('name', 'email')
\ No newline at end of file
+        unique_together = ('name', 'email')
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from . import models
+
+
+class SupplierSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Supplier
+        fields = ['id', 'name', 'address', 'phone', 'email', 'website', 'lead_time_days', 'minimum_order_quantity']
+
+    def create(self, validated_data):
+        validated_data['company'] = self.context['request'].user.company
+        return super().create(validated_data)
+
+
+class SupplierBulkSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100)
+    address = serializers.CharField(max_length=100)
+    phone = serializers.CharField(max_length=20)
+    email = serializers.EmailField()
+    website = serializers.URLField()
+    lead_time_days = serializers.IntegerField(min_value=0, allow_null=True, default=None)
+    minimum_order_quantity = serializers.FloatField(min_value=0, default=0)
@@ -0,0 +1,8 @@
+from . import views
+from django.urls import path
+
+app_name = 'suppliers'
+
+urlpatterns = [
+    path('supplier/', views.SupplierViewSet.as_view(), name='supplier'),
+]
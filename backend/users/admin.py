@@ -1,6 +1,34 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Company
+from .models import CustomUser, Company, RevokedToken
 
-admin.site.register(CustomUser, UserAdmin)
-admin.site.register(Company)
\ No newline at end of file
+
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    list_display = ('name', 'domain', 'email', 'is_active', 'expiration_date')
+    list_filter = ('is_active',)
+    search_fields = ('name', 'domain', 'email')
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(UserAdmin):
+    list_display = ('username', 'email', 'company', 'role', 'is_active', 'is_staff')
+    list_filter = ('role', 'is_active', 'is_staff', 'is_superuser')
+    list_select_related = ('company',)
+    autocomplete_fields = ('company',)
+    show_full_result_count = False
+    fieldsets = UserAdmin.fieldsets + (
+        ('Company', {'fields': ('company', 'role')}),
+    )
+    add_fieldsets = UserAdmin.add_fieldsets + (
+        ('Company', {'fields': ('email', 'company', 'role')}),
+    )
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'user', 'revoked_at', 'expires_at')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    search_fields = ('=jti',)
+    show_full_result_count = False
@@ -0,0 +1,32 @@
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework.request import Request
+from monitoring import metrics
+from typing import Any, Optional, Tuple
+from .revocation import revocation_list
+from .tenants import active_companies
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWT authentication that rejects revoked tokens and users of inactive or
+    expired companies, and records its duration in the application metrics.
+    """
+
+    def authenticate(self, request: Request) -> Optional[Tuple[Any, Any]]:
+        with metrics.AUTH_DURATION.labels('jwt').time():
+            return super().authenticate(request)
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        validated_token = super().get_validated_token(raw_token)
+        if revocation_list.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken('Token has been revoked')
+        return validated_token
+
+    def get_user(self, validated_token: Token) -> Any:
+        user = super().get_user(validated_token)
+        if not user.is_superuser and not active_companies.is_active(user.company_id):
+            raise AuthenticationFailed('Company is not verified or expired', code='company_inactive')
+        return user
@@ -0,0 +1,12 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Deactivate companies whose expiration date has passed. Meant to be run periodically (e.g. from cron).'
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        expired = Company.objects.filter(is_active=True, expiration_date__lt=timezone.localdate()).update(is_active=False)
+        self.stdout.write(self.style.SUCCESS(f'Deactivated {expired} expired companies'))
@@ -0,0 +1,12 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = 'Delete revocations of tokens that have already expired.'
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired revocations'))
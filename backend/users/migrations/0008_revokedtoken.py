@@ -0,0 +1,31 @@
+# Generated by Django 5.1 on 2026-10-19 10:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_alter_company_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(help_text='JWT ID of the revoked token', max_length=255, unique=True, verbose_name='Token ID')),
+                ('revoked_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='Expiration of the revoked token, after which the entry can be pruned')),
+                ('user', models.ForeignKey(blank=True, help_text='Owner of the revoked token', null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Revoked Token',
+                'verbose_name_plural': 'Revoked Tokens',
+                'db_table': 'revoked_token',
+                'ordering': ['-revoked_at'],
+            },
+        ),
+    ]
@@ -1,12 +1,12 @@
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.contrib.auth.hashers import make_password
 from django.core.mail import EmailMultiAlternatives
-from django.db.models.functions import Now
 from django.utils import timezone
 from django.conf import settings
 from django.db import models
 from enum import StrEnum
 from typing import Any, List, Callable
+import datetime
 from django.contrib.auth.decorators import user_passes_test
 from django.utils.decorators import method_decorator
 
@@ -18,9 +18,9 @@ class UserGroups(StrEnum):
     PICKER_PACKER = "Picker/Packer"
 
 
-def default_expiration_date() -> timezone.datetime:
+def default_expiration_date() -> datetime.date:
     """Calculate the default expiration date (30 days from now)."""
-    return Now() + timezone.timedelta(days=30)
+    return timezone.localdate() + datetime.timedelta(days=30)
 
 
 class CompanyManager(models.Manager):
@@ -148,3 +148,36 @@ class CustomUser(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ['-date_joined']
+
+
+class RevokedToken(models.Model):
+    """Model representing a revoked JWT, identified by its ``jti`` claim."""
+    
+    jti = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="JWT ID of the revoked token",
+        verbose_name="Token ID"
+    )
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Owner of the revoked token",
+        verbose_name="User"
+    )
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    expires_at = models.DateTimeField(
+        db_index=True,
+        help_text="Expiration of the revoked token, after which the entry can be pruned"
+    )
+
+    class Meta:
+        db_table = "revoked_token"
+        verbose_name = "Revoked Token"
+        verbose_name_plural = "Revoked Tokens"
+        ordering = ['-revoked_at']
+
+    def __str__(self) -> str:
+        return self.jti
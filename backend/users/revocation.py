@@ -0,0 +1,179 @@
+"""
+JWT revocation list backed by an in-process Bloom filter.
+
+Revoked ``jti``s are stored in the ``revoked_token`` table and mirrored into
+a Bloom filter in every worker process. Checking a token that was never
+revoked (practically every request) costs a few hashes; only Bloom positives
+fall through to a database lookup, which also rules out false positives.
+
+The filter is refreshed incrementally every ``REFRESH_INTERVAL`` seconds by
+reading rows with an id above the highest one seen, so a revocation made by
+another worker takes effect within that interval. Ids are assigned by the
+database and do not depend on the clocks of the workers, but concurrent
+transactions can commit them out of order: ids below the highest one that
+were not seen yet are re-read on every refresh until they appear or the next
+rebuild. The filter is rebuilt from the unexpired rows every
+``REBUILD_INTERVAL`` seconds, which drops expired tokens and grows the filter
+when needed.
+"""
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, Optional, Set
+from monitoring import metrics
+from .models import RevokedToken
+import datetime
+import threading
+import math
+import time
+
+DEFAULTS = {
+    'REFRESH_INTERVAL': 5,
+    'REBUILD_INTERVAL': 3600,
+    'CAPACITY': 100_000,
+    'ERROR_RATE': 0.001,
+}
+
+# Unseen ids below the highest one seen that are re-read on every refresh; older gaps are
+# left to the next rebuild. On rebuilds this many ids below the highest one are checked for gaps.
+MAX_GAPS = 1000
+
+
+def revocation_settings() -> Dict[str, Any]:
+    """Get TOKEN_REVOCATION settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'TOKEN_REVOCATION', {})}
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings using double hashing of a single blake2b digest.
+
+    Args:
+        capacity: Expected number of elements
+        error_rate: False positive probability at full capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+        self.count = 0
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        if value in self:
+            return
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationList:
+    """Process-wide view of revoked tokens."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._last_id = 0
+        self._gaps: Set[int] = set()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Check whether the token with the given ``jti`` has been revoked.
+
+        Args:
+            jti: JWT ID claim of the token
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        if not jti:
+            return False
+        self.refresh()
+        if jti not in self._bloom:
+            metrics.record_cache_lookup('token_revocation', hit=True)
+            return False
+        metrics.record_cache_lookup('token_revocation', hit=False)
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti: str, expires_at: datetime.datetime, user_id: Optional[int] = None) -> None:
+        """
+        Persist a revocation and apply it to this process immediately.
+
+        Args:
+            jti: JWT ID claim of the token
+            expires_at: Expiration of the token
+            user_id: Owner of the token
+        """
+        RevokedToken.objects.get_or_create(jti=jti, defaults={'expires_at': expires_at, 'user_id': user_id})
+        self.refresh()
+        with self._lock:
+            self._bloom.add(jti)
+
+    def refresh(self, force: bool = False) -> None:
+        """Load revocations made since the last refresh, rebuilding the filter when due."""
+        options = revocation_settings()
+        now = time.monotonic()
+        if not force and self._bloom is not None and now - self._refreshed_at < options['REFRESH_INTERVAL']:
+            return
+        with self._lock:
+            if self._bloom is None or now - self._rebuilt_at >= options['REBUILD_INTERVAL']:
+                self._rebuild(options)
+                self._rebuilt_at = now
+            else:
+                self._load(RevokedToken.objects.filter(Q(pk__gt=self._last_id) | Q(pk__in=self._gaps)))
+            self._refreshed_at = now
+
+    def reset(self) -> None:
+        """Replace the filter with an empty one, e.g. after the table was emptied."""
+        options = revocation_settings()
+        with self._lock:
+            self._bloom = BloomFilter(options['CAPACITY'], options['ERROR_RATE'])
+            self._last_id = 0
+            self._gaps = set()
+            self._refreshed_at = self._rebuilt_at = time.monotonic()
+
+    def _rebuild(self, options: Dict[str, Any]) -> None:
+        queryset = RevokedToken.objects.filter(expires_at__gt=timezone.now())
+        capacity = max(options['CAPACITY'], 2 * queryset.count())
+        self._bloom = BloomFilter(capacity, options['ERROR_RATE'])
+        # Expired rows are not loaded but still count as seen; ids missing among the
+        # most recent ones may belong to transactions that have not committed yet.
+        last_id = RevokedToken.objects.aggregate(last=Max('pk'))['last'] or 0
+        recent = RevokedToken.objects.filter(pk__gt=last_id - MAX_GAPS, pk__lte=last_id)
+        self._last_id = last_id
+        self._gaps = set(range(max(last_id - MAX_GAPS, 0) + 1, last_id + 1)) - set(
+            recent.values_list('pk', flat=True))
+        self._load(queryset.filter(pk__lte=last_id))
+
+    def _load(self, queryset: Any) -> None:
+        seen = set()
+        for pk, jti in queryset.values_list('pk', 'jti').iterator():
+            self._bloom.add(jti)
+            seen.add(pk)
+        self._gaps -= seen
+        last_id = max(seen, default=0)
+        if last_id > self._last_id:
+            self._gaps.update(set(range(self._last_id + 1, last_id)) - seen)
+            self._last_id = last_id
+        if len(self._gaps) > MAX_GAPS:
+            self._gaps = set(sorted(self._gaps)[-MAX_GAPS:])
+        if self._bloom.count > self._bloom.capacity:
+            # Force a larger filter on the next refresh.
+            self._rebuilt_at = float('-inf')
+
+
+revocation_list = RevocationList()
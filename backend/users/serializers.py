@@ -1,5 +1,10 @@
 from users.models import CustomUser, Company, UserGroups
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework import serializers
+from .revocation import revocation_list
 from drf_yasg import openapi
 from django.db import transaction
 
@@ -64,6 +69,28 @@ class LoginResponseSerializer(serializers.Serializer):
     refresh = serializers.CharField(help_text='Refresh token')
 
 
+class RevocationCheckingTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh serializer that rejects revoked refresh tokens."""
+    
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs['refresh'])
+        if revocation_list.is_revoked(refresh.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken('Token has been revoked')
+        return super().validate(attrs)
+
+
+class RevokeTokenSerializer(serializers.Serializer):
+    """Serializer for revoking an access or refresh token."""
+    
+    token = serializers.CharField(help_text='Access or refresh token to revoke')
+
+    def validate_token(self, value: str) -> UntypedToken:
+        try:
+            return UntypedToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
+
+
 class AcceptCompanySerializer(serializers.ModelSerializer):
     """Serializer for accepting company registration."""
     
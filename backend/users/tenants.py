@@ -0,0 +1,102 @@
+"""
+In-process set of active companies used to gate authentication.
+
+Every worker keeps the ids and expiration dates of active companies in
+memory, so checking the company of an authenticated user needs no query.
+Changes made through the ORM in the same process are applied by the
+``Company`` signal handlers once their transaction commits, so a rolled back
+save never reaches the set; changes made elsewhere (other workers, the
+``expire_companies`` sweeper) are picked up by reloading the set every
+``ACTIVE_COMPANIES['REFRESH_INTERVAL']`` seconds. Expiration dates are kept
+alongside the ids, so a company stops passing the check on the day after its
+expiration date even before the sweeper deactivates it.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from functools import partial
+from typing import Any, Dict, Optional
+from .models import Company
+import datetime
+import threading
+import time
+
+DEFAULTS = {
+    'REFRESH_INTERVAL': 60,
+}
+
+
+def active_companies_settings() -> Dict[str, Any]:
+    """Get ACTIVE_COMPANIES settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'ACTIVE_COMPANIES', {})}
+
+
+class ActiveCompanies:
+    """Process-wide mapping of active company ids to their expiration dates."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._expirations: Optional[Dict[int, datetime.date]] = None
+        self._refreshed_at = 0.0
+
+    def is_active(self, company_id: Optional[int]) -> bool:
+        """
+        Check whether a company is active and not expired.
+
+        Args:
+            company_id: Primary key of the company
+
+        Returns:
+            bool: True if users of the company may authenticate
+        """
+        self.refresh()
+        expiration_date = self._expirations.get(company_id)
+        return expiration_date is not None and expiration_date >= timezone.localdate()
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload the set from the database when it is missing or stale."""
+        now = time.monotonic()
+        interval = active_companies_settings()['REFRESH_INTERVAL']
+        if not force and self._expirations is not None and now - self._refreshed_at < interval:
+            return
+        expirations = dict(Company.objects.filter(is_active=True).values_list('pk', 'expiration_date'))
+        with self._lock:
+            self._expirations = expirations
+            self._refreshed_at = now
+
+    def update(self, company: Company) -> None:
+        """Apply a saved company to the set."""
+        with self._lock:
+            if self._expirations is None:
+                return
+            if company.is_active:
+                expiration_date = company.expiration_date
+                if isinstance(expiration_date, datetime.datetime):
+                    expiration_date = timezone.localdate(expiration_date)
+                self._expirations[company.pk] = expiration_date
+            else:
+                self._expirations.pop(company.pk, None)
+
+    def discard(self, company_id: int) -> None:
+        """Remove a company from the set."""
+        with self._lock:
+            if self._expirations is not None:
+                self._expirations.pop(company_id, None)
+
+
+active_companies = ActiveCompanies()
+
+
+@receiver(post_save, sender=Company, dispatch_uid='active_companies_update')
+def update_active_companies(sender: Any, instance: Company, using: str, **kwargs: Any) -> None:
+    # Copy the applied fields, the instance can still change before the transaction commits.
+    saved = Company(pk=instance.pk, is_active=instance.is_active, expiration_date=instance.expiration_date)
+    transaction.on_commit(partial(active_companies.update, saved), using=using)
+
+
+@receiver(post_delete, sender=Company, dispatch_uid='active_companies_discard')
+def discard_active_company(sender: Any, instance: Company, using: str, **kwargs: Any) -> None:
+    transaction.on_commit(partial(active_companies.discard, instance.pk), using=using)
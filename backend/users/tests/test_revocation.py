@@ -0,0 +1,124 @@
+"""
+Test suite for the JWT revocation list.
+"""
+
+from datetime import timedelta
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import Company, CustomUser, RevokedToken, UserGroups
+from ..revocation import BloomFilter, revocation_list
+
+
+class TestRevocation(TestCase):
+    """Test suite for revoking access and refresh tokens."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.other_company = Company.objects.create(name='Other', domain='other.com', email='other@other.com')
+        cls.admin = CustomUser.objects.create_user(
+            username='admin', password='password', company=cls.company, role=UserGroups.ADMIN.value,
+        )
+        cls.picker = CustomUser.objects.create_user(
+            username='picker', password='password', company=cls.company, role=UserGroups.PICKER_PACKER.value,
+        )
+        cls.other_admin = CustomUser.objects.create_user(
+            username='other', password='password', company=cls.other_company, role=UserGroups.ADMIN.value,
+        )
+        cls.admin.groups.add(Group.objects.get(name=UserGroups.ADMIN.value))
+
+    def client_for(self, user: CustomUser) -> APIClient:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def test_bloom_filter_has_no_false_negatives(self) -> None:
+        """
+        Test that every added value is reported as present.
+        """
+        bloom = BloomFilter(1000, 0.01)
+        values = [f'jti-{i}' for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+        assert all(value in bloom for value in values)
+        assert sum(f'other-{i}' in bloom for i in range(1000)) < 50
+
+    def test_revoked_access_token_is_rejected(self) -> None:
+        """
+        Test revoking an access token.
+
+        Verifies:
+            - The token works before revocation
+            - Requests with the revoked token are unauthorized
+        """
+        token = RefreshToken.for_user(self.admin).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        assert client.get(reverse('products:material')).status_code == status.HTTP_200_OK
+
+        response = client.post(reverse('users:revoke_token'), {'token': str(token)})
+        assert response.status_code == status.HTTP_200_OK
+        assert RevokedToken.objects.filter(jti=token['jti'], user=self.admin).exists()
+        assert client.get(reverse('products:material')).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoked_refresh_token_cannot_be_refreshed(self) -> None:
+        """
+        Test that a company admin can revoke a refresh token of their user.
+        """
+        refresh = RefreshToken.for_user(self.picker)
+        response = self.client_for(self.admin).post(reverse('users:revoke_token'), {'token': str(refresh)})
+        assert response.status_code == status.HTTP_200_OK
+
+        response = APIClient().post(reverse('users:refresh_token'), {'refresh': str(refresh)})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cannot_revoke_token_of_other_company(self) -> None:
+        """
+        Test that admins cannot revoke tokens of users from other companies.
+        """
+        refresh = RefreshToken.for_user(self.picker)
+        response = self.client_for(self.other_admin).post(reverse('users:revoke_token'), {'token': str(refresh)})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not RevokedToken.objects.exists()
+
+    def test_refresh_picks_up_revocations_from_other_processes(self) -> None:
+        """
+        Test that revocations written by other workers are loaded on refresh.
+
+        Verifies:
+            - A row inserted directly is not seen before a refresh
+            - It is seen after an incremental refresh
+        """
+        token = RefreshToken.for_user(self.picker).access_token
+        RevokedToken.objects.create(jti=token['jti'], expires_at=timezone.now() + timedelta(minutes=5))
+        assert not revocation_list.is_revoked(token['jti'])
+
+        revocation_list.refresh(force=True)
+        assert revocation_list.is_revoked(token['jti'])
+
+    def test_refresh_picks_up_revocations_committed_out_of_order(self) -> None:
+        """
+        Test that the incremental refresh does not depend on commit order or clocks.
+
+        Verifies:
+            - A row committed after a row with a higher id is loaded on a later refresh
+            - A row whose ``revoked_at`` lies far in the past is loaded
+        """
+        revocation_list.refresh(force=True)
+        last_id = revocation_list._last_id
+        early, late = (RefreshToken.for_user(self.picker).access_token for _ in range(2))
+        expires_at = timezone.now() + timedelta(minutes=5)
+        RevokedToken.objects.create(pk=last_id + 2, jti=late['jti'], expires_at=expires_at)
+        revocation_list.refresh(force=True)
+        assert revocation_list.is_revoked(late['jti'])
+
+        RevokedToken.objects.create(pk=last_id + 1, jti=early['jti'], expires_at=expires_at)
+        RevokedToken.objects.filter(pk=last_id + 1).update(revoked_at=timezone.now() - timedelta(hours=1))
+        assert not revocation_list.is_revoked(early['jti'])
+        revocation_list.refresh(force=True)
+        assert revocation_list.is_revoked(early['jti'])
@@ -0,0 +1,90 @@
+"""
+Test suite for the active company set and the company expiration sweeper.
+"""
+
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from conftest import create_user
+from ..models import Company, UserGroups
+from ..tenants import active_companies
+
+
+class TestActiveCompanies(TestCase):
+    """Test suite for tenant gating of authenticated requests."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.create(name='Tenant', domain='tenant.com', email='tenant@tenant.com')
+        cls.user = create_user(cls.company, 'tenant', UserGroups.ADMIN)
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_expiry_mid_session(self) -> None:
+        """
+        Test that an expired company is rejected on requests with a valid token.
+
+        Verifies:
+            - Requests succeed while the company is valid
+            - Requests fail with 401 after the expiration date passes
+        """
+        assert self.client.get(reverse('products:material')).status_code == status.HTTP_200_OK
+
+        self.company.expiration_date = timezone.localdate() - timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.save()
+        assert self.client.get(reverse('products:material')).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_signals_update_set_without_queries(self) -> None:
+        """
+        Test that saving a company updates the set in place.
+
+        Verifies:
+            - The set is updated once the transaction commits, without queries
+            - Saves that are rolled back do not change the set
+        """
+        active_companies.refresh(force=True)
+        try:
+            with transaction.atomic():
+                self.company.is_active = False
+                self.company.save()
+                assert active_companies.is_active(self.company.pk)
+                raise ValueError
+        except ValueError:
+            pass
+        assert active_companies.is_active(self.company.pk)
+
+        self.company.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.save()
+        with self.assertNumQueries(0):
+            assert not active_companies.is_active(self.company.pk)
+
+    def test_sweeper_deactivates_expired_companies(self) -> None:
+        """
+        Test the expire_companies command.
+
+        Verifies:
+            - Only expired companies are deactivated, in one query
+            - A refreshed set no longer contains them
+        """
+        expired = Company.objects.create(name='Expired', domain='expired.com', email='expired@expired.com')
+        Company.objects.filter(pk=expired.pk).update(expiration_date=timezone.localdate() - timedelta(days=1))
+
+        with self.assertNumQueries(1):
+            call_command('expire_companies', stdout=StringIO())
+        assert not Company.objects.get(pk=expired.pk).is_active
+        assert Company.objects.get(pk=self.company.pk).is_active
+
+        active_companies.refresh(force=True)
+        assert not active_companies.is_active(expired.pk)
+        assert active_companies.is_active(self.company.pk)
@@ -157,7 +157,8 @@ class TestTokensAndUsers(TestCase):
         """
         company = self.random_company()
         company['is_active'] = is_active
-        company = Company.objects.create(**company)
+        with self.captureOnCommitCallbacks(execute=True):
+            company = Company.objects.create(**company)
         return company
 
     def test_cant_create_user_without_auth(self) -> None:
@@ -310,14 +311,16 @@ class TestTokensAndUsers(TestCase):
             user['role'] = role
             user['company'] = self.create_company()
             user['company'].is_active = True
-            user['company'].save()
+            with self.captureOnCommitCallbacks(execute=True):
+                user['company'].save()
             CustomUser.objects.create(**user)
             
             response = self.client.post(API.login, user, headers=headers)
             assert response.status_code == status.HTTP_200_OK
             
             user['company'].expiration_date = timezone.now() - timezone.timedelta(days=1)
-            user['company'].save()
+            with self.captureOnCommitCallbacks(execute=True):
+                user['company'].save()
             response = self.client.post(API.login, user, headers=headers)
             assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
@@ -433,7 +436,8 @@ class TestTokensAndUsers(TestCase):
         # Test different company password update
         company = self.random_company()
         company['is_active'] = True
-        company_obj = Company.objects.create(**company)
+        with self.captureOnCommitCallbacks(execute=True):
+            company_obj = Company.objects.create(**company)
         admin_user_obj.company = company_obj
         admin_user_obj.save()
         
@@ -1,4 +1,3 @@
-from rest_framework_simplejwt.views import TokenRefreshView
 from . import views
 from django.urls import path
 
@@ -9,7 +8,8 @@ urlpatterns = [
     path('company/create/', views.CreateCompanyView.as_view(), name='create_company'),
     path('company/accept/<int:pk>/', views.AcceptCompanyView.as_view(), name='accept_company'),
     path('login/', views.OnlyVerifiedCompaniesTokenObtainPairView.as_view(), name='login'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='refresh_token'),
+    path('token/refresh/', views.RevocationCheckingTokenRefreshView.as_view(), name='refresh_token'),
+    path('token/revoke/', views.RevokeTokenView.as_view(), name='revoke_token'),
     path('user/delete/<int:pk>/', views.DeleteUserView.as_view(), name='delete_user'),
     path('user/update/<int:pk>/', views.UpdateUserView.as_view(), name='update_user_password'),
 ]
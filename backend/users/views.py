@@ -1,5 +1,6 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
-from django.db.models import Q, functions as db_functions
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework import generics, permissions, status
 from rest_framework.serializers import ModelSerializer
 from drf_yasg.utils import swagger_auto_schema
@@ -9,12 +10,18 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from . import serializers
 from typing import Any
+import datetime
 from django.db import transaction
+from .revocation import revocation_list
+from .tenants import active_companies
+from wms.idempotency import idempotency_key_parameter
 
 
 class OnlyVerifiedCompaniesTokenObtainPairView(TokenObtainPairView):
     """Custom token view that only allows login for verified and non-expired companies."""
     
+    query_budget = {'post': 1}
+
     @swagger_auto_schema(
         responses={
             401: serializers.error_response,
@@ -37,12 +44,14 @@ class OnlyVerifiedCompaniesTokenObtainPairView(TokenObtainPairView):
         Raises:
             Response: 401 error if company is not verified or expired
         """
-        company_is_active = CustomUser.objects.filter(
-            (Q(company__expiration_date__gte=db_functions.Now()) & Q(company__is_active=True)) | Q(is_superuser=True),
-            username=request.data.get('username'),
-        ).exists()
-        
-        if not company_is_active:
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        user = serializer.user
+        if not user.is_superuser and not active_companies.is_active(user.company_id):
             return Response(
                 {
                     'error': 'Company is not verified or expired',
@@ -51,7 +60,7 @@ class OnlyVerifiedCompaniesTokenObtainPairView(TokenObtainPairView):
                     },
                 status=status.HTTP_401_UNAUTHORIZED
             )
-        return super().post(request, *args, **kwargs)
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
 class CreateUserView(generics.GenericAPIView):
@@ -59,6 +68,7 @@ class CreateUserView(generics.GenericAPIView):
     
     serializer_class = serializers.CustomUserSerializer
     permission_classes = [IsCompanyAdmin]
+    query_budget = {'post': 4}
 
     def get_serializer_class(self) -> type[ModelSerializer]:
         """Get appropriate serializer based on user role."""
@@ -73,7 +83,8 @@ class CreateUserView(generics.GenericAPIView):
             401: serializers.error_response,
             403: serializers.error_response
         },
-        operation_description="Create a new user. Superuser can create users for any company. Admin can only create users for their company."
+        operation_description="Create a new user. Superuser can create users for any company. Admin can only create users for their company.",
+        manual_parameters=[idempotency_key_parameter]
     )
     def post(self, request: Request) -> Response:
         """
@@ -116,6 +127,7 @@ class DeleteUserView(generics.DestroyAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = serializers.CustomUserSerializer
     permission_classes = [IsCompanyAdmin, IsCompanyMember]
+    query_budget = {'delete': 8}
 
     @swagger_auto_schema(
         responses={
@@ -155,6 +167,7 @@ class UpdateUserView(generics.UpdateAPIView):
     serializer_class = serializers.UpdateUserPasswordSerializer
     http_method_names = ['patch']
     permission_classes = [IsCompanyAdmin, IsCompanyMember]
+    query_budget = {'patch': 3}
 
     @swagger_auto_schema(
         responses={
@@ -193,13 +206,15 @@ class CreateCompanyView(generics.GenericAPIView):
     """View for creating new companies with admin user."""
     
     permission_classes = [permissions.AllowAny]
+    query_budget = {'post': 9}
 
     @swagger_auto_schema(
         responses={
             201: serializers.info_response,
             400: serializers.error_response
         },
-        operation_description="Create a new company and its admin user."
+        operation_description="Create a new company and its admin user.",
+        manual_parameters=[idempotency_key_parameter]
     )
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """
@@ -237,6 +252,7 @@ class AcceptCompanyView(generics.UpdateAPIView):
     
     queryset = CustomUser.objects.all()
     serializer_class = serializers.AcceptCompanySerializer
+    query_budget = {'patch': 4}
 
     @swagger_auto_schema(
         responses={
@@ -273,4 +289,72 @@ class AcceptCompanyView(generics.UpdateAPIView):
         return Response(
             {'message': 'Company accepted'},
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class RevocationCheckingTokenRefreshView(TokenRefreshView):
+    """Token refresh view that rejects revoked refresh tokens."""
+    
+    serializer_class = serializers.RevocationCheckingTokenRefreshSerializer
+    query_budget = {'post': 2}
+
+
+class RevokeTokenView(generics.GenericAPIView):
+    """View for revoking access and refresh tokens, e.g. of a lost scanner."""
+    
+    serializer_class = serializers.RevokeTokenSerializer
+    query_budget = {'post': 6}
+
+    @swagger_auto_schema(
+        responses={
+            200: serializers.info_response,
+            400: serializers.error_response,
+            401: serializers.error_response,
+            403: serializers.error_response
+        },
+        operation_description="Revoke a token. Users can revoke their own tokens, admins the tokens of their company's users and superusers any token."
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Revoke a token.
+        
+        Args:
+            request: HTTP request object containing the token
+            *args: Additional positional arguments
+            **kwargs: Additional keyword arguments
+            
+        Returns:
+            Response: Success message if token revoked successfully
+            
+        Raises:
+            Response: 400 error if the token is invalid
+            Response: 403 error if user lacks permission
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = serializer.validated_data['token']
+        owner_id = token.get(api_settings.USER_ID_CLAIM)
+
+        if not self.can_revoke(request.user, owner_id):
+            return Response(
+                {'error': 'You are not allowed to revoke this token'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        revocation_list.revoke(
+            jti=token[api_settings.JTI_CLAIM],
+            expires_at=datetime.datetime.fromtimestamp(token['exp'], tz=datetime.timezone.utc),
+            user_id=owner_id,
+        )
+        return Response(
+            {'message': 'Token revoked'},
+            status=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def can_revoke(user: CustomUser, owner_id: Any) -> bool:
+        """Check whether ``user`` may revoke a token issued to ``owner_id``."""
+        if user.is_superuser or str(user.pk) == str(owner_id):
+            return True
+        return user.role == UserGroups.ADMIN.value and CustomUser.objects.filter(
+            pk=owner_id, company_id=user.company_id
+        ).exists()
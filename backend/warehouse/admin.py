@@ -1,3 +1,31 @@
 from django.contrib import admin
+from .models import Warehouse, Location, Wave
 
-# Register your models here.
+
+@admin.register(Warehouse)
+class WarehouseAdmin(admin.ModelAdmin):
+    list_display = ('name', 'company')
+    list_filter = ('name',)
+    list_select_related = ('company',)
+    autocomplete_fields = ('company',)
+    search_fields = ('company__name',)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('code', 'warehouse', 'aisle', 'rack', 'level', 'x', 'y', 'is_depot')
+    list_filter = ('is_depot', 'warehouse__name')
+    list_select_related = ('warehouse__company',)
+    autocomplete_fields = ('warehouse',)
+    search_fields = ('=code',)
+    show_full_result_count = False
+
+
+@admin.register(Wave)
+class WaveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'warehouse', 'status', 'created_at', 'lines', 'distance')
+    list_filter = ('status',)
+    list_select_related = ('warehouse__company',)
+    autocomplete_fields = ('company', 'warehouse')
+    search_fields = ('=id',)
+    show_full_result_count = False
@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, verbose_name='Location Code')),
+                ('aisle', models.CharField(max_length=10)),
+                ('rack', models.PositiveIntegerField(default=0)),
+                ('level', models.PositiveIntegerField(default=0)),
+                ('x', models.FloatField(help_text='Distance across the aisles in meters')),
+                ('y', models.FloatField(help_text='Distance along the aisle from the front cross-aisle in meters')),
+                ('is_depot', models.BooleanField(default=False, help_text='Where pick routes start and end')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='locations', to='warehouse.warehouse')),
+            ],
+            options={
+                'db_table': 'location',
+                'unique_together': {('warehouse', 'code')},
+            },
+        ),
+    ]
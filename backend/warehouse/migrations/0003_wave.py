@@ -0,0 +1,30 @@
+# Generated by Django 5.1 on 2026-10-19 11:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_revokedtoken'),
+        ('warehouse', '0002_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Wave',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Planned', 'Planned'), ('Picking', 'Picking'), ('Done', 'Done')], db_index=True, default='Planned', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('lines', models.PositiveIntegerField(default=0, help_text='Allocations picked in the wave')),
+                ('distance', models.FloatField(default=0, help_text='Length of the pick route in meters')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.company')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waves', to='warehouse.warehouse')),
+            ],
+            options={
+                'db_table': 'wave',
+            },
+        ),
+    ]
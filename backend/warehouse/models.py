@@ -18,3 +18,43 @@ class Warehouse(models.Model):
     class Meta:
         db_table = 'warehouse'
         unique_together = ('company', 'name')
+
+
+class Location(models.Model):
+    """A storage bin (or the pick depot) with its position on the floor plan."""
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name='locations')
+    code = models.CharField(max_length=20, verbose_name="Location Code")
+    aisle = models.CharField(max_length=10)
+    rack = models.PositiveIntegerField(default=0)
+    level = models.PositiveIntegerField(default=0)
+    x = models.FloatField(help_text="Distance across the aisles in meters")
+    y = models.FloatField(help_text="Distance along the aisle from the front cross-aisle in meters")
+    is_depot = models.BooleanField(default=False, help_text="Where pick routes start and end")
+
+    def __str__(self):
+        return f'Location: {self.code} - {self.warehouse.name}'
+
+    class Meta:
+        db_table = 'location'
+        unique_together = ('warehouse', 'code')
+
+
+class Wave(models.Model):
+    """Confirmed orders picked together on one route."""
+    company = models.ForeignKey(users_models.Company, on_delete=models.CASCADE)
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name='waves')
+    STATUS_CHOICES = (
+        ('Planned', 'Planned'),
+        ('Picking', 'Picking'),
+        ('Done', 'Done'),
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Planned', db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    lines = models.PositiveIntegerField(default=0, help_text="Allocations picked in the wave")
+    distance = models.FloatField(default=0, help_text="Length of the pick route in meters")
+
+    def __str__(self):
+        return f'Wave: {self.id} - {self.status}'
+
+    class Meta:
+        db_table = 'wave'
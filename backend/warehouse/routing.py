@@ -0,0 +1,279 @@
+"""
+Walking distances between locations and pick route optimization.
+
+Warehouses are modelled with parallel aisles running along ``y`` between a
+front cross-aisle at ``y = 0`` and a back cross-aisle at the deepest
+location. Two locations in the same aisle are ``|y1 - y2|`` apart; otherwise
+the picker walks to one of the cross-aisles, across, and into the other
+aisle, whichever is shorter. The depot sits on the front cross-aisle.
+
+The coordinates of all locations of a warehouse are loaded once per layout
+and kept in a small per-process LRU; distances are computed with numpy for
+the locations of one pick list only, so memory grows linearly with the
+number of bins rather than quadratically. The layout version is stored in
+the shared cache and bumped by ``Location`` signals, so every worker drops
+its layout when a location is added, moved or removed.
+
+Routes are built with nearest neighbour from the depot and improved with
+2-opt until no reversal shortens the closed tour. A pick list visits the
+locations holding the lots allocated to the product batches of one order or
+of a wave of orders (see ``warehouse.waves``).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from monitoring import metrics
+from products.models import Batch, Inventory
+from .models import Location
+import numpy as np
+import threading
+import time
+
+MAX_TWO_OPT_ROUNDS = 50
+
+
+@dataclass
+class Layout:
+    """Locations of a warehouse and their coordinates."""
+
+    version: int
+    location_ids: np.ndarray
+    index: Dict[int, int]
+    x: np.ndarray
+    y: np.ndarray
+    aisles: np.ndarray
+    depot: Optional[int]
+    # Position of the back cross-aisle
+    depth: float
+
+    def distances(self, nodes: List[int]) -> np.ndarray:
+        """Walking distances between the locations at the given positions."""
+        return distance_matrix(self.x[nodes], self.y[nodes], self.aisles[nodes], self.depth)
+
+
+def distance_matrix(x: np.ndarray, y: np.ndarray, aisles: np.ndarray, depth: Optional[float] = None) -> np.ndarray:
+    """
+    Walking distances between all pairs of locations.
+
+    Args:
+        x: Positions across the aisles
+        y: Positions along the aisles
+        aisles: Aisle labels; the depot has an empty label
+        depth: Position of the back cross-aisle, the deepest of the given locations if None
+
+    Returns:
+        Symmetric ``float32`` matrix of distances in meters
+    """
+    if depth is None:
+        depth = float(y.max()) if len(y) else 0.0
+    dx = np.abs(x[:, None] - x[None, :])
+    within = dx + np.abs(y[:, None] - y[None, :])
+    across = dx + np.minimum(y[:, None] + y[None, :], 2 * depth - y[:, None] - y[None, :])
+    same_aisle = (aisles[:, None] == aisles[None, :]) & (aisles[:, None] != '')
+    return np.where(same_aisle, within, across).astype(np.float32)
+
+
+class LayoutCache:
+    """Per-process LRU of warehouse layouts."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._layouts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, warehouse_id: int) -> Layout:
+        """Get the current layout of a warehouse, computing it when it changed."""
+        # A fresh version after the cache lost the key must not match a layout kept in memory.
+        version = cache.get_or_set(version_key(warehouse_id), time.time_ns, timeout=None)
+        with self._lock:
+            layout = self._layouts.get(warehouse_id)
+            if layout is not None and layout.version == version:
+                self._layouts.move_to_end(warehouse_id)
+                metrics.record_cache_lookup('warehouse_layout', hit=True)
+                return layout
+        metrics.record_cache_lookup('warehouse_layout', hit=False)
+        layout = load_layout(warehouse_id, version)
+        with self._lock:
+            self._layouts[warehouse_id] = layout
+            self._layouts.move_to_end(warehouse_id)
+            while len(self._layouts) > self.size:
+                self._layouts.popitem(last=False)
+        return layout
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layouts.clear()
+
+
+def version_key(warehouse_id: int) -> str:
+    return f'warehouse:layout:{warehouse_id}'
+
+
+def load_layout(warehouse_id: int, version: int) -> Layout:
+    rows = list(Location.objects.filter(warehouse_id=warehouse_id).values_list('pk', 'x', 'y', 'aisle', 'is_depot'))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    x = np.array([row[1] for row in rows], dtype=np.float64)
+    y = np.array([row[2] for row in rows], dtype=np.float64)
+    aisles = np.array(['' if row[4] else row[3] for row in rows], dtype=object)
+    depot = next((i for i, row in enumerate(rows) if row[4]), None)
+    return Layout(
+        version=version,
+        location_ids=ids,
+        index={pk: i for i, pk in enumerate(ids.tolist())},
+        x=x,
+        y=y,
+        aisles=aisles,
+        depot=depot,
+        depth=float(y.max()) if len(y) else 0.0,
+    )
+
+
+layouts = LayoutCache(getattr(settings, 'LAYOUT_CACHE_SIZE', 16))
+
+
+def nearest_neighbour(distances: np.ndarray, start: int) -> List[int]:
+    """Greedy tour over all nodes of ``distances`` starting at ``start``."""
+    unvisited = np.ones(len(distances), dtype=bool)
+    unvisited[start] = False
+    route = [start]
+    for _ in range(len(distances) - 1):
+        row = np.where(unvisited, distances[route[-1]], np.inf)
+        nearest = int(row.argmin())
+        unvisited[nearest] = False
+        route.append(nearest)
+    return route
+
+
+def two_opt(route: List[int], distances: np.ndarray) -> List[int]:
+    """
+    Improve a closed tour by reversing segments while that shortens it.
+
+    The first node (the depot) stays in place. Gains of all reversals
+    starting at one position are evaluated at once with numpy.
+    """
+    tour = np.array(route + [route[0]])
+    n = len(route)
+    for _ in range(MAX_TWO_OPT_ROUNDS):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = tour[i - 1], tour[i]
+            c, d = tour[i + 1:n], tour[i + 2:n + 1]
+            gains = distances[a, b] + distances[c, d] - distances[a, c] - distances[b, d]
+            best = int(gains.argmax())
+            if gains[best] > 1e-6:
+                j = i + 1 + best
+                tour[i:j + 1] = tour[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return tour[:-1].tolist()
+
+
+def route_length(route: List[int], distances: np.ndarray) -> float:
+    """Length of the closed tour."""
+    closed = route + route[:1]
+    return float(sum(distances[a, b] for a, b in zip(closed, closed[1:])))
+
+
+def plan_route(warehouse_id: int, location_ids: List[int]) -> Tuple[List[int], float]:
+    """
+    Order locations to visit into a short closed route from the depot.
+
+    Args:
+        warehouse_id: Warehouse of the locations
+        location_ids: Locations to visit
+
+    Returns:
+        Location ids in visiting order (without the depot) and the route length in meters
+    """
+    layout = layouts.get(warehouse_id)
+    nodes = sorted({layout.index[pk] for pk in location_ids if pk in layout.index})
+    if layout.depot is not None and layout.depot not in nodes:
+        nodes.insert(0, layout.depot)
+    elif layout.depot is not None:
+        nodes.insert(0, nodes.pop(nodes.index(layout.depot)))
+    if not nodes:
+        return [], 0.0
+
+    distances = layout.distances(nodes)
+    route = two_opt(nearest_neighbour(distances, 0), distances) if len(nodes) > 3 else list(range(len(nodes)))
+    length = route_length(route, distances)
+    ordered = [int(layout.location_ids[nodes[i]]) for i in route]
+    if layout.depot is not None:
+        ordered = [pk for pk in ordered if pk != int(layout.location_ids[layout.depot])]
+    return ordered, length
+
+
+def locate_lots(warehouse_id: int, lot_ids: Iterable[int]) -> Dict[int, Tuple[int, str]]:
+    """
+    Get the location each lot is picked from in a warehouse.
+
+    Args:
+        warehouse_id: Warehouse to pick from
+        lot_ids: Lots to locate
+
+    Returns:
+        Mapping of lot id to the id and code of the location holding the most
+        of the lot; lots without a location are omitted
+    """
+    located: Dict[int, Tuple[int, str]] = {}
+    stock = (
+        Inventory.objects
+        .filter(warehouse_id=warehouse_id, lot_id__in=set(lot_ids), location__warehouse_id=warehouse_id)
+        .order_by('lot_id', '-quantity', 'pk')
+        .values_list('lot_id', 'location_id', 'location__code')
+    )
+    for lot_id, location_id, code in stock:
+        located.setdefault(lot_id, (location_id, code))
+    return located
+
+
+def pick_list(warehouse_id: int, order_ids: Iterable[int]) -> Dict[str, Any]:
+    """
+    Build one pick route for the material allocations of orders.
+
+    Args:
+        warehouse_id: Warehouse to pick from
+        order_ids: Orders whose product batch allocations are picked
+
+    Returns:
+        Route length, stops in visiting order with their picks, and the
+        allocations whose lot has no location in the warehouse
+    """
+    allocations = list(
+        Batch.objects.filter(product_batch__order_id__in=order_ids)
+        .order_by('pk')
+        .values('id', 'product_batch_id', 'product_batch__order_id', 'lot_id', 'lot__material_id',
+                'lot__material__name', 'quantity')
+    )
+    located = locate_lots(warehouse_id, (row['lot_id'] for row in allocations))
+
+    stops: Dict[int, Dict[str, Any]] = {}
+    unlocated = []
+    for row in allocations:
+        pick = {
+            'batch': row['id'], 'order': row['product_batch__order_id'], 'product_batch': row['product_batch_id'],
+            'lot': row['lot_id'], 'material': row['lot__material_id'], 'material_name': row['lot__material__name'],
+            'quantity': row['quantity'],
+        }
+        if row['lot_id'] not in located:
+            unlocated.append(pick)
+            continue
+        location_id, code = located[row['lot_id']]
+        stops.setdefault(location_id, {'location': location_id, 'code': code, 'picks': []})['picks'].append(pick)
+
+    route, distance = plan_route(warehouse_id, list(stops)) if stops else ([], 0.0)
+    return {'distance': distance, 'stops': [stops[pk] for pk in route], 'unlocated': unlocated}
+
+
+@receiver([post_save, post_delete], sender=Location, dispatch_uid='location_layout_changed')
+def location_changed(sender: Any, instance: Location, **kwargs: Any) -> None:
+    try:
+        cache.incr(version_key(instance.warehouse_id))
+    except ValueError:
+        pass
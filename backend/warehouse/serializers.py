@@ -0,0 +1,60 @@
+from rest_framework import serializers
+from . import models
+
+
+class LocationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Location
+        fields = ['id', 'warehouse', 'code', 'aisle', 'rack', 'level', 'x', 'y', 'is_depot']
+
+    def validate_warehouse(self, warehouse):
+        if warehouse.company_id != self.context['request'].user.company_id:
+            raise serializers.ValidationError('Warehouse does not belong to your company.')
+        return warehouse
+
+
+class PickSerializer(serializers.Serializer):
+    batch = serializers.IntegerField()
+    order = serializers.IntegerField()
+    product_batch = serializers.IntegerField()
+    lot = serializers.IntegerField()
+    material = serializers.IntegerField()
+    material_name = serializers.CharField()
+    quantity = serializers.FloatField()
+
+
+class PickStopSerializer(serializers.Serializer):
+    location = serializers.IntegerField()
+    code = serializers.CharField()
+    picks = PickSerializer(many=True)
+
+
+class PickListSerializer(serializers.Serializer):
+    warehouse = serializers.IntegerField()
+    order = serializers.IntegerField()
+    distance = serializers.FloatField(help_text='Length of the route from the depot and back in meters')
+    stops = PickStopSerializer(many=True)
+    unlocated = PickSerializer(many=True, help_text='Picks whose lot has no location in the warehouse')
+
+
+class WaveSerializer(serializers.ModelSerializer):
+    orders = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = models.Wave
+        fields = ['id', 'warehouse', 'status', 'created_at', 'lines', 'distance', 'orders']
+        read_only_fields = ['warehouse', 'created_at', 'lines', 'distance']
+
+
+class WavePlanRequestSerializer(serializers.Serializer):
+    warehouse = serializers.IntegerField(help_text='Warehouse the orders are picked from')
+    max_orders = serializers.IntegerField(required=False, min_value=1, help_text='Maximum orders per wave')
+    max_lines = serializers.IntegerField(required=False, min_value=1, help_text='Maximum allocations per wave')
+
+
+class WavePickListSerializer(serializers.Serializer):
+    wave = serializers.IntegerField()
+    warehouse = serializers.IntegerField()
+    distance = serializers.FloatField(help_text='Length of the route from the depot and back in meters')
+    stops = PickStopSerializer(many=True)
+    unlocated = PickSerializer(many=True, help_text='Picks whose lot has no location in the warehouse')
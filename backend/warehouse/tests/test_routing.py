@@ -0,0 +1,153 @@
+"""
+Test suite for bin locations and pick routes.
+"""
+
+from datetime import timedelta
+from itertools import permutations
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from orders.models import Order
+from products.models import Material, Product, Lot, Inventory, ProductBatch, Batch
+from ..models import Warehouse, Location
+from ..routing import distance_matrix, layouts, nearest_neighbour, plan_route, route_length, two_opt
+import numpy as np
+
+
+class TestDistances(TestCase):
+    """Test suite for the aisle distance model and route construction."""
+
+    def test_aisle_distances(self) -> None:
+        """
+        Test walking distances between locations.
+
+        Verifies:
+            - Locations in one aisle are connected directly
+            - Other aisles are reached through the nearer cross-aisle
+            - The depot on the front cross-aisle is reached directly
+            - Distances of a subset of locations use the back cross-aisle of the whole layout
+        """
+        x = np.array([0.0, 0.0, 3.0, 3.0, 1.0])
+        y = np.array([2.0, 8.0, 9.0, 10.0, 0.0])
+        aisles = np.array(['A', 'A', 'B', 'B', ''], dtype=object)
+        distances = distance_matrix(x, y, aisles)
+        assert distances[0, 1] == 6
+        assert distances[0, 2] == 3 + min(2 + 9, 20 - 2 - 9)
+        assert distances[1, 3] == 3 + 2
+        assert distances[4, 0] == 1 + 2
+        assert (distances == distances.T).all()
+        nodes = [0, 2, 4]
+        subset = distance_matrix(x[nodes], y[nodes], aisles[nodes], depth=10.0)
+        assert (subset == distances[np.ix_(nodes, nodes)]).all()
+
+    def test_two_opt_matches_brute_force(self) -> None:
+        """
+        Test that 2-opt improves the nearest neighbour tour of small random layouts.
+
+        Verifies:
+            - The route is a permutation starting at the depot
+            - The route is never longer than nearest neighbour and close to the optimum
+        """
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            n = 7
+            x = rng.integers(0, 5, n).astype(float) * 3
+            y = rng.uniform(0, 20, n)
+            aisles = np.array([str(v) for v in x], dtype=object)
+            aisles[0], y[0] = '', 0
+            distances = distance_matrix(x, y, aisles)
+            greedy = nearest_neighbour(distances, 0)
+            route = two_opt(greedy, distances)
+            assert route[0] == 0 and sorted(route) == list(range(n))
+            optimum = min(route_length([0, *rest], distances) for rest in permutations(range(1, n)))
+            assert route_length(route, distances) <= route_length(greedy, distances) + 1e-4
+            assert route_length(route, distances) <= optimum * 1.25 + 1e-4
+
+
+class TestPickList(TestCase):
+    """Test suite for pick lists built from order allocations."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.main = Warehouse.objects.create(company=cls.company, name='Main')
+        production = Warehouse.objects.create(company=cls.company, name='Production')
+        cls.depot = Location.objects.create(warehouse=cls.main, code='DEPOT', aisle='', x=0, y=0, is_depot=True)
+        # Two aisles, 3 m apart, with bins at 2 m intervals.
+        cls.bins = {
+            f'{aisle}{rack}': Location.objects.create(
+                warehouse=cls.main, code=f'{aisle}{rack}', aisle=aisle, rack=rack, x=x, y=2 * rack,
+            )
+            for aisle, x in (('A', 1), ('B', 4)) for rack in range(1, 6)
+        }
+        supplier = create_supplier(cls.company)
+        client = create_client(cls.company)
+        product = Product.objects.create(company=cls.company, name='Frame', unit='pcs')
+        cls.order = Order.objects.create(company=cls.company, client=client, status='Confirmed')
+        product_batch = ProductBatch.objects.create(warehouse=production, product=product, order=cls.order,
+                                                    ordered_quantity=1, produced_quantity=0)
+        expiration = timezone.now() + timedelta(days=30)
+        cls.lots = {}
+        for code in ('B5', 'A1', 'B1', 'A5', None):
+            material = Material.objects.create(company=cls.company, name=f'M-{code}', unit='kg')
+            lot = Lot.objects.create(supplier=supplier, material=material, quantity_received=10,
+                                     quantity_remaining=10, expiration=expiration)
+            Inventory.objects.create(warehouse=cls.main, lot=lot, quantity=10,
+                                     location=cls.bins[code] if code else None)
+            Batch.objects.create(product_batch=product_batch, lot=lot, quantity=1)
+            cls.lots[code] = lot
+
+        cls.user = create_user(cls.company, 'picker', UserGroups.PICKER_PACKER)
+
+    def test_route_walks_aisles_in_order(self) -> None:
+        """
+        Test that the route goes up one aisle and down the next.
+        """
+        ids = [self.bins[code].pk for code in ('B5', 'A1', 'B1', 'A5')]
+        route, distance = plan_route(self.main.pk, ids)
+        assert [Location.objects.get(pk=pk).code for pk in route] in (['A1', 'A5', 'B5', 'B1'],
+                                                                      ['B1', 'B5', 'A5', 'A1'])
+        assert distance == (1 + 2) + 8 + 3 + 8 + (4 + 2)
+
+    def test_layout_is_cached_until_locations_change(self) -> None:
+        """
+        Test the per-process distance matrix cache.
+
+        Verifies:
+            - Repeated routes in one layout run no queries
+            - Saving a location reloads the layout
+        """
+        layouts.get(self.main.pk)
+        with self.assertNumQueries(0):
+            plan_route(self.main.pk, [self.bins['A1'].pk])
+
+        moved = Location.objects.create(warehouse=self.main, code='C1', aisle='C', x=7, y=2)
+        route, _ = plan_route(self.main.pk, [moved.pk])
+        assert route == [moved.pk]
+
+    def test_picklist_endpoint(self) -> None:
+        """
+        Test the pick list of an order.
+
+        Verifies:
+            - Stops hold the allocations of the lots stored there
+            - Allocations of lots without a location are listed separately
+            - Warehouses of other companies are not found
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('warehouse:picklist', args=[self.main.pk, self.order.pk]))
+        assert response.status_code == 200
+        data = response.json()
+        assert data['distance'] == 28
+        assert [stop['code'] for stop in data['stops']] in (['A1', 'A5', 'B5', 'B1'], ['B1', 'B5', 'A5', 'A1'])
+        assert data['stops'][0]['picks'][0]['lot'] in (self.lots['A1'].pk, self.lots['B1'].pk)
+        assert [pick['lot'] for pick in data['unlocated']] == [self.lots[None].pk]
+
+        other = Company.objects.create(name='Other', domain='https://other.com', email='o@other.com')
+        warehouse = Warehouse.objects.create(company=other, name='Main')
+        response = client.get(reverse('warehouse:picklist', args=[warehouse.pk, self.order.pk]))
+        assert response.status_code == 404
@@ -0,0 +1,132 @@
+"""
+Test suite for wave planning.
+"""
+
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from conftest import create_client, create_supplier, create_user
+from users.models import Company, UserGroups
+from orders.models import Order
+from products.models import Material, Product, Lot, Inventory, ProductBatch, Batch
+from ..models import Warehouse, Location, Wave
+from ..waves import PendingOrder, WavePlanner, cluster
+import numpy as np
+
+
+def pending(pk: int, locations: set, lines: int = 1) -> PendingOrder:
+    return PendingOrder(pk, lines, frozenset(locations), frozenset())
+
+
+class TestClustering(TestCase):
+    """Test suite for grouping orders by shared locations."""
+
+    def test_orders_sharing_locations_are_grouped(self) -> None:
+        """
+        Test that similar orders end up in the same wave.
+
+        Verifies:
+            - The most urgent order seeds the first wave
+            - Orders are grouped by overlapping locations rather than by urgency
+        """
+        orders = [pending(0, {1, 2}), pending(1, {8, 9}), pending(2, {1, 2, 3}), pending(3, {9})]
+        assert cluster(orders, max_orders=2, max_lines=10) == [[0, 2], [1, 3]]
+
+    def test_limits_are_respected(self) -> None:
+        """
+        Test wave capacity limits on random orders.
+
+        Verifies:
+            - Every order is planned exactly once
+            - Waves stay within the order and line limits, except for single oversized orders
+        """
+        rng = np.random.default_rng(3)
+        orders = [pending(i, set(rng.integers(0, 40, rng.integers(1, 6)).tolist()), int(rng.integers(1, 8)))
+                  for i in range(300)]
+        waves = cluster(orders, max_orders=10, max_lines=25)
+        assert sorted(position for wave in waves for position in wave) == list(range(300))
+        for wave in waves:
+            assert len(wave) <= 10
+            assert len(wave) == 1 or sum(orders[position].lines for position in wave) <= 25
+
+    def test_unrelated_orders_fill_waves(self) -> None:
+        """
+        Test that orders without any overlap still share waves by urgency.
+        """
+        orders = [pending(i, {i}) for i in range(5)]
+        assert cluster(orders, max_orders=2, max_lines=10) == [[0, 1], [2, 3], [4]]
+
+
+class TestWavePlanner(TestCase):
+    """Test suite for planning and picking waves of confirmed orders."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.main = Warehouse.objects.create(company=cls.company, name='Main')
+        production = Warehouse.objects.create(company=cls.company, name='Production')
+        Location.objects.create(warehouse=cls.main, code='DEPOT', aisle='', x=0, y=0, is_depot=True)
+        supplier = create_supplier(cls.company)
+        client = create_client(cls.company)
+        product = Product.objects.create(company=cls.company, name='Frame', unit='pcs')
+        expiration = timezone.now() + timedelta(days=30)
+        lots = []
+        for aisle, x in (('A', 1), ('B', 30)):
+            location = Location.objects.create(warehouse=cls.main, code=f'{aisle}1', aisle=aisle, x=x, y=2)
+            material = Material.objects.create(company=cls.company, name=f'M-{aisle}', unit='kg')
+            lot = Lot.objects.create(supplier=supplier, material=material, quantity_received=10,
+                                     quantity_remaining=10, expiration=expiration)
+            Inventory.objects.create(warehouse=cls.main, lot=lot, quantity=10, location=location)
+            lots.append(lot)
+
+        # Orders alternate between the two aisles; the draft order is never planned.
+        cls.orders = []
+        for i, status in enumerate(['Confirmed'] * 4 + ['Draft']):
+            order = Order.objects.create(company=cls.company, client=client, status=status,
+                                         due_date=timezone.now() + timedelta(days=i))
+            batch = ProductBatch.objects.create(warehouse=production, product=product, order=order,
+                                                ordered_quantity=1, produced_quantity=0)
+            Batch.objects.create(product_batch=batch, lot=lots[i % 2], quantity=1)
+            cls.orders.append(order)
+
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def test_plan_groups_orders_by_aisle(self) -> None:
+        """
+        Test planning waves of confirmed orders.
+
+        Verifies:
+            - Orders picked from the same location share a wave
+            - Planned orders are not planned again
+        """
+        waves = WavePlanner(self.company.pk, self.main.pk, max_orders=2).plan()
+        assert [sorted(wave.orders.values_list('pk', flat=True)) for wave in waves] == [
+            [self.orders[0].pk, self.orders[2].pk], [self.orders[1].pk, self.orders[3].pk],
+        ]
+        assert waves[0].lines == 2
+        assert waves[0].distance == 2 * (1 + 2)
+        assert WavePlanner(self.company.pk, self.main.pk).plan() == []
+
+    def test_wave_endpoints(self) -> None:
+        """
+        Test planning and picking a wave through the API.
+
+        Verifies:
+            - Planning returns the created waves with their orders
+            - The wave pick list holds the picks of all its orders at one stop
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('warehouse:wave'), {'warehouse': self.main.pk, 'max_orders': 2},
+                               format='json')
+        assert response.status_code == 201
+        assert [len(wave['orders']) for wave in response.json()] == [2, 2]
+
+        wave = Wave.objects.order_by('pk').first()
+        response = client.get(reverse('warehouse:wave_picklist', args=[wave.pk]))
+        assert response.status_code == 200
+        stops = response.json()['stops']
+        assert [stop['code'] for stop in stops] == ['A1']
+        assert {pick['order'] for pick in stops[0]['picks']} == {self.orders[0].pk, self.orders[2].pk}
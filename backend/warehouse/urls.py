@@ -0,0 +1,11 @@
+from . import views
+from django.urls import path
+
+app_name = 'warehouse'
+
+urlpatterns = [
+    path('location/', views.LocationViewSet.as_view(), name='location'),
+    path('wave/', views.WaveViewSet.as_view(), name='wave'),
+    path('wave/<int:pk>/picklist/', views.WavePickListView.as_view(), name='wave_picklist'),
+    path('<int:warehouse_id>/picklist/<int:order_id>/', views.PickListView.as_view(), name='picklist'),
+]
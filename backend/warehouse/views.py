@@ -1,3 +1,117 @@
-from django.shortcuts import render
+from rest_framework import generics, status
+from django.db.models import Prefetch
+from users.models import UserGroups
+from users.permissions import has_group_permission
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.request import Request
+from rest_framework.response import Response
+from orders.models import Order
+from . import serializers, models
+from typing import Any
+from .routing import pick_list
+from .waves import WavePlanner
 
-# Create your views here.
+
+class LocationViewSet(generics.ListCreateAPIView):
+    """View for managing storage locations of the user's warehouses."""
+    serializer_class = serializers.LocationSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 3, 'post': 4}
+
+    def get_queryset(self):
+        return models.Location.objects.filter(warehouse__company_id=self.request.user.company_id).order_by('pk')
+
+    @swagger_auto_schema(
+        operation_description="Get all locations",
+        responses={200: serializers.LocationSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Create a new location",
+        responses={201: serializers.LocationSerializer},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().post(request, *args, **kwargs)
+
+
+class PickListView(generics.GenericAPIView):
+    """View for the optimized pick route of an order's material allocations."""
+    serializer_class = serializers.PickListSerializer
+    permission_classes = [has_group_permission(
+        [UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER, UserGroups.PICKER_PACKER]
+    )]
+    query_budget = {'get': 7}
+
+    @swagger_auto_schema(
+        operation_description="Get the locations to visit for the allocations of an order in visiting order, "
+                              "starting and ending at the depot of the warehouse.",
+        responses={200: serializers.PickListSerializer},
+    )
+    def get(self, request: Request, warehouse_id: int, order_id: int, *args: Any, **kwargs: Any) -> Response:
+        company_id = request.user.company_id
+        generics.get_object_or_404(models.Warehouse.objects.values_list('pk'), pk=warehouse_id, company_id=company_id)
+        generics.get_object_or_404(Order.objects.values_list('pk'), pk=order_id, company_id=company_id)
+        data = {'warehouse': warehouse_id, 'order': order_id, **pick_list(warehouse_id, [order_id])}
+        return Response(self.get_serializer(data).data)
+
+
+class WaveViewSet(generics.ListAPIView):
+    """View for pick waves of the user's company."""
+    serializer_class = serializers.WaveSerializer
+    permission_classes = [has_group_permission([UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER])]
+    query_budget = {'get': 4, 'post': 13}
+
+    def get_queryset(self):
+        return (
+            models.Wave.objects
+            .filter(company_id=self.request.user.company_id)
+            .prefetch_related(Prefetch('orders', queryset=Order.objects.only('pk', 'wave_id')))
+            .order_by('-pk')
+        )
+
+    @swagger_auto_schema(
+        operation_description="Get all waves, newest first",
+        responses={200: serializers.WaveSerializer(many=True)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description="Group confirmed orders that are not in a wave yet into waves of orders "
+                              "picked from the same locations.",
+        request_body=serializers.WavePlanRequestSerializer,
+        responses={201: serializers.WaveSerializer(many=True)},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        params = serializers.WavePlanRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        company_id = request.user.company_id
+        warehouse_id = params.validated_data['warehouse']
+        generics.get_object_or_404(models.Warehouse.objects.values_list('pk'), pk=warehouse_id, company_id=company_id)
+        waves = WavePlanner(
+            company_id, warehouse_id, params.validated_data.get('max_orders'), params.validated_data.get('max_lines'),
+        ).plan()
+        queryset = self.get_queryset().filter(pk__in=[wave.pk for wave in waves]).order_by('pk')
+        return Response(self.get_serializer(queryset, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class WavePickListView(generics.GenericAPIView):
+    """View for the consolidated pick route of a wave."""
+    serializer_class = serializers.WavePickListSerializer
+    permission_classes = [has_group_permission(
+        [UserGroups.ADMIN, UserGroups.WAREHOUSE_MANAGER, UserGroups.PICKER_PACKER]
+    )]
+    query_budget = {'get': 6}
+
+    @swagger_auto_schema(
+        operation_description="Get the locations to visit for all orders of a wave in visiting order, "
+                              "starting and ending at the depot of the warehouse.",
+        responses={200: serializers.WavePickListSerializer},
+    )
+    def get(self, request: Request, pk: int, *args: Any, **kwargs: Any) -> Response:
+        wave = generics.get_object_or_404(models.Wave, pk=pk, company_id=request.user.company_id)
+        order_ids = Order.objects.filter(wave_id=wave.pk).values_list('pk', flat=True)
+        data = {'wave': wave.pk, 'warehouse': wave.warehouse_id, **pick_list(wave.warehouse_id, order_ids)}
+        return Response(self.get_serializer(data).data)
@@ -0,0 +1,186 @@
+"""
+Wave planning: batching confirmed orders into shared pick routes.
+
+Every confirmed order without a wave is described by the set of locations
+its allocations are picked from (the products of allocations whose lot has
+no location stand in for them). Waves are grown greedily: the most urgent
+unplanned order (earliest due date) seeds a wave, and the order with the
+highest Jaccard similarity between its set and the union of the wave's sets
+joins it next, as long as the wave stays within its order and line limits.
+When no remaining order shares anything with the wave, the next most urgent
+order that fits fills it, so pickers still make fewer trips.
+
+An inverted index from feature to orders keeps the overlap of every order
+with the growing wave up to date as features are added, and the similarity
+of all candidates is evaluated at once with numpy, so a run over thousands
+of orders takes well under a second. Each wave's route is planned over the
+cached warehouse layout (see ``warehouse.routing``).
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from typing import Dict, List, Optional, Sequence
+from orders.models import Order
+from products.models import Batch
+from users.models import Company
+from .models import Wave
+from .routing import locate_lots, plan_route
+import numpy as np
+
+WAVE_STATUS = 'Confirmed'
+
+
+@dataclass
+class PendingOrder:
+    """Wave planning view of a confirmed order."""
+
+    pk: int
+    lines: int
+    locations: frozenset
+    products: frozenset
+
+    @property
+    def features(self) -> frozenset:
+        # Locations and products share one id space: even for locations, odd for products.
+        return frozenset(2 * pk for pk in self.locations) | frozenset(2 * pk + 1 for pk in self.products)
+
+
+def cluster(orders: Sequence[PendingOrder], max_orders: int, max_lines: int) -> List[List[int]]:
+    """
+    Group orders into waves.
+
+    Args:
+        orders: Orders to plan, most urgent first
+        max_orders: Maximum number of orders in a wave
+        max_lines: Maximum number of allocations in a wave; a larger order gets a wave of its own
+
+    Returns:
+        Positions of the orders of every wave in ``orders``, in the order they joined
+    """
+    n = len(orders)
+    feature_ids: Dict[int, int] = {}
+    members = defaultdict(list)
+    sizes = np.zeros(n, dtype=np.int64)
+    for position, order in enumerate(orders):
+        features = order.features
+        sizes[position] = len(features)
+        for feature in features:
+            members[feature_ids.setdefault(feature, len(feature_ids))].append(position)
+    index = [np.array(members[feature], dtype=np.int64) for feature in range(len(feature_ids))]
+    order_features = [[feature_ids[feature] for feature in order.features] for order in orders]
+    lines = np.array([order.lines for order in orders], dtype=np.int64)
+
+    unplanned = np.ones(n, dtype=bool)
+    waves = []
+    seed = 0
+    while True:
+        while seed < n and not unplanned[seed]:
+            seed += 1
+        if seed == n:
+            break
+
+        wave, wave_lines, wave_features = [], 0, 0
+        in_wave = np.zeros(len(feature_ids), dtype=bool)
+        shared = np.zeros(n, dtype=np.int64)
+        candidate: Optional[int] = seed
+        while candidate is not None:
+            wave.append(candidate)
+            wave_lines += lines[candidate]
+            unplanned[candidate] = False
+            for feature in order_features[candidate]:
+                if not in_wave[feature]:
+                    in_wave[feature] = True
+                    wave_features += 1
+                    shared[index[feature]] += 1
+            if len(wave) >= max_orders:
+                break
+
+            fits = unplanned & (lines + wave_lines <= max_lines)
+            if not fits.any():
+                break
+            # Empty sets on both sides leave a zero denominator; such orders score 0.
+            union = np.maximum(wave_features + sizes - shared, 1)
+            similarity = np.where(fits, shared / union, -1.0)
+            best = int(similarity.argmax())
+            candidate = best if similarity[best] > 0 else int(fits.argmax())
+        waves.append(wave)
+    return waves
+
+
+class WavePlanner:
+    """
+    Plans waves of the confirmed orders of a company in one warehouse.
+
+    Args:
+        company_id: Company whose orders are planned
+        warehouse_id: Warehouse the orders are picked from
+        max_orders: Maximum number of orders in a wave
+        max_lines: Maximum number of allocations in a wave
+    """
+
+    def __init__(self, company_id: int, warehouse_id: int, max_orders: Optional[int] = None,
+                 max_lines: Optional[int] = None) -> None:
+        self.company_id = company_id
+        self.warehouse_id = warehouse_id
+        self.max_orders = max_orders or settings.WAVE_PLANNING['MAX_ORDERS']
+        self.max_lines = max_lines or settings.WAVE_PLANNING['MAX_LINES']
+
+    def plan(self) -> List[Wave]:
+        """
+        Create waves for all confirmed orders that are not in a wave yet.
+
+        Returns:
+            Created waves, most urgent first
+        """
+        with transaction.atomic():
+            # Concurrent runs of a company would put the same orders into two waves.
+            list(Company.objects.select_for_update().filter(pk=self.company_id).values_list('pk'))
+            orders = self._pending()
+            groups = cluster(orders, self.max_orders, self.max_lines)
+            waves = []
+            for group in groups:
+                locations = set().union(*(orders[position].locations for position in group))
+                _, distance = plan_route(self.warehouse_id, list(locations)) if locations else ([], 0.0)
+                waves.append(Wave(
+                    company_id=self.company_id, warehouse_id=self.warehouse_id,
+                    lines=sum(orders[position].lines for position in group), distance=distance,
+                ))
+            Wave.objects.bulk_create(waves)
+            self._assign([(wave.pk, orders[position].pk) for wave, group in zip(waves, groups) for position in group])
+        return waves
+
+    def _pending(self) -> List[PendingOrder]:
+        rows = list(
+            Batch.objects.filter(
+                product_batch__order__company_id=self.company_id,
+                product_batch__order__status=WAVE_STATUS,
+                product_batch__order__wave__isnull=True,
+            )
+            .order_by(F('product_batch__order__due_date').asc(nulls_last=True), 'product_batch__order_id')
+            .values_list('product_batch__order_id', 'product_batch__product_id', 'lot_id')
+        )
+        located = locate_lots(self.warehouse_id, (lot_id for _, _, lot_id in rows))
+        lines: Dict[int, int] = defaultdict(int)
+        locations, products = defaultdict(set), defaultdict(set)
+        for order_id, product_id, lot_id in rows:
+            lines[order_id] += 1
+            if lot_id in located:
+                locations[order_id].add(located[lot_id][0])
+            else:
+                products[order_id].add(product_id)
+        # Rows come sorted by urgency and dicts keep the insertion order.
+        return [PendingOrder(pk, count, frozenset(locations[pk]), frozenset(products[pk]))
+                for pk, count in lines.items()]
+
+    @staticmethod
+    def _assign(assignments: List[tuple]) -> None:
+        # Like the production scheduler, a plain executemany beats bulk_update for thousands of rows.
+        if not assignments:
+            return
+        connection = connections[router.db_for_write(Order)]
+        table = connection.ops.quote_name(Order._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.executemany(f'UPDATE {table} SET wave_id = %s WHERE id = %s', assignments)
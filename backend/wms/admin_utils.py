@@ -0,0 +1,96 @@
+"""
+Building blocks for admin changelists of tables with tens of millions of rows.
+
+Counting rows is the most expensive part of a changelist on a large table:
+Django runs a ``COUNT(*)`` for the paginator and another one for the full
+result count. ``LargeTableAdmin`` replaces them with a planner estimate (on
+PostgreSQL) or a count capped at ``EstimatedCountPaginator.count_limit`` and
+adds keyset ("cursor") navigation past the capped pages.
+"""
+
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+from typing import Any, Optional
+
+CURSOR_PARAM = 'id__lt'
+
+
+def estimated_row_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Get the planner's row estimate for the queryset's table.
+
+    Args:
+        queryset: Unfiltered queryset
+
+    Returns:
+        Estimated number of rows, or None when the backend has no statistics
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts more than ``count_limit`` rows.
+
+    Unfiltered lists of big PostgreSQL tables use the planner estimate,
+    everything else is counted with ``LIMIT count_limit``, so pages past the
+    limit are reached through cursor navigation instead of OFFSET.
+    """
+
+    count_limit = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset)
+            if estimate is not None and estimate > self.count_limit:
+                return estimate
+        return queryset.order_by()[:self.count_limit].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin defaults for large tables.
+
+    Subclasses should set ``list_select_related`` for every foreign key used
+    by ``list_display`` (including the ones used by ``__str__``), use
+    ``autocomplete_fields`` for foreign keys and only filter on indexed or
+    choice fields.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+    list_per_page = 100
+    change_list_template = 'admin/cursor_change_list.html'
+
+    def changelist_view(self, request: HttpRequest, extra_context: Any = None) -> Any:
+        """Add the cursor of the next (older) page to the changelist context."""
+        response = super().changelist_view(request, extra_context)
+        if not isinstance(response, TemplateResponse) or 'cl' not in response.context_data:
+            return response
+        changelist = response.context_data['cl']
+        response.context_data['next_cursor_query'] = ''
+        rows = list(changelist.result_list)
+        # Keyset navigation only makes sense in the default -pk ordering.
+        if rows and 'o' not in request.GET and len(rows) == changelist.list_per_page:
+            params = request.GET.copy()
+            params.pop('p', None)
+            params[CURSOR_PARAM] = rows[-1].pk
+            response.context_data['next_cursor_query'] = params.urlencode()
+        return response
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class WmsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'wms'
+
+    def ready(self) -> None:
+        from . import checks  # noqa: F401
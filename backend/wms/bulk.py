@@ -0,0 +1,162 @@
+"""
+Bulk upserts for catalog endpoints.
+
+Views mixing in ``BulkUpsertMixin`` keep their single-object POST and also
+accept a JSON list. A list is handled with a fixed number of queries
+regardless of its length:
+
+- every item is validated by one instance of ``bulk_serializer_class``,
+  whose foreign keys are plain integers, so field validation runs no queries,
+- the ids of every foreign key in ``bulk_related`` are checked against the
+  user's company with one ``IN`` query per field,
+- rows that already exist under the unique key are read with one query;
+  rows of the user's company are updated, keys taken by another company are
+  reported as errors, and repeated keys in the payload are rejected,
+- the valid items are written with ``wms.db.upsert``, one
+  ``INSERT ... ON CONFLICT DO UPDATE`` for up to 5000 rows. For models with
+  a ``company_id`` column the update only applies to rows of the user's
+  company, so a key another company took after the read above is reported
+  as an error too instead of being overwritten.
+
+The response lists one result per item, in order, with the status
+``created``, ``updated`` or ``error``. Valid items are written even when
+other items fail.
+"""
+
+from django.db import transaction
+from rest_framework import serializers, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .db import upsert
+
+
+class BulkResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField(help_text='Position of the item in the request')
+    status = serializers.ChoiceField(choices=['created', 'updated', 'error'])
+    id = serializers.IntegerField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class BulkUpsertMixin:
+    """
+    Accept a list of objects on POST and upsert them in one statement.
+
+    Attributes:
+        bulk_serializer_class: Query-free serializer of one item
+        bulk_unique_fields: Fields (``product_id`` style for foreign keys) of the unique key
+        bulk_update_fields: Fields updated when the key exists; the validated
+            items must hold exactly the key and update fields
+        bulk_related: Foreign key fields mapped to ``(model, company lookup)`` pairs
+        bulk_company_lookup: Lookup of the owning company from the model
+        bulk_max_items: Maximum length of a list payload
+    """
+    bulk_serializer_class = None
+    bulk_unique_fields: Sequence[str] = ()
+    bulk_update_fields: Sequence[str] = ()
+    bulk_related: Dict[str, Tuple[type, str]] = {}
+    bulk_company_lookup = 'company_id'
+    bulk_max_items = 5000
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if isinstance(request.data, list):
+            return self.bulk_upsert(request, request.data)
+        return super().post(request, *args, **kwargs)
+
+    def bulk_upsert(self, request: Request, items: List[Any]) -> Response:
+        """Validate and upsert a list payload, see the module docstring."""
+        if not items or len(items) > self.bulk_max_items:
+            return Response({'error': f'Send between 1 and {self.bulk_max_items} items'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        company_id = request.user.company_id
+        model = self.get_queryset().model
+        results: List[Dict[str, Any]] = [{'index': index} for index in range(len(items))]
+
+        valid = self._validate_items(items, results)
+        self._check_related(valid, company_id, results)
+        valid = [(index, data) for index, data in valid if 'errors' not in results[index]]
+        existing = self._existing(model, valid)
+        rows = []
+        first_index: Dict[Tuple, int] = {}
+        for index, data in valid:
+            key = self.bulk_key(data)
+            if key in first_index:
+                results[index].update(status='error', errors={'non_field_errors': [
+                    f'Duplicate of item {first_index[key]}.']})
+                continue
+            first_index[key] = index
+            found = existing.get(key)
+            if found is not None and found[1] != company_id:
+                results[index].update(status='error', errors={'non_field_errors': [
+                    'An object with this key already exists.']})
+                continue
+            results[index]['status'] = 'updated' if found else 'created'
+            rows.append((index, data))
+
+        if rows:
+            fields = [*self.bulk_unique_fields, *self.bulk_update_fields]
+            values = [tuple(data[field] for field in fields) for _, data in rows]
+            guard_fields = ()
+            if self.bulk_company_lookup == 'company_id':
+                fields.append('company_id')
+                values = [row + (company_id,) for row in values]
+                guard_fields = ('company_id',)
+            with transaction.atomic():
+                ids = upsert(model, fields, self.bulk_unique_fields, self.bulk_update_fields, values, guard_fields)
+                for (index, _), pk in zip(rows, ids):
+                    if pk is None:
+                        results[index].update(status='error', errors={'non_field_errors': [
+                            'An object with this key already exists.']})
+                    else:
+                        results[index]['id'] = pk
+                rows = [(index, data) for index, data in rows if 'id' in results[index]]
+                self.bulk_saved(
+                    [results[index]['id'] for index, _ in rows if results[index]['status'] == 'created'],
+                    [results[index]['id'] for index, _ in rows if results[index]['status'] == 'updated'],
+                    company_id,
+                )
+
+        data = BulkResultSerializer(results, many=True).data
+        return Response(data, status=status.HTTP_200_OK if rows else status.HTTP_400_BAD_REQUEST)
+
+    def bulk_key(self, data: Dict[str, Any]) -> Tuple:
+        return tuple(data[field] for field in self.bulk_unique_fields)
+
+    def bulk_saved(self, created: List[int], updated: List[int], company_id: int) -> None:
+        """Hook for work that model signals would do for single saves; runs in the upsert's transaction."""
+
+    def _validate_items(self, items: List[Any], results: List[Dict[str, Any]]) -> List[Tuple[int, Dict]]:
+        child = self.bulk_serializer_class(context=self.get_serializer_context())
+        valid = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, child.run_validation(item)))
+            except serializers.ValidationError as e:
+                errors = e.detail if isinstance(e.detail, dict) else {'non_field_errors': e.detail}
+                results[index].update(status='error', errors=errors)
+        return valid
+
+    def _check_related(self, valid: List[Tuple[int, Dict]], company_id: int,
+                       results: List[Dict[str, Any]]) -> None:
+        for field, (related_model, company_lookup) in self.bulk_related.items():
+            ids = {data[field] for _, data in valid}
+            allowed = set(
+                related_model.objects.filter(pk__in=ids, **{company_lookup: company_id})
+                .values_list('pk', flat=True)
+            )
+            for index, data in valid:
+                if data[field] not in allowed:
+                    errors = results[index].setdefault('errors', {})
+                    errors[field.removesuffix('_id')] = ['Object does not exist.']
+                    results[index]['status'] = 'error'
+
+    def _existing(self, model: type, valid: List[Tuple[int, Dict]]) -> Dict[Tuple, Tuple[int, Optional[int]]]:
+        if not valid:
+            return {}
+        # Narrow by the first key field with one IN query and match full keys in Python.
+        first = self.bulk_unique_fields[0]
+        rows = (
+            model.objects.filter(**{f'{first}__in': {data[first] for _, data in valid}})
+            .values_list('pk', self.bulk_company_lookup, *self.bulk_unique_fields)
+        )
+        return {tuple(key): (pk, owner) for pk, owner, *key in rows}
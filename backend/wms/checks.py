@@ -0,0 +1,32 @@
+"""
+System checks of the deployment settings.
+
+Idempotency keys (``wms.idempotency``), the available-to-promise cache
+version (``products.atp``) and the warehouse layout versions
+(``warehouse.routing``) are shared between workers through the default
+cache. A per-process cache silently breaks them as soon as more than one
+worker serves requests, so it is only accepted with ``DEBUG`` on.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from typing import Any, List
+
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches)
+def shared_cache_check(app_configs: Any, **kwargs: Any) -> List[Error]:
+    """Reject a per-process default cache when DEBUG is off."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        f'The default cache ({backend}) is not shared between worker processes.',
+        hint='Set CACHE_BACKEND and CACHE_LOCATION to a shared cache, '
+             'e.g. django.core.cache.backends.redis.RedisCache and redis://host:6379/0.',
+        id='wms.E001',
+    )]
@@ -0,0 +1,181 @@
+"""
+Set-based writes that the ORM cannot express in a single statement.
+
+The helpers build one statement for many rows with a ``VALUES`` list and
+work on PostgreSQL and on SQLite 3.35+, which share the ``ON CONFLICT``,
+``RETURNING`` and ``WITH name (columns) AS (VALUES ...)`` syntax. Rows are
+written in chunks to stay below the bind parameter limits of both databases
+(32766 on SQLite 3.32+, 65535 on PostgreSQL); Django's own ``bulk_create``
+assumes SQLite's historical limit of 999 and splits far more often.
+"""
+
+from django.db import connections, router
+from django.db.models import Model
+from typing import List, Optional, Sequence, Tuple, Type
+
+CHUNK_SIZE = 5000
+MAX_PARAMS = 32000
+
+
+def upsert_add(model: Type[Model], key_fields: Sequence[str], value_field: str,
+               rows: Sequence[Tuple], version_field: Optional[str] = None) -> None:
+    """
+    Insert rows or add their value to the existing row with the same key.
+
+    Runs ``INSERT ... ON CONFLICT (keys) DO UPDATE SET value = value + EXCLUDED.value``;
+    the key fields must be covered by a unique constraint.
+
+    Args:
+        model: Model whose table is written
+        key_fields: Fields (``warehouse_id`` style for foreign keys) identifying a row
+        value_field: Numeric field the values are added to
+        rows: Tuples of the key values followed by the value to add
+        version_field: Version column set to 0 on insert and incremented on update
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [quote(model._meta.get_field(name).column) for name in [*key_fields, value_field]]
+    value = columns[-1]
+    placeholders = ['%s'] * len(columns)
+    updates = [f'{value} = {table}.{value} + EXCLUDED.{value}']
+    if version_field:
+        version = quote(model._meta.get_field(version_field).column)
+        columns.append(version)
+        placeholders.append('0')
+        updates.append(f'{version} = {table}.{version} + 1')
+    row_sql = '(' + ', '.join(placeholders) + ')'
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(columns)}) VALUES '
+                + ', '.join([row_sql] * len(chunk))
+                + f' ON CONFLICT ({", ".join(columns[:len(key_fields)])}) DO UPDATE SET {", ".join(updates)}',
+                [item for row in chunk for item in row],
+            )
+
+
+def conditional_subtract(model: Type[Model], filter_field: str, filter_value: object, key_field: str,
+                         value_field: str, rows: Sequence[Tuple],
+                         version_field: Optional[str] = None) -> List[object]:
+    """
+    Subtract values from rows that hold at least that much, all or nothing per row.
+
+    Args:
+        model: Model whose table is written
+        filter_field: Field every updated row must match, e.g. ``warehouse_id``
+        filter_value: Value of ``filter_field``
+        key_field: Field identifying the row of each value, e.g. ``lot_id``
+        value_field: Numeric field the values are subtracted from
+        rows: ``(key, value)`` tuples with distinct keys
+        version_field: Version column incremented on every updated row
+
+    Returns:
+        Keys whose row is missing or holds less than the value; their rows
+        are left unchanged. Callers roll back when the list is not empty.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column = quote(model._meta.get_field(filter_field).column)
+    key = quote(model._meta.get_field(key_field).column)
+    value = quote(model._meta.get_field(value_field).column)
+    amount = f'(SELECT amount FROM moves WHERE move_key = {table}.{key})'
+    assignments = f'{value} = {value} - {amount}'
+    if version_field:
+        version = quote(model._meta.get_field(version_field).column)
+        assignments += f', {version} = {version} + 1'
+    short = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            moves = 'WITH moves (move_key, amount) AS (VALUES ' + ', '.join(['(%s, %s)'] * len(chunk)) + ') '
+            params = [item for row in chunk for item in row]
+            cursor.execute(
+                moves + f'UPDATE {table} SET {assignments} '
+                f'WHERE {column} = %s AND {key} IN (SELECT move_key FROM moves) AND {value} >= {amount} '
+                f'RETURNING {key}',
+                params + [filter_value],
+            )
+            updated = {row[0] for row in cursor.fetchall()}
+            short.extend(row[0] for row in chunk if row[0] not in updated)
+    return short
+
+
+def upsert(model: Type[Model], fields: Sequence[str], key_fields: Sequence[str], update_fields: Sequence[str],
+           rows: Sequence[Tuple], guard_fields: Sequence[str] = ()) -> List[Optional[int]]:
+    """
+    Insert rows or overwrite some fields of the existing row with the same key.
+
+    Runs ``INSERT ... ON CONFLICT (keys) DO UPDATE SET field = EXCLUDED.field
+    WHERE guard = EXCLUDED.guard RETURNING id, keys``; the key fields must be
+    covered by a unique constraint. The guard is checked by the same statement
+    that writes, so an existing row whose guard fields differ (e.g. a row of
+    another company under a globally unique name) is left alone even when it
+    was inserted after the caller last looked.
+
+    Args:
+        model: Model whose table is written
+        fields: Fields (``product_id`` style for foreign keys) of every row
+        key_fields: Subset of ``fields`` identifying a row
+        update_fields: Subset of ``fields`` overwritten when the key exists
+        rows: Tuples of values in the order of ``fields``, with distinct keys
+        guard_fields: Subset of ``fields`` that must match the existing row for it to be updated
+
+    Returns:
+        Primary keys of the inserted or updated rows in the order of ``rows``,
+        None for rows skipped because of the guard
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column = {name: quote(model._meta.get_field(name).column) for name in fields}
+    keys = ', '.join(column[name] for name in key_fields)
+    updates = ', '.join(f'{column[name]} = EXCLUDED.{column[name]}' for name in update_fields)
+    guard = ' AND '.join(f'{table}.{column[name]} = EXCLUDED.{column[name]}' for name in guard_fields)
+    row_sql = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    positions = [fields.index(name) for name in key_fields]
+    size = min(CHUNK_SIZE, MAX_PARAMS // len(fields))
+    ids = {}
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), size):
+            chunk = rows[start:start + size]
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(column.values())}) VALUES '
+                + ', '.join([row_sql] * len(chunk))
+                + f' ON CONFLICT ({keys}) DO UPDATE SET {updates}'
+                + (f' WHERE {guard}' if guard else '')
+                + f' RETURNING {quote(model._meta.pk.column)}, {keys}',
+                [item for row in chunk for item in row],
+            )
+            ids.update((tuple(key), pk) for pk, *key in cursor.fetchall())
+    return [ids.get(tuple(row[i] for i in positions)) for row in rows]
+
+
+def insert(model: Type[Model], fields: Sequence[str], rows: Sequence[Tuple]) -> None:
+    """
+    Insert rows with one ``INSERT ... VALUES`` statement per chunk.
+
+    Unlike the other helpers, values are converted by their model fields
+    (``get_db_prep_save``), so JSON and datetime values can be passed as is.
+
+    Args:
+        model: Model whose table is written
+        fields: Fields (``company_id`` style for foreign keys) of every row
+        rows: Tuples of values in the order of ``fields``
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    model_fields = [model._meta.get_field(name) for name in fields]
+    columns = ', '.join(quote(field.column) for field in model_fields)
+    row_sql = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    size = min(CHUNK_SIZE, MAX_PARAMS // len(fields))
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), size):
+            chunk = rows[start:start + size]
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES ' + ', '.join([row_sql] * len(chunk)),
+                [field.get_db_prep_save(value, connection) for row in chunk for field, value in zip(model_fields, row)],
+            )
@@ -0,0 +1,135 @@
+"""
+Idempotency keys for write requests.
+
+Clients on unreliable networks retry writes. A POST, PUT, PATCH or DELETE
+sent with an ``Idempotency-Key`` header is executed once; retries with the
+same key replay the stored response (marked with ``Idempotent-Replayed``)
+without running the view or touching the database.
+
+Keys are scoped to the method, path and user (taken from a valid access
+token, so a retry after a token refresh still matches), so two users cannot
+collide. A key reused with a different request body is
+rejected with 422, and a retry arriving while the first request is still
+running gets 409. Responses are kept in the Django cache for ``TTL``
+seconds, which evicts them without any cleanup job; only small responses
+are stored, compressed when that pays off. Server errors, conflicts and
+rate limits are not stored, so those requests can be retried for real.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from drf_yasg import openapi
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from typing import Any, Callable, Dict
+import hashlib
+import zlib
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+NOT_STORED_STATUSES = {409, 429}
+COMPRESS_ABOVE = 1024
+
+DEFAULTS = {
+    # Seconds a response is replayed for.
+    'TTL': 24 * 3600,
+    # Seconds after which a request that never finished no longer blocks its key.
+    'LOCK_TIMEOUT': 60,
+    # Responses with larger bodies are not stored.
+    'MAX_RESPONSE_SIZE': 256 * 1024,
+    'MAX_KEY_LENGTH': 255,
+}
+
+idempotency_key_parameter = openapi.Parameter(
+    HEADER, openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description='Unique key of the request; retries with the same key replay the first response',
+)
+
+
+def idempotency_settings() -> Dict[str, Any]:
+    """Get IDEMPOTENCY settings merged with defaults."""
+    return {**DEFAULTS, **getattr(settings, 'IDEMPOTENCY', {})}
+
+
+def client_scope(request: HttpRequest) -> str:
+    """
+    Identify the client of a request before DRF authenticates it.
+
+    The signature of the access token is verified, so a forged token cannot
+    replay another user's responses. Requests without a valid token are
+    scoped to their raw ``Authorization`` header.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    parts = header.split()
+    if len(parts) == 2 and parts[0] in api_settings.AUTH_HEADER_TYPES:
+        try:
+            return f'user:{AccessToken(parts[1])[api_settings.USER_ID_CLAIM]}'
+        except (TokenError, KeyError):
+            pass
+    return header
+
+
+def scope_key(request: HttpRequest, key: str) -> str:
+    scope = '\n'.join([request.method, request.path, client_scope(request), key])
+    return 'idempotency:' + hashlib.sha256(scope.encode()).hexdigest()
+
+
+class IdempotencyMiddleware:
+    """
+    Middleware replaying stored responses of write requests with an idempotency key.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        key = request.headers.get(HEADER)
+        if request.method not in METHODS or not key:
+            return self.get_response(request)
+
+        options = idempotency_settings()
+        if len(key) > options['MAX_KEY_LENGTH']:
+            return JsonResponse({'error': f'{HEADER} is too long'}, status=400)
+        cache_key = scope_key(request, key)
+        body_hash = hashlib.sha256(request.body).hexdigest()
+
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return self.replay(stored, body_hash)
+        if not cache.add(cache_key + ':lock', 1, options['LOCK_TIMEOUT']):
+            # Another request may have finished between the lookup and the lock.
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return self.replay(stored, body_hash)
+            return JsonResponse({'error': 'A request with this idempotency key is in progress'}, status=409)
+
+        try:
+            response = self.get_response(request)
+            self.store(cache_key, body_hash, response, options)
+        finally:
+            cache.delete(cache_key + ':lock')
+        return response
+
+    @staticmethod
+    def store(cache_key: str, body_hash: str, response: HttpResponse, options: Dict[str, Any]) -> None:
+        if (response.streaming or response.status_code >= 500 or response.status_code in NOT_STORED_STATUSES
+                or len(response.content) > options['MAX_RESPONSE_SIZE']):
+            return
+        content, compressed = response.content, False
+        if len(content) > COMPRESS_ABOVE:
+            content, compressed = zlib.compress(content), True
+        cache.set(cache_key, (body_hash, response.status_code, response.get('Content-Type'), compressed, content),
+                  options['TTL'])
+
+    @staticmethod
+    def replay(stored: tuple, body_hash: str) -> HttpResponse:
+        stored_hash, status, content_type, compressed, content = stored
+        if stored_hash != body_hash:
+            return JsonResponse({'error': f'{HEADER} was already used for a different request'}, status=422)
+        response = HttpResponse(zlib.decompress(content) if compressed else content,
+                                status=status, content_type=content_type)
+        response[REPLAYED_HEADER] = 'true'
+        return response
@@ -0,0 +1,73 @@
+"""
+Model helpers shared by the apps.
+"""
+
+from django.db import router, transaction
+from typing import Any, Dict, Sequence, Set
+
+
+class SnapshotMixin:
+    """
+    Remember the values of ``snapshot_fields`` as last loaded or saved.
+
+    Signal receivers use ``changed_fields()`` in ``post_save`` to react to
+    real changes only (e.g. an order's status) without reading the row again.
+    Fields deferred when the row was loaded are not tracked.
+    """
+    snapshot_fields: Sequence[str] = ()
+
+    @classmethod
+    def from_db(cls, db: Any, field_names: Any, values: Any) -> Any:
+        instance = super().from_db(db, field_names, values)
+        instance.take_snapshot()
+        return instance
+
+    def take_snapshot(self) -> None:
+        self._snapshot: Dict[str, Any] = {
+            name: self.__dict__[name] for name in self.snapshot_fields if name in self.__dict__
+        }
+
+    def changed_fields(self) -> Set[str]:
+        """Tracked fields whose value differs from the snapshot; all of them for unsaved rows."""
+        snapshot = getattr(self, '_snapshot', None)
+        if snapshot is None:
+            return set(self.snapshot_fields)
+        return {name for name, value in snapshot.items() if self.__dict__.get(name) != value}
+
+    def previous(self, name: str, default: Any = None) -> Any:
+        """Value of a tracked field as last loaded or saved, ``default`` for unsaved rows."""
+        return getattr(self, '_snapshot', {}).get(name, default)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+        self.take_snapshot()
+
+
+class VersionedMixin(SnapshotMixin):
+    """
+    Increment ``version`` when ``save()`` changes one of ``versioned_fields``.
+
+    Optimistic writers (see ``products.services``) only succeed while the row
+    is at the version they read, so a save changing a quantity must move the
+    version too. The row is locked and its current version read in the same
+    transaction, so the new version also passes versions written since the
+    instance was loaded and is known to ``post_save`` receivers.
+    """
+    versioned_fields: Sequence[str] = ()
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get('update_fields')
+        changed = set() if self._state.adding else self.changed_fields() & set(self.versioned_fields)
+        if update_fields is not None:
+            changed &= set(update_fields)
+        if not changed:
+            super().save(*args, **kwargs)
+            return
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            current = (type(self)._base_manager.using(using).select_for_update()
+                       .filter(pk=self.pk).values_list('version', flat=True).first())
+            self.version = (self.version if current is None else current) + 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+            super().save(*args, **kwargs)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 from get_docker_secret import get_docker_secret
+from corsheaders.defaults import default_headers
 from pathlib import Path
 import os
 
@@ -34,6 +35,8 @@ CORS_ALLOWED_ORIGINS = [
 
 # CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key', 'last-event-id')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 
 # Application definition
@@ -55,13 +58,25 @@ INSTALLED_APPS = [
     'orders.apps.OrdersConfig',
     'suppliers.apps.SuppliersConfig',
     'clients.apps.ClientsConfig',
+    'monitoring.apps.MonitoringConfig',
+    'events.apps.EventsConfig',
+    'alerts.apps.AlertsConfig',
+    'planning.apps.PlanningConfig',
+    'reports.apps.ReportsConfig',
+    'search.apps.SearchConfig',
+    'audit.apps.AuditConfig',
+    'wms.apps.WmsConfig',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
+    'audit.middleware.AuditMiddleware',
+    'monitoring.middleware.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'wms.idempotency.IdempotencyMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -70,7 +85,7 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.JWTAuthentication',
         'rest_framework.authentication.TokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
@@ -78,6 +93,45 @@ REST_FRAMEWORK = {
     ]
 }
 
+# JWT revocation list, see users.revocation
+TOKEN_REVOCATION = {
+    'REFRESH_INTERVAL': int(os.environ.get('TOKEN_REVOCATION_REFRESH_INTERVAL', 5)),
+    'REBUILD_INTERVAL': 3600,
+    'CAPACITY': 100_000,
+    'ERROR_RATE': 0.001,
+}
+
+# In-process set of active companies, see users.tenants
+ACTIVE_COMPANIES = {
+    'REFRESH_INTERVAL': int(os.environ.get('ACTIVE_COMPANIES_REFRESH_INTERVAL', 60)),
+}
+
+# Optional bearer token required to scrape /metrics
+METRICS_AUTH_TOKEN = get_docker_secret("metrics_token", os.environ.get("METRICS_AUTH_TOKEN"))
+
+# Per-request SQL instrumentation, see monitoring.middleware.QueryInspectorMiddleware
+QUERY_INSPECTOR = {
+    'RAISE': os.environ.get('QUERY_BUDGET_RAISE') == 'True',
+    'MAX_QUERIES': None,
+    'MAX_DUPLICATES': 10,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'monitoring': {
+            'handlers': ['console'],
+            'level': os.environ.get('MONITORING_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'api_key': {
@@ -93,7 +147,7 @@ ROOT_URLCONF = 'wms.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': os.path.join(BASE_DIR, "templates"),
+        'DIRS': [os.path.join(BASE_DIR, "templates")],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -123,6 +177,73 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Use a shared backend (e.g. django.core.cache.backends.redis.RedisCache)
+# when running several workers, so cached results are invalidated everywhere;
+# per-process backends are rejected when DEBUG is off, see wms.checks.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Available-to-promise results are cached per company for this many seconds
+# unless stock moves earlier, see products.atp
+ATP_CACHE_TIMEOUT = int(os.environ.get('ATP_CACHE_TIMEOUT', 300))
+
+# Number of scanned items kept in the per-process LRU, see products.scanning
+SCAN_CACHE_SIZE = int(os.environ.get('SCAN_CACHE_SIZE', 10_000))
+# Seconds a scanned item is kept; changes made by other workers are seen after at most this long
+SCAN_CACHE_TTL = float(os.environ.get('SCAN_CACHE_TTL', 60))
+
+# Number of warehouse layouts kept in the per-process LRU, see warehouse.routing
+LAYOUT_CACHE_SIZE = int(os.environ.get('LAYOUT_CACHE_SIZE', 16))
+
+# Responses of write requests with an Idempotency-Key header are replayed
+# for this many seconds, see wms.idempotency
+IDEMPOTENCY = {
+    'TTL': int(os.environ.get('IDEMPOTENCY_TTL', 24 * 3600)),
+}
+
+# Server-Sent Events stream, see events.bus
+EVENTS = {
+    'BUFFER_SIZE': int(os.environ.get('EVENTS_BUFFER_SIZE', 10_000)),
+    'HEARTBEAT': int(os.environ.get('EVENTS_HEARTBEAT', 15)),
+}
+
+# Low stock and expiry alerts, see alerts.engine
+ALERTS = {
+    'EXPIRY_HORIZON_DAYS': int(os.environ.get('ALERTS_EXPIRY_HORIZON_DAYS', 7)),
+    'NOTIFIERS': ['alerts.notifiers.EmailNotifier'],
+}
+
+# Demand forecasts and reorder points, see planning.forecast
+PLANNING = {
+    'HISTORY_WEEKS': int(os.environ.get('PLANNING_HISTORY_WEEKS', 52)),
+    'SERVICE_LEVEL': float(os.environ.get('PLANNING_SERVICE_LEVEL', 0.95)),
+    'LEAD_TIME_DAYS': float(os.environ.get('PLANNING_LEAD_TIME_DAYS', 14)),
+    'ORDER_COVER_DAYS': float(os.environ.get('PLANNING_ORDER_COVER_DAYS', 7)),
+}
+
+# Report rollups, see reports.rollups
+REPORTS = {
+    'LAG_SECONDS': int(os.environ.get('REPORTS_LAG_SECONDS', 60)),
+}
+
+# Audit log of stock-affecting writes, see audit.log and audit.partitions
+AUDIT = {
+    'RETENTION_DAYS': int(os.environ['AUDIT_RETENTION_DAYS']) if os.environ.get('AUDIT_RETENTION_DAYS') else None,
+    'PARTITIONS_AHEAD': int(os.environ.get('AUDIT_PARTITIONS_AHEAD', 3)),
+}
+
+# Default limits of a pick wave, see warehouse.waves
+WAVE_PLANNING = {
+    'MAX_ORDERS': int(os.environ.get('WAVE_MAX_ORDERS', 20)),
+    'MAX_LINES': int(os.environ.get('WAVE_MAX_LINES', 200)),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -0,0 +1,181 @@
+"""
+Test suite for bulk upserts on catalog endpoints.
+"""
+
+from unittest import mock
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from conftest import create_user
+from users.models import Company, UserGroups
+from products.models import BillOfMaterials, Material, Product, ProductClosure
+from suppliers.models import Supplier
+from clients.models import Client
+from ..bulk import BulkUpsertMixin
+
+
+class TestBulkUpsert(TestCase):
+    """Test suite for list payloads on the catalog endpoints."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.other = Company.objects.create(name='Other', domain='other.com', email='other@other.com')
+        cls.user = create_user(cls.company, 'manager', UserGroups.WAREHOUSE_MANAGER)
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def post(self, name: str, data):
+        return self.client.post(reverse(name), data, format='json')
+
+    def test_materials_created_and_updated(self) -> None:
+        """
+        Test upserting materials by name.
+
+        Verifies:
+            - New names are created for the user's company and existing ones updated
+            - Results keep the order of the request and carry the ids
+            - A single object is still created the usual way
+        """
+        steel = Material.objects.create(company=self.company, name='Steel', unit='kg')
+        response = self.post('products:material', [{'name': 'Copper', 'unit': 'kg'}, {'name': 'Steel', 'unit': 't'}])
+        assert response.status_code == 200
+        copper = Material.objects.get(name='Copper')
+        assert response.json() == [
+            {'index': 0, 'status': 'created', 'id': copper.pk},
+            {'index': 1, 'status': 'updated', 'id': steel.pk},
+        ]
+        assert copper.company_id == self.company.pk
+        steel.refresh_from_db()
+        assert steel.unit == 't'
+
+        assert self.post('products:material', {'name': 'Tin', 'unit': 'kg'}).status_code == 201
+
+    def test_item_errors(self) -> None:
+        """
+        Test a list mixing valid and invalid items.
+
+        Verifies:
+            - Invalid fields, repeated keys and keys of another company are reported per item
+            - Valid items are written anyway
+            - A list without any valid item is answered with 400
+        """
+        Material.objects.create(company=self.other, name='Gold', unit='g')
+        response = self.post('products:material', [
+            {'name': 'Copper', 'unit': 'kg'},
+            {'name': 'Iron'},
+            {'name': 'Copper', 'unit': 't'},
+            {'name': 'Gold', 'unit': 'kg'},
+        ])
+        assert response.status_code == 200
+        results = response.json()
+        assert [result['status'] for result in results] == ['created', 'error', 'error', 'error']
+        assert 'unit' in results[1]['errors']
+        assert 'item 0' in results[2]['errors']['non_field_errors'][0]
+        assert Material.objects.get(name='Copper').unit == 'kg'
+        assert Material.objects.get(name='Gold').company_id == self.other.pk
+
+        assert self.post('products:material', [{'name': 'Gold', 'unit': 'kg'}]).status_code == 400
+        assert self.post('products:material', []).status_code == 400
+
+    def test_key_taken_after_read(self) -> None:
+        """
+        Test a key another company takes between the existence check and the write.
+
+        Verifies:
+            - The other company's row is not overwritten
+            - The item is reported as an error and the other items are written
+            - A list whose only item hits such a key is answered with 400
+        """
+        gold = Material.objects.create(company=self.other, name='Gold', unit='g')
+        with mock.patch.object(BulkUpsertMixin, '_existing', return_value={}):
+            response = self.post('products:material', [{'name': 'Gold', 'unit': 'kg'}, {'name': 'Tin', 'unit': 'kg'}])
+        assert response.status_code == 200
+        results = response.json()
+        assert [result['status'] for result in results] == ['error', 'created']
+        assert 'id' not in results[0]
+        gold.refresh_from_db()
+        assert (gold.company_id, gold.unit) == (self.other.pk, 'g')
+        assert Material.objects.get(name='Tin').company_id == self.company.pk
+
+        item = {'name': 'Acme', 'address': 'Street 1', 'phone': '1', 'email': 'acme@example.com',
+                'website': 'https://acme.example.com'}
+        acme = Supplier.objects.create(company=self.other, **item)
+        with mock.patch.object(BulkUpsertMixin, '_existing', return_value={}):
+            response = self.post('suppliers:supplier', [item | {'phone': '2'}])
+        assert response.status_code == 400
+        assert response.json()[0]['status'] == 'error'
+        acme.refresh_from_db()
+        assert (acme.company_id, acme.phone) == (self.other.pk, '1')
+
+    def test_products_seed_closure(self) -> None:
+        """
+        Test upserting products.
+
+        Verifies:
+            - Created products get their closure row like products saved one by one
+            - Existing products are updated without duplicating the closure row
+        """
+        response = self.post('products:product', [{'name': 'Chair', 'unit': 'pcs'}])
+        chair = Product.objects.get(name='Chair')
+        assert response.json()[0]['id'] == chair.pk
+        response = self.post('products:product', [{'name': 'Chair', 'unit': 'pcs', 'production_rate': 4},
+                                                  {'name': 'Table', 'unit': 'pcs'}])
+        assert [result['status'] for result in response.json()] == ['updated', 'created']
+        chair.refresh_from_db()
+        assert chair.production_rate == 4
+        closure = set(ProductClosure.objects.values_list('ancestor__name', 'descendant__name'))
+        assert closure == {('Chair', 'Chair'), ('Table', 'Table')}
+
+    def test_bill_of_materials(self) -> None:
+        """
+        Test upserting bill of materials lines.
+
+        Verifies:
+            - Lines are upserted by product and material
+            - Products and materials of another company are rejected per item
+            - Foreign keys are checked with one query per field however many items there are
+        """
+        chair = Product.objects.create(company=self.company, name='Chair', unit='pcs')
+        materials = [Material.objects.create(company=self.company, name=f'M{i}', unit='kg') for i in range(50)]
+        foreign = Material.objects.create(company=self.other, name='Foreign', unit='kg')
+        BillOfMaterials.objects.create(product=chair, material=materials[0], quantity=1)
+        lines = [{'product': chair.pk, 'material': material.pk, 'quantity': 2} for material in materials]
+        lines.append({'product': chair.pk, 'material': foreign.pk, 'quantity': 1})
+        with CaptureQueriesContext(connection) as few:
+            self.post('products:bom', lines[:2])
+        with CaptureQueriesContext(connection) as many:
+            response = self.post('products:bom', lines)
+        assert len(many) == len(few)
+
+        results = response.json()
+        assert [result['status'] for result in results[:3]] == ['updated', 'updated', 'created']
+        assert all(result['status'] == 'created' for result in results[3:50])
+        assert results[50]['errors'] == {'material': ['Object does not exist.']}
+        assert set(BillOfMaterials.objects.values_list('quantity', flat=True)) == {2}
+        assert BillOfMaterials.objects.count() == 50
+
+    def test_suppliers_and_clients(self) -> None:
+        """
+        Test upserting suppliers and clients by name and email.
+
+        Verifies:
+            - Both endpoints create rows for the user's company and update existing ones
+            - Lists only show the user's company
+        """
+        for name, model in (('suppliers:supplier', Supplier), ('clients:client', Client)):
+            item = {'name': 'Acme', 'address': 'Street 1', 'phone': '1', 'email': 'acme@example.com',
+                    'website': 'https://acme.example.com'}
+            assert self.post(name, [item]).json()[0]['status'] == 'created'
+            response = self.post(name, [item | {'phone': '2'}, item | {'email': 'sales@example.com'}])
+            assert [result['status'] for result in response.json()] == ['updated', 'created']
+            assert set(model.objects.values_list('phone', flat=True)) == {'2', '1'}
+            assert model.objects.filter(company=self.company).count() == 2
+            model.objects.create(company=self.other, name='Other', address='-', phone='-',
+                                 email='other@example.com', website='https://other.example.com')
+            assert len(self.client.get(reverse(name)).json()) == 2
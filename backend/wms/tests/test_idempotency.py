@@ -0,0 +1,112 @@
+"""
+Test suite for idempotency keys on write requests.
+"""
+
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from conftest import create_user
+from users.models import Company, CustomUser, UserGroups
+from products.models import Material
+from ..idempotency import HEADER, REPLAYED_HEADER, scope_key
+
+
+class TestIdempotency(TestCase):
+    """Test suite for replaying responses of retried requests."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.company = Company.objects.first()
+        cls.users = [create_user(cls.company, name, UserGroups.ADMIN) for name in ('first', 'second')]
+
+    def client_for(self, user: CustomUser) -> APIClient:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def post_material(self, client: APIClient, key: str = None, name: str = 'Steel'):
+        headers = {HEADER: key} if key else {}
+        return client.post(reverse('products:material'), {'name': name, 'unit': 'kg'}, format='json',
+                           headers=headers)
+
+    def test_retry_replays_response(self) -> None:
+        """
+        Test retrying a create request with the same key.
+
+        Verifies:
+            - The material is created once
+            - The retry gets the original status and body without running any query
+            - Requests without a key are not deduplicated
+        """
+        client = self.client_for(self.users[0])
+        first = self.post_material(client, 'key-1')
+        assert first.status_code == 201
+        with self.assertNumQueries(0):
+            retry = self.post_material(client, 'key-1')
+        assert retry.status_code == 201
+        assert retry.content == first.content
+        assert retry[REPLAYED_HEADER] == 'true'
+        assert Material.objects.filter(name='Steel').count() == 1
+
+        # Without a key the retry runs again and fails on the unique name.
+        response = self.post_material(client)
+        assert response.status_code == 400 and REPLAYED_HEADER not in response
+
+    def test_keys_are_scoped(self) -> None:
+        """
+        Test key scoping and reuse.
+
+        Verifies:
+            - The same key of another user runs the request
+            - A key reused with a different body is rejected, also with a new token of the same user
+        """
+        self.post_material(self.client_for(self.users[0]), 'shared')
+        response = self.post_material(self.client_for(self.users[1]), 'shared')
+        assert response.status_code == 400 and REPLAYED_HEADER not in response
+
+        response = self.post_material(self.client_for(self.users[0]), 'shared', name='Copper')
+        assert response.status_code == 422
+        assert not Material.objects.filter(name='Copper').exists()
+
+    def test_concurrent_retry_conflicts(self) -> None:
+        """
+        Test that a retry of a request that is still running is rejected.
+
+        Verifies:
+            - The retry gets 409 and does not run the view
+            - The key works again once the lock is released
+        """
+        client = self.client_for(self.users[0])
+        token = client._credentials['HTTP_AUTHORIZATION']
+        request = RequestFactory().post(reverse('products:material'), HTTP_AUTHORIZATION=token)
+        lock = scope_key(request, 'running') + ':lock'
+        cache.add(lock, 1)
+        assert self.post_material(client, 'running').status_code == 409
+        assert not Material.objects.exists()
+
+        cache.delete(lock)
+        assert self.post_material(client, 'running').status_code == 201
+
+    def test_shared_cache_required(self) -> None:
+        """
+        Test the system check of the cache the keys are stored in.
+
+        Verifies:
+            - A per-process cache is rejected when DEBUG is off and accepted when it is on
+            - A shared cache is accepted
+        """
+        def errors() -> list:
+            return [message.id for message in run_checks(tags=['caches'])]
+
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem, DEBUG=False):
+            assert errors() == ['wms.E001']
+        with override_settings(CACHES=locmem, DEBUG=True):
+            assert errors() == []
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                              'LOCATION': 'redis://cache:6379/0'}}
+        with override_settings(CACHES=shared, DEBUG=False):
+            assert errors() == []
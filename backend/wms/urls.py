@@ -35,6 +35,16 @@ urlpatterns = [
     path('accounts/login/', OnlyVerifiedCompaniesTokenObtainPairView.as_view(), name='login'),
     path('api/users/', include('users.urls', 'users')),
     path('api/products/', include('products.urls', 'products')),
+    path('api/suppliers/', include('suppliers.urls', 'suppliers')),
+    path('api/clients/', include('clients.urls', 'clients')),
+    path('api/warehouse/', include('warehouse.urls', 'warehouse')),
+    path('api/alerts/', include('alerts.urls', 'alerts')),
+    path('api/planning/', include('planning.urls', 'planning')),
+    path('api/reports/', include('reports.urls', 'reports')),
+    path('api/search/', include('search.urls', 'search')),
+    path('api/audit/', include('audit.urls', 'audit')),
+    path('api/events/', include('events.urls', 'events')),
+    path('metrics/', include('monitoring.urls', 'monitoring')),
     path('admin/', admin.site.urls),
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="redoc-ui"),